@@ -0,0 +1,27 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: __init__.py
+@Description: Benchmarks and synthetic workloads for the optimizer (run from core/ with python -m).
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
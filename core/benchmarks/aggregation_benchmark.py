@@ -0,0 +1,161 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: aggregation_benchmark.py
+@Description: Symmetry aggregation on synthetic fleets of identical BESS racks and EV chargers:
+              solve time and objective with and without aggregation, the number of devices
+              left after clustering, and power balance / limit checks of the split results.
+
+              python -m benchmarks.aggregation_benchmark --fleets 10 50 200 [--json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+from typing import Dict, Any, Tuple
+
+from benchmarks.fallback_benchmark import dispatch_violations
+from benchmarks.synthetic_site import OBJECTIVES, generate_site, generate_measurements
+from optimization.aggregation import AGGREGATABLE
+from optimization.optimizer import OptimizerRunner
+
+
+def fleet_counts(units: int) -> Dict[str, int]:
+    """`units` of every aggregatable type, with one PV/load/AFE per ten units."""
+    per_ten = max(1, units // 10)
+    return {'AFE': per_ten, 'PV': per_ten, 'WIND': 1, 'LOAD': per_ten, 'CRITICAL_LOAD': 1,
+            **{device_type: units for device_type in AGGREGATABLE}}
+
+
+def fleet_measurements(config: Dict[str, Any], rng: random.Random) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """A snapshot in which every connected car is of the same model."""
+    averaged, recent = generate_measurements(config, rng, grid_outage_probability=0)
+    for key in recent:
+        if key.endswith('_CAR_CAP') and recent[key] > 0:
+            recent[key] = 60000
+        elif key.endswith('_CAR_MAX_P') and recent[key] > 0:
+            recent[key] = 11000
+    return averaged, recent
+
+
+def benchmark_aggregation(objective: str, backend: str, units: int, snapshots: int,
+                          soc_bucket: float, seed: int = 0) -> Dict[str, Any]:
+    """
+    Solve `snapshots` fleet snapshots with and without aggregation.
+
+    Returns:
+        Median solve ms of both, devices per group after clustering, the largest relative
+        objective loss of the aggregated solve and the number of split results that break
+        the power balance or a device limit
+    """
+    settings = {'backend': backend, 'fallback': False}
+    runners = {
+        aggregate: OptimizerRunner(generate_site(
+            fleet_counts(units), objective, seed=seed, spread=0,
+            settings={**settings, 'aggregation': {'types': list(AGGREGATABLE), 'socBucket': soc_bucket}}
+            if aggregate else settings))
+        for aggregate in (True, False)
+    }
+    rng = random.Random(seed)
+    solve_ms = {True: [], False: []}
+    devices = {group: [] for group in AGGREGATABLE.values()}
+    max_obj_loss, violated, failed = 0.0, 0, 0
+
+    for _ in range(snapshots):
+        averaged, recent = fleet_measurements(runners[True].config, rng)
+        results = {}
+        for aggregate, runner in runners.items():
+            inputs = runner.prepare_inputs(averaged, recent)
+            start = time.perf_counter()
+            results[aggregate] = runner.run_optimization(inputs)
+            solve_ms[aggregate].append((time.perf_counter() - start) * 1000)
+
+        if results[True]['status'] != 'success' or results[False]['status'] != 'success':
+            failed += 1
+            continue
+        for group, counts in runners[True].solver_stats()['aggregation'].items():
+            devices[group].append(counts['devices'])
+        if dispatch_violations(inputs, results[True]['output']):
+            violated += 1
+        full_obj = results[False]['output']['obj']
+        loss = (full_obj - results[True]['output']['obj']) / max(1.0, abs(full_obj))
+        max_obj_loss = max(max_obj_loss, loss)
+
+    return {
+        'median_full_ms': round(statistics.median(solve_ms[False]), 2),
+        'median_aggregated_ms': round(statistics.median(solve_ms[True]), 2),
+        'devices': {group: round(statistics.mean(counts), 1) if counts else None for group, counts in devices.items()},
+        'max_obj_loss': max_obj_loss,
+        'violations': violated,
+        'failed': failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve times with and without symmetry aggregation")
+    parser.add_argument('--fleets', type=int, nargs='+', default=[10, 50, 200], help="Units per aggregatable type")
+    parser.add_argument('--backend', default='highs')
+    parser.add_argument('--objectives', nargs='+', default=['maxWeightPowerFlow', 'peakShaving'],
+                        choices=list(OBJECTIVES))
+    parser.add_argument('--snapshots', type=int, default=5)
+    parser.add_argument('--soc-bucket', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    report = {
+        'backend': args.backend,
+        'snapshots': args.snapshots,
+        'soc_bucket': args.soc_bucket,
+        'results': {
+            objective: {units: benchmark_aggregation(objective, args.backend, units, args.snapshots,
+                                                     args.soc_bucket, args.seed)
+                        for units in args.fleets}
+            for objective in args.objectives
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"backend {args.backend}, {args.snapshots} snapshots, SoC bucket {args.soc_bucket}")
+    print(f"{'objective':<20} {'units':>6} {'full ms':>9} {'aggr ms':>9} {'speedup':>8} "
+          f"{'bess':>6} {'unidir':>7} {'bidir':>6} {'max rel loss':>12} {'violations':>10}")
+    for objective, results in report['results'].items():
+        for units, r in results.items():
+            speedup = r['median_full_ms'] / r['median_aggregated_ms'] if r['median_aggregated_ms'] else 0
+            d = {group: f"{count:.0f}" if count is not None else '-' for group, count in r['devices'].items()}
+            print(f"{objective:<20} {units:>6} {r['median_full_ms']:>9.1f} {r['median_aggregated_ms']:>9.1f} "
+                  f"{speedup:>8.2f} {d['bess']:>6} {d['unidir']:>7} {d['bidir']:>6} "
+                  f"{r['max_obj_loss']:>12.2e} {r['violations']:>10}")
+
+
+if __name__ == '__main__':
+    main()
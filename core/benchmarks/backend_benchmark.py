@@ -0,0 +1,137 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: backend_benchmark.py
+@Description: Compares the solver backends objective by objective on identical synthetic inputs:
+              per-cycle latency, solver status agreement and objective value difference
+              against the 'pyomo' reference.
+
+              python -m benchmarks.backend_benchmark --devices 20 --cycles 10 [--json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+from typing import Dict, Any, List
+
+from benchmarks.synthetic_site import OBJECTIVES, generate_site, generate_measurements
+from optimization.optimizer import OptimizerRunner
+from optimization.solver_backends import BACKENDS
+
+
+def benchmark_objective(objective: str, devices: int, cycles: int, backends: List[str],
+                        seed: int = 0) -> Dict[str, Any]:
+    """
+    Run `cycles` optimizations of one objective with every backend on the same inputs.
+
+    Returns:
+        Per backend: mean/median/max ms, successful cycles, status mismatches and the
+        largest relative objective difference versus the first backend (MIP solutions
+        agree within the solver's relative gap)
+    """
+    runners = {
+        name: OptimizerRunner(generate_site(devices, objective, {'backend': name}, seed=seed))
+        for name in backends
+    }
+    reference = backends[0]
+    rng = random.Random(seed)
+    timings = {name: [] for name in backends}
+    results = {name: {'success': 0, 'status_mismatches': 0, 'max_obj_diff': 0.0} for name in backends}
+
+    for _ in range(cycles):
+        averaged, recent = generate_measurements(runners[reference].config, rng)
+        outcomes = {}
+        for name, runner in runners.items():
+            inputs = runner.prepare_inputs(averaged, recent)
+            start = time.perf_counter()
+            outcomes[name] = runner.run_optimization(inputs)
+            timings[name].append((time.perf_counter() - start) * 1000)
+
+        expected = outcomes[reference]
+        for name, outcome in outcomes.items():
+            result = results[name]
+            if outcome['status'] == 'success':
+                result['success'] += 1
+            if outcome['status'] != expected['status']:
+                result['status_mismatches'] += 1
+            elif outcome['status'] == 'success':
+                reference_obj = expected['output']['obj']
+                diff = abs(outcome['output']['obj'] - reference_obj) / max(1.0, abs(reference_obj))
+                result['max_obj_diff'] = max(result['max_obj_diff'], diff)
+
+    for name in backends:
+        # The first cycle includes model construction for the persistent backend
+        steady = timings[name][1:] or timings[name]
+        results[name].update(
+            first_ms=round(timings[name][0], 2),
+            mean_ms=round(statistics.mean(steady), 2),
+            median_ms=round(statistics.median(steady), 2),
+            max_ms=round(max(steady), 2),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare optimizer solver backends")
+    parser.add_argument('--devices', type=int, default=20, help="Devices per type")
+    parser.add_argument('--cycles', type=int, default=10, help="Cycles per objective")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS),
+                        help="Backends to compare; the first one is the reference")
+    parser.add_argument('--objectives', nargs='+', default=list(OBJECTIVES), choices=list(OBJECTIVES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    report = {
+        'devices_per_type': args.devices,
+        'cycles': args.cycles,
+        'reference': args.backends[0],
+        'objectives': {
+            objective: benchmark_objective(objective, args.devices, args.cycles, args.backends, args.seed)
+            for objective in args.objectives
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{args.devices} devices per type, {args.cycles} cycles, reference '{report['reference']}'")
+    print(f"{'objective':<20} {'backend':<18} {'first':>9} {'mean':>9} {'median':>9} {'max':>9} "
+          f"{'ok':>4} {'status!=':>8} {'max rel dobj':>12}")
+    for objective, results in report['objectives'].items():
+        for name, r in results.items():
+            print(f"{objective:<20} {name:<18} {r['first_ms']:>9.1f} {r['mean_ms']:>9.1f} "
+                  f"{r['median_ms']:>9.1f} {r['max_ms']:>9.1f} {r['success']:>4} "
+                  f"{r['status_mismatches']:>8} {r['max_obj_diff']:>12.2e}")
+
+
+if __name__ == '__main__':
+    main()
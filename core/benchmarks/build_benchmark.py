@@ -0,0 +1,147 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: build_benchmark.py
+@Description: Model generation time of the three single-interval builders - Pyomo expressions
+              ('pyomo'), per-entry column/row lists ('highs') and device-table arrays compiled
+              to scipy.sparse ('sparse') - for EV depots of growing size, plus the solve
+              through each backend and the objective agreement with Pyomo.
+
+              python -m benchmarks.build_benchmark --chargers 30 100 300 1000 [--json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+from typing import Dict, Any, List
+
+from benchmarks.synthetic_site import OBJECTIVES, generate_site, generate_measurements
+from optimization.horizon_model import build_horizon_model
+from optimization.linear_model import build_linear_model
+from optimization.optimizer import OptimizerRunner
+
+BUILDERS = ('pyomo', 'highs', 'sparse')
+
+
+def depot_counts(chargers: int) -> Dict[str, int]:
+    """An EV depot: chargers split between unidirectional and bidirectional, a few of the rest."""
+    return {
+        'AFE': max(1, chargers // 75), 'PV': max(1, chargers // 50), 'WIND': 0,
+        'LOAD': max(1, chargers // 50), 'CRITICAL_LOAD': 1, 'BESS': max(1, chargers // 100),
+        'UNI_EV': chargers - chargers // 2, 'BI_EV': chargers // 2,
+    }
+
+
+def _build(name: str, optimizer, inputs: Dict[str, Any]):
+    if name == 'pyomo':
+        return optimizer.build_pyomo_model(inputs)
+    if name == 'highs':
+        return build_linear_model(optimizer, inputs).to_highs_lp()
+    hm = build_horizon_model(optimizer, inputs, 1, 1.0)
+    hm.to_csc()
+    return hm
+
+
+def benchmark_builders(chargers: int, objective: str, repeats: int, solve: bool,
+                       seed: int = 0) -> Dict[str, Any]:
+    """
+    Time model generation (and optionally the full backend solve) for one depot size.
+
+    Returns:
+        Per builder: median build ms; with `solve`, the median solve-through-backend ms,
+        status and relative objective difference to 'pyomo'
+    """
+    counts = depot_counts(chargers)
+    runners = {name: OptimizerRunner(generate_site(counts, objective, {'backend': name}, seed=seed))
+               for name in BUILDERS}
+    rng = random.Random(seed)
+    averaged, recent = generate_measurements(runners['pyomo'].config, rng, grid_outage_probability=0)
+    report: Dict[str, Any] = {'chargers': chargers, 'devices': len(runners['pyomo'].config['devices'])}
+
+    outcomes = {}
+    for name, runner in runners.items():
+        inputs = runner.prepare_inputs(averaged, recent)
+        build_ms: List[float] = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _build(name, runner.optimizer, inputs)
+            build_ms.append((time.perf_counter() - start) * 1000)
+        result = {'build_ms': round(statistics.median(build_ms), 2)}
+
+        if solve:
+            start = time.perf_counter()
+            outcomes[name] = runner.run_optimization(inputs)
+            result['total_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            result['status'] = outcomes[name].get('solver_status', outcomes[name]['status'])
+        report[name] = result
+
+    if solve and outcomes['pyomo']['status'] == 'success':
+        reference = outcomes['pyomo']['output']['obj']
+        for name in BUILDERS[1:]:
+            if outcomes[name]['status'] == 'success':
+                report[name]['obj_diff'] = abs(outcomes[name]['output']['obj'] - reference) / max(1.0, abs(reference))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model generation time per builder for EV depots")
+    parser.add_argument('--chargers', type=int, nargs='+', default=[30, 100, 300, 1000])
+    parser.add_argument('--objective', default='maxWeightPowerFlow', choices=list(OBJECTIVES))
+    parser.add_argument('--repeats', type=int, default=3, help="Builds per builder (median is reported)")
+    parser.add_argument('--no-solve', action='store_true', help="Only time model generation")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    results = [benchmark_builders(n, args.objective, args.repeats, not args.no_solve, args.seed)
+               for n in args.chargers]
+
+    if args.json:
+        print(json.dumps({'objective': args.objective, 'results': results}, indent=2))
+        return
+
+    print(f"{args.objective}: median model generation ms (solve through the backend, ms)")
+    print(f"{'chargers':>8} {'devices':>8} " + " ".join(f"{name:>22}" for name in BUILDERS))
+    for r in results:
+        cells = []
+        for name in BUILDERS:
+            cell = f"{r[name]['build_ms']:.1f}"
+            if 'total_ms' in r[name]:
+                cell += f" ({r[name]['total_ms']:.0f})"
+            cells.append(f"{cell:>22}")
+        print(f"{r['chargers']:>8} {r['devices']:>8} " + " ".join(cells))
+    if not args.no_solve:
+        for r in results:
+            diffs = {name: r[name].get('obj_diff') for name in BUILDERS[1:]}
+            print(f"{r['chargers']:>8} chargers: relative objective difference to pyomo {diffs}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: fallback_benchmark.py
+@Description: Checks and times the merit-order fallback dispatch: on random snapshots it is
+              compared with the MIP solution (objective ratio), checked for power balance and
+              device limits, and timed in microseconds.
+
+              python -m benchmarks.fallback_benchmark --devices 5 --snapshots 50 [--json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+from typing import Dict, Any, List
+
+from benchmarks.synthetic_site import OBJECTIVES, generate_site, generate_measurements
+from optimization.fallback_dispatch import merit_order_dispatch
+from optimization.optimizer import OptimizerRunner
+
+TOLERANCE = 1e-3
+
+
+def dispatch_violations(inputs: Dict[str, Any], output: Dict[str, Any]) -> List[str]:
+    """Power balance and device limit violations of an output dict (empty if none)."""
+    violations = []
+
+    def total(group, key):
+        return sum(device[key] for device in output.get(group, {}).values())
+
+    supply = output['imp'] + total('pv', 'power') + total('wind', 'power') + total('bess', 'discharge') \
+        + total('bidir', 'discharge')
+    demand = output['exp'] + total('load', 'power') + total('cload', 'power') + total('bess', 'charge') \
+        + total('unidir', 'charge') + total('bidir', 'charge')
+    if abs(supply - demand) > TOLERANCE:
+        violations.append(f"power balance {supply:.4f} != {demand:.4f}")
+
+    for group in ('pv', 'wind', 'load', 'cload'):
+        for device_id, device in output.get(group, {}).items():
+            if not -TOLERANCE <= device['power'] <= inputs[group][device_id]['power_fct_kW'] + TOLERANCE:
+                violations.append(f"{device_id} power {device['power']}")
+
+    for afe_id, afe in output.get('afe', {}).items():
+        data = inputs['afe'][afe_id]
+        if afe['imp'] > TOLERANCE and afe['exp'] > TOLERANCE:
+            violations.append(f"{afe_id} imports and exports")
+        if max(afe['imp'], afe['exp']) > data['max_kW'] * data['available'] + TOLERANCE:
+            violations.append(f"{afe_id} exceeds its capacity")
+        if afe['exp2'] > data['grid_svc_kW'] + TOLERANCE or (data['grid_svc_kW'] > 0 and afe['imp'] > TOLERANCE):
+            violations.append(f"{afe_id} grid service")
+
+    for bess_id, bess in output.get('bess', {}).items():
+        data = inputs['bess'][bess_id]
+        if bess['charge'] > TOLERANCE and bess['discharge'] > TOLERANCE:
+            violations.append(f"{bess_id} charges and discharges")
+        if max(bess['charge'], bess['discharge']) > data['power_max_kW'] + TOLERANCE:
+            violations.append(f"{bess_id} exceeds its power")
+        if bess['level'] > data['level_max_kWh'] + TOLERANCE:
+            violations.append(f"{bess_id} level {bess['level']}")
+
+    for group in ('unidir', 'bidir'):
+        for charger_id, charger in output.get(group, {}).items():
+            data = inputs[group][charger_id]
+            power_max = min(data['car_power_max_kW'], data['charger_power_max_kW'])
+            if charger['charge'] > power_max + TOLERANCE or charger.get('discharge', 0) > power_max + TOLERANCE:
+                violations.append(f"{charger_id} exceeds its power")
+            if not -TOLERANCE <= charger['soc'] <= 1 + TOLERANCE:
+                violations.append(f"{charger_id} soc {charger['soc']}")
+
+    return violations
+
+
+def benchmark_fallback(objective: str, devices: int, snapshots: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Dispatch `snapshots` random snapshots with the fallback and with the MIP.
+
+    Returns:
+        Median/max dispatch time in microseconds, the number of snapshots with violations,
+        the number the MIP could not solve, and the min/mean ratio of the fallback objective
+        to the optimal one (over snapshots with a positive optimum)
+    """
+    runner = OptimizerRunner(generate_site(devices, objective, {'backend': 'highs', 'fallback': False}, seed=seed))
+    rng = random.Random(seed)
+    dispatch_us, ratios = [], []
+    violated, unsolved = 0, 0
+
+    for _ in range(snapshots):
+        inputs = runner.prepare_inputs(*generate_measurements(runner.config, rng))
+        start = time.perf_counter()
+        output = merit_order_dispatch(runner.optimizer, inputs)
+        dispatch_us.append((time.perf_counter() - start) * 1e6)
+        if dispatch_violations(inputs, output):
+            violated += 1
+
+        result = runner.run_optimization(inputs)
+        if result['status'] != 'success':
+            unsolved += 1
+        elif result['output']['obj'] > 0:
+            ratios.append(output['obj'] / result['output']['obj'])
+
+    return {
+        'median_us': round(statistics.median(dispatch_us), 1),
+        'max_us': round(max(dispatch_us), 1),
+        'violations': violated,
+        'mip_unsolved': unsolved,
+        'min_obj_ratio': round(min(ratios), 3) if ratios else None,
+        'mean_obj_ratio': round(statistics.mean(ratios), 3) if ratios else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merit-order fallback dispatch versus the MIP")
+    parser.add_argument('--devices', type=int, default=5, help="Devices per type")
+    parser.add_argument('--snapshots', type=int, default=50)
+    parser.add_argument('--objectives', nargs='+', default=list(OBJECTIVES), choices=list(OBJECTIVES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    report = {
+        'devices_per_type': args.devices,
+        'snapshots': args.snapshots,
+        'results': {objective: benchmark_fallback(objective, args.devices, args.snapshots, args.seed)
+                    for objective in args.objectives},
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{args.devices} devices per type, {args.snapshots} snapshots")
+    print(f"{'objective':<20} {'median us':>10} {'max us':>9} {'violations':>10} {'unsolved':>9} "
+          f"{'min ratio':>10} {'mean ratio':>11}")
+    for objective, r in report['results'].items():
+        def fmt(value, width):
+            return f"{value:>{width}.3f}" if value is not None else f"{'-':>{width}}"
+        print(f"{objective:<20} {r['median_us']:>10.1f} {r['max_us']:>9.1f} {r['violations']:>10} "
+              f"{r['mip_unsolved']:>9} {fmt(r['min_obj_ratio'], 10)} {fmt(r['mean_obj_ratio'], 11)}")
+
+
+if __name__ == '__main__':
+    main()
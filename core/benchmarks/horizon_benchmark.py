@@ -0,0 +1,124 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: horizon_benchmark.py
+@Description: Receding-horizon ('horizon' backend) build and solve times per cycle for a range
+              of site sizes, against the 15-minute control cycle.
+
+              python -m benchmarks.horizon_benchmark --devices 1 5 20 --steps 96 --cycles 4 [--json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import json
+import logging
+import random
+import statistics
+from typing import Dict, Any
+
+from benchmarks.synthetic_site import (OBJECTIVES, generate_site, generate_measurements, drift_measurements,
+                                       generate_forecasts)
+from optimization.optimizer import OptimizerRunner
+
+CYCLE_SECONDS = 15 * 60
+
+
+def benchmark_horizon(devices: int, steps: int, step_minutes: float, cycles: int,
+                      objective: str = 'maxWeightPowerFlow', seed: int = 0) -> Dict[str, Any]:
+    """
+    Run `cycles` consecutive receding-horizon cycles; each cycle moves the forecast window
+    one step forward and drifts the measurements.
+
+    Returns:
+        Model size and build/solve/total ms (mean and max), the share of the control
+        cycle used by the slowest cycle, and solver statuses
+    """
+    settings = {'backend': 'horizon', 'warmStart': True, 'horizon': {'steps': steps, 'stepMinutes': step_minutes}}
+    runner = OptimizerRunner(generate_site(devices, objective, settings, seed=seed))
+    rng = random.Random(seed)
+    averaged, recent = generate_measurements(runner.config, rng, grid_outage_probability=0)
+    build_ms, solve_ms, total_ms, statuses = [], [], [], []
+    stats = {}
+
+    for cycle in range(cycles):
+        averaged, recent = drift_measurements(averaged, recent, rng)
+        inputs = runner.prepare_inputs(averaged, recent)
+        inputs['forecast'] = generate_forecasts(runner.config, steps, step_minutes, rng,
+                                                start_hour=8 + cycle * step_minutes / 60)
+        result = runner.run_optimization(inputs)
+        stats = runner.solver_stats()
+        statuses.append(result.get('solver_status', result['status']))
+        build_ms.append(stats['build_ms'])
+        solve_ms.append(stats['solve_ms'])
+        total_ms.append(stats['build_ms'] + stats['solve_ms'])
+
+    return {
+        'devices_per_type': devices,
+        'devices': len(runner.config['devices']),
+        'steps': steps,
+        'columns': stats.get('num_col'),
+        'rows': stats.get('num_row'),
+        'nonzeros': stats.get('num_nz'),
+        'mean_build_ms': round(statistics.mean(build_ms), 1),
+        'mean_solve_ms': round(statistics.mean(solve_ms), 1),
+        'mean_total_ms': round(statistics.mean(total_ms), 1),
+        'max_total_ms': round(max(total_ms), 1),
+        'cycle_share_pct': round(100 * max(total_ms) / 1000 / CYCLE_SECONDS, 3),
+        'warm_solves': stats.get('warm_solves'),
+        'statuses': sorted(set(statuses)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receding-horizon build and solve times")
+    parser.add_argument('--devices', type=int, nargs='+', default=[1, 5, 20], help="Devices per type")
+    parser.add_argument('--steps', type=int, default=96)
+    parser.add_argument('--step-minutes', type=float, default=15)
+    parser.add_argument('--cycles', type=int, default=4)
+    parser.add_argument('--objective', default='maxWeightPowerFlow', choices=list(OBJECTIVES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    results = [benchmark_horizon(n, args.steps, args.step_minutes, args.cycles, args.objective, args.seed)
+               for n in args.devices]
+
+    if args.json:
+        print(json.dumps({'objective': args.objective, 'step_minutes': args.step_minutes, 'results': results},
+                         indent=2))
+        return
+
+    print(f"{args.objective}, {args.steps} steps of {args.step_minutes:g} min, {args.cycles} cycles")
+    print(f"{'per type':>8} {'devices':>8} {'columns':>9} {'rows':>9} {'build ms':>9} {'solve ms':>9} "
+          f"{'max ms':>9} {'% cycle':>8}  status")
+    for r in results:
+        print(f"{r['devices_per_type']:>8} {r['devices']:>8} {r['columns']:>9} {r['rows']:>9} "
+              f"{r['mean_build_ms']:>9.1f} {r['mean_solve_ms']:>9.1f} {r['max_total_ms']:>9.1f} "
+              f"{r['cycle_share_pct']:>8.3f}  {','.join(r['statuses'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: lp_mode_benchmark.py
+@Description: LP mode validation - the same inputs solved as the full MILP and in LP mode
+              (optimizerSettings.lpMode), comparing statuses, objective values and solve
+              times, counting the devices with simultaneous flows in the relaxation, the
+              targeted re-solves and the outputs with balance or device limit violations.
+              Inputs are synthetic snapshots, or with --recorded the inputs of the last
+              successful cycles in optimization_cycles, rebuilt with the site config.
+
+              python -m benchmarks.lp_mode_benchmark --devices 20 --snapshots 10 [--backend highs] [--json]
+              python -m benchmarks.lp_mode_benchmark --recorded 200 --config ../conf/config.json [--mode "Optimizer Mode"]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import copy
+import json
+import logging
+import random
+import statistics
+import time
+from typing import Dict, Any, List, Tuple
+
+from benchmarks.fallback_benchmark import dispatch_violations
+from benchmarks.synthetic_site import OBJECTIVES, generate_site, generate_measurements
+from db.queries import run_query
+from optimization.optimizer import OptimizerRunner
+from optimization.replay import site_config
+from optimization.solver_backends import BACKENDS, HighsBackend
+from utils.database_utils import unflatten_inputs
+
+LP_BACKENDS = [name for name, backend in BACKENDS.items() if issubclass(backend, HighsBackend)]
+
+
+def site_runners(config: Dict[str, Any], objective: str, backend: str) -> Dict[bool, OptimizerRunner]:
+    """An OptimizerRunner of the site per LP mode setting (False: full MILP)."""
+    return {
+        lp_mode: OptimizerRunner(site_config(config, objective, {'backend': backend, 'lpMode': lp_mode,
+                                                                'fallback': False, 'resultCache': None}))
+        for lp_mode in (False, True)
+    }
+
+
+def synthetic_inputs(runner: OptimizerRunner, snapshots: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Inputs of `snapshots` random measurement snapshots (half of them grid outages)."""
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(snapshots):
+        averaged, recent = generate_measurements(runner.config, rng, grid_outage_probability=0.5)
+        inputs.append(runner.prepare_inputs(averaged, recent))
+    return inputs
+
+
+def recorded_inputs(config: Dict[str, Any], last: int, mode: str = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Inputs of the last `last` successful cycles, as (objective, inputs).
+
+    Devices missing from a recorded cycle take their values from the current config.
+    """
+    template = OptimizerRunner(config).prepare_inputs({}, {})
+    default = config['generalSiteConfig']['objectiveFunction']
+    return [(row['objective'] or default, unflatten_inputs(row['inputs'] or [], template))
+            for row in run_query('cycle_inputs', (mode, last))]
+
+
+def compare_lp_mode(runners: Dict[bool, OptimizerRunner], inputs_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Solve every inputs dict as the full MILP and in LP mode.
+
+    Returns:
+        Status mismatches, max relative objective gap, output violations, mean devices with
+        simultaneous flows and re-solves, solves that ended as the full MILP and median
+        solve times
+    """
+    timings = {False: [], True: []}
+    conflicts, resolves = [], []
+    report = {'solved': 0, 'status_mismatches': 0, 'max_obj_gap': 0.0, 'violations': 0, 'full_milp': 0}
+
+    for inputs in inputs_list:
+        outcomes = {}
+        for lp_mode, runner in runners.items():
+            start = time.perf_counter()
+            outcomes[lp_mode] = runner.run_optimization(copy.deepcopy(inputs))
+            timings[lp_mode].append((time.perf_counter() - start) * 1000)
+
+        stats = runners[True].optimizer.backend.stats
+        conflicts.append(stats.get('lp_conflicts', 0))
+        resolves.append(stats.get('lp_resolves', 0))
+        report['full_milp'] += stats.get('lp_integer', 0) == stats.get('num_int', 0) > 0
+
+        milp, lp = outcomes[False], outcomes[True]
+        if milp['status'] != lp['status']:
+            report['status_mismatches'] += 1
+            continue
+        if lp['status'] != 'success':
+            continue
+        report['solved'] += 1
+        obj = milp['output']['obj']
+        report['max_obj_gap'] = max(report['max_obj_gap'], abs(lp['output']['obj'] - obj) / max(1.0, abs(obj)))
+        report['violations'] += len(dispatch_violations(inputs, lp['output']))
+
+    if inputs_list:
+        milp_ms, lp_ms = statistics.median(timings[False]), statistics.median(timings[True])
+        report.update(
+            inputs=len(inputs_list),
+            mean_conflicts=round(statistics.mean(conflicts), 2),
+            mean_resolves=round(statistics.mean(resolves), 2),
+            milp_ms=round(milp_ms, 2),
+            lp_ms=round(lp_ms, 2),
+            speedup=round(milp_ms / lp_ms, 2) if lp_ms else None,
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LP mode against the full MILP")
+    parser.add_argument('--devices', type=int, default=20, help="Devices per type (synthetic inputs)")
+    parser.add_argument('--snapshots', type=int, default=10, help="Synthetic snapshots per objective")
+    parser.add_argument('--objectives', nargs='+', default=list(OBJECTIVES), choices=list(OBJECTIVES))
+    parser.add_argument('--recorded', type=int, default=None,
+                        help="Use the inputs of the last N successful recorded cycles instead")
+    parser.add_argument('--config', default='../conf/config.json', help="Site config of the recorded cycles")
+    parser.add_argument('--mode', default=None, help="Only recorded cycles of this mode")
+    parser.add_argument('--backend', default='highs', choices=LP_BACKENDS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    report = {}
+    if args.recorded is not None:
+        with open(args.config) as f:
+            config = json.load(f)
+        by_objective: Dict[str, List[Dict[str, Any]]] = {}
+        for objective, inputs in recorded_inputs(config, args.recorded, args.mode):
+            by_objective.setdefault(objective, []).append(inputs)
+        for objective, inputs_list in by_objective.items():
+            report[objective] = compare_lp_mode(site_runners(config, objective, args.backend), inputs_list)
+        source = f"{sum(r.get('inputs', 0) for r in report.values())} recorded cycles"
+    else:
+        for objective in args.objectives:
+            runners = site_runners(generate_site(args.devices, objective, seed=args.seed), objective, args.backend)
+            report[objective] = compare_lp_mode(runners, synthetic_inputs(runners[False], args.snapshots, args.seed))
+        source = f"{args.devices} devices per type, {args.snapshots} snapshots"
+
+    if args.json:
+        print(json.dumps({'backend': args.backend, 'source': source, 'objectives': report}, indent=2))
+        return
+
+    print(f"backend {args.backend}, {source}")
+    print(f"{'objective':<20} {'solved':>6} {'status!=':>8} {'max rel gap':>11} {'violations':>10} "
+          f"{'conflicts':>9} {'resolves':>8} {'milp':>4} {'milp ms':>8} {'lp ms':>8} {'speedup':>7}")
+    for objective, r in report.items():
+        if not r.get('inputs'):
+            continue
+        print(f"{objective:<20} {r['solved']:>6} {r['status_mismatches']:>8} {r['max_obj_gap']:>11.2e} "
+              f"{r['violations']:>10} {r['mean_conflicts']:>9.2f} {r['mean_resolves']:>8.2f} {r['full_milp']:>4} "
+              f"{r['milp_ms']:>8.1f} {r['lp_ms']:>8.1f} {r['speedup']:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: multisite_benchmark.py
+@Description: Memory per site with one container stack per site against all sites hosted
+              in one process (multisite.py). Every setup runs in fresh interpreters and
+              reports their resident set size (VmRSS, Linux):
+
+              - separate: per site, one optimizer process (imports optimizer.py, builds the
+                site's optimizer and solves its snapshots) and one measurement process
+                (imports measure.py), like the py-optimizer and py-measure containers
+              - hosted: one process importing multisite.py that builds the optimizers of all
+                sites and solves their snapshots from one thread per site through a shared
+                SolverPool
+
+              The forecast and metrics services stay per site in both setups and are not
+              measured. Like the services, the child processes need pymodbus installed.
+
+              python -m benchmarks.multisite_benchmark --sites 1 4 16 [--per-type 2]
+                                                       [--workers 2] [--output multisite.json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import importlib
+import json
+import logging
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Any, List
+
+from benchmarks.synthetic_site import generate_site, generate_measurements
+from utils.time_utils import current_time
+
+# Modules imported by the processes of each setup
+ROLE_MODULES = {
+    'optimizer': ('optimizer',),
+    'measure': ('measure',),
+    'hosted': ('multisite',),
+}
+
+
+def rss_mb() -> Dict[str, float]:
+    """Current and peak resident set size of this process in MB."""
+    try:
+        with open('/proc/self/status') as f:
+            status = {line.split(':')[0]: line.split()[1] for line in f if line.startswith(('VmRSS', 'VmHWM'))}
+        return {'rss_mb': round(int(status['VmRSS']) / 1024, 1), 'peak_mb': round(int(status['VmHWM']) / 1024, 1)}
+    except (OSError, KeyError):
+        peak = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        return {'rss_mb': peak, 'peak_mb': peak}
+
+
+# ── Child processes ───────────────────────────────────────────────────────────
+
+def _solve_site(runner, config: Dict[str, Any], snapshots: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    statuses: Dict[str, int] = {}
+    start = time.perf_counter()
+    for _ in range(snapshots):
+        averaged, recent = generate_measurements(config, rng)
+        result = runner.run_optimization(runner.prepare_inputs(averaged, recent))
+        statuses[result['status']] = statuses.get(result['status'], 0) + 1
+    return {'statuses': statuses, 'wall_ms': round((time.perf_counter() - start) * 1000, 1)}
+
+
+def run_child(role: str, sites: int, per_type: int, objective: str, snapshots: int,
+              workers: int, seed: int) -> Dict[str, Any]:
+    """
+    Body of one benchmark process (`--child`).
+
+    Args:
+        role: 'optimizer' and 'measure' (one site's container) or 'hosted' (all sites)
+        sites: Sites of a hosted process; the site seed of a separate one is `seed`
+        per_type: Devices of each type per site
+        objective: Objective function of the sites
+        snapshots: Measurement snapshots solved per site
+        workers: SolverPool workers of a hosted process
+        seed: Seed of the first site
+
+    Returns:
+        Result dict: import time, wall time of the solves, statuses and RSS
+    """
+    start = time.perf_counter()
+    for module in ROLE_MODULES[role]:
+        importlib.import_module(module)
+    result: Dict[str, Any] = {'role': role, 'import_ms': round((time.perf_counter() - start) * 1000, 1)}
+    if role == 'measure':
+        return {**result, **rss_mb()}
+
+    from optimization.optimizer import OptimizerRunner
+    from optimization.solver_pool import SolverPool
+
+    configs = [generate_site(per_type, objective, seed=seed + i) for i in range(sites if role == 'hosted' else 1)]
+    if role == 'optimizer':
+        runner = OptimizerRunner(configs[0])
+        return {**result, **_solve_site(runner, configs[0], snapshots, seed), **rss_mb()}
+
+    pool = SolverPool(workers)
+    runners = [OptimizerRunner(config, solver_pool=pool, site_id=f"site_{i}") for i, config in enumerate(configs)]
+    outcomes: List[Dict[str, Any]] = [{} for _ in configs]
+
+    def site_loop(i: int):
+        outcomes[i] = _solve_site(runners[i], configs[i], snapshots, seed + i)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=site_loop, args=(i,)) for i in range(len(configs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    statuses: Dict[str, int] = {}
+    for outcome in outcomes:
+        for status, count in outcome.get('statuses', {}).items():
+            statuses[status] = statuses.get(status, 0) + count
+    waits = [site['max_wait_ms'] for site in pool.stats()['sites'].values()]
+    return {**result, 'statuses': statuses, 'wall_ms': round((time.perf_counter() - start) * 1000, 1),
+            'max_wait_ms': max(waits, default=0.0), **rss_mb()}
+
+
+def spawn_child(role: str, args: argparse.Namespace, sites: int = 1, seed: int = 0) -> Dict[str, Any]:
+    """Run one benchmark process and return its result."""
+    command = [sys.executable, '-m', 'benchmarks.multisite_benchmark', '--child', role,
+               '--sites', str(sites), '--per-type', str(args.per_type), '--objective', args.objective,
+               '--snapshots', str(args.snapshots), '--workers', str(args.workers), '--seed', str(seed)]
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def benchmark(sites: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Total and per-site RSS of both setups for `sites` sites."""
+    separate = [spawn_child(role, args, seed=args.seed + i)
+                for i in range(sites) for role in ('optimizer', 'measure')]
+    hosted = spawn_child('hosted', args, sites=sites, seed=args.seed)
+    separate_mb = sum(child['rss_mb'] for child in separate)
+    return {
+        'sites': sites,
+        'separate_mb': round(separate_mb, 1),
+        'separate_per_site_mb': round(separate_mb / sites, 1),
+        'separate_processes': len(separate),
+        'hosted_mb': hosted['rss_mb'],
+        'hosted_per_site_mb': round(hosted['rss_mb'] / sites, 1),
+        'hosted_peak_mb': hosted['peak_mb'],
+        'saved': round(1 - hosted['rss_mb'] / separate_mb, 3),
+        'separate_solve_ms': round(sum(child.get('wall_ms', 0) for child in separate), 1),
+        'hosted_solve_ms': hosted['wall_ms'],
+        'hosted_max_wait_ms': hosted['max_wait_ms'],
+        'statuses': hosted['statuses'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per site: one process per site and service vs. one host process")
+    parser.add_argument('--sites', type=int, nargs='+', default=[1, 4, 16], help="Numbers of sites")
+    parser.add_argument('--per-type', type=int, default=2, help="Devices of each type per site")
+    parser.add_argument('--objective', default='peakShaving')
+    parser.add_argument('--snapshots', type=int, default=3, help="Snapshots solved per site")
+    parser.add_argument('--workers', type=int, default=2, help="Solver workers of the hosted process")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="Write the report to this JSON file")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    parser.add_argument('--child', choices=list(ROLE_MODULES), default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.sites[0], args.per_type, args.objective,
+                                   args.snapshots, args.workers, args.seed)))
+        return
+
+    report = {
+        'benchmark': 'multisite',
+        'created': current_time().isoformat(),
+        'python': sys.version.split()[0],
+        'per_type': args.per_type,
+        'objective': args.objective,
+        'snapshots': args.snapshots,
+        'workers': args.workers,
+        'results': [benchmark(sites, args) for sites in args.sites],
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{args.per_type} devices per type, {args.objective}, {args.snapshots} snapshots per site, "
+              f"{args.workers} solver workers; RSS in MB")
+        print(f"{'sites':>5} {'processes':>9} {'separate':>9} {'per site':>9} {'hosted':>8} {'per site':>9} "
+              f"{'saved':>6} {'sep. solve ms':>13} {'hosted ms':>10} {'max wait':>9}")
+        for r in report['results']:
+            print(f"{r['sites']:>5} {r['separate_processes']:>9} {r['separate_mb']:>9.1f} "
+                  f"{r['separate_per_site_mb']:>9.1f} {r['hosted_mb']:>8.1f} {r['hosted_per_site_mb']:>9.1f} "
+                  f"{r['saved']:>6.0%} {r['separate_solve_ms']:>13.1f} {r['hosted_solve_ms']:>10.1f} "
+                  f"{r['hosted_max_wait_ms']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+@File: presolve_benchmark.py
+@Description: Presolve check - every objective solved with and without presolve on the same
+              snapshots (with grid outages, zero forecasts and empty chargers), comparing
+              statuses, objective values and solve times, counting the removed variables and
+              checking the restored outputs for balance and device limit violations.
+
+              python -m benchmarks.presolve_benchmark --devices 20 --snapshots 10 [--backend highs] [--json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+from typing import Dict, Any
+
+from benchmarks.fallback_benchmark import dispatch_violations
+from benchmarks.synthetic_site import OBJECTIVES, generate_site, generate_measurements
+from optimization.optimizer import OptimizerRunner
+from optimization.solver_backends import BACKENDS
+
+
+def zero_forecasts(averaged: Dict[str, float], rng: random.Random, share: float) -> Dict[str, float]:
+    """Set a share of the power forecasts to zero (night PV, idle loads)."""
+    return {key: 0.0 if rng.random() < share else value for key, value in averaged.items()}
+
+
+def benchmark_presolve(objective: str, devices: int, snapshots: int, backend: str,
+                       zero_share: float = 0.3, seed: int = 0) -> Dict[str, Any]:
+    """
+    Solve `snapshots` snapshots of one objective with presolve on and off.
+
+    Returns:
+        Status mismatches, max relative objective difference, mean removed variables and
+        binaries, restored output violations and mean solve times of both runs
+    """
+    runners = {
+        presolve: OptimizerRunner(generate_site(devices, objective, {'backend': backend, 'presolve': presolve,
+                                                                      'fallback': False}, seed=seed))
+        for presolve in (False, True)
+    }
+    rng = random.Random(seed)
+    timings = {False: [], True: []}
+    removed_variables, removed_binaries = [], []
+    report = {'status_mismatches': 0, 'max_obj_diff': 0.0, 'violations': 0, 'solved': 0}
+
+    for _ in range(snapshots):
+        averaged, recent = generate_measurements(runners[False].config, rng, grid_outage_probability=0.5)
+        averaged = zero_forecasts(averaged, rng, zero_share)
+        outcomes = {}
+        for presolve, runner in runners.items():
+            inputs = runner.prepare_inputs(averaged, recent)
+            start = time.perf_counter()
+            outcomes[presolve] = runner.run_optimization(inputs)
+            timings[presolve].append((time.perf_counter() - start) * 1000)
+
+        stats = runners[True].optimizer.presolve_stats
+        removed_variables.append(stats.get('variables', 0))
+        removed_binaries.append(stats.get('binaries', 0))
+
+        full, reduced = outcomes[False], outcomes[True]
+        if full['status'] != reduced['status']:
+            report['status_mismatches'] += 1
+            continue
+        if reduced['status'] != 'success':
+            continue
+        report['solved'] += 1
+        obj = full['output']['obj']
+        report['max_obj_diff'] = max(report['max_obj_diff'],
+                                     abs(reduced['output']['obj'] - obj) / max(1.0, abs(obj)))
+        report['violations'] += len(dispatch_violations(inputs, reduced['output']))
+        for group, devices_out in full['output'].items():
+            if isinstance(devices_out, dict) and set(devices_out) != set(reduced['output'].get(group, {})):
+                report['violations'] += 1
+
+    report.update(
+        mean_removed_variables=round(statistics.mean(removed_variables), 1),
+        mean_removed_binaries=round(statistics.mean(removed_binaries), 1),
+        full_ms=round(statistics.median(timings[False]), 2),
+        presolve_ms=round(statistics.median(timings[True]), 2),
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare solves with and without presolve")
+    parser.add_argument('--devices', type=int, default=20, help="Devices per type")
+    parser.add_argument('--snapshots', type=int, default=10)
+    parser.add_argument('--backend', default='highs', choices=list(BACKENDS))
+    parser.add_argument('--objectives', nargs='+', default=list(OBJECTIVES), choices=list(OBJECTIVES))
+    parser.add_argument('--zero-share', type=float, default=0.3, help="Share of zero power forecasts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    report = {
+        objective: benchmark_presolve(objective, args.devices, args.snapshots, args.backend,
+                                      args.zero_share, args.seed)
+        for objective in args.objectives
+    }
+
+    if args.json:
+        print(json.dumps({'backend': args.backend, 'devices_per_type': args.devices, 'objectives': report},
+                         indent=2))
+        return
+
+    print(f"backend {args.backend}, {args.devices} devices per type, {args.snapshots} snapshots")
+    print(f"{'objective':<20} {'solved':>6} {'status!=':>8} {'max rel dobj':>12} {'violations':>10} "
+          f"{'vars -':>7} {'bins -':>7} {'full ms':>8} {'presolve ms':>11}")
+    for objective, r in report.items():
+        print(f"{objective:<20} {r['solved']:>6} {r['status_mismatches']:>8} {r['max_obj_diff']:>12.2e} "
+              f"{r['violations']:>10} {r['mean_removed_variables']:>7.1f} {r['mean_removed_binaries']:>7.1f} "
+              f"{r['full_ms']:>8.1f} {r['presolve_ms']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+@File: scaling_benchmark.py
+@Description: How every objective scales with the site size: synthetic sites with 1 to 1000
+              devices of each type, prepare_inputs() and run_optimization() on random
+              measurement snapshots, recording preparation, build and solve time, peak Python
+              memory and model size. --output writes the report as JSON; --compare checks a
+              run against such a baseline and exits with 1 on a regression.
+
+              python -m benchmarks.scaling_benchmark --sizes 1 10 100 1000 [--backend highs]
+                                                     [--output scaling.json]
+                                                     [--compare baseline.json --tolerance 0.25]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, List, Optional
+
+import highspy
+import numpy as np
+import pyomo
+
+from benchmarks.synthetic_site import OBJECTIVES, generate_site, generate_measurements
+from optimization.optimizer import OptimizerRunner
+from optimization.solver_backends import BACKENDS
+from utils.time_utils import current_time
+
+# Solver statistics copied into each result (HiGHS backends also report num_nz)
+MODEL_KEYS = ('num_col', 'num_row', 'num_int', 'num_nz', 'mip_nodes', 'mip_gap', 'simplex_iterations')
+
+# Metrics checked by --compare (higher is worse)
+COMPARED = ('prepare_ms', 'build_ms', 'solve_ms', 'total_ms', 'peak_mb')
+
+
+def environment() -> Dict[str, Any]:
+    """Versions the timings depend on, stored with every report."""
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'pyomo': pyomo.version.version,
+        'highspy': getattr(highspy, '__version__', None) or highspy.Highs().version(),
+        'numpy': np.__version__,
+    }
+
+
+def _median(values: List[float]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def benchmark_site(objective: str, per_type: int, backend: str, snapshots: int,
+                   time_limit: float = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Prepare and solve `snapshots` measurement snapshots of one synthetic site.
+
+    Timings are medians over the snapshots, measured without tracing; the peak Python
+    memory of prepare_inputs() + run_optimization() comes from one extra traced run
+    (memory allocated inside HiGHS is not included).
+
+    Args:
+        objective: Objective function of the site
+        per_type: Devices of each type (AFEs: one per four)
+        backend: Solver backend
+        snapshots: Measurement snapshots solved
+        time_limit: optimizerSettings.solveTimeLimit in seconds (default: the backend's)
+        seed: Seed of the site and the measurements
+
+    Returns:
+        Result dict: site size, status counts, timings, peak memory, model size, objective
+    """
+    settings = {'backend': backend}
+    if time_limit:
+        settings['solveTimeLimit'] = time_limit
+    config = generate_site(per_type, objective, settings, seed=seed)
+    start = time.perf_counter()
+    runner = OptimizerRunner(config)
+    init_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(seed)
+    measurements = [generate_measurements(config, rng) for _ in range(snapshots)]
+    prepare_ms, build_ms, solve_ms, total_ms, objectives = [], [], [], [], []
+    statuses: Dict[str, int] = {}
+    stats: Dict[str, Any] = {}
+
+    for averaged, recent in measurements:
+        start = time.perf_counter()
+        inputs = runner.prepare_inputs(averaged, recent)
+        prepared = time.perf_counter()
+        result = runner.run_optimization(inputs)
+        end = time.perf_counter()
+
+        status = 'fallback' if result.get('fallback') else result['status']
+        statuses[status] = statuses.get(status, 0) + 1
+        prepare_ms.append((prepared - start) * 1000)
+        total_ms.append((end - prepared) * 1000)
+        # Failed solves (fallback dispatch) still report the model and the time spent
+        stats = runner.solver_stats()
+        build_ms.append(stats.get('build_ms'))
+        solve_ms.append(stats.get('solve_ms'))
+        if result['status'] == 'success':
+            objectives.append(result['output']['obj'])
+
+    tracemalloc.start()
+    try:
+        averaged, recent = measurements[0]
+        runner.run_optimization(runner.prepare_inputs(averaged, recent))
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'objective': objective,
+        'backend': backend,
+        'per_type': per_type,
+        'devices': len(config['devices']),
+        'snapshots': snapshots,
+        'statuses': statuses,
+        'init_ms': round(init_ms, 3),
+        'prepare_ms': _median(prepare_ms),
+        'build_ms': _median(build_ms),
+        'solve_ms': _median(solve_ms),
+        'total_ms': _median(total_ms),
+        'max_total_ms': round(max(total_ms), 3),
+        'peak_mb': round(peak_mb, 3),
+        **{key: stats.get(key) for key in MODEL_KEYS if key in stats},
+        'mean_obj': round(statistics.mean(objectives), 4) if objectives else None,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            floor_ms: float = 5.0) -> List[Dict[str, Any]]:
+    """
+    Regressions of `report` against `baseline`: results matched on (objective, backend,
+    per_type) whose metric grew by more than `tolerance` (relative). Timings below
+    `floor_ms` in both runs are ignored as noise.
+
+    Returns:
+        One dict per regression: key, metric, baseline, current and ratio
+    """
+    previous = {(r['objective'], r['backend'], r['per_type']): r for r in baseline.get('results', [])}
+    regressions = []
+    for r in report['results']:
+        key = (r['objective'], r['backend'], r['per_type'])
+        old = previous.get(key)
+        if old is None:
+            continue
+        for metric in COMPARED:
+            before, after = old.get(metric), r.get(metric)
+            if before is None or after is None or before <= 0:
+                continue
+            if metric.endswith('_ms') and max(before, after) < floor_ms:
+                continue
+            ratio = after / before
+            if ratio > 1 + tolerance:
+                regressions.append({'key': list(key), 'metric': metric, 'baseline': before,
+                                    'current': after, 'ratio': round(ratio, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimizer scaling with the number of devices per type")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 1000], help="Devices per type")
+    parser.add_argument('--objectives', nargs='+', default=list(OBJECTIVES), choices=list(OBJECTIVES))
+    parser.add_argument('--backend', default='pyomo', choices=list(BACKENDS))
+    parser.add_argument('--snapshots', type=int, default=3, help="Measurement snapshots per site")
+    parser.add_argument('--time-limit', type=float, default=None, help="solveTimeLimit in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="Write the report to this JSON file")
+    parser.add_argument('--compare', default=None, help="Baseline report (JSON) to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative growth per metric")
+    parser.add_argument('--floor-ms', type=float, default=5.0, help="Timings below this are not compared")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    report = {
+        'benchmark': 'scaling',
+        'created': current_time().isoformat(),
+        'environment': environment(),
+        'backend': args.backend,
+        'snapshots': args.snapshots,
+        'seed': args.seed,
+        'results': [
+            benchmark_site(objective, per_type, args.backend, args.snapshots, args.time_limit, args.seed)
+            for objective in args.objectives
+            for per_type in args.sizes
+        ],
+    }
+
+    regressions = None
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance, args.floor_ms)
+        report['regressions'] = regressions
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"backend {args.backend}, {args.snapshots} snapshots, medians in ms")
+        print(f"{'objective':<20} {'per type':>8} {'devices':>8} {'prepare':>9} {'build':>9} {'solve':>9} "
+              f"{'total':>9} {'peak MB':>8} {'cols':>7} {'rows':>7} {'ints':>6} {'status':<18}")
+        for r in report['results']:
+            status = ' '.join(f"{k}:{v}" for k, v in r['statuses'].items())
+            print(f"{r['objective']:<20} {r['per_type']:>8} {r['devices']:>8} {r['prepare_ms']:>9.2f} "
+                  f"{r['build_ms'] or 0:>9.1f} {r['solve_ms'] or 0:>9.1f} {r['total_ms']:>9.1f} "
+                  f"{r['peak_mb']:>8.1f} {r.get('num_col', 0):>7} {r.get('num_row', 0):>7} "
+                  f"{r.get('num_int', 0):>6} {status:<18}")
+        if regressions is not None:
+            print(f"{len(regressions)} regression(s) against {args.compare} (tolerance {args.tolerance:.0%})")
+            for reg in regressions:
+                print(f"  {' / '.join(map(str, reg['key']))}: {reg['metric']} "
+                      f"{reg['baseline']} -> {reg['current']} (x{reg['ratio']})")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: synthetic_site.py
+@Description: Synthetic site configurations and measurement snapshots for optimizer benchmarks.
+              Configs follow conf/config.json; measurements use the parameter names read by
+              BaseOptimizer.prepare_inputs() (W, Wh and % as written by the measurement service).
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import random
+from typing import Dict, Any, Tuple, Union
+
+import numpy as np
+
+DEVICE_TYPES = ('AFE', 'PV', 'WIND', 'LOAD', 'CRITICAL_LOAD', 'BESS', 'UNI_EV', 'BI_EV')
+
+ID_PREFIX = {
+    'AFE': 'afe', 'PV': 'pv', 'WIND': 'wind', 'LOAD': 'load', 'CRITICAL_LOAD': 'cload',
+    'BESS': 'bess', 'UNI_EV': 'uniev', 'BI_EV': 'biev',
+}
+
+DEVICE_PARAMETERS = {
+    'AFE':           {'nominalPower': 50000},
+    'PV':            {'nominalPower': 20000},
+    'WIND':          {'nominalPower': 10000},
+    'LOAD':          {'nominalPower': 15000},
+    'CRITICAL_LOAD': {'nominalPower': 5000},
+    'BESS':          {'efficiency': 95, 'capacity': 100000, 'minSoC': 10, 'maxSoC': 90,
+                      'maxChargePower': 25000, 'maxDischargePower': 25000},
+    'UNI_EV':        {'efficiency': 93, 'maxPower': 11000},
+    'BI_EV':         {'efficiency': 92, 'maxPower': 11000},
+}
+
+OBJECTIVES = (
+    'maxWeightPowerFlow', 'maxSelfConsumption', 'maxEVSatisfaction', 'minFossilEmissions',
+    'maxReliability', 'lifeExtentBESS', 'peakShaving',
+)
+
+
+def device_counts(per_type: int, afe: int = None) -> Dict[str, int]:
+    """`per_type` devices of every type; AFEs default to one per four devices of a type."""
+    counts = {device_type: per_type for device_type in DEVICE_TYPES}
+    counts['AFE'] = afe if afe is not None else max(1, per_type // 4)
+    return counts
+
+
+def generate_site(counts: Union[int, Dict[str, int]], objective: str = 'maxWeightPowerFlow',
+                  settings: Dict[str, Any] = None, seed: int = 0, spread: float = 0.2) -> Dict[str, Any]:
+    """
+    Build a site configuration.
+
+    Args:
+        counts: Devices per type (dict keyed by device type) or one count for every type
+        objective: objectiveFunction of the site
+        settings: Optional generalSiteConfig.optimizerSettings
+        seed: Seed for the per-device parameter spread
+        spread: Relative spread of the device ratings (0 for a fleet of identical units)
+
+    Returns:
+        Configuration dict with 'devices' and 'generalSiteConfig'
+    """
+    if isinstance(counts, int):
+        counts = device_counts(counts)
+    rng = random.Random(seed)
+
+    devices = []
+    for device_type in DEVICE_TYPES:
+        for i in range(counts.get(device_type, 0)):
+            scale = rng.uniform(1 - spread, 1 + spread)
+            parameters = {
+                key: value if key in ('efficiency', 'minSoC', 'maxSoC') else round(value * scale)
+                for key, value in DEVICE_PARAMETERS[device_type].items()
+            }
+            devices.append({'id': f"{ID_PREFIX[device_type]}{i + 1}", 'type': device_type,
+                            'parameters': parameters})
+
+    general = {'selectedOperationMode': 'optimizerMode', 'objectiveFunction': objective}
+    if settings:
+        general['optimizerSettings'] = dict(settings)
+    return {'devices': devices, 'generalSiteConfig': general}
+
+
+def generate_measurements(config: Dict[str, Any], rng: random.Random,
+                          grid_outage_probability: float = 0.1,
+                          grid_service_probability: float = 0.1) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Random measurement snapshot for a site.
+
+    Returns:
+        (averaged, recent) dicts as returned by OptimizerInputProvider
+    """
+    averaged: Dict[str, float] = {}
+    recent: Dict[str, float] = {}
+
+    for device in config['devices']:
+        device_id = device['id']
+        device_type = device['type']
+        parameters = device['parameters']
+
+        if device_type in ('PV', 'WIND', 'LOAD', 'CRITICAL_LOAD'):
+            averaged[f"{device_id}_POWER"] = rng.uniform(0, parameters['nominalPower'])
+        elif device_type == 'AFE':
+            recent[f"{device_id}_AVBL"] = 0 if rng.random() < grid_outage_probability else 1
+            grid_service = rng.random() < grid_service_probability
+            recent[f"{device_id}_GRIDSRVC"] = rng.uniform(1000, 10000) if grid_service else 0
+        elif device_type == 'BESS':
+            recent[f"{device_id}_SoC"] = rng.uniform(parameters['minSoC'], parameters['maxSoC'])
+        elif device_type in ('UNI_EV', 'BI_EV'):
+            connected = rng.random() < 0.7
+            recent[f"{device_id}_SoC"] = rng.uniform(5, 95) if connected else 0
+            recent[f"{device_id}_CAR_CAP"] = rng.choice((40000, 60000, 80000)) if connected else 0
+            recent[f"{device_id}_CAR_MAX_P"] = rng.choice((7400, 11000, 22000)) if connected else 0
+            if device_type == 'BI_EV':
+                recent[f"{device_id}_CAR_ARRIVAL"] = rng.uniform(5, 50) if connected else 0
+                recent[f"{device_id}_CAR_AVBL"] = 1 if connected else 0
+
+    return averaged, recent
+
+
+def drift_measurements(averaged: Dict[str, float], recent: Dict[str, float], rng: random.Random,
+                       power_jitter: float = 0.05,
+                       soc_step: float = 1.0) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Next cycle of a snapshot: powers move by up to +-`power_jitter`, SoCs by up to
+    +-`soc_step` percentage points; availabilities and connected cars stay the same.
+    """
+    averaged = {key: max(0.0, value * rng.uniform(1 - power_jitter, 1 + power_jitter))
+                for key, value in averaged.items()}
+    recent = dict(recent)
+    for key, value in recent.items():
+        if key.endswith('_SoC') and value > 0:
+            recent[key] = min(95.0, max(5.0, value + rng.uniform(-soc_step, soc_step)))
+    return averaged, recent
+
+
+def generate_forecasts(config: Dict[str, Any], steps: int, step_minutes: float, rng: random.Random,
+                       start_hour: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Forecasts in the shape of ForecastProvider.fetch(): {device id: kW per step}. PV follows
+    a clear-sky bell between 06:00 and 20:00, loads a day/night profile, wind a random walk.
+    """
+    hours = (start_hour + np.arange(steps) * step_minutes / 60) % 24
+    daylight = np.clip(np.sin((hours - 6) / 14 * np.pi), 0, None)
+    forecasts = {}
+    for device in config['devices']:
+        device_type = device['type']
+        if device_type not in ('PV', 'WIND', 'LOAD', 'CRITICAL_LOAD'):
+            continue
+        nominal_kW = device['parameters']['nominalPower'] / 1000
+        if device_type == 'PV':
+            profile = daylight * rng.uniform(0.6, 1.0)
+        elif device_type == 'WIND':
+            profile = np.clip(0.5 + np.cumsum(np.array([rng.gauss(0, 0.05) for _ in range(steps)])), 0, 1)
+        else:
+            profile = 0.4 + 0.4 * np.clip(np.sin((hours - 7) / 16 * np.pi), 0, None) * rng.uniform(0.7, 1.0)
+        forecasts[device['id']] = profile * nominal_kW
+    return forecasts
@@ -0,0 +1,147 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: warm_start_benchmark.py
+@Description: Measures what warm starting saves: the same sequence of slowly drifting cycles is
+              solved by a warm-started and a cold backend, and solve times, simplex iterations
+              and objective values are compared.
+
+              python -m benchmarks.warm_start_benchmark --devices 50 --cycles 20 [--json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import json
+import logging
+import random
+import statistics
+from typing import Dict, Any
+
+from benchmarks.synthetic_site import OBJECTIVES, generate_site, generate_measurements, drift_measurements
+from optimization.optimizer import OptimizerRunner
+
+WARM_START_BACKENDS = ('highs', 'pyomo_persistent')
+
+
+def benchmark_warm_start(objective: str, backend: str, devices: int, cycles: int,
+                         seed: int = 0) -> Dict[str, Any]:
+    """
+    Solve `cycles` drifting cycles with warm starting on and off.
+
+    Returns:
+        Mean/median solve ms of both runs (first cycle excluded - it is cold in both),
+        the mean saving, iteration means where reported and the largest relative objective
+        difference between the two runs
+    """
+    runners = {
+        warm: OptimizerRunner(generate_site(devices, objective, {'backend': backend, 'warmStart': warm}, seed=seed))
+        for warm in (True, False)
+    }
+    rng = random.Random(seed)
+    averaged, recent = generate_measurements(runners[True].config, rng, grid_outage_probability=0)
+    solve_ms = {True: [], False: []}
+    iterations = {True: [], False: []}
+    warm_solves = 0
+    max_obj_diff = 0.0
+
+    for cycle in range(cycles):
+        averaged, recent = drift_measurements(averaged, recent, rng)
+        outcomes = {}
+        for warm, runner in runners.items():
+            outcomes[warm] = runner.run_optimization(runner.prepare_inputs(averaged, recent))
+            stats = runner.solver_stats()
+            if cycle == 0:
+                continue
+            solve_ms[warm].append(stats['solve_ms'])
+            if 'simplex_iterations' in stats:
+                iterations[warm].append(stats['simplex_iterations'])
+            if warm and stats.get('warm_start'):
+                warm_solves += 1
+
+        if outcomes[True]['status'] == outcomes[False]['status'] == 'success':
+            cold_obj = outcomes[False]['output']['obj']
+            diff = abs(outcomes[True]['output']['obj'] - cold_obj) / max(1.0, abs(cold_obj))
+            max_obj_diff = max(max_obj_diff, diff)
+
+    def mean(values):
+        return round(statistics.mean(values), 2) if values else None
+
+    report = {
+        'warm_solves': warm_solves,
+        'mean_warm_ms': mean(solve_ms[True]),
+        'mean_cold_ms': mean(solve_ms[False]),
+        'median_warm_ms': round(statistics.median(solve_ms[True]), 2) if solve_ms[True] else None,
+        'median_cold_ms': round(statistics.median(solve_ms[False]), 2) if solve_ms[False] else None,
+        'mean_warm_iterations': mean(iterations[True]),
+        'mean_cold_iterations': mean(iterations[False]),
+        'max_obj_diff': max_obj_diff,
+    }
+    if report['mean_warm_ms'] is not None:
+        report['saved_ms'] = round(report['mean_cold_ms'] - report['mean_warm_ms'], 2)
+        report['saved_pct'] = round(100 * report['saved_ms'] / report['mean_cold_ms'], 1) if report['mean_cold_ms'] else None
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm-started versus cold solves on drifting inputs")
+    parser.add_argument('--devices', type=int, default=50, help="Devices per type")
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--backends', nargs='+', default=list(WARM_START_BACKENDS), choices=WARM_START_BACKENDS)
+    parser.add_argument('--objectives', nargs='+', default=['maxWeightPowerFlow', 'peakShaving'],
+                        choices=list(OBJECTIVES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    report = {
+        'devices_per_type': args.devices,
+        'cycles': args.cycles,
+        'results': {
+            objective: {backend: benchmark_warm_start(objective, backend, args.devices, args.cycles, args.seed)
+                        for backend in args.backends}
+            for objective in args.objectives
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{args.devices} devices per type, {args.cycles} cycles")
+    print(f"{'objective':<20} {'backend':<18} {'warm':>5} {'warm ms':>9} {'cold ms':>9} {'saved':>8} "
+          f"{'saved %':>8} {'warm it':>8} {'cold it':>8} {'max rel dobj':>12}")
+    for objective, results in report['results'].items():
+        for backend, r in results.items():
+            def fmt(value, width, spec='.1f'):
+                return f"{value:>{width}{spec}}" if value is not None else f"{'-':>{width}}"
+            print(f"{objective:<20} {backend:<18} {r['warm_solves']:>5} {fmt(r['mean_warm_ms'], 9)} "
+                  f"{fmt(r['mean_cold_ms'], 9)} {fmt(r.get('saved_ms'), 8)} {fmt(r.get('saved_pct'), 8)} "
+                  f"{fmt(r['mean_warm_iterations'], 8, '.0f')} {fmt(r['mean_cold_iterations'], 8, '.0f')} "
+                  f"{r['max_obj_diff']:>12.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -17,66 +17,60 @@ limitations under the License.
 
 @File: database_client.py
 @Description: This script connects to PostgreSQL and queries average values for the most recent 15-minute interval, and also provides methods to get the most recent individual values.
+              OptimizerInputProvider fetches both for the parameters an optimizer needs in one query.
 
 @Created: 1st July 2025
-@Last Modified: 05 March 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
 '''
 
 
-import psycopg2
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 import sys
 import logging
+from db.pool import DatabasePool, get_pool
+from db.queries import run_query
 from utils.time_utils import current_time, TIMEZONE
 from utils.logging_utils import setup_logging
 setup_logging
 
 
-# Dotenv variables
-from dotenv import load_dotenv
-import os
-load_dotenv('./conf/.env')
-
-DB_USER = os.getenv('DB_USER')
-DB_PASSWORD = os.getenv('DB_PASSWORD')
-DB_HOST = os.getenv('DB_HOST')
-DB_PORT = os.getenv('DB_PORT')
-DB_NAME = os.getenv('DB_NAME')
-
 class LastIntervalQuerier:
-    def __init__(self, host: str, database: str, user: str, password: str, port: int = 5432):
-        """Initialize database connection parameters."""
-        self.connection_params = {
-            'host': host,
-            'database': database,
-            'user': user,
-            'password': password,
-            'port': port
-        }
-        self.connection = None
+    def __init__(self, db: DatabasePool = None):
+        """
+        Initialize the querier.
+
+        Args:
+            db: Connection pool to use (default: the process-wide shared pool)
+        """
+        self.db = db or get_pool()
         self.logger = logging.getLogger(__name__)
 
     def connect(self) -> bool:
-        """Establish database connection."""
-        try:
-            self.connection = psycopg2.connect(**self.connection_params)
-            return True
-        except psycopg2.Error as e:
-            self.logger.error(f"Error connecting to database: {e}")
-            return False
+        """Check that the database is reachable."""
+        return self.db.health_check()
 
-    def disconnect(self):
-        """Close database connection."""
-        if self.connection:
-            self.connection.close()
+    def _check_table(self, table_name: str):
+        """The prepared hot-path queries (db/queries.py) are bound to the measurements table."""
+        if table_name != "measurements":
+            raise ValueError(f"Unsupported measurements table: {table_name}")
+
+    def _resolve_parameters(self, parameters: list = None) -> list:
+        """Requested parameters, or every parameter that has 'ok' samples."""
+        if parameters:
+            return list(parameters)
+        return [row['parameter'] for row in run_query('distinct_parameters', db=self.db)]
 
     def get_last_15min_averages(self, table_name: str = "measurements", 
                           max_age_minutes: int = 20,
-                          timezone: str = None) -> pd.DataFrame:
+                          timezone: str = None,
+                          parameters: list = None) -> pd.DataFrame:
         """
         Query average values for the most recent 15-minute interval with freshness check.
 
@@ -85,47 +79,16 @@ class LastIntervalQuerier:
             max_age_minutes: Maximum age in minutes for data to be considered fresh (default: 20)
             timezone: Timezone for comparison (e.g., 'UTC', 'Europe/Amsterdam'). 
                     If None, uses naive datetime comparison
+            parameters: List of specific parameters to average. If None, averages all parameters
 
         Returns:
             pandas.DataFrame with parameter averages for the last 15-minute interval
             Returns empty DataFrame if data is too old or if no data found
         """
-        if not self.connection:
-            self.logger.error("No database connection. Connect first.")
-            return pd.DataFrame()
-
-        query = f"""
-        WITH latest_interval AS (
-            -- Find the most recent 15-minute bucket that has data
-            SELECT 
-                DATE_TRUNC('hour', MAX(time)) + 
-                INTERVAL '15 min' * FLOOR(EXTRACT(MINUTE FROM MAX(time)) / 15) as interval_start
-            FROM {table_name}
-        ),
-        interval_bounds AS (
-            SELECT 
-                interval_start,
-                interval_start + INTERVAL '15 minutes' as interval_end
-            FROM latest_interval
-        )
-        SELECT 
-            parameter,
-            ROUND(AVG(value)::numeric, 4) as average_value,
-            unit,
-            COUNT(*) as sample_count,
-            MIN(ib.interval_start) as interval_start,
-            MIN(ib.interval_end) as interval_end
-        FROM {table_name} m
-        CROSS JOIN interval_bounds ib
-        WHERE m.time >= ib.interval_start 
-        AND m.time < ib.interval_end
-        AND quality = 'ok'
-        GROUP BY parameter, unit
-        ORDER BY parameter;
-        """
-
         try:
-            df = pd.read_sql_query(query, self.connection)
+            self._check_table(table_name)
+            rows = run_query('interval_averages', (self._resolve_parameters(parameters),), db=self.db)
+            df = pd.DataFrame(rows)
             
             if df.empty:
                 self.logger.error("No data found for the last 15-minute interval")
@@ -182,40 +145,10 @@ class LastIntervalQuerier:
             pandas.DataFrame with the most recent value for each parameter
             Returns empty DataFrame if data is too old or if no data found
         """
-        if not self.connection:
-            self.logger.error("No database connection. Connect first.")
-            return pd.DataFrame()
-
-        # Build parameter filter if specified
-        parameter_filter = ""
-        if parameters:
-            parameter_list = "', '".join(parameters)
-            parameter_filter = f"AND parameter IN ('{parameter_list}')"
-
-        query = f"""
-        WITH ranked_measurements AS (
-            SELECT 
-                parameter,
-                value,
-                unit,
-                time,
-                ROW_NUMBER() OVER (PARTITION BY parameter ORDER BY time DESC) as rn
-            FROM {table_name}
-            WHERE quality = 'ok'
-            {parameter_filter}
-        )
-        SELECT 
-            parameter,
-            ROUND(value::numeric, 4) as latest_value,
-            unit,
-            time as measurement_time
-        FROM ranked_measurements
-        WHERE rn = 1
-        ORDER BY parameter;
-        """
-
         try:
-            df = pd.read_sql_query(query, self.connection)
+            self._check_table(table_name)
+            rows = run_query('latest_values', (self._resolve_parameters(parameters),), db=self.db)
+            df = pd.DataFrame(rows)
             
             if df.empty:
                 self.logger.error("No recent data found")
@@ -249,7 +182,7 @@ class LastIntervalQuerier:
             return df
             
         except Exception as e:
-            print(f"Error executing query: {e}")
+            self.logger.error(f"Error executing query: {e}")
             return pd.DataFrame()
 
     def get_simple_averages(self, table_name: str = "measurements") -> dict:
@@ -283,17 +216,179 @@ class LastIntervalQuerier:
         return dict(zip(df['parameter'], df['latest_value']))
 
 
-def main():
-    DB_CONFIG = {
-        'host': DB_HOST,
-        'database': DB_NAME,
-        'user': DB_USER,
-        'password': DB_PASSWORD,
-        'port': DB_PORT
-    }
+@dataclass
+class OptimizerData:
+    """Result of one OptimizerInputProvider.fetch()."""
+    averaged: Dict[str, float] = field(default_factory=dict)
+    recent: Dict[str, float] = field(default_factory=dict)
+    stale: Dict[str, float] = field(default_factory=dict)     # parameter -> age in minutes
+    missing: List[str] = field(default_factory=list)
+    interval_start: Optional[datetime] = None
+    fetched_at: Optional[datetime] = None
+    newest_sample: Optional[datetime] = None                  # newest latest value used
+
+
+class OptimizerInputProvider:
+    """
+    Fetches everything an optimizer needs in one prepared query ('optimizer_inputs'): the
+    15-minute averages and the latest values of only the requested parameters.
 
+    Freshness is checked per parameter against its own latest sample; stale or missing
+    parameters are left out, so prepare_inputs() falls back to its defaults for them only.
+    """
+
+    def __init__(self, averaged_parameters: List[str], recent_parameters: List[str],
+                 db: DatabasePool = None, averaged_max_age_minutes: float = 20,
+                 recent_max_age_minutes: float = 2):
+        """
+        Args:
+            averaged_parameters: Parameters read as 15-minute averages
+            recent_parameters: Parameters read as latest values
+            db: Connection pool (default: the shared pool)
+            averaged_max_age_minutes: Max age of the latest sample of an averaged parameter
+            recent_max_age_minutes: Max age of a latest value
+        """
+        self.averaged_parameters = list(dict.fromkeys(averaged_parameters))
+        self.recent_parameters = list(dict.fromkeys(recent_parameters))
+        self.db = db or get_pool()
+        self.averaged_max_age_minutes = averaged_max_age_minutes
+        self.recent_max_age_minutes = recent_max_age_minutes
+        self.logger = logging.getLogger('ems.inputs')
+
+    def fetch(self) -> OptimizerData:
+        """Run the combined query and split the rows into averaged and recent values."""
+        now = current_time()
+        data = OptimizerData(fetched_at=now)
+        if not self.averaged_parameters and not self.recent_parameters:
+            return data
+
+        rows = run_query('optimizer_inputs', (self.averaged_parameters, self.recent_parameters), db=self.db)
+        found = set()
+
+        for row in rows:
+            parameter = row['parameter']
+            found.add(parameter)
+            sample_time = row['measurement_time']
+            if sample_time.tzinfo is None:
+                sample_time = sample_time.replace(tzinfo=TIMEZONE)
+            age_minutes = (now - sample_time).total_seconds() / 60
+
+            if row['averaged']:
+                data.interval_start = row['interval_start']
+                if row['sample_count'] and age_minutes <= self.averaged_max_age_minutes:
+                    data.averaged[parameter] = row['average_value']
+                else:
+                    data.stale[parameter] = round(age_minutes, 1)
+
+            if row['recent']:
+                if age_minutes <= self.recent_max_age_minutes:
+                    data.recent[parameter] = row['latest_value']
+                    if data.newest_sample is None or sample_time > data.newest_sample:
+                        data.newest_sample = sample_time
+                else:
+                    data.stale[parameter] = round(age_minutes, 1)
+
+        data.missing = [p for p in dict.fromkeys(self.averaged_parameters + self.recent_parameters)
+                        if p not in found]
+
+        if data.stale:
+            self.logger.warning(f"Stale parameters (age in minutes), using defaults: {data.stale}")
+        if data.missing:
+            self.logger.warning(f"No data for parameters, using defaults: {data.missing}")
+        self.logger.debug(f"Fetched {len(data.averaged)} averages and {len(data.recent)} latest values "
+                          f"(interval start {data.interval_start})")
+        return data
+
+
+class LatestValueFeed:
+    """
+    Latest value of each watched parameter ('latest_values'), for the re-optimization
+    triggers of the coordinator. Values older than `max_age_seconds` are left out.
+    """
+
+    def __init__(self, parameters: List[str], db: DatabasePool = None, max_age_seconds: float = 120):
+        """
+        Args:
+            parameters: Parameters to read
+            db: Connection pool (default: the shared pool)
+            max_age_seconds: Max age of a latest value
+        """
+        self.parameters = list(dict.fromkeys(parameters))
+        self.db = db or get_pool()
+        self.max_age_seconds = max_age_seconds
+        self.logger = logging.getLogger('ems.feed')
+
+    def fetch(self) -> Dict[str, float]:
+        """{parameter: latest value} of the fresh parameters."""
+        if not self.parameters:
+            return {}
+        now = current_time()
+        values = {}
+        for row in run_query('latest_values', (self.parameters,), db=self.db):
+            sample_time = row['measurement_time']
+            if sample_time.tzinfo is None:
+                sample_time = sample_time.replace(tzinfo=TIMEZONE)
+            if (now - sample_time).total_seconds() <= self.max_age_seconds:
+                values[row['parameter']] = row['latest_value']
+        return values
+
+
+class ForecastProvider:
+    """
+    Reads the latest stored forecast of each asset ('horizon_forecasts') and resamples it
+    onto the steps of an optimization horizon. Forecasts are hourly; step values are
+    linearly interpolated and held flat past the last forecast point.
+    """
+
+    def __init__(self, asset_keys: List[str], db: DatabasePool = None):
+        """
+        Args:
+            asset_keys: Assets (device ids) whose '<id>_POWER' forecasts are read
+            db: Connection pool (default: the shared pool)
+        """
+        self.asset_keys = list(dict.fromkeys(asset_keys))
+        self.db = db or get_pool()
+        self.logger = logging.getLogger('ems.forecasts')
+
+    def fetch(self, start: datetime, steps: int, step_minutes: float) -> Dict[str, np.ndarray]:
+        """
+        Forecast power per asset at `start + k * step_minutes`, k = 0..steps-1.
+
+        Returns:
+            {asset_key: array of kW per step}; assets without forecast points are left out
+        """
+        if not self.asset_keys:
+            return {}
+        step_seconds = step_minutes * 60
+        end = start + timedelta(seconds=step_seconds * (steps - 1))
+        # One hour either side so the first and last steps can be interpolated
+        rows = run_query('horizon_forecasts',
+                         (self.asset_keys, start - timedelta(hours=1), end + timedelta(hours=1)),
+                         db=self.db, cursor_factory=None)
+        if not rows:
+            self.logger.warning("No forecasts found for the optimization horizon")
+            return {}
+
+        keys = np.array([row[0] for row in rows])
+        epochs = np.array([row[1] for row in rows], dtype=np.float64)
+        power_kW = np.abs(np.array([row[2] for row in rows], dtype=np.float64)) / 1000
+        step_epochs = start.timestamp() + step_seconds * np.arange(steps)
+
+        # Rows are ordered by asset - split them at the asset boundaries
+        boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        forecasts = {}
+        for segment in np.split(np.arange(len(keys)), boundaries):
+            forecasts[str(keys[segment[0]])] = np.interp(step_epochs, epochs[segment], power_kW[segment])
+
+        missing = [key for key in self.asset_keys if key not in forecasts]
+        if missing:
+            self.logger.warning(f"No forecast for assets, holding their measured value: {missing}")
+        return forecasts
+
+
+def main():
     # Initialize querier
-    querier = LastIntervalQuerier(**DB_CONFIG)
+    querier = LastIntervalQuerier()
 
     if not querier.connect():
         sys.exit(1)
@@ -345,45 +440,37 @@ def main():
         print(f"Error in main execution: {e}")
 
     finally:
-        querier.disconnect()
+        querier.db.close_pool()
 
 
 # Quick usage functions
-def get_last_15min_data(host, database, user, password, port=5432, table_name="measurements"):
+def get_last_15min_data(table_name="measurements", db: DatabasePool = None):
     """
     Quick function to get last 15-minute averages.
 
+    Args:
+        table_name: Name of the measurements table
+        db: Connection pool to use (default: the shared pool)
+
     Returns:
         Dictionary with parameter: average_value pairs
     """
-    querier = LastIntervalQuerier(host, database, user, password, port)
-    if querier.connect():
-        try:
-            return querier.get_simple_averages(table_name)
-        finally:
-            querier.disconnect()
-    return {}
+    return LastIntervalQuerier(db).get_simple_averages(table_name)
 
 
-def get_most_recent_data(host, database, user, password, port=5432, table_name="measurements", parameters=None):
+def get_most_recent_data(table_name="measurements", parameters=None, db: DatabasePool = None):
     """
     Quick function to get most recent values.
 
     Args:
-        host, database, user, password, port: Database connection parameters
         table_name: Name of the measurements table
         parameters: List of specific parameters to fetch. If None, fetches all parameters
+        db: Connection pool to use (default: the shared pool)
 
     Returns:
         Dictionary with parameter: latest_value pairs
     """
-    querier = LastIntervalQuerier(host, database, user, password, port)
-    if querier.connect():
-        try:
-            return querier.get_simple_recent_values(table_name, parameters)
-        finally:
-            querier.disconnect()
-    return {}
+    return LastIntervalQuerier(db).get_simple_recent_values(table_name, parameters)
 
 
 if __name__ == "__main__":
@@ -19,7 +19,7 @@ limitations under the License.
 @Description: # TODO: Add desc
 
 @Created: 31st July 2025
-@Last Modified: 01 April 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -34,6 +34,7 @@ from datetime import datetime
 from pymodbus.client import ModbusTcpClient
 import logging
 import struct
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict
 import argparse
@@ -49,6 +50,7 @@ class ModbusDataReader:
         self.clients = {}
         self.max_batch_size = max_batch_size
         self.connection_timeouts = {'timeout': 3, 'retries': 1}
+        self._clients_lock = threading.Lock()
 
     def load_config(self, config_file):
         with open(config_file, 'r') as f:
@@ -58,7 +60,12 @@ class ModbusDataReader:
         """
         Get or create a persistent Modbus TCP client for the given address.
         Reuses an existing healthy connection; reconnects if the socket is closed or broken.
+        The pool is shared by the reader and writer threads, so lookups are serialized.
         """
+        with self._clients_lock:
+            return self._get_client(ip_address, port)
+
+    def _get_client(self, ip_address, port):
         client_key = f"{ip_address}:{port}"
         existing = self.clients.get(client_key)
 
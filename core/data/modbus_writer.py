@@ -19,7 +19,7 @@ limitations under the License.
 @Description: # TODO: Add desc
 
 @Created: 3rd February 2026
-@Last Modified: 17 February 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -27,6 +27,8 @@ limitations under the License.
 
 
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 from data.measurements_client import ModbusDataReader
 from utils.logging_utils import setup_logging
@@ -39,15 +41,36 @@ class ModbusWriter:
     High-level interface for writing setpoints to Modbus devices
     """
     
-    def __init__(self, config_file='modbus.json'):
+    def __init__(self, config_file='modbus.json', max_workers=10):
         """
         Initialize the Modbus writer
         
         Args:
             config_file: Path to modbus configuration file
+            max_workers: Max number of connections written to at the same time
         """
         self.reader = ModbusDataReader(config_file)
         self.logger = logging.getLogger('ems.modbuswriter')
+        self.max_workers = max_workers
+        self._executor = None
+
+    def _connection_key(self, device_assetKey: str) -> str:
+        """'ip:port' of a device; unknown devices get their own key."""
+        device = next((d for d in self.reader.config['devices'] if d.get('assetKey') == device_assetKey), None)
+        if not device:
+            return device_assetKey
+        return f"{device['ipAddress']}:{device['port']}"
+
+    def _write_group(self, device_setpoints: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, bool]]:
+        """Write the devices behind one connection, one after the other."""
+        results = {}
+        for device_assetKey, setpoints in device_setpoints.items():
+            try:
+                results[device_assetKey] = self.write_setpoints(device_assetKey, setpoints)
+            except Exception as e:
+                self.logger.error(f"Error writing setpoints to {device_assetKey}: {e}")
+                results[device_assetKey] = {param_name: False for param_name in setpoints}
+        return results
     
     def write_setpoints(self, device_assetKey: str, setpoints: Dict[str, float]) -> Dict[str, bool]:
         """
@@ -85,7 +108,11 @@ class ModbusWriter:
     
     def write_device_setpoints_batch(self, device_setpoints: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, bool]]:
         """
-        Write setpoints to multiple devices
+        Write setpoints to multiple devices concurrently.
+
+        Devices are grouped by connection (ip:port): the groups are written in parallel,
+        the devices of a group in sequence, so a Modbus TCP client is never used by two
+        threads at once.
         
         Args:
             device_setpoints: Dictionary mapping device names to their setpoints
@@ -97,13 +124,29 @@ class ModbusWriter:
         Returns:
             Dictionary mapping device names to their write results
         """
-        results = {}
+        groups = defaultdict(dict)
         for device_assetKey, setpoints in device_setpoints.items():
-            results[device_assetKey] = self.write_setpoints(device_assetKey, setpoints)
-        return results
+            groups[self._connection_key(device_assetKey)][device_assetKey] = setpoints
+
+        if len(groups) <= 1:
+            return self._write_group(device_setpoints)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='modbus-write')
+        futures = [self._executor.submit(self._write_group, group) for group in groups.values()]
+
+        results = {}
+        for future in futures:
+            results.update(future.result())
+        # Keep the caller's device order
+        return {device_assetKey: results[device_assetKey] for device_assetKey in device_setpoints}
     
     def close(self):
         """Close all Modbus connections"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
         if self.reader:
             self.reader.close_connections()
     
@@ -0,0 +1,66 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: m0001_measurements_btree_indexes.py
+@Description: Composite B-tree indexes for the per-parameter and per-asset time-series lookups.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+VERSION = 1
+NAME = 'measurements_btree_indexes'
+
+# Built CONCURRENTLY so that the measurement service can keep inserting while the index builds.
+TRANSACTIONAL = False
+
+STATEMENTS = [
+    # Latest value / time range of a single parameter (optimizer inputs, forecast history)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_measurements_parameter_time "
+    "ON measurements (parameter, time DESC)",
+    # Per-asset windows (metrics, web-app device pages)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_measurements_asset_time "
+    "ON measurements (asset_key, time)",
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ems_inputs_parameter_time '
+    'ON "ems-inputs" (parameter, time DESC)',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ems_outputs_parameter_time '
+    'ON "ems-outputs" (parameter, time DESC)',
+]
+
+BENCHMARK_QUERIES = {
+    'latest_value': """
+        SELECT value, unit, time FROM measurements
+        WHERE parameter = (SELECT parameter FROM measurements ORDER BY id DESC LIMIT 1)
+          AND quality = 'ok'
+        ORDER BY time DESC LIMIT 1
+    """,
+    'asset_window': """
+        SELECT time, parameter, value FROM measurements
+        WHERE asset_key = (SELECT asset_key FROM measurements ORDER BY id DESC LIMIT 1)
+          AND time >= now() - INTERVAL '1 day'
+    """,
+    'ems_outputs_parameter': """
+        SELECT time, value FROM "ems-outputs"
+        WHERE parameter = (SELECT parameter FROM "ems-outputs" ORDER BY id DESC LIMIT 1)
+        ORDER BY time DESC LIMIT 96
+    """,
+}
@@ -0,0 +1,55 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: m0002_time_brin_indexes.py
+@Description: BRIN indexes on the time column of the append-only tables.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+VERSION = 2
+NAME = 'time_brin_indexes'
+TRANSACTIONAL = False
+
+# Rows are only ever appended in time order, so a BRIN index gives range pruning on `time`
+# for a few kB of index instead of a full B-tree. autosummarize keeps the newest block
+# ranges indexed without waiting for the next VACUUM.
+STATEMENTS = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_measurements_time_brin "
+    "ON measurements USING BRIN (time) WITH (pages_per_range = 32, autosummarize = on)",
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ems_inputs_time_brin '
+    'ON "ems-inputs" USING BRIN (time) WITH (pages_per_range = 32, autosummarize = on)',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ems_outputs_time_brin '
+    'ON "ems-outputs" USING BRIN (time) WITH (pages_per_range = 32, autosummarize = on)',
+]
+
+BENCHMARK_QUERIES = {
+    'metrics_window': """
+        SELECT time, asset_key, parameter, value, unit, quality FROM measurements
+        WHERE time >= now() - INTERVAL '1 hour' AND time <= now()
+    """,
+    'ems_inputs_last_day': """
+        SELECT id, input_id, time, parameter, value, unit, quality FROM "ems-inputs"
+        WHERE time >= now() - INTERVAL '24 hours'
+    """,
+}
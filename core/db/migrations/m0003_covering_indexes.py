@@ -0,0 +1,66 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: m0003_covering_indexes.py
+@Description: Covering indexes for the optimizer input and forecast queries.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+VERSION = 3
+NAME = 'covering_indexes'
+TRANSACTIONAL = False
+
+STATEMENTS = [
+    # Optimizer (latest values, 15-min averages) and forecast history/validation all read
+    # (time, value, unit) of quality='ok' rows for a parameter - served by index-only scans.
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_measurements_ok_parameter_time_covering "
+    "ON measurements (parameter, time DESC) INCLUDE (value, unit) WHERE quality = 'ok'",
+    # Forecast horizon reads per asset
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_forecasts_asset_horizon_covering "
+    "ON forecasts (asset_key, horizon_timestamp) "
+    "INCLUDE (forecast_timestamp, predicted_power, confidence_lower, confidence_upper)",
+]
+
+BENCHMARK_QUERIES = {
+    '15min_average': """
+        SELECT parameter, AVG(value), unit FROM measurements
+        WHERE parameter IN (SELECT DISTINCT parameter FROM measurements
+                            WHERE time >= now() - INTERVAL '1 minute')
+          AND time >= now() - INTERVAL '15 minutes'
+          AND quality = 'ok'
+        GROUP BY parameter, unit
+    """,
+    'forecast_history': """
+        SELECT time, value FROM measurements
+        WHERE parameter = (SELECT parameter FROM measurements ORDER BY id DESC LIMIT 1)
+          AND time >= now() - INTERVAL '30 days' AND time <= now()
+          AND quality = 'ok'
+        ORDER BY time
+    """,
+    'forecast_horizon': """
+        SELECT horizon_timestamp, predicted_power FROM forecasts
+        WHERE asset_key = (SELECT asset_key FROM forecasts ORDER BY id DESC LIMIT 1)
+        ORDER BY horizon_timestamp
+    """,
+}
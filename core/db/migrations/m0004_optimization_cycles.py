@@ -0,0 +1,149 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: m0004_optimization_cycles.py
+@Description: One `optimization_cycles` row per optimizer run (inputs, outputs and setpoint
+              results as JSONB). "ems-inputs" and "ems-outputs" become views that expand the
+              cycles into the old one-row-per-parameter layout, so the web app keeps working.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+VERSION = 4
+NAME = 'optimization_cycles'
+
+# View ids of cycle rows are `cycle id * CYCLE_ROW_STRIDE + row number`; the cycle id
+# sequence starts above the legacy tables so the ids never collide with legacy rows.
+CYCLE_ROW_STRIDE = 100000
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS optimization_cycles (
+        id BIGSERIAL PRIMARY KEY,
+        cycle_id UUID NOT NULL UNIQUE,
+        time TIMESTAMPTZ NOT NULL DEFAULT now(),
+        mode TEXT NOT NULL,
+        objective VARCHAR(100),
+        status TEXT NOT NULL,
+        solver_status TEXT,
+        quality TEXT NOT NULL DEFAULT 'ok',
+        message TEXT,
+        fetch_ms DOUBLE PRECISION,
+        solve_ms DOUBLE PRECISION,
+        apply_ms DOUBLE PRECISION,
+        total_ms DOUBLE PRECISION,
+        inputs JSONB NOT NULL DEFAULT '[]',
+        outputs JSONB NOT NULL DEFAULT '[]',
+        setpoints JSONB,
+        stats JSONB
+    )
+    """,
+    "COMMENT ON TABLE optimization_cycles IS "
+    "'One row per optimization cycle: inputs, outputs, setpoint results and timings'",
+    "CREATE INDEX IF NOT EXISTS idx_optimization_cycles_time ON optimization_cycles (time DESC)",
+    # Keep the per-parameter history written before this migration (looked up in the
+    # schema being migrated, which is not always public)
+    """
+    DO $$
+    BEGIN
+        IF to_regclass(quote_ident(current_schema()) || '.ems_inputs_legacy') IS NULL AND EXISTS (
+            SELECT 1 FROM pg_class
+            WHERE oid = to_regclass(quote_ident(current_schema()) || '."ems-inputs"') AND relkind = 'r'
+        ) THEN
+            ALTER TABLE "ems-inputs" RENAME TO ems_inputs_legacy;
+        END IF;
+        IF to_regclass(quote_ident(current_schema()) || '.ems_outputs_legacy') IS NULL AND EXISTS (
+            SELECT 1 FROM pg_class
+            WHERE oid = to_regclass(quote_ident(current_schema()) || '."ems-outputs"') AND relkind = 'r'
+        ) THEN
+            ALTER TABLE "ems-outputs" RENAME TO ems_outputs_legacy;
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ems_inputs_legacy (
+        id BIGSERIAL PRIMARY KEY,
+        input_id INT NOT NULL,
+        time TIMESTAMPTZ NOT NULL DEFAULT now(),
+        parameter TEXT NOT NULL,
+        value DOUBLE PRECISION NOT NULL,
+        unit TEXT NOT NULL,
+        quality TEXT,
+        objective VARCHAR(100)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ems_outputs_legacy (
+        id BIGSERIAL PRIMARY KEY,
+        output_id INT NOT NULL,
+        time TIMESTAMPTZ NOT NULL DEFAULT now(),
+        parameter TEXT NOT NULL,
+        value DOUBLE PRECISION NOT NULL,
+        unit TEXT NOT NULL,
+        quality TEXT,
+        objective VARCHAR(100)
+    )
+    """,
+    f"""
+    SELECT setval('optimization_cycles_id_seq', GREATEST(
+        (SELECT COALESCE(MAX(id), 0) FROM optimization_cycles),
+        (SELECT COALESCE(MAX(id), 0) FROM ems_inputs_legacy) / {CYCLE_ROW_STRIDE} + 1,
+        (SELECT COALESCE(MAX(id), 0) FROM ems_outputs_legacy) / {CYCLE_ROW_STRIDE} + 1
+    ))
+    """,
+    f"""
+    CREATE OR REPLACE VIEW "ems-inputs" AS
+    SELECT id, input_id, time, parameter, value, unit, quality, objective
+    FROM ems_inputs_legacy
+    UNION ALL
+    SELECT c.id * {CYCLE_ROW_STRIDE} + r.n, r.n::int, c.time, r.parameter, r.value, r.unit,
+           'ok'::text, c.objective
+    FROM optimization_cycles c
+    CROSS JOIN LATERAL ROWS FROM (
+        jsonb_to_recordset(c.inputs) AS (parameter text, value double precision, unit text)
+    ) WITH ORDINALITY AS r(parameter, value, unit, n)
+    """,
+    f"""
+    CREATE OR REPLACE VIEW "ems-outputs" AS
+    SELECT id, output_id, time, parameter, value, unit, quality, objective
+    FROM ems_outputs_legacy
+    UNION ALL
+    SELECT c.id * {CYCLE_ROW_STRIDE} + r.n, r.n::int, c.time, r.parameter, r.value, r.unit,
+           c.quality, c.objective
+    FROM optimization_cycles c
+    CROSS JOIN LATERAL ROWS FROM (
+        jsonb_to_recordset(c.outputs) AS (parameter text, value double precision, unit text)
+    ) WITH ORDINALITY AS r(parameter, value, unit, n)
+    """,
+    """COMMENT ON VIEW "ems-inputs" IS 'Optimizer inputs, one row per parameter (legacy rows and optimization_cycles)'""",
+    """COMMENT ON VIEW "ems-outputs" IS 'Optimizer outputs, one row per parameter (legacy rows and optimization_cycles)'""",
+]
+
+BENCHMARK_QUERIES = {
+    'outputs_recent': """
+        SELECT id, output_id, time, parameter, value, unit, quality FROM "ems-outputs"
+        WHERE time >= now() - INTERVAL '24 hours'
+        ORDER BY time DESC
+    """,
+}
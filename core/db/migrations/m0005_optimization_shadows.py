@@ -0,0 +1,53 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: m0005_optimization_shadows.py
+@Description: One `optimization_shadows` row per live cycle and shadow objective: the outputs
+              another objective would have produced from the same inputs (optimization/shadow.py).
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+VERSION = 5
+NAME = 'optimization_shadows'
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS optimization_shadows (
+        id BIGSERIAL PRIMARY KEY,
+        cycle_id UUID NOT NULL,
+        time TIMESTAMPTZ NOT NULL DEFAULT now(),
+        objective VARCHAR(100) NOT NULL,
+        status TEXT NOT NULL,
+        solver_status TEXT,
+        message TEXT,
+        solve_ms DOUBLE PRECISION,
+        wall_ms DOUBLE PRECISION,
+        outputs JSONB NOT NULL DEFAULT '[]',
+        UNIQUE (cycle_id, objective)
+    )
+    """,
+    "COMMENT ON TABLE optimization_shadows IS "
+    "'Outputs of the other objectives for the inputs of a live cycle (optimization_cycles.cycle_id)'",
+    "CREATE INDEX IF NOT EXISTS idx_optimization_shadows_time ON optimization_shadows (time DESC)",
+]
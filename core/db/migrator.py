@@ -0,0 +1,431 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: migrator.py
+@Description: Versioned schema migration runner. Every service calls `run_migrations()` at
+              start-up; a PostgreSQL advisory lock guarantees that only one process applies
+              pending migrations while the others wait (or skip, if they must not block).
+
+              Usage (from the `core` directory):
+                  python -m db.migrator --status
+                  python -m db.migrator --benchmark       # EXPLAIN before/after every migration
+                  python -m db.migrator --target 2
+                  python -m db.migrator --schema site_a    # one site of a multi-site database
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import argparse
+import hashlib
+import importlib
+import logging
+import pkgutil
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import os
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import Json
+
+import db.migrations as migrations_package
+from db.pool import DatabaseSettings
+from utils.logging_utils import setup_logging
+
+# Arbitrary, but shared by every EMS4DC service - must never change.
+MIGRATION_LOCK_ID = 4_004_026
+
+# Tables of db/init.sql that every site schema is created with (the web-app's users and
+# sessions stay in public). They are created from init.sql's own DDL, with its keys,
+# defaults and indexes; the migrations then run on them like on a fresh public schema.
+# docker-compose.yml mounts init.sql into the Python services and sets DB_INIT_SQL; the
+# default is the repository's db/init.sql, for runs from a checkout.
+INIT_SQL_PATH = os.getenv('DB_INIT_SQL') or os.path.join(os.path.dirname(__file__), '..', '..', 'db', 'init.sql')
+SITE_TABLES = (
+    'assets', 'asset_events', 'measurements', 'ems-inputs', 'ems-outputs', 'forecasts',
+    'model_metadata', 'forecast_readiness', 'metrics_summary', 'asset_metrics', 'metrics_timeseries',
+)
+
+logger = logging.getLogger('ems.migrations')
+
+
+@dataclass
+class Migration:
+    """A single schema migration loaded from `db/migrations/mNNNN_<name>.py`."""
+    version: int
+    name: str
+    statements: List[str]
+    transactional: bool = True
+    benchmark_queries: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256("\n;\n".join(self.statements).encode('utf-8')).hexdigest()
+
+
+def discover_migrations() -> List[Migration]:
+    """
+    Load all migration modules from the `db.migrations` package, ordered by version.
+
+    Each module must define VERSION (int), NAME (str) and STATEMENTS (list of SQL strings).
+    Optional: TRANSACTIONAL (default True) and BENCHMARK_QUERIES (name -> SQL).
+    Non-transactional migrations (e.g. CREATE INDEX CONCURRENTLY) are executed statement
+    by statement in autocommit mode and therefore must be idempotent.
+    """
+    migrations = []
+    for module_info in pkgutil.iter_modules(migrations_package.__path__):
+        if not re.match(r'^m\d{4}_', module_info.name):
+            continue
+        module = importlib.import_module(f"{migrations_package.__name__}.{module_info.name}")
+        migrations.append(Migration(
+            version=module.VERSION,
+            name=module.NAME,
+            statements=list(module.STATEMENTS),
+            transactional=getattr(module, 'TRANSACTIONAL', True),
+            benchmark_queries=dict(getattr(module, 'BENCHMARK_QUERIES', {})),
+        ))
+
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions found: {versions}")
+    return migrations
+
+
+def site_table_statements(path: str = INIT_SQL_PATH) -> List[str]:
+    """
+    The statements of db/init.sql that create SITE_TABLES: CREATE TABLE, COMMENT ON TABLE
+    and CREATE INDEX, unqualified so they run in the schema first on the search_path.
+    """
+    try:
+        with open(path, 'r') as f:
+            script = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"db/init.sql not found at {path} - site schemas are created from it "
+                                f"(set DB_INIT_SQL to its path)")
+
+    script = re.sub(r'--[^\n]*', '', script)
+    target = re.compile(r'^(?:CREATE TABLE IF NOT EXISTS|COMMENT ON TABLE|CREATE INDEX\b.*?\bON)\s+("[^"]+"|\w+)',
+                        re.IGNORECASE | re.DOTALL)
+    statements = []
+    for statement in script.split(';'):
+        statement = statement.strip()
+        match = target.match(statement)
+        if match and match.group(1).strip('"') in SITE_TABLES:
+            statements.append(statement)
+    return statements
+
+
+def _access_path(nodes: list) -> str:
+    """First scan node of a plan - the part an index migration is expected to change."""
+    return next((node for node in nodes if 'Scan' in node), nodes[0] if nodes else '?')
+
+
+def _walk_plan(plan: dict, nodes: list):
+    """Collect a compact description of every node of an EXPLAIN plan."""
+    node = plan.get('Node Type', '?')
+    if plan.get('Index Name'):
+        node = f"{node} using {plan['Index Name']}"
+    elif plan.get('Relation Name'):
+        node = f"{node} on {plan['Relation Name']}"
+    nodes.append(node)
+    for child in plan.get('Plans', []):
+        _walk_plan(child, nodes)
+
+
+class MigrationRunner:
+    def __init__(self, settings: DatabaseSettings = None, benchmark: bool = False, schema: str = None):
+        """
+        Initialize the migration runner.
+
+        Migrations use their own session (the advisory lock is session-scoped and
+        CREATE INDEX CONCURRENTLY needs autocommit), so they do not go through the pool.
+
+        Args:
+            settings: Database settings (default: DB_* env variables, no statement timeout)
+            benchmark: Run EXPLAIN (ANALYZE, BUFFERS) of each migration's benchmark queries
+                       before and after applying it, and store the result in `schema_migrations`
+            schema: Site schema to migrate (default: DB_SCHEMA, else public). It is created
+                    with the SITE_TABLES of db/init.sql and has its own `schema_migrations`.
+        """
+        overrides = {'schema': schema} if schema else {}
+        self.settings = settings or DatabaseSettings.from_env(
+            application_name='ems-migrations', statement_timeout_ms=0, **overrides
+        )
+        self.benchmark = benchmark
+        self.migrations = discover_migrations()
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.settings.connect_kwargs())
+        conn.autocommit = True
+        return conn
+
+    def _ensure_schema(self, cursor):
+        """Create the site schema with the SITE_TABLES of db/init.sql, if it does not exist yet."""
+        cursor.execute("SELECT 1 FROM pg_namespace WHERE nspname = %s", (self.settings.schema,))
+        if cursor.fetchone():
+            return
+
+        statements = site_table_statements()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(self.settings.schema)))
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        logger.info(f"Created schema {self.settings.schema} with {len(SITE_TABLES)} site tables")
+
+    def _ensure_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                name TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                duration_ms DOUBLE PRECISION,
+                benchmark JSONB
+            )
+        """)
+
+    def _applied_versions(self, cursor) -> Dict[int, str]:
+        cursor.execute("SELECT version, checksum FROM schema_migrations")
+        return {version: checksum for version, checksum in cursor.fetchall()}
+
+    def _drop_invalid_indexes(self, cursor, migration: Migration):
+        """Remove indexes left INVALID by an interrupted CREATE INDEX CONCURRENTLY."""
+        cursor.execute("""
+            SELECT c.relname
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE NOT i.indisvalid AND n.nspname = current_schema()
+        """)
+        for (index_name,) in cursor.fetchall():
+            if any(re.search(rf'\b{re.escape(index_name)}\b', sql) for sql in migration.statements):
+                logger.warning(f"Dropping invalid index {index_name} before re-running migration {migration.version}")
+                cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+
+    def explain(self, cursor, query: str) -> dict:
+        """
+        Run EXPLAIN (ANALYZE, BUFFERS) for a benchmark query and summarise the plan.
+
+        Returns:
+            Dictionary with planning/execution time in ms, shared buffer hits/reads and plan nodes
+        """
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}")
+        result = cursor.fetchone()[0][0]
+        plan = result['Plan']
+        nodes = []
+        _walk_plan(plan, nodes)
+        return {
+            'planning_ms': round(result.get('Planning Time', 0.0), 3),
+            'execution_ms': round(result.get('Execution Time', 0.0), 3),
+            'shared_hit_blocks': plan.get('Shared Hit Blocks', 0),
+            'shared_read_blocks': plan.get('Shared Read Blocks', 0),
+            'nodes': nodes,
+        }
+
+    def _run_benchmark(self, cursor, migration: Migration) -> Dict[str, dict]:
+        results = {}
+        for name, query in migration.benchmark_queries.items():
+            try:
+                results[name] = self.explain(cursor, query)
+            except psycopg2.Error as e:
+                results[name] = {'error': str(e).strip()}
+        return results
+
+    def _log_benchmark(self, migration: Migration, benchmark: dict):
+        for name, before in benchmark['before'].items():
+            after = benchmark['after'].get(name, {})
+            if 'error' in before or 'error' in after:
+                logger.warning(f"[{migration.version}] {name}: benchmark failed "
+                               f"({before.get('error') or after.get('error')})")
+                continue
+            logger.info(
+                f"[{migration.version}] {name}: "
+                f"{before['execution_ms']:.2f} ms ({_access_path(before['nodes'])}) -> "
+                f"{after['execution_ms']:.2f} ms ({_access_path(after['nodes'])})"
+            )
+
+    def _apply(self, conn, migration: Migration):
+        start = time.perf_counter()
+        benchmark = None
+
+        with conn.cursor() as cursor:
+            if self.benchmark and migration.benchmark_queries:
+                benchmark = {'before': self._run_benchmark(cursor, migration)}
+
+            if migration.transactional:
+                conn.autocommit = False
+                try:
+                    for statement in migration.statements:
+                        cursor.execute(statement)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.autocommit = True
+            else:
+                self._drop_invalid_indexes(cursor, migration)
+                for statement in migration.statements:
+                    cursor.execute(statement)
+
+            duration_ms = (time.perf_counter() - start) * 1000
+
+            if benchmark is not None:
+                cursor.execute("ANALYZE")
+                benchmark['after'] = self._run_benchmark(cursor, migration)
+                self._log_benchmark(migration, benchmark)
+
+            cursor.execute("""
+                INSERT INTO schema_migrations (version, name, checksum, duration_ms, benchmark)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (migration.version, migration.name, migration.checksum, duration_ms,
+                  Json(benchmark) if benchmark is not None else None))
+
+        logger.info(f"Applied migration {migration.version:04d}_{migration.name} in {duration_ms:.0f} ms")
+
+    def run(self, wait: bool = True, target: Optional[int] = None) -> List[int]:
+        """
+        Apply all pending migrations (up to `target`, if given) under an advisory lock.
+
+        Args:
+            wait: Block until the migration lock is available. If False and another process
+                  holds the lock, return immediately without applying anything.
+            target: Highest migration version to apply
+
+        Returns:
+            List of versions applied by this call
+        """
+        applied_now = []
+        conn = self._connect()
+        try:
+            with conn.cursor() as cursor:
+                if wait:
+                    cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+                else:
+                    cursor.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+                    if not cursor.fetchone()[0]:
+                        logger.info("Migrations are being applied by another service, skipping")
+                        return applied_now
+
+                try:
+                    if self.settings.schema:
+                        self._ensure_schema(cursor)
+                    self._ensure_table(cursor)
+                    applied = self._applied_versions(cursor)
+
+                    for migration in self.migrations:
+                        if target is not None and migration.version > target:
+                            break
+                        if migration.version in applied:
+                            if applied[migration.version] != migration.checksum:
+                                logger.warning(f"Migration {migration.version:04d}_{migration.name} "
+                                               f"was modified after being applied")
+                            continue
+                        self._apply(conn, migration)
+                        applied_now.append(migration.version)
+                finally:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+        finally:
+            conn.close()
+
+        if not applied_now:
+            logger.debug("Database schema is up to date")
+        return applied_now
+
+    def status(self) -> List[dict]:
+        """Return every known migration with its applied state."""
+        conn = self._connect()
+        try:
+            with conn.cursor() as cursor:
+                if self.settings.schema:
+                    self._ensure_schema(cursor)
+                self._ensure_table(cursor)
+                cursor.execute("SELECT version, applied_at, duration_ms FROM schema_migrations")
+                applied = {row[0]: row[1:] for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+        return [{
+            'version': m.version,
+            'name': m.name,
+            'applied_at': applied[m.version][0] if m.version in applied else None,
+            'duration_ms': applied[m.version][1] if m.version in applied else None,
+        } for m in self.migrations]
+
+
+def run_migrations(wait: bool = True, benchmark: bool = None, schema: str = None) -> bool:
+    """
+    Start-up hook for the EMS services. Never raises: a failed migration is logged and the
+    service keeps running on the current schema.
+
+    Args:
+        wait: Wait for another service that is currently applying migrations
+        benchmark: Record EXPLAIN before/after each migration (default: env DB_MIGRATION_BENCHMARK)
+        schema: Site schema to migrate (default: DB_SCHEMA, else public)
+
+    Returns:
+        True if the schema is up to date (or was brought up to date), False otherwise
+    """
+    if benchmark is None:
+        benchmark = os.getenv('DB_MIGRATION_BENCHMARK', '0').lower() in ('1', 'true', 'yes')
+    try:
+        MigrationRunner(benchmark=benchmark, schema=schema).run(wait=wait)
+        return True
+    except Exception as e:
+        logger.error(f"Database migration failed: {e}")
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EMS4DC database migrations')
+    parser.add_argument('--status', action='store_true', help='Show migration status and exit')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='EXPLAIN (ANALYZE) benchmark queries before and after each migration')
+    parser.add_argument('--target', type=int, default=None, help='Highest migration version to apply')
+    parser.add_argument('--schema', default=None, help='Site schema to migrate (default: DB_SCHEMA, else public)')
+    args = parser.parse_args()
+
+    runner = MigrationRunner(benchmark=args.benchmark, schema=args.schema)
+
+    if args.status:
+        for row in runner.status():
+            state = f"applied {row['applied_at']:%Y-%m-%d %H:%M} ({row['duration_ms']:.0f} ms)" \
+                if row['applied_at'] else "pending"
+            print(f"{row['version']:04d}  {row['name']:<40} {state}")
+        return
+
+    applied = runner.run(target=args.target)
+    print(f"Applied {len(applied)} migration(s): {applied}" if applied else "Database schema is up to date")
+
+
+if __name__ == '__main__':
+    setup_logging()
+    main()
@@ -0,0 +1,441 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: pool.py
+@Description: Shared, thread-safe PostgreSQL connection pool used by every EMS4DC service.
+              Provides health-checked connections, retry with exponential backoff,
+              server-side statement timeouts and per-query timing hooks.
+
+              Environment (./conf/.env):
+                  DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+                  DB_POOL_MIN (1), DB_POOL_MAX (10), DB_STATEMENT_TIMEOUT_MS (30000),
+                  DB_CONNECT_TIMEOUT (5), DB_SLOW_QUERY_MS (1000)
+                  DB_SCHEMA (unset) - schema of one site of a multi-site database, searched
+                  before public (see multisite.py)
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import RealDictCursor, execute_batch
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+# Dotenv variables
+from dotenv import load_dotenv
+
+load_dotenv('./conf/.env')
+
+logger = logging.getLogger('ems.db')
+
+# Errors after which the connection is considered broken and the operation may be retried
+RETRYABLE_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+# An OperationalError too, but raised by statement_timeout on a healthy connection: the
+# statement would time out again, so it is neither retried nor a reason to drop the connection
+CANCELED_ERRORS = (psycopg2.extensions.QueryCanceledError,)
+
+
+def _default_application_name() -> str:
+    """'ems-<script>' (e.g. ems-measure), visible in pg_stat_activity."""
+    script = os.path.splitext(os.path.basename(sys.argv[0] if sys.argv else ''))[0]
+    return f"ems-{script}" if script.isidentifier() else 'ems'
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """Connection and pool settings, by default read from the DB_* environment variables."""
+    host: Optional[str] = None
+    port: int = 5432
+    database: Optional[str] = None
+    user: Optional[str] = None
+    password: Optional[str] = None
+    min_connections: int = 1
+    max_connections: int = 10
+    statement_timeout_ms: int = 30000
+    connect_timeout_s: int = 5
+    acquire_timeout_s: float = 30.0
+    health_check_interval_s: float = 30.0
+    retries: int = 3
+    retry_backoff_s: float = 0.5
+    slow_query_ms: float = 1000.0
+    application_name: str = 'ems'
+    schema: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, **overrides) -> 'DatabaseSettings':
+        """Build settings from the environment; keyword arguments override single fields."""
+        settings = cls(
+            host=os.getenv('DB_HOST'),
+            port=int(os.getenv('DB_PORT') or 5432),
+            database=os.getenv('DB_NAME'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('DB_PASSWORD'),
+            min_connections=int(os.getenv('DB_POOL_MIN', 1)),
+            max_connections=int(os.getenv('DB_POOL_MAX', 10)),
+            statement_timeout_ms=int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000)),
+            connect_timeout_s=int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+            slow_query_ms=float(os.getenv('DB_SLOW_QUERY_MS', 1000)),
+            application_name=_default_application_name(),
+            schema=os.getenv('DB_SCHEMA') or None,
+        )
+        return replace(settings, **overrides)
+
+    def connect_kwargs(self) -> dict:
+        """Keyword arguments for psycopg2.connect()."""
+        options = f"-c statement_timeout={int(self.statement_timeout_ms)}"
+        if self.schema:
+            options += f" -c search_path={self.schema},public"
+        return {
+            'host': self.host,
+            'port': self.port,
+            'database': self.database,
+            'user': self.user,
+            'password': self.password,
+            'connect_timeout': self.connect_timeout_s,
+            'application_name': self.application_name,
+            'options': options,
+        }
+
+
+@dataclass
+class QueryEvent:
+    """Passed to every query hook after a statement has finished (or failed)."""
+    query: str
+    duration_ms: float
+    rowcount: int
+    error: Optional[BaseException] = None
+    name: Optional[str] = None
+
+
+QueryHook = Callable[[QueryEvent], None]
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection carrying the bookkeeping the pool needs."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_used = time.monotonic()
+        self.query_hooks: List[QueryHook] = []
+        # Names of server-side prepared statements that exist on this session
+        self.prepared_statements = set()
+
+
+class TimedCursorMixin:
+    """Times execute()/executemany() and reports them to the connection's query hooks."""
+
+    query_name: Optional[str] = None
+
+    def _timed(self, method, query, args):
+        start = time.perf_counter()
+        error = None
+        try:
+            return method(query, args)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            hooks = getattr(self.connection, 'query_hooks', ())
+            if hooks:
+                event = QueryEvent(
+                    query=query if isinstance(query, str) else str(query),
+                    duration_ms=(time.perf_counter() - start) * 1000,
+                    rowcount=self.rowcount,
+                    error=error,
+                    name=self.query_name,
+                )
+                for hook in hooks:
+                    try:
+                        hook(event)
+                    except Exception as hook_error:
+                        logger.debug(f"Query hook failed: {hook_error}")
+
+    def execute(self, query, vars=None):
+        return self._timed(super().execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._timed(super().executemany, query, vars_list)
+
+
+class TimedCursor(TimedCursorMixin, psycopg2.extensions.cursor):
+    pass
+
+
+class TimedRealDictCursor(TimedCursorMixin, RealDictCursor):
+    pass
+
+
+_TIMED_CURSORS = {
+    None: TimedCursor,
+    psycopg2.extensions.cursor: TimedCursor,
+    RealDictCursor: TimedRealDictCursor,
+}
+
+
+def _timed_cursor_factory(cursor_factory):
+    """Return a timing-enabled subclass of the requested cursor class."""
+    if cursor_factory not in _TIMED_CURSORS:
+        _TIMED_CURSORS[cursor_factory] = type(
+            f"Timed{cursor_factory.__name__}", (TimedCursorMixin, cursor_factory), {}
+        )
+    return _TIMED_CURSORS[cursor_factory]
+
+
+class DatabasePool:
+    """Thread-safe connection pool shared by all database users of a process."""
+
+    def __init__(self, settings: DatabaseSettings = None):
+        """
+        Initialize the pool (connections are opened lazily on first use).
+
+        Args:
+            settings: Connection settings (default: DatabaseSettings.from_env())
+        """
+        self.settings = settings or DatabaseSettings.from_env()
+        self.query_hooks: List[QueryHook] = [self._log_slow_query]
+
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.settings.max_connections)
+        self._stats = {'acquired': 0, 'discarded': 0, 'retries': 0, 'health_check_failures': 0}
+
+    # ── Pool lifecycle ────────────────────────────────────────────────────────
+
+    def initialize_pool(self):
+        """Create the underlying pool (retrying with backoff while the database is unavailable)."""
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                return
+            # A pool inherited through fork() shares sockets with the parent - never reuse it
+            self._pool = self._with_retry(
+                lambda: ThreadedConnectionPool(
+                    self.settings.min_connections,
+                    self.settings.max_connections,
+                    connection_factory=PooledConnection,
+                    **self.settings.connect_kwargs()
+                ),
+                'connect'
+            )
+            self._pid = os.getpid()
+            logger.debug(f"Connection pool ready ({self.settings.application_name}, "
+                         f"max {self.settings.max_connections} connections)")
+
+    def close_pool(self):
+        """Close all connections in the pool."""
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.closeall()
+            self._pool = None
+
+    def _with_retry(self, operation, description: str):
+        """Run `operation`, retrying connection-level errors with exponential backoff."""
+        for attempt in range(self.settings.retries + 1):
+            try:
+                return operation()
+            except CANCELED_ERRORS:
+                raise
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.settings.retries:
+                    raise
+                delay = self.settings.retry_backoff_s * (2 ** attempt)
+                self._stats['retries'] += 1
+                logger.warning(f"Database {description} failed ({' '.join(str(e).split())}), "
+                               f"retrying in {delay:.1f}s ({attempt + 1}/{self.settings.retries})")
+                time.sleep(delay)
+
+    # ── Connection checkout ───────────────────────────────────────────────────
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - conn.last_used < self.settings.health_check_interval_s:
+            return True
+        try:
+            with psycopg2.extensions.cursor(conn) as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            self._stats['health_check_failures'] += 1
+            return False
+
+    def _acquire(self) -> PooledConnection:
+        if self._pool is None or self._pid != os.getpid():
+            self.initialize_pool()
+
+        if not self._slots.acquire(timeout=self.settings.acquire_timeout_s):
+            raise PoolError(f"No database connection available within {self.settings.acquire_timeout_s}s")
+
+        try:
+            for _ in range(self.settings.max_connections + 1):
+                conn = self._with_retry(self._pool.getconn, 'connect')
+                if self._is_healthy(conn):
+                    conn.query_hooks = self.query_hooks
+                    self._stats['acquired'] += 1
+                    return conn
+                logger.info("Discarding broken database connection")
+                self._release(conn, discard=True)
+            raise psycopg2.OperationalError("Could not obtain a healthy database connection")
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: PooledConnection, discard: bool = False):
+        discard = discard or conn.closed or \
+            conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+        if discard:
+            self._stats['discarded'] += 1
+        conn.last_used = time.monotonic()
+        try:
+            self._pool.putconn(conn, close=discard)
+        except PoolError:
+            # Pool was closed or re-created (fork) while the connection was checked out
+            conn.close()
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Get a pooled connection as context manager. Commits on success, rolls back on error.
+
+        Yields:
+            PooledConnection: Database connection
+        """
+        conn = self._acquire()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            broken = isinstance(e, RETRYABLE_ERRORS) and not isinstance(e, CANCELED_ERRORS)
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            raise
+        finally:
+            self._release(conn, discard=broken)
+            self._slots.release()
+
+    @contextmanager
+    def get_cursor(self, cursor_factory=RealDictCursor, name: str = None):
+        """
+        Get a timed cursor from a pooled connection.
+
+        Args:
+            cursor_factory: Type of cursor to create (RealDictCursor by default, None for tuples)
+            name: Optional query name reported to the query hooks
+
+        Yields:
+            psycopg2.cursor: Database cursor
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor(cursor_factory=_timed_cursor_factory(cursor_factory))
+            cursor.query_name = name
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    # ── Convenience helpers ───────────────────────────────────────────────────
+
+    def execute_query(self, query: str, params: tuple = None, cursor_factory=RealDictCursor,
+                      retry: bool = True, name: str = None):
+        """
+        Execute a query and return its rows (None for statements without a result set).
+
+        Args:
+            query: SQL statement
+            params: Statement parameters
+            cursor_factory: Row type (RealDictCursor by default)
+            retry: Retry on a broken connection. Only use for idempotent statements.
+            name: Optional query name reported to the query hooks
+        """
+        def run():
+            with self.get_cursor(cursor_factory, name=name) as cursor:
+                cursor.execute(query, params)
+                if cursor.description:
+                    return cursor.fetchall()
+                return None
+
+        if retry:
+            return self._with_retry(run, 'query')
+        return run()
+
+    def execute_many(self, query: str, params_list: list, page_size: int = 500, name: str = None):
+        """Execute a statement for every parameter tuple, batching round trips."""
+        with self.get_cursor(None, name=name) as cursor:
+            execute_batch(cursor, query, params_list, page_size=page_size)
+
+    def health_check(self) -> bool:
+        """Return True if the database answers a trivial query."""
+        try:
+            self.execute_query("SELECT 1", cursor_factory=None, retry=False)
+            return True
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            return False
+
+    # ── Query hooks ───────────────────────────────────────────────────────────
+
+    def add_query_hook(self, hook: QueryHook):
+        """Register a callable that receives a QueryEvent after every statement."""
+        if hook not in self.query_hooks:
+            self.query_hooks.append(hook)
+
+    def remove_query_hook(self, hook: QueryHook):
+        if hook in self.query_hooks:
+            self.query_hooks.remove(hook)
+
+    def _log_slow_query(self, event: QueryEvent):
+        if event.duration_ms >= self.settings.slow_query_ms:
+            label = event.name or ' '.join(event.query.split())[:120]
+            logger.warning(f"Slow query ({event.duration_ms:.0f} ms): {label}")
+
+    def stats(self) -> Dict[str, int]:
+        """Pool counters (connections acquired, discarded, retries, failed health checks)."""
+        return dict(self._stats)
+
+
+# Global pool instance (singleton pattern)
+_pool_instance: Optional[DatabasePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> DatabasePool:
+    """Get or create the process-wide database pool."""
+    global _pool_instance
+    if _pool_instance is None:
+        with _pool_lock:
+            if _pool_instance is None:
+                _pool_instance = DatabasePool()
+    return _pool_instance
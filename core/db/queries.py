@@ -0,0 +1,386 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: queries.py
+@Description: Registry of the hot-path queries. Every named query is PREPAREd once per pooled
+              connection and then run with EXECUTE and bound parameters (lists are bound as
+              arrays and matched with `= ANY($n)`), so Postgres neither re-parses nor, once it
+              settles on a generic plan, re-plans them. Latency is recorded per named query and
+              planning time is sampled with EXPLAIN (SUMMARY) EXECUTE.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Sequence, Tuple
+
+from psycopg2.extras import RealDictCursor
+
+from db.pool import DatabasePool, get_pool
+
+logger = logging.getLogger('ems.db.queries')
+
+# Planning time is sampled on the first call and then every N calls per named query
+PLAN_SAMPLE_EVERY = 100
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    """A server-side prepared statement. `sql` uses $1..$n placeholders typed by `arg_types`."""
+    name: str
+    arg_types: Tuple[str, ...]
+    sql: str
+
+
+@dataclass
+class QueryStats:
+    calls: int = 0
+    errors: int = 0
+    prepares: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    plan_samples: int = 0
+    total_plan_ms: float = 0.0
+    last_plan_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    @property
+    def mean_plan_ms(self) -> float:
+        return self.total_plan_ms / self.plan_samples if self.plan_samples else 0.0
+
+
+QUERIES: Dict[str, NamedQuery] = {}
+_stats: Dict[str, QueryStats] = {}
+_stats_lock = threading.Lock()
+
+
+def register_query(name: str, arg_types: Sequence[str], sql: str) -> NamedQuery:
+    """Add a query to the registry. Names must be valid SQL identifiers."""
+    if not name.isidentifier():
+        raise ValueError(f"Invalid query name: {name}")
+    if name in QUERIES:
+        raise ValueError(f"Query {name} is already registered")
+    query = NamedQuery(name=name, arg_types=tuple(arg_types), sql=sql)
+    QUERIES[name] = query
+    return query
+
+
+# ── Hot-path queries ──────────────────────────────────────────────────────────
+
+# Every parameter with at least one 'ok' sample - a loose index scan over
+# idx_measurements_ok_parameter_time_covering instead of a DISTINCT over the table.
+register_query('distinct_parameters', (), """
+    WITH RECURSIVE params AS (
+        (SELECT parameter FROM measurements WHERE quality = 'ok' ORDER BY parameter LIMIT 1)
+        UNION ALL
+        SELECT (SELECT m.parameter FROM measurements m
+                WHERE m.quality = 'ok' AND m.parameter > p.parameter
+                ORDER BY m.parameter LIMIT 1)
+        FROM params p
+        WHERE p.parameter IS NOT NULL
+    )
+    SELECT parameter FROM params WHERE parameter IS NOT NULL
+""")
+
+# Latest 'ok' value of each requested parameter (one index probe per parameter)
+register_query('latest_values', ('text[]',), """
+    SELECT p.parameter,
+           ROUND(m.value::numeric, 4)::float8 AS latest_value,
+           m.unit,
+           m.time AS measurement_time
+    FROM unnest($1::text[]) AS p(parameter)
+    CROSS JOIN LATERAL (
+        SELECT value, unit, time FROM measurements
+        WHERE parameter = p.parameter AND quality = 'ok'
+        ORDER BY time DESC
+        LIMIT 1
+    ) m
+    ORDER BY p.parameter
+""")
+
+# Averages over the most recent 15-minute bucket that has data for the requested parameters
+register_query('interval_averages', ('text[]',), """
+    WITH latest AS (
+        SELECT MAX(m.time) AS latest_time
+        FROM unnest($1::text[]) AS p(parameter)
+        CROSS JOIN LATERAL (
+            SELECT time FROM measurements
+            WHERE parameter = p.parameter AND quality = 'ok'
+            ORDER BY time DESC
+            LIMIT 1
+        ) m
+    ),
+    interval_bounds AS (
+        SELECT interval_start, interval_start + INTERVAL '15 minutes' AS interval_end
+        FROM (
+            SELECT DATE_TRUNC('hour', latest_time) +
+                   INTERVAL '15 min' * FLOOR(EXTRACT(MINUTE FROM latest_time) / 15) AS interval_start
+            FROM latest
+        ) l
+    )
+    SELECT m.parameter,
+           ROUND(AVG(m.value)::numeric, 4)::float8 AS average_value,
+           m.unit,
+           COUNT(*) AS sample_count,
+           MIN(ib.interval_start) AS interval_start,
+           MIN(ib.interval_end) AS interval_end
+    FROM interval_bounds ib
+    JOIN measurements m
+      ON m.parameter = ANY($1)
+     AND m.time >= ib.interval_start
+     AND m.time < ib.interval_end
+     AND m.quality = 'ok'
+    GROUP BY m.parameter, m.unit
+    ORDER BY m.parameter
+""")
+
+# Everything the optimizer reads, in one round trip: the latest sample of every parameter in
+# $1 (15-minute averages) or $2 (latest values) and, for $1, the average over the most recent
+# 15-minute bucket. Each row carries its own sample time so freshness is checked per parameter.
+register_query('optimizer_inputs', ('text[]', 'text[]'), """
+    WITH requested AS (
+        SELECT parameter, bool_or(averaged) AS averaged, bool_or(NOT averaged) AS recent
+        FROM (
+            SELECT unnest($1::text[]), true
+            UNION ALL
+            SELECT unnest($2::text[]), false
+        ) r(parameter, averaged)
+        GROUP BY parameter
+    ),
+    latest AS (
+        SELECT r.parameter, r.averaged, r.recent, m.value, m.unit, m.time
+        FROM requested r
+        CROSS JOIN LATERAL (
+            SELECT value, unit, time FROM measurements
+            WHERE parameter = r.parameter AND quality = 'ok'
+            ORDER BY time DESC
+            LIMIT 1
+        ) m
+    ),
+    bucket AS (
+        SELECT DATE_TRUNC('hour', MAX(time)) +
+               INTERVAL '15 min' * FLOOR(EXTRACT(MINUTE FROM MAX(time)) / 15) AS interval_start
+        FROM latest
+        WHERE averaged
+    )
+    SELECT l.parameter,
+           l.averaged,
+           l.recent,
+           ROUND(l.value::numeric, 4)::float8 AS latest_value,
+           l.unit,
+           l.time AS measurement_time,
+           a.average_value,
+           COALESCE(a.sample_count, 0) AS sample_count,
+           b.interval_start,
+           b.interval_start + INTERVAL '15 minutes' AS interval_end
+    FROM latest l
+    CROSS JOIN bucket b
+    LEFT JOIN LATERAL (
+        SELECT ROUND(AVG(value)::numeric, 4)::float8 AS average_value, COUNT(*) AS sample_count
+        FROM measurements
+        WHERE l.averaged
+          AND parameter = l.parameter
+          AND quality = 'ok'
+          AND time >= b.interval_start
+          AND time < b.interval_start + INTERVAL '15 minutes'
+    ) a ON true
+    ORDER BY l.parameter
+""")
+
+# Points of the most recent forecast run of each requested asset within [$2, $3]
+register_query('horizon_forecasts', ('text[]', 'timestamptz', 'timestamptz'), """
+    SELECT a.asset_key,
+           EXTRACT(EPOCH FROM f.horizon_timestamp)::float8 AS horizon_epoch,
+           f.predicted_power
+    FROM unnest($1::text[]) AS a(asset_key)
+    CROSS JOIN LATERAL (
+        SELECT MAX(forecast_timestamp) AS forecast_timestamp
+        FROM forecasts
+        WHERE asset_key = a.asset_key
+    ) latest
+    JOIN forecasts f
+      ON f.asset_key = a.asset_key
+     AND f.forecast_timestamp = latest.forecast_timestamp
+     AND f.horizon_timestamp >= $2
+     AND f.horizon_timestamp <= $3
+    ORDER BY a.asset_key, f.horizon_timestamp
+""")
+
+# Training / forecasting history of one parameter
+register_query('forecast_history', ('text', 'timestamptz', 'timestamptz'), """
+    SELECT time AS timestamp, value AS power
+    FROM measurements
+    WHERE parameter = $1
+      AND time >= $2
+      AND time <= $3
+      AND quality = 'ok'
+    ORDER BY time
+""")
+
+# Metrics calculation window; NULL filters mean "all"
+register_query('metric_window', ('timestamptz', 'timestamptz', 'text[]', 'text[]', 'text'), """
+    SELECT id, measurement_id, time, parameter, value, unit, quality, asset_key
+    FROM measurements
+    WHERE time >= $1 AND time <= $2
+      AND ($3::text[] IS NULL OR asset_key = ANY($3))
+      AND ($4::text[] IS NULL OR parameter = ANY($4))
+      AND ($5::text IS NULL OR quality = $5)
+    ORDER BY time, asset_key, parameter
+""")
+
+
+# Historical replay: per parameter and 15-minute interval of [$2, $3) the average, the sample
+# count and the last sample, in one pass over the period (optimization/replay.py)
+register_query('interval_history', ('text[]', 'timestamptz', 'timestamptz'), """
+    SELECT parameter,
+           DATE_TRUNC('hour', time) + INTERVAL '15 min' * FLOOR(EXTRACT(MINUTE FROM time) / 15) AS interval_start,
+           ROUND(AVG(value)::numeric, 4)::float8 AS average_value,
+           COUNT(*) AS sample_count,
+           ROUND((ARRAY_AGG(value ORDER BY time DESC))[1]::numeric, 4)::float8 AS latest_value,
+           MAX(time) AS latest_time
+    FROM measurements
+    WHERE parameter = ANY($1)
+      AND quality = 'ok'
+      AND time >= $2
+      AND time < $3
+    GROUP BY parameter, interval_start
+    ORDER BY interval_start, parameter
+""")
+
+# Timings and stats of the most recent optimization cycles (idx_optimization_cycles_time);
+# NULL mode means "all"
+register_query('recent_cycles', ('text', 'int'), """
+    SELECT time, mode, status, quality, fetch_ms, solve_ms, apply_ms, total_ms, stats
+    FROM optimization_cycles
+    WHERE ($1::text IS NULL OR mode = $1)
+    ORDER BY time DESC
+    LIMIT $2
+""")
+
+# Recorded inputs of the most recent successful cycles, for solving them again offline;
+# NULL mode means "all"
+register_query('cycle_inputs', ('text', 'int'), """
+    SELECT time, mode, objective, inputs
+    FROM optimization_cycles
+    WHERE status = 'success'
+      AND ($1::text IS NULL OR mode = $1)
+    ORDER BY time DESC
+    LIMIT $2
+""")
+
+# ── Execution ─────────────────────────────────────────────────────────────────
+
+def _record(name: str, duration_ms: float = None, error: bool = False, prepared: bool = False,
+            plan_ms: float = None):
+    with _stats_lock:
+        stats = _stats.setdefault(name, QueryStats())
+        if prepared:
+            stats.prepares += 1
+        if error:
+            stats.errors += 1
+        if duration_ms is not None:
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.last_ms = duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+        if plan_ms is not None:
+            stats.plan_samples += 1
+            stats.total_plan_ms += plan_ms
+            stats.last_plan_ms = plan_ms
+
+
+def _should_sample_plan(name: str) -> bool:
+    with _stats_lock:
+        calls = _stats[name].calls if name in _stats else 0
+    return calls % PLAN_SAMPLE_EVERY == 0
+
+
+def run_query(name: str, params: Sequence = (), db: DatabasePool = None,
+              cursor_factory=RealDictCursor) -> List:
+    """
+    Execute a registered query as a prepared statement.
+
+    Args:
+        name: Registered query name
+        params: Bound parameters, in $1..$n order (Python lists are sent as arrays)
+        db: Connection pool (default: the shared pool)
+        cursor_factory: Row type (RealDictCursor by default)
+
+    Returns:
+        List of result rows
+    """
+    query = QUERIES[name]
+    if len(params) != len(query.arg_types):
+        raise ValueError(f"Query {name} expects {len(query.arg_types)} parameters, got {len(params)}")
+
+    db = db or get_pool()
+    execute_sql = f"EXECUTE {name}" + (f" ({', '.join(['%s'] * len(params))})" if params else "")
+    sample_plan = _should_sample_plan(name)
+
+    with db.get_cursor(cursor_factory, name=name) as cursor:
+        conn = cursor.connection
+        if name not in conn.prepared_statements:
+            arg_list = f" ({', '.join(query.arg_types)})" if query.arg_types else ""
+            cursor.execute(f"PREPARE {name}{arg_list} AS {query.sql}")
+            conn.prepared_statements.add(name)
+            _record(name, prepared=True)
+
+        if sample_plan:
+            cursor.execute(f"EXPLAIN (SUMMARY ON, FORMAT JSON) {execute_sql}", params)
+            explain = cursor.fetchone()
+            plan = explain['QUERY PLAN'] if isinstance(explain, dict) else explain[0]
+            _record(name, plan_ms=plan[0].get('Planning Time', 0.0))
+
+        start = time.perf_counter()
+        try:
+            cursor.execute(execute_sql, params)
+            rows = cursor.fetchall()
+        except Exception:
+            _record(name, error=True)
+            raise
+        _record(name, duration_ms=(time.perf_counter() - start) * 1000)
+
+    return rows
+
+
+def get_query_stats() -> Dict[str, dict]:
+    """Per named query: calls, errors, prepares, latency (mean/max/last ms) and sampled planning time."""
+    with _stats_lock:
+        return {
+            name: {**asdict(stats), 'mean_ms': round(stats.mean_ms, 3), 'mean_plan_ms': round(stats.mean_plan_ms, 3)}
+            for name, stats in _stats.items()
+        }
+
+
+def log_query_stats(level: int = logging.INFO):
+    """Log a one-line summary per named query."""
+    for name, stats in sorted(get_query_stats().items()):
+        logger.log(level, f"{name}: {stats['calls']} calls, mean {stats['mean_ms']:.2f} ms, "
+                          f"max {stats['max_ms']:.2f} ms, planning {stats['mean_plan_ms']:.3f} ms, "
+                          f"{stats['prepares']} prepares, {stats['errors']} errors")
@@ -0,0 +1,143 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: writer.py
+@Description: Background writer - a bounded queue drained by a daemon thread, so that
+              bookkeeping writes (cycle records, logs) never sit on the control loop.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+from db.pool import DatabasePool, get_pool
+
+logger = logging.getLogger('ems.db.writer')
+
+
+class BackgroundWriter:
+    """
+    Executes submitted statements on a daemon thread through the shared pool.
+
+    Statements are retried on connection errors by the pool, so they must be idempotent
+    (e.g. INSERT ... ON CONFLICT DO NOTHING). When the queue is full, new writes are
+    dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, db: DatabasePool = None, max_queue: int = 1000, name: str = 'ems-db-writer'):
+        """
+        Args:
+            db: Connection pool (default: the shared pool)
+            max_queue: Maximum number of pending statements
+            name: Thread name
+        """
+        self.db = db or get_pool()
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._stats = {'written': 0, 'failed': 0, 'dropped': 0}
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def submit(self, query: str, params: tuple = None, name: str = None) -> bool:
+        """
+        Queue a statement for execution.
+
+        Args:
+            query: SQL statement
+            params: Statement parameters
+            name: Query name reported to the query hooks and in error logs
+
+        Returns:
+            bool: False if the queue was full and the write was dropped
+        """
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((query, params, name))
+            return True
+        except queue.Full:
+            self._count('dropped')
+            logger.error(f"Write queue full ({self._queue.maxsize}), dropped {name or 'statement'}")
+            return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                query, params, name = item
+                try:
+                    self.db.execute_query(query, params, cursor_factory=None, name=name)
+                    self._count('written')
+                except Exception as e:
+                    self._count('failed')
+                    logger.error(f"Background write {name or ''} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every queued statement has been executed.
+
+        Returns:
+            bool: True if the queue drained within `timeout` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Flush pending writes and stop the thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        if not self.flush(timeout):
+            logger.warning(f"{self._queue.qsize()} pending writes not flushed within {timeout}s")
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of written, failed and dropped statements plus the current queue depth."""
+        with self._stats_lock:
+            return {**self._stats, 'pending': self._queue.qsize()}
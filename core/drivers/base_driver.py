@@ -16,18 +16,24 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 @File: base_driver.py
-@Description: # TODO: Add desc
+@Description: Base class of the droop drivers and the parsed configuration they share.
+
+              DriverConfig indexes config.json and modbus.json once per site, so every
+              driver built from it (see drivers.registry) reads its device parameters and
+              write-register map from memory instead of re-parsing the files.
 
 @Created: 3rd February 2026
-@Last Modified: 16 February 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
 '''
 
 
+import json
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
 @dataclass
@@ -39,39 +45,126 @@ class RegisterMapping:
     offset: float = 0.0
     unit: str = ""
 
+
+class DriverConfig:
+    """
+    Site configuration (config.json) and Modbus map (modbus.json), parsed once and
+    shared by all droop drivers of a site.
+    """
+
+    def __init__(self, site_config: Dict[str, Any], modbus_config: Dict[str, Any]):
+        """
+        Args:
+            site_config: Parsed config.json ('devices' and 'generalSiteConfig')
+            modbus_config: Parsed modbus.json ('devices' with 'assetKey' and 'parameters')
+        """
+        self.site_config = site_config
+        self.devices: Dict[str, Dict[str, Any]] = {
+            device['id']: device for device in site_config.get('devices', []) if 'id' in device
+        }
+        self.modbus_devices: Dict[str, Dict[str, Any]] = {
+            device['assetKey']: device for device in modbus_config.get('devices', []) if 'assetKey' in device
+        }
+        self._write_registers: Dict[str, Dict[str, RegisterMapping]] = {}
+
+    @classmethod
+    def from_files(cls, config_path: str = './conf/config.json',
+                   modbus_path: str = './conf/modbus.json') -> 'DriverConfig':
+        """Parse config.json and modbus.json from disk (for scripts outside the Coordinator)."""
+        with open(config_path, 'r') as f:
+            site_config = json.load(f)
+        with open(modbus_path, 'r') as f:
+            modbus_config = json.load(f)
+        return cls(site_config, modbus_config)
+
+    def device_parameters(self, device_id: str) -> Dict[str, Any]:
+        """Return the 'parameters' of a device in config.json (empty if it is not configured)."""
+        device = self.devices.get(device_id)
+        return device.get('parameters', {}) if device else {}
+
+    def write_registers(self, asset_key: str) -> Dict[str, RegisterMapping]:
+        """
+        Return the write-mode registers of a device in modbus.json, keyed by parameter name.
+
+        The map is built on the first call for each device and reused afterwards.
+        """
+        registers = self._write_registers.get(asset_key)
+        if registers is None:
+            registers = {}
+            for param in self.modbus_devices.get(asset_key, {}).get('parameters', []):
+                if param.get('mode') == 'write':
+                    registers[param['name']] = RegisterMapping(
+                        address=param['address'],
+                        name=param['name'],
+                        scale_factor=param.get('scaleFactor', 1),
+                        offset=param.get('offset', 0.0),
+                        unit=param.get('unit', ''),
+                    )
+            self._write_registers[asset_key] = registers
+        return registers
+
+
 class BaseDeviceDriver(ABC):
     """Abstract base class for all device drivers"""
-    
-    def __init__(self, device_id: str, config: Dict[str, Any]):
+
+    # Device 'type' in config.json the driver is written for
+    DEVICE_TYPE: str = ""
+
+    def __init__(self, device_id: str, config: DriverConfig):
+        """
+        Args:
+            device_id: Device 'id' in config.json, which is also its 'assetKey' in modbus.json
+            config: Parsed configuration shared by all drivers of the site
+        """
         self.device_id = device_id
         self.config = config
-        self._register_map: Dict[str, RegisterMapping] = {}
-        self._initialize_registers()
-    
-    @abstractmethod
-    def _initialize_registers(self) -> None:
-        """Initialize device-specific register mappings"""
-        pass
-    
+        self.logger = logging.getLogger(f'ems.driver.{device_id}')
+
+        if device_id not in config.devices:
+            self.logger.warning(f"Device with ID '{device_id}' not found in config")
+        self._device_config: Dict[str, Any] = config.device_parameters(device_id)
+        self._register_map: Dict[str, RegisterMapping] = config.write_registers(device_id)
+
+    def get_device_config(self) -> Dict[str, Any]:
+        """Get the loaded device configuration"""
+        return self._device_config.copy()
+
+    def get_available_registers(self) -> Dict[str, RegisterMapping]:
+        """Get all available register mappings"""
+        return self._register_map.copy()
+
     @abstractmethod
-    def transform_droop_curve(self, optimizer_data: Dict[str, float]) -> Dict[int, Any]:
+    def transform_droop_curve(self, optimizer_data: Dict[str, float],
+                              config_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Transforms droop curve based on the output from the optimizer
         
         Args:
             optimizer_data: Raw data from optimizer (e.g., {'pv': 1500, 'battery': -500})
+            config_data: Optional override for device configuration. If None, uses loaded config
         
         Returns:
             Dictionary of "Write" registers with asigned values to those registers so that those values can be written on the devices' registers.
         """
         pass
-        
-    @abstractmethod
+
     def validate_setpoints(self, setpoints: Dict[str, float]) -> bool:
-        """Validate setpoints against device limits"""
-        pass
-    
-    
+        """Validate setpoints are within device limits"""
+        config = self._device_config
+
+        if 'power' in setpoints:
+            max_power = config.get('nominalPower', float('inf'))
+            if not -max_power <= setpoints['power'] <= max_power:
+                return False
+
+        if 'voltage' in setpoints:
+            min_voltage = config.get('minVoltage', 0)
+            max_voltage = config.get('maxVoltage', float('inf'))
+            if not min_voltage <= setpoints['voltage'] <= max_voltage:
+                return False
+
+        return True
+
     def apply_setpoints(self, setpoints: Dict[str, float], modbus_writer) -> Dict[str, bool]:
         """
         Apply calculated setpoints to the device via Modbus
@@ -91,4 +184,4 @@ class BaseDeviceDriver(ABC):
         # Write to Modbus
         results = modbus_writer.write_setpoints(self.device_id, setpoints)
         
-        return results
\ No newline at end of file
+        return results
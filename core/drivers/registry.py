@@ -0,0 +1,149 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+@File: registry.py
+@Description: Maps device types to droop driver classes and builds one driver per device.
+
+              The built-in drivers are listed in DRIVERS under a short name. Other packages
+              can add drivers through the 'ems4dc.droop_drivers' entry-point group, and a site
+              picks the driver of each device type in generalSiteConfig.droopDrivers:
+
+                  "droopDrivers": {"BESS": "bess", "PV": null,
+                                   "BI_EV": "my_drivers.v2g:V2GDriver"}
+
+              A value is a DRIVERS name, an entry-point name or "module:Class"; null turns
+              droop control off for that type. Types that are not listed keep the defaults
+              in DEFAULT_ASSIGNMENTS.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import importlib
+import logging
+from importlib.metadata import entry_points
+from typing import Dict, Any, Optional, Type
+
+from .base_driver import BaseDeviceDriver, DriverConfig
+from .afe_driver import ActiveFrontEndDriver
+from .bess_driver import BESSDriver
+from .pv_driver import PVDriver
+from .uniev_driver import UniEVDriver
+
+logger = logging.getLogger('ems.drivers')
+
+ENTRY_POINT_GROUP = 'ems4dc.droop_drivers'
+
+DRIVERS: Dict[str, Type[BaseDeviceDriver]] = {
+    'afe': ActiveFrontEndDriver,
+    'bess': BESSDriver,
+    'pv': PVDriver,
+    'uniev': UniEVDriver,
+}
+
+# Device types that get a droop driver when generalSiteConfig.droopDrivers does not say otherwise
+DEFAULT_ASSIGNMENTS: Dict[str, Optional[str]] = {
+    'AFE': 'afe',
+    'BESS': 'bess',
+}
+
+
+def resolve_driver(name: str) -> Type[BaseDeviceDriver]:
+    """
+    Resolve a driver name to its class.
+
+    Args:
+        name: Name in DRIVERS, name of an entry point in ENTRY_POINT_GROUP, or "module:Class"
+
+    Returns:
+        The driver class
+
+    Raises:
+        ValueError: If the name cannot be resolved to a BaseDeviceDriver subclass
+    """
+    if name in DRIVERS:
+        return DRIVERS[name]
+
+    driver_cls = None
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name == name:
+            driver_cls = entry_point.load()
+            break
+    if driver_cls is None and ':' in name:
+        module_name, _, class_name = name.partition(':')
+        driver_cls = getattr(importlib.import_module(module_name), class_name, None)
+
+    if not (isinstance(driver_cls, type) and issubclass(driver_cls, BaseDeviceDriver)):
+        raise ValueError(f"Unknown droop driver: {name}. Built-in drivers: {list(DRIVERS)}")
+    return driver_cls
+
+
+def driver_assignments(site_config: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Return the driver name of every device type (None: no droop control for the type)."""
+    assignments = dict(DEFAULT_ASSIGNMENTS)
+    assignments.update(site_config.get('generalSiteConfig', {}).get('droopDrivers') or {})
+    return assignments
+
+
+def build_drivers(config: DriverConfig) -> Dict[str, BaseDeviceDriver]:
+    """
+    Build one driver per device whose type has a driver assigned.
+
+    Each driver class is resolved once per type. A type whose driver cannot be resolved,
+    or a device whose driver fails to initialise, is logged and left out; the other
+    devices still get their drivers.
+
+    Args:
+        config: Parsed configuration of the site, shared by all drivers
+
+    Returns:
+        Dictionary mapping device id (asset key) to its driver
+    """
+    assignments = driver_assignments(config.site_config)
+    classes: Dict[str, Optional[Type[BaseDeviceDriver]]] = {}
+    drivers: Dict[str, BaseDeviceDriver] = {}
+
+    for device_id, device in config.devices.items():
+        device_type = device.get('type')
+        name = assignments.get(device_type)
+        if not name:
+            continue
+
+        if device_type not in classes:
+            try:
+                classes[device_type] = resolve_driver(name)
+            except Exception as e:
+                logger.error(f"Failed to load droop driver '{name}' for type '{device_type}': {e}")
+                classes[device_type] = None
+        driver_cls = classes[device_type]
+        if driver_cls is None:
+            continue
+
+        if device_id not in config.modbus_devices:
+            logger.warning(f"Device '{device_id}' has no entry in modbus.json - its droop registers cannot be written")
+        try:
+            drivers[device_id] = driver_cls(device_id=device_id, config=config)
+            logger.debug(f"Initialized droop driver '{driver_cls.__name__}' for '{device_id}'")
+        except Exception as e:
+            logger.error(f"Failed to initialize droop driver '{driver_cls.__name__}' for '{device_id}': {e}")
+
+    return drivers
@@ -19,116 +19,25 @@ limitations under the License.
 @Description: # TODO: Add desc
 
 @Created: 3rd February 2026
-@Last Modified: 05 March 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
 '''
 
 
-import json
-import os
-from .base_driver import BaseDeviceDriver, RegisterMapping
+from .base_driver import BaseDeviceDriver
 from typing import Dict, Any, Optional
 
-MODBUS_CONFIG_PATH = './../conf/modbus.json'
-DEVICE_CONFIG_PATH = './../conf/config.json'
-
+# Register the driver for a device type in config.json, either under a short name in
+# drivers.registry DRIVERS or per site as "module:Class" in generalSiteConfig.droopDrivers:
+#   "droopDrivers": {"device_x": "drivers.template_driver:TemplateDriver"}
+# Every device of that type then gets its own driver instance. The device parameters
+# (self._device_config) and write registers (self._register_map) are already loaded.
 class TemplateDriver(BaseDeviceDriver):
     """Driver for Device X"""
-    
-    def __init__(self, device_id: str, config: str):
-        """Initialize the driver and load device configuration"""
-        super().__init__(device_id, config)
-        self._device_config = self._load_device_config()
-        self.DEVICE_TYPE = "device_x"
-    
-    def _load_device_config(self, asset_key: str = "assetUniqueID") -> Dict[str, Any]:
-        """
-        Load device configuration from config.json for a specific asset
-        
-        Args:
-            asset_key: The device ID to extract configuration for (default: "assetUniqueID")
-            
-        Returns:
-            Dictionary containing the device parameters, or empty dict if not found
-        """
-        config_path = os.path.join(os.path.dirname(__file__), DEVICE_CONFIG_PATH)
-        
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-        except FileNotFoundError:
-            print(f"Warning: Config file not found at {config_path}")
-            return {}
-        except json.JSONDecodeError:
-            print(f"Warning: Invalid JSON in config file at {config_path}")
-            return {}
-        
-        # Extract device configuration by asset key
-        devices = config.get('devices', [])
-        
-        # Find the device with matching ID
-        for device in devices:
-            if device.get('id') == asset_key:
-                return device.get('parameters', {})
-        
-        # If device not found, print warning and return empty dict
-        print(f"Warning: Device with ID '{asset_key}' not found in config")
-        return {}
-    
-    def get_device_config(self) -> Dict[str, Any]:
-        """Get the loaded device configuration"""
-        return self._device_config.copy()
-    
-    def _load_write_parameters(self) -> Dict[str, RegisterMapping]:
-        """Load write-mode parameters from modbus.json"""
-        config_path = os.path.join(os.path.dirname(__file__), MODBUS_CONFIG_PATH)
-        
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-        except FileNotFoundError:
-            print(f"Warning: Config file not found at {config_path}")
-            return {}
-        except json.JSONDecodeError:
-            print(f"Warning: Invalid JSON in config file at {config_path}")
-            return {}
-        
-        register_mappings = {}
-        
-        # Find the Device X in the config
-        for device in config.get('devices', []):
-            if device.get('assetKey') == 'assetUniqueID':
-                # Extract write-mode parameters
-                for param in device.get('parameters', []):
-                    if param.get('mode') == 'write':
-                        # Create a key from the parameter name
-                        key = param['name']
-                        
-                        # Create RegisterMapping from parameter config
-                        register_mappings[key] = RegisterMapping(
-                            address=param['address'],
-                            name=param['name'],
-                            scale_factor=param.get('scaleFactor', 1),
-                            unit=param.get('unit', ''),
-                            # more fields can be added as needed based on RegisterMapping class
-                        )
-                break
-        
-        return register_mappings
-    
-    def _initialize_registers(self) -> None:
-        """Initialize registers from modbus.json config"""
-        # Load write-mode parameters from config file
-        loaded_registers = self._load_write_parameters()
-        
-        # Initialize with loaded registers
-        self._register_map = loaded_registers
-        
-    def get_available_registers(self) -> Dict[str, RegisterMapping]:
-        """Get all available register mappings"""
-        return self._register_map.copy()
+
+    DEVICE_TYPE = "device_x"
     
     def transform_droop_curve(self, optimizer_data: Dict[str, float], config_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
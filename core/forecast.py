@@ -19,7 +19,7 @@ limitations under the License.
 @Description: Scheduler module for orchestrating periodic forecast generation and model retraining.
 
 @Created: 08 February 2026
-@Last Modified: 05 March 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -35,11 +35,13 @@ import signal
 import sys
 
 from forecast_utils.db_config import get_db
+from db.queries import log_query_stats
 from forecast_utils.data_validator import DataValidator
 from forecast_utils.forecast_generator import ForecastGenerator
 from forecast_utils.model_trainer import ModelTrainer
 
 from utils.logging_utils import setup_logging
+from db.migrator import run_migrations
 from utils.time_utils import current_time
 setup_logging()
 logger = logging.getLogger('forecast')
@@ -213,6 +215,7 @@ class ForecastScheduler:
         
         # Close database connections
         try:
+            log_query_stats()
             self.db.close_pool()
             logger.info("Database connections closed")
         except Exception as e:
@@ -308,6 +311,8 @@ def main():
     )
     
     args = parser.parse_args()
+
+    run_migrations()
     
     if args.mode == 'once':
         # Run forecast generation once and exit
@@ -16,10 +16,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 @File: db_config.py
-@Description: Database configuration and connection management for EMS forecasting system.
+@Description: Database access for the EMS forecasting system (backed by the shared pool in db/pool.py).
 
 @Created: 08 February 2026
-@Last Modified: 01 March 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -27,137 +27,21 @@ limitations under the License.
 
 
 import os
-from typing import Optional
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
-from contextlib import contextmanager
-
-# Dotenv variables
-from dotenv import load_dotenv
-import os
-
-load_dotenv('./../conf/.env')
-
-DB_USER = os.getenv('DB_USER')
-DB_PASSWORD = os.getenv('DB_PASSWORD')
-DB_HOST = os.getenv('DB_HOST')
-DB_PORT = os.getenv('DB_PORT')
-DB_NAME = os.getenv('DB_NAME')
-
-
-class DatabaseConfig:
-    """Database configuration and connection pool management."""
-    
-    def __init__(
-        self,
-        host: str = None,
-        port: int = None,
-        database: str = None,
-        user: str = None,
-        password: str = None,
-        min_conn: int = 1,
-        max_conn: int = 10
-    ):
-        """
-        Initialize database configuration.
-        
-        Args:
-            host: Database host (default from env: DB_HOST or 'localhost')
-            port: Database port (default from env: DB_PORT or 5432)
-            database: Database name (default from env: DB_NAME or 'ems-db')
-            user: Database user (default from env: DB_USER or 'postgres')
-            password: Database password (default from env: DB_PASSWORD)
-            min_conn: Minimum connections in pool
-            max_conn: Maximum connections in pool
-        """
-        self.host = host or DB_HOST
-        self.port = port or int(DB_PORT)
-        self.database = database or DB_NAME
-        self.user = user or DB_USER
-        self.password = password or DB_PASSWORD
-        
-        self._pool: Optional[SimpleConnectionPool] = None
-        self.min_conn = min_conn
-        self.max_conn = max_conn
-    
-    def initialize_pool(self):
-        """Initialize connection pool."""
-        if self._pool is None:
-            self._pool = SimpleConnectionPool(
-                self.min_conn,
-                self.max_conn,
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-    
-    def close_pool(self):
-        """Close all connections in pool."""
-        if self._pool is not None:
-            self._pool.closeall()
-            self._pool = None
-    
-    @contextmanager
-    def get_connection(self):
-        """
-        Get a connection from the pool as context manager.
-        
-        Yields:
-            psycopg2.connection: Database connection
-        """
-        if self._pool is None:
-            self.initialize_pool()
-        
-        conn = self._pool.getconn()
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            self._pool.putconn(conn)
-    
-    @contextmanager
-    def get_cursor(self, cursor_factory=RealDictCursor):
-        """
-        Get a cursor from a pooled connection.
-        
-        Args:
-            cursor_factory: Type of cursor to create
-            
-        Yields:
-            psycopg2.cursor: Database cursor
-        """
-        with self.get_connection() as conn:
-            cursor = conn.cursor(cursor_factory=cursor_factory)
-            try:
-                yield cursor
-            finally:
-                cursor.close()
-
 
-# Global database instance (singleton pattern)
-_db_instance: Optional[DatabaseConfig] = None
+from db.pool import DatabasePool, get_pool
 
 
-def get_db() -> DatabaseConfig:
-    """Get or create the global database instance."""
-    global _db_instance
-    if _db_instance is None:
-        _db_instance = DatabaseConfig()
-    return _db_instance
+def get_db() -> DatabasePool:
+    """Get the process-wide shared database pool (see db/pool.py)."""
+    return get_pool()
 
 
-def initialize_database(config: DatabaseConfig = None):
+def initialize_database(config: DatabasePool = None):
     """
     Initialize the database with the forecasting schema.
     
     Args:
-        config: Database configuration (uses default if None)
+        config: Database pool (uses the shared pool if None)
     """
     if config is None:
         config = get_db()
@@ -19,7 +19,7 @@ limitations under the License.
 @Description: Forecast generator module that orchestrates training and prediction for all assets. Handles data preparation, model training, prediction, and database storage.
 
 @Created: 08 February 2026
-@Last Modified: 22 April 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -36,6 +36,7 @@ import os
 from zoneinfo import ZoneInfo
 
 from forecast_utils.db_config import get_db
+from db.queries import run_query
 from forecast_utils.data_validator import DataValidator, MIN_SAMPLES_REQUIREMENTS
 from forecast_utils.forecast_models import create_forecaster, ForecastResult
 
@@ -223,18 +224,7 @@ class ForecastGenerator:
         end_time = current_time()
         start_time = end_time - timedelta(days=days)
         
-        with self.db.get_cursor() as cursor:
-            cursor.execute("""
-                SELECT time as timestamp, value as power
-                FROM measurements
-                WHERE parameter = %s
-                    AND time >= %s
-                    AND time <= %s
-                    AND quality = 'ok'
-                ORDER BY time
-            """, (power_param, start_time, end_time))
-            
-            rows = cursor.fetchall()
+        rows = run_query('forecast_history', (power_param, start_time, end_time), db=self.db)
         
         if not rows:
             return None
@@ -19,7 +19,7 @@ limitations under the License.
 @Description: TODO
 
 @Created: 11 February 2026
-@Last Modified: 01 April 2026
+@Last Modified: 19 October 2026
 @Author: Leon Gritsyuk
 
 @Version: v2.0.2
@@ -28,32 +28,21 @@ limitations under the License.
 
 from utils.logging_utils import setup_logging
 from utils.time_utils import calculate_time_for_execution, current_time
+from db.migrator import run_migrations
 import json
 import time
 import logging
 from datetime import datetime
 
-import psycopg2
-from contextlib import contextmanager
-
-# Dotenv variables
-from dotenv import load_dotenv
-import os
-
-load_dotenv('./conf/.env')
-
-DB_USER = os.getenv('DB_USER')
-DB_PASSWORD = os.getenv('DB_PASSWORD')
-DB_HOST = os.getenv('DB_HOST')
-DB_PORT = os.getenv('DB_PORT')
-DB_NAME = os.getenv('DB_NAME')
+from db.pool import DatabasePool, get_pool
 
 # Modbus reader
 from data.measurements_client import ModbusDataReader
 
 
 class MeasurementsManager:
-    def __init__(self, modbus_config_dir, data_collection_interval=10):
+    def __init__(self, modbus_config_dir, data_collection_interval=10, db: DatabasePool = None,
+                 site_id: str = None):
         """
         Initialize measurements' client class.
 
@@ -61,8 +50,10 @@ class MeasurementsManager:
             modbus_config_dir: Path to `modbus.json` file which contains modbus parameters configuration
             data_collection_interval: The regular interval (in seconds) which defines how often
                                       measurements will be taken. E.g. every 10 seconds.
+            db: Connection pool of the site (default: the process-wide pool, closed by stop())
+            site_id: Site measured when several share the process (see multisite.py)
         """
-        self.logger = logging.getLogger('measurements')
+        self.logger = logging.getLogger('measurements' if site_id is None else f'measurements.{site_id}')
         self.data_collection_interval = data_collection_interval
         self.modbus_config_dir = modbus_config_dir
         self.modbus_config = self._load_modbus_config(modbus_config_dir)
@@ -73,27 +64,9 @@ class MeasurementsManager:
         # if a connection drops (see ModbusDataReader.get_client).
         self.modbus_reader = ModbusDataReader(modbus_config_dir)
 
-    @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
-        try:
-            conn = psycopg2.connect(
-                host=DB_HOST,
-                port=DB_PORT,
-                database=DB_NAME,
-                user=DB_USER,
-                password=DB_PASSWORD
-            )
-            yield conn
-        except Exception as e:
-            self.logger.error(f"Database connection error: {e}")
-            if conn:
-                conn.rollback()
-            raise
-        finally:
-            if conn:
-                conn.close()
+        # Shared connection pool - one long-lived connection instead of a new one every cycle
+        self._owns_db = db is None
+        self.db = db or get_pool()
 
     def _load_modbus_config(self, modbus_config_dir):
         """Import Modbus parameters configuration - `modbus.json`"""
@@ -104,15 +77,11 @@ class MeasurementsManager:
     def insert_measurements(self, data_to_insert):
         """Insert measurement data into database"""
         try:
-            with self.get_connection() as conn:
-                cur = conn.cursor()
-                cur.executemany("""
-                    INSERT INTO measurements (measurement_id, time, parameter, value, unit, quality, asset_key)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, data_to_insert)
-                conn.commit()
-                cur.close()
-                self.logger.debug(f"Inserted {len(data_to_insert)} measurements")
+            self.db.execute_many("""
+                INSERT INTO measurements (measurement_id, time, parameter, value, unit, quality, asset_key)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, data_to_insert)
+            self.logger.debug(f"Inserted {len(data_to_insert)} measurements")
         except Exception as e:
             self.logger.error(f"Error inserting measurements: {e}")
 
@@ -185,12 +154,16 @@ class MeasurementsManager:
         """Stop the data collection loop and cleanly close all Modbus connections"""
         self.running = False
         self.modbus_reader.close_connections()
+        if self._owns_db:
+            self.db.close_pool()
         self.logger.info("Data collection loop stopped")
 
 
 if __name__ == "__main__":
 
     setup_logging()
+    # Never hold up data collection behind another service's migration
+    run_migrations(wait=False)
 
     modbus_config_dir = './conf/modbus.json'
 
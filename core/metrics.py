@@ -30,7 +30,7 @@ limitations under the License.
     python metrics.py --backfill --start "2026-02-01 00:00:00" --end "2026-02-10 00:00:00" --period-hours 1
 
 @Created: 11 February 2026
-@Last Modified: 05 March 2026
+@Last Modified: 19 October 2026
 @Author: Leon Gritsyuk
 
 @Version: v2.0.2
@@ -39,13 +39,14 @@ limitations under the License.
 
 import argparse
 import sys
-from datetime import datetime, timedelta
+from datetime import timedelta
 from pathlib import Path
 
 import logging
 from metrics_utils.orchestrator import MetricsOrchestrator
-from utils.time_utils import floor_to_hour, current_time
+from utils.time_utils import floor_to_hour, current_time, parse_datetime
 from utils.logging_utils import setup_logging
+from db.migrator import run_migrations
 setup_logging()
 logger = logging.getLogger('metrics')
 
@@ -53,23 +54,6 @@ logger = logging.getLogger('metrics')
 sys.path.insert(0, str(Path(__file__).parent))
 
 
-def parse_datetime(date_string: str) -> datetime:
-    """Parse datetime string in various formats."""
-    formats = [
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%d",
-    ]
-    
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_string, fmt)
-        except ValueError:
-            continue
-    
-    raise ValueError(f"Could not parse datetime: {date_string}")
-
-
 def main():
     parser = argparse.ArgumentParser(
         description="EMS Metrics Calculation System",
@@ -158,6 +142,8 @@ def main():
         if start_time is None:
             start_time = end_time - timedelta(hours=args.period_hours)
     
+    run_migrations()
+
     # Initialize orchestrator
     logger.info("Initializing EMS Metrics Orchestrator")
     orchestrator = MetricsOrchestrator(config_dir=args.config_dir)
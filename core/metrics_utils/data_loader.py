@@ -19,7 +19,7 @@ limitations under the License.
 @Description: Data loader module for fetching measurements from database.
 
 @Created: 11 February 2026
-@Last Modified: 22 April 2026
+@Last Modified: 19 October 2026
 @Author: Leon Gritsyuk
 
 @Version: v2.0.2
@@ -29,7 +29,8 @@ limitations under the License.
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Tuple
-from metrics_utils.database import DatabaseConnection
+from db.pool import DatabasePool
+from db.queries import run_query
 import logging
 from utils.logging_utils import setup_logging
 setup_logging()
@@ -39,7 +40,7 @@ logger = logging.getLogger('data-loader')
 class MeasurementLoader:
     """Load and process measurements from database."""
     
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: DatabasePool):
         self.db = db_connection
     
     def get_active_assets(self) -> pd.DataFrame:
@@ -74,31 +75,13 @@ class MeasurementLoader:
         Returns:
             DataFrame with measurements
         """
-        query = """
-        SELECT 
-            id, measurement_id, time, parameter, value, unit, quality, asset_key
-        FROM measurements
-        WHERE time >= %s AND time <= %s
-        """
-        params = [start_time, end_time]
-        
-        if asset_keys:
-            placeholders = ','.join(['%s'] * len(asset_keys))
-            query += f" AND asset_key IN ({placeholders})"
-            params.extend(asset_keys)
-        
-        if parameters:
-            placeholders = ','.join(['%s'] * len(parameters))
-            query += f" AND parameter IN ({placeholders})"
-            params.extend(parameters)
-        
-        if quality_filter:
-            query += " AND quality = %s"
-            params.append(quality_filter)
-        
-        query += " ORDER BY time, asset_key, parameter"
-        
-        results = self.db.execute_query(query, tuple(params))
+        results = run_query('metric_window', (
+            start_time,
+            end_time,
+            list(asset_keys) if asset_keys else None,
+            list(parameters) if parameters else None,
+            quality_filter or None,
+        ), db=self.db)
         df = pd.DataFrame(results)
         
         if not df.empty:
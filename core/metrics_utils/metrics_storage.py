@@ -19,7 +19,7 @@ limitations under the License.
 @Description: Metrics storage module for persisting calculated metrics to database.
 
 @Created: 11 February 2026
-@Last Modified: 05 March 2026
+@Last Modified: 19 October 2026
 @Author: Leon Gritsyuk
 
 @Version: v2.0.2
@@ -31,14 +31,14 @@ import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional
-from metrics_utils.database import DatabaseConnection
+from db.pool import DatabasePool
 from utils.time_utils import current_time
 
 
 class MetricsStorage:
     """Store calculated metrics in database."""
     
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: DatabasePool):
         self.db = db_connection
         self._ensure_tables_exist()
     
@@ -19,7 +19,7 @@ limitations under the License.
 @Description: Main orchestrator for EMS metrics calculation. Coordinates all metric calculators and runs on schedule.
 
 @Created: 11 February 2026
-@Last Modified: 05 March 2026
+@Last Modified: 19 October 2026
 @Author: Leon Gritsyuk
 
 @Version: v2.0.2
@@ -32,7 +32,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 import traceback
 
-from metrics_utils.database import DatabaseConnection, DatabaseConfig
+from db.pool import DatabasePool, get_pool
 from metrics_utils.config_loader import ConfigLoader
 from metrics_utils.data_loader import MeasurementLoader
 from metrics_utils.energy_flow_metrics import EnergyFlowMetrics
@@ -54,16 +54,16 @@ class MetricsOrchestrator:
     def __init__(
         self,
         config_dir: str = "./conf/",
-        db_config: Optional[DatabaseConfig] = None
+        db: Optional[DatabasePool] = None
     ):
         """
         Initialize the metrics orchestrator.
         
         Args:
             config_dir: Directory containing config.json and modbus.json
-            db_config: Database configuration (uses environment if None)
+            db: Database pool (uses the shared pool if None)
         """
-        self.db = DatabaseConnection(db_config)
+        self.db = db or get_pool()
         self.config_loader = ConfigLoader(config_dir)
         self.data_loader = MeasurementLoader(self.db)
         self.storage = MetricsStorage(self.db)
@@ -212,7 +212,7 @@ class MetricsOrchestrator:
         except KeyboardInterrupt:
             logger.info("Scheduler stopped by user.")
         finally:
-            self.db.close()
+            self.db.close_pool()
     
     def run_once(
         self,
@@ -234,7 +234,7 @@ class MetricsOrchestrator:
             )
             return metrics
         finally:
-            self.db.close()
+            self.db.close_pool()
     
     def backfill_metrics(
         self,
@@ -277,4 +277,4 @@ class MetricsOrchestrator:
             logger.info(f"Backfill complete! Processed {completed}/{total_periods} periods.")
             
         finally:
-            self.db.close()
\ No newline at end of file
+            self.db.close_pool()
\ No newline at end of file
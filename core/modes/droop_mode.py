@@ -19,7 +19,7 @@ limitations under the License.
 @Description: # TODO: Add desc
 
 @Created: 3rd February 2026
-@Last Modified: 27 February 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -27,44 +27,14 @@ limitations under the License.
 
 
 import logging
-from typing import Dict, Any, Type
-from dotenv import load_dotenv
-import os
-
-# ── Import your droop driver classes here ────────────────────────────────────
-# Create one driver file + class per device (any naming convention you like)
-# and import them here. Only devices listed in _ASSIGN_DRIVERS_ below will
-# receive droop-curve setpoints.
-#
-# Example imports:
-from drivers.afe_driver import ActiveFrontEndDriver
-from drivers.bess_driver import BESSDriver
-# from drivers.ev1_driver import DriverEV1
-# from drivers.ev2_driver import DriverEV2
+from typing import Dict, Any
 
+from drivers.base_driver import BaseDeviceDriver, DriverConfig
+from drivers.registry import build_drivers
 from data.modbus_writer import ModbusWriter
-from utils.database_utils import DatabaseOperations
+from utils.database_utils import DatabaseOperations, OptimizationCycle, flatten_inputs, flatten_outputs
 from optimization.optimizer import OptimizerRunner
-
-load_dotenv('./conf/.env')
-
-
-# ── USER CONFIGURATION ────────────────────────────────────────────────────────
-# Map each asset key (must match the device 'id' in config.json) to the droop
-# driver class that should handle it.  Add one entry per physical device.
-#
-# Example:
-#   _ASSIGN_DRIVERS_ = {
-#       'afe1':  ActiveFrontEndDriver,
-#       'bess1': DriverBESS1,
-#       'bess2': DriverBESS2,
-#       'ev1':   DriverEV1,
-#   }
-_ASSIGN_DRIVERS_: Dict[str, Type] = {
-    'afe1':  ActiveFrontEndDriver,
-    'bess1': BESSDriver,
-}
-# ─────────────────────────────────────────────────────────────────────────────
+from optimization.shadow import ShadowEvaluator, shadow_settings_enabled
 
 
 class DroopMode:
@@ -72,51 +42,53 @@ class DroopMode:
     Droop control mode - runs the optimizer and applies results as droop curve
     parameters to each device via its dedicated driver.
 
-    Driver assignment is intentionally manual: the user imports their own
-    per-device driver classes and registers them against the matching asset key
-    in _ASSIGN_DRIVERS_ above.  DroopMode instantiates each class at startup
-    and dispatches transform_droop_curve() / apply_setpoints() at runtime.
+    Drivers are assigned per device type (drivers.registry, configurable in
+    generalSiteConfig.droopDrivers). DroopMode builds one driver per device at
+    startup from the already-parsed config.json and modbus.json, and dispatches
+    transform_droop_curve() at runtime.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], db_ops: DatabaseOperations = None,
+                 optimizer: OptimizerRunner = None, modbus_writer: ModbusWriter = None,
+                 shadow: ShadowEvaluator = None):
+        """
+        Args:
+            config: Site configuration
+            db_ops: Database layer shared with the other modes (default: a new one)
+            optimizer: Optimizer runner shared with the other modes (default: a new one)
+            modbus_writer: Modbus writer (and client pool) shared with the other modes
+                           (default: a new one); cleanup() only closes what was created here
+            shadow: Shadow evaluator shared with the other modes (default: a new one if
+                    generalSiteConfig.shadowEvaluation is configured)
+        """
         self.logger = logging.getLogger('ems.droopmode')
         self.config = config
         self.mode_name = "Droop Mode"
 
-        db_config = {
-            'host':     os.getenv('DB_HOST'),
-            'port':     os.getenv('DB_PORT'),
-            'database': os.getenv('DB_NAME'),
-            'user':     os.getenv('DB_USER'),
-            'password': os.getenv('DB_PASSWORD'),
-        }
-
-        self.db_ops = DatabaseOperations(db_config, site_config=config)
-        self.optimizer = OptimizerRunner(config)
-        self.modbus_writer = ModbusWriter(config_file='./conf/modbus.json')
+        self._owns_db_ops = db_ops is None
+        self._owns_modbus_writer = modbus_writer is None
+        self._owns_shadow = shadow is None
+        self.db_ops = db_ops or DatabaseOperations(site_config=config)
+        self.optimizer = optimizer or OptimizerRunner(config)
+        self.input_provider = self.db_ops.create_input_provider(self.optimizer.required_parameters())
+        self.modbus_writer = modbus_writer or ModbusWriter(config_file='./conf/modbus.json')
+        self.shadow = shadow
+        if shadow is None and shadow_settings_enabled(config):
+            self.shadow = ShadowEvaluator(config, self.db_ops)
 
         # Instantiated driver objects keyed by asset_key
-        self.drivers: Dict[str, Any] = self._initialize_drivers()
+        self.drivers: Dict[str, BaseDeviceDriver] = self._initialize_drivers()
 
     # ── Driver setup ──────────────────────────────────────────────────────────
 
-    def _initialize_drivers(self) -> Dict[str, Any]:
+    def _initialize_drivers(self) -> Dict[str, BaseDeviceDriver]:
         """
-        Instantiate every driver class declared in _ASSIGN_DRIVERS_.
-        Each class is called with (device_id=<asset_key>, config=<full config>).
+        Build one driver per device whose type has a droop driver assigned,
+        sharing the site config and the Modbus map the writer already parsed.
         """
-        drivers: Dict[str, Any] = {}
-        for asset_key, driver_cls in _ASSIGN_DRIVERS_.items():
-            try:
-                drivers[asset_key] = driver_cls(device_id=asset_key, config=self.config)
-                self.logger.debug(
-                    f"Initialized droop driver '{driver_cls.__name__}' for '{asset_key}'"
-                )
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to initialize droop driver '{driver_cls.__name__}' "
-                    f"for '{asset_key}': {e}"
-                )
+        driver_config = DriverConfig(self.config, self.modbus_writer.reader.config)
+        drivers = build_drivers(driver_config)
+        self.logger.info(f"Droop drivers: {', '.join(f'{k} ({type(d).__name__})' for k, d in drivers.items()) or 'none'}")
         return drivers
 
     # ── Error output ──────────────────────────────────────────────────────────
@@ -155,9 +127,10 @@ class DroopMode:
 
     def apply_droop_curves(self, optimizer_output: Dict[str, Any]) -> Dict[str, Any]:
         """
-        For each asset key in _ASSIGN_DRIVERS_, extract the relevant slice from
+        For each device with a droop driver, extract the relevant slice from
         the optimizer output, pass it to the driver's transform_droop_curve(),
-        and write the resulting registers via apply_setpoints().
+        validate the resulting registers and write all devices in one concurrent
+        batch (modbus_writer.write_device_setpoints_batch).
 
         The optimizer output contains per-device dicts nested by type group
         ('afe', 'bess', 'unidir', etc.).  A flat {asset_key -> device_data}
@@ -171,6 +144,9 @@ class DroopMode:
             for asset_key, device_data in optimizer_output.get(group, {}).items():
                 device_slices[asset_key] = device_data
 
+        # Transform and validate per driver, then write all devices in one concurrent batch
+        device_registers: Dict[str, Dict[str, float]] = {}
+        device_ids: Dict[str, str] = {}
         for asset_key, driver in self.drivers.items():
             device_data = device_slices.get(asset_key)
             if device_data is None:
@@ -185,53 +161,102 @@ class DroopMode:
                 droop_registers = driver.transform_droop_curve(device_data)
                 self.logger.debug(f"[{asset_key}] Droop registers: {droop_registers}")
 
-                write_results = driver.apply_setpoints(droop_registers, self.modbus_writer)
-                total = len(write_results)
-                success_count = sum(1 for v in write_results.values() if v)
-                success = success_count == total
-
-                results[asset_key] = {'success': success, 'details': write_results}
-
-                if success:
-                    self.logger.debug(f"[{asset_key}] Droop curve applied successfully")
-                else:
-                    self.logger.warning(
-                        f"[{asset_key}] Droop curve partially applied: "
-                        f"{success_count}/{total} registers written"
-                    )
+                if not driver.validate_setpoints(droop_registers):
+                    self.logger.error(f"Setpoint validation failed for {driver.device_id}")
+                    results[asset_key] = {'success': False, 'details': {k: False for k in droop_registers}}
+                    continue
+                device_registers[driver.device_id] = droop_registers
+                device_ids[asset_key] = driver.device_id
 
             except Exception as e:
                 self.logger.error(f"[{asset_key}] Error applying droop curve: {e}")
                 results[asset_key] = {'success': False, 'error': str(e)}
 
+        try:
+            batch_results = self.modbus_writer.write_device_setpoints_batch(device_registers)
+        except Exception as e:
+            self.logger.error(f"Error writing droop registers: {e}")
+            for asset_key in device_ids:
+                results[asset_key] = {'success': False, 'error': str(e)}
+            return results
+
+        for asset_key, device_id in device_ids.items():
+            write_results = batch_results[device_id]
+            total = len(write_results)
+            success_count = sum(1 for v in write_results.values() if v)
+            success = success_count == total
+
+            results[asset_key] = {'success': success, 'details': write_results}
+
+            if success:
+                self.logger.debug(f"[{asset_key}] Droop curve applied successfully")
+            else:
+                self.logger.warning(
+                    f"[{asset_key}] Droop curve partially applied: "
+                    f"{success_count}/{total} registers written"
+                )
+
         return results
 
     # ── Main execute loop ─────────────────────────────────────────────────────
 
-    def execute(self) -> Dict[str, Any]:
+    def execute(self, trigger: str = None, cycle: OptimizationCycle = None) -> Dict[str, Any]:
         """
         Execute droop mode:
-          1. Fetch averaged + recent data from database
-          2. Prepare and store optimizer inputs
+          1. Fetch averaged + recent data of the required parameters (one query)
+          2. Prepare optimizer inputs
           3. Run optimizer
-          4. Store optimizer outputs
-          5. Apply droop curves to all assigned devices
+          4. Apply droop curves to all assigned devices (concurrently)
+          5. Queue the cycle record (inputs, outputs, setpoint results, timings)
+             for the background writer
+
+        Args:
+            trigger: What requested an off-cycle run (None for a scheduled cycle),
+                     recorded in the cycle stats
+            cycle: Record to fill in, queued by the caller (the Coordinator, which adds its
+                   own stages); default: a new one, queued here
         """
         self.logger.debug("Executing Droop Mode")
+        owns_cycle = cycle is None
+        if owns_cycle:
+            cycle = self.db_ops.new_cycle(self.mode_name)
+        if trigger:
+            cycle.stats['trigger'] = trigger
 
         try:
-            averaged_data = self.db_ops.get_latest_15_min_interval()
-            recent_data   = self.db_ops.get_most_recent_data()
-
-            inputs = self.optimizer.prepare_inputs(averaged_data, recent_data)
-            self.db_ops.insert_inputs_to_db(inputs)
-
-            result = self.optimizer.run_optimization(inputs)
+            with cycle.stage('fetch'):
+                data = self.input_provider.fetch()
+            if data.stale or data.missing:
+                cycle.stats['stale_parameters'] = data.stale
+                cycle.stats['missing_parameters'] = data.missing
+
+            with cycle.stage('prepare'):
+                inputs = self.optimizer.prepare_inputs(data.averaged, data.recent)
+
+            with cycle.stage('solve'):
+                result = self.optimizer.run_optimization(inputs)
+            cycle.solver_status = result.get('solver_status')
+            if result.get('cached'):
+                cycle.stats['cached'] = True
+            cycle.stats['solver'] = self.optimizer.solver_stats()
 
             if result['status'] == 'success':
                 optimizer_output = result['output']
-                self.db_ops.insert_outputs_to_db(optimizer_output, quality='ok')
-                application_results = self.apply_droop_curves(optimizer_output)
+
+                with cycle.stage('apply'):
+                    application_results = self.apply_droop_curves(optimizer_output)
+                cycle.actuated(data.newest_sample)
+                if self.shadow:
+                    # The other objectives solve the same inputs in the background
+                    cycle.stats['shadow'] = self.shadow.submit(cycle.cycle_id, inputs)
+
+                with cycle.stage('record'):
+                    cycle.inputs = flatten_inputs(inputs)
+                    cycle.outputs = flatten_outputs(optimizer_output)
+                cycle.setpoints = application_results
+                if result.get('fallback'):
+                    cycle.stats['fallback'] = {'reason': result['fallback'], 'dispatch_us': result.get('fallback_us')}
+                cycle.finish('success', quality='fallback' if result.get('fallback') else None)
 
                 return {
                     'status': 'success',
@@ -243,7 +268,9 @@ class DroopMode:
             else:
                 self.logger.error(f"Optimizer failed: {result.get('message', 'Unknown error')}")
                 error_output = self._create_error_output()
-                self.db_ops.insert_outputs_to_db(error_output, quality='error')
+                cycle.inputs = flatten_inputs(inputs)
+                cycle.outputs = flatten_outputs(error_output)
+                cycle.finish('error', quality='error', message=result.get('message', 'Optimizer failed'))
 
                 return {
                     'status': 'error',
@@ -254,8 +281,13 @@ class DroopMode:
 
         except Exception as e:
             self.logger.error(f"Error in droop mode execution: {e}")
+            cycle.finish('error', quality='error', message=str(e))
             return {'status': 'error', 'mode': self.mode_name, 'message': str(e)}
 
+        finally:
+            if owns_cycle:
+                self.db_ops.record_cycle(cycle)
+
     # ── Lifecycle helpers ─────────────────────────────────────────────────────
 
     def validate(self) -> bool:
@@ -270,7 +302,11 @@ class DroopMode:
         return True
 
     def cleanup(self):
-        """Release resources."""
-        if self.modbus_writer:
+        """Release the resources this mode created (shared ones are closed by their owner)."""
+        if self.shadow and self._owns_shadow:
+            self.shadow.close()
+        if self._owns_db_ops:
+            self.db_ops.close()
+        if self.modbus_writer and self._owns_modbus_writer:
             self.modbus_writer.close()
             self.logger.info("Modbus writer closed")
\ No newline at end of file
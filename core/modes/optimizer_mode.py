@@ -19,7 +19,7 @@ limitations under the License.
 @Description: # TODO: Add desc
 
 @Created: 1st July 2025
-@Last Modified: 01 April 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -29,14 +29,11 @@ limitations under the License.
 import logging
 import json
 from typing import Dict, Any
-from dotenv import load_dotenv
-import os
 
 from data.modbus_writer import ModbusWriter
-from utils.database_utils import DatabaseOperations
+from utils.database_utils import DatabaseOperations, OptimizationCycle, flatten_inputs, flatten_outputs
 from optimization.optimizer import OptimizerRunner
-
-load_dotenv('./conf/.env')
+from optimization.shadow import ShadowEvaluator, shadow_settings_enabled
 
 
 class OptimizerMode:
@@ -53,22 +50,37 @@ class OptimizerMode:
       Negative  → power flowing OUT OF the DC bus (charging, consuming)
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], db_ops: DatabaseOperations = None,
+                 optimizer: OptimizerRunner = None, modbus_writer: ModbusWriter = None,
+                 shadow: ShadowEvaluator = None):
+        """
+        Args:
+            config: Site configuration
+            db_ops: Database layer shared with the other modes (default: a new one)
+            optimizer: Optimizer runner shared with the other modes (default: a new one)
+            modbus_writer: Modbus writer (and client pool) shared with the other modes
+                           (default: a new one); cleanup() only closes what was created here
+            shadow: Shadow evaluator shared with the other modes (default: a new one if
+                    generalSiteConfig.shadowEvaluation is configured)
+        """
         self.logger = logging.getLogger('ems.optimizermode')
         self.config = config
         self.mode_name = "Optimizer Mode"
 
-        db_config = {
-            'host':     os.getenv('DB_HOST'),
-            'port':     os.getenv('DB_PORT'),
-            'database': os.getenv('DB_NAME'),
-            'user':     os.getenv('DB_USER'),
-            'password': os.getenv('DB_PASSWORD'),
-        }
-
-        self.db_ops = DatabaseOperations(db_config, site_config=config)
-        self.optimizer = OptimizerRunner(config)
-        self.modbus_writer = ModbusWriter(config_file='./conf/modbus.json')
+        self._owns_db_ops = db_ops is None
+        self._owns_modbus_writer = modbus_writer is None
+        self._owns_shadow = shadow is None
+        self.db_ops = db_ops or DatabaseOperations(site_config=config)
+        self.optimizer = optimizer or OptimizerRunner(config)
+        self.input_provider = self.db_ops.create_input_provider(self.optimizer.required_parameters())
+        self.horizon = self.optimizer.forecast_horizon()
+        self.forecast_provider = (
+            self.db_ops.create_forecast_provider(self.optimizer.forecast_assets()) if self.horizon else None
+        )
+        self.modbus_writer = modbus_writer or ModbusWriter(config_file='./conf/modbus.json')
+        self.shadow = shadow
+        if shadow is None and shadow_settings_enabled(config):
+            self.shadow = ShadowEvaluator(config, self.db_ops)
 
     # ── Error output ──────────────────────────────────────────────────────────
 
@@ -232,7 +244,8 @@ class OptimizerMode:
     def apply_power_setpoints(self, optimizer_output: Dict[str, Any]) -> Dict[str, Any]:
         """
         Translate optimizer output to setpoints and write them directly to
-        hardware via modbus_writer — no device drivers involved.
+        hardware via modbus_writer — no device drivers involved. Devices on
+        different connections are written concurrently.
 
         Returns per-device application results:
           { '<asset_key>': { 'success': bool, 'setpoints': {...}, 'details': {...} } }
@@ -242,55 +255,104 @@ class OptimizerMode:
 
         self.logger.debug(f"Writing setpoints for {len(device_setpoints)} devices")
 
+        try:
+            batch_results = self.modbus_writer.write_device_setpoints_batch(device_setpoints)
+        except Exception as e:
+            self.logger.error(f"Error writing setpoints: {e}")
+            return {asset_key: {'success': False, 'error': str(e)} for asset_key in device_setpoints}
+
         for asset_key, setpoints in device_setpoints.items():
-            try:
-                write_results = self.modbus_writer.write_setpoints(asset_key, setpoints)
-                success = all(write_results.values())
-
-                results[asset_key] = {
-                    'success':   success,
-                    'setpoints': setpoints,
-                    'details':   write_results,
-                }
+            write_results = batch_results[asset_key]
+            success = all(write_results.values())
 
-                if success:
-                    self.logger.debug(f"[{asset_key}] Setpoints written: {setpoints}")
-                else:
-                    failed = [k for k, v in write_results.items() if not v]
-                    self.logger.warning(f"[{asset_key}] Failed to write registers: {failed}")
+            results[asset_key] = {
+                'success':   success,
+                'setpoints': setpoints,
+                'details':   write_results,
+            }
 
-            except Exception as e:
-                self.logger.error(f"[{asset_key}] Error writing setpoints: {e}")
-                results[asset_key] = {'success': False, 'error': str(e)}
+            if success:
+                self.logger.debug(f"[{asset_key}] Setpoints written: {setpoints}")
+            else:
+                failed = [k for k, v in write_results.items() if not v]
+                self.logger.warning(f"[{asset_key}] Failed to write registers: {failed}")
 
         return results
 
     # ── Main execute loop ─────────────────────────────────────────────────────
 
-    def execute(self) -> Dict[str, Any]:
+    def execute(self, trigger: str = None, cycle: OptimizationCycle = None) -> Dict[str, Any]:
         """
         Execute optimizer mode:
-          1. Fetch averaged + recent data from database
-          2. Prepare and store optimizer inputs
+          1. Fetch averaged + recent data of the required parameters (one query),
+             and the stored forecasts when a receding-horizon backend is configured
+          2. Prepare optimizer inputs
           3. Run optimizer
-          4. Store optimizer outputs
-          5. Write direct power setpoints to all devices
+          4. Write direct power setpoints to all devices (concurrently), then hand
+             the inputs to the shadow evaluation if configured
+          5. Queue the cycle record (inputs, outputs, setpoint results, timings)
+             for the background writer
+
+        Fetch → solve → actuate is the critical path; flattening the inputs and
+        outputs for the record happens after the setpoints are written. The
+        data-to-actuation latency is recorded in the cycle stats.
+
+        Args:
+            trigger: What requested an off-cycle run (None for a scheduled cycle),
+                     recorded in the cycle stats
+            cycle: Record to fill in, queued by the caller (the Coordinator, which adds its
+                   own stages); default: a new one, queued here
         """
         self.logger.debug("Executing Optimizer Mode")
+        owns_cycle = cycle is None
+        if owns_cycle:
+            cycle = self.db_ops.new_cycle(self.mode_name)
+        if trigger:
+            cycle.stats['trigger'] = trigger
 
         try:
-            averaged_data = self.db_ops.get_latest_15_min_interval()
-            recent_data   = self.db_ops.get_most_recent_data()
-
-            inputs = self.optimizer.prepare_inputs(averaged_data, recent_data)
-            self.db_ops.insert_inputs_to_db(inputs)
-
-            result = self.optimizer.run_optimization(inputs)
+            with cycle.stage('fetch'):
+                data = self.input_provider.fetch()
+                forecasts = None
+                if self.forecast_provider:
+                    steps, step_minutes = self.horizon
+                    forecasts = self.forecast_provider.fetch(data.fetched_at, steps, step_minutes)
+            if data.stale or data.missing:
+                cycle.stats['stale_parameters'] = data.stale
+                cycle.stats['missing_parameters'] = data.missing
+
+            with cycle.stage('prepare'):
+                inputs = self.optimizer.prepare_inputs(data.averaged, data.recent)
+            recorded_inputs = inputs
+            if forecasts is not None:
+                # Only the first step is applied; the plan is re-solved every cycle
+                inputs = {**inputs, 'forecast': forecasts}
+                cycle.stats['forecast_assets'] = len(forecasts)
+
+            with cycle.stage('solve'):
+                result = self.optimizer.run_optimization(inputs)
+            cycle.solver_status = result.get('solver_status')
+            if result.get('cached'):
+                cycle.stats['cached'] = True
+            cycle.stats['solver'] = self.optimizer.solver_stats()
 
             if result['status'] == 'success':
                 optimizer_output = result['output']
-                self.db_ops.insert_outputs_to_db(optimizer_output, quality='ok')
-                application_results = self.apply_power_setpoints(optimizer_output)
+
+                with cycle.stage('apply'):
+                    application_results = self.apply_power_setpoints(optimizer_output)
+                cycle.actuated(data.newest_sample)
+                if self.shadow:
+                    # The other objectives solve the same inputs in the background
+                    cycle.stats['shadow'] = self.shadow.submit(cycle.cycle_id, inputs)
+
+                with cycle.stage('record'):
+                    cycle.inputs = flatten_inputs(recorded_inputs)
+                    cycle.outputs = flatten_outputs(optimizer_output)
+                cycle.setpoints = application_results
+                if result.get('fallback'):
+                    cycle.stats['fallback'] = {'reason': result['fallback'], 'dispatch_us': result.get('fallback_us')}
+                cycle.finish('success', quality='fallback' if result.get('fallback') else None)
 
                 return {
                     'status': 'success',
@@ -302,7 +364,9 @@ class OptimizerMode:
             else:
                 self.logger.error(f"Optimizer failed: {result.get('message', 'Unknown error')}")
                 error_output = self._create_error_output()
-                self.db_ops.insert_outputs_to_db(error_output, quality='error')
+                cycle.inputs = flatten_inputs(recorded_inputs)
+                cycle.outputs = flatten_outputs(error_output)
+                cycle.finish('error', quality='error', message=result.get('message', 'Optimizer failed'))
 
                 return {
                     'status': 'error',
@@ -313,8 +377,13 @@ class OptimizerMode:
 
         except Exception as e:
             self.logger.error(f"Error in optimizer mode execution: {e}")
+            cycle.finish('error', quality='error', message=str(e))
             return {'status': 'error', 'mode': self.mode_name, 'message': str(e)}
 
+        finally:
+            if owns_cycle:
+                self.db_ops.record_cycle(cycle)
+
     # ── Lifecycle helpers ─────────────────────────────────────────────────────
 
     def validate(self) -> bool:
@@ -325,7 +394,11 @@ class OptimizerMode:
         return True
 
     def cleanup(self):
-        """Release resources."""
-        if self.modbus_writer:
+        """Release the resources this mode created (shared ones are closed by their owner)."""
+        if self.shadow and self._owns_shadow:
+            self.shadow.close()
+        if self._owns_db_ops:
+            self.db_ops.close()
+        if self.modbus_writer and self._owns_modbus_writer:
             self.modbus_writer.close()
             self.logger.info("Modbus writer closed")
\ No newline at end of file
@@ -0,0 +1,302 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: multisite.py
+@Description: Runs the optimizer and measurement loops of several sites in one process, so a
+              fleet of small sites shares one copy of the Python, Pyomo and pandas imports
+              instead of one container stack per site.
+
+              Every site keeps its own data in a PostgreSQL schema (created and migrated at
+              start-up, see db.migrator SITE_TABLES) and gets its own connection pool,
+              Coordinator and MeasurementsManager, each loop in its own thread. The solves of
+              all sites go through one SolverPool with round-robin fair scheduling. A site
+              whose loop dies or fails to start is stopped on its own and restarted with an
+              exponential backoff; the other sites keep running.
+
+              The forecast and metrics services are not hosted here; run them per site with
+              DB_SCHEMA set to the site's schema.
+
+              ./conf/sites.json:
+                  {
+                      "solverWorkers": 2,           # concurrent solves of all sites
+                      "restartBackoff": 30,         # s, doubled per failure ...
+                      "maxRestartBackoff": 900,     # ... up to this
+                      "sites": [
+                          {
+                              "siteId": "site_a",
+                              "schema": "site_a",                           # default: siteId
+                              "config": "./conf/sites/site_a/config.json",  # default
+                              "modbus": "./conf/sites/site_a/modbus.json",  # default
+                              "optimizationInterval": 15,                   # min
+                              "measurements": true,
+                              "measurementInterval": 10,                    # s
+                              "dbMaxConnections": 3
+                          }
+                      ]
+                  }
+
+              python multisite.py [--sites ./conf/sites.json]
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+from db.migrator import run_migrations
+from db.pool import DatabasePool, DatabaseSettings
+from db.queries import log_query_stats
+from measure import MeasurementsManager
+from optimization.solver_pool import SolverPool
+from optimizer import Coordinator
+from utils.logging_utils import setup_logging
+
+# Site ids double as schema names, pool application names and thread names
+SITE_ID_PATTERN = re.compile(r'^[a-z_][a-z0-9_]{0,62}$')
+
+logger = logging.getLogger('multisite')
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """One entry of sites.json."""
+    site_id: str
+    schema: str
+    config_file: str
+    modbus_file: str
+    optimization_interval: int = 15
+    measurements: bool = True
+    measurement_interval: int = 10
+    max_connections: int = 3
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> 'SiteSpec':
+        site_id = entry.get('siteId')
+        schema = entry.get('schema') or site_id
+        for name, value in (('siteId', site_id), ('schema', schema)):
+            if not isinstance(value, str) or not SITE_ID_PATTERN.match(value):
+                raise ValueError(f"Invalid {name} {value!r}: lower-case letters, digits and underscores only")
+        return cls(
+            site_id=site_id,
+            schema=schema,
+            config_file=entry.get('config', f'./conf/sites/{site_id}/config.json'),
+            modbus_file=entry.get('modbus', f'./conf/sites/{site_id}/modbus.json'),
+            optimization_interval=int(entry.get('optimizationInterval', 15)),
+            measurements=bool(entry.get('measurements', True)),
+            measurement_interval=int(entry.get('measurementInterval', 10)),
+            max_connections=int(entry.get('dbMaxConnections', 3)),
+        )
+
+
+@dataclass
+class Site:
+    """Runtime state of a hosted site."""
+    spec: SiteSpec
+    state: str = 'stopped'          # running, failed or stopped
+    db: Optional[DatabasePool] = None
+    coordinator: Optional[Coordinator] = None
+    measurements: Optional[MeasurementsManager] = None
+    threads: List[threading.Thread] = field(default_factory=list)
+    started_at: float = 0.0
+    failures: int = 0
+    restart_at: float = 0.0
+    last_error: Optional[str] = None
+
+
+class SiteHost:
+    """Starts, supervises and stops the sites of the process."""
+
+    def __init__(self, specs: List[SiteSpec], solver_workers: int = 1, restart_backoff: float = 30.0,
+                 max_restart_backoff: float = 900.0, check_interval: float = 5.0):
+        """
+        Args:
+            specs: Sites to host
+            solver_workers: Concurrent solves of all sites together
+            restart_backoff: Wait before the first restart of a failed site (s), doubled per failure
+            max_restart_backoff: Longest wait before a restart (s); a site that has run this
+                                 long without failing starts over at `restart_backoff`
+            check_interval: How often the loops of the sites are checked (s)
+        """
+        for key in ('site_id', 'schema'):
+            values = [getattr(spec, key) for spec in specs]
+            duplicates = sorted({value for value in values if values.count(value) > 1})
+            if duplicates:
+                raise ValueError(f"Duplicate {key} in the site list: {duplicates}")
+        self.sites: Dict[str, Site] = {spec.site_id: Site(spec) for spec in specs}
+        self.solver_pool = SolverPool(solver_workers)
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.check_interval = check_interval
+        self.running = False
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SiteHost':
+        """Host the sites of a sites.json file (see module docstring)."""
+        with open(path, 'r') as file:
+            settings = json.load(file)
+        return cls(
+            [SiteSpec.from_dict(entry) for entry in settings.get('sites', [])],
+            solver_workers=int(settings.get('solverWorkers', 1)),
+            restart_backoff=float(settings.get('restartBackoff', 30)),
+            max_restart_backoff=float(settings.get('maxRestartBackoff', 900)),
+        )
+
+    # ── Site lifecycle ────────────────────────────────────────────────────────
+
+    def _start(self, site: Site):
+        """Migrate the site's schema and start its loops; a failure only affects this site."""
+        spec = site.spec
+        try:
+            if not run_migrations(schema=spec.schema):
+                raise RuntimeError(f"migrations of schema {spec.schema} failed")
+            with open(spec.config_file, 'r') as file:
+                config = json.load(file)
+
+            site.db = DatabasePool(DatabaseSettings.from_env(
+                schema=spec.schema, max_connections=spec.max_connections,
+                application_name=f"ems-{spec.site_id}"))
+            site.coordinator = Coordinator(config, site_id=spec.site_id, db=site.db,
+                                           solver_pool=self.solver_pool, modbus_config=spec.modbus_file)
+            site.threads = [threading.Thread(
+                target=site.coordinator.run, kwargs={'optimization_interval': spec.optimization_interval},
+                name=f"{spec.site_id}-optimizer", daemon=True)]
+            if spec.measurements:
+                site.measurements = MeasurementsManager(spec.modbus_file, spec.measurement_interval,
+                                                        db=site.db, site_id=spec.site_id)
+                site.threads.append(threading.Thread(
+                    target=site.measurements.run_data_collection_loop,
+                    name=f"{spec.site_id}-measurements", daemon=True))
+        except Exception as e:
+            self._failed(site, f"start failed: {e}")
+            return
+
+        for thread in site.threads:
+            thread.start()
+        site.state = 'running'
+        site.started_at = time.monotonic()
+        logger.info(f"Site {spec.site_id} running ({len(site.threads)} loops, schema {spec.schema})")
+
+    def _signal_stop(self, site: Site):
+        """Ask the site's loops to end after their current cycle."""
+        if site.coordinator is not None:
+            site.coordinator.stop()
+        if site.measurements is not None:
+            # The loop calls stop() itself when it ends
+            site.measurements.running = False
+
+    def _stop(self, site: Site, timeout: float = 30.0):
+        """Stop the site's loops, wait for them and close its connection pool."""
+        self._signal_stop(site)
+        deadline = time.monotonic() + timeout
+        for thread in site.threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                logger.warning(f"{thread.name} did not stop within {timeout:.0f} s")
+        if site.db is not None:
+            site.db.close_pool()
+        site.db, site.coordinator, site.measurements, site.threads = None, None, None, []
+
+    def _failed(self, site: Site, reason: str):
+        """Stop a failed site and schedule its restart."""
+        site.failures += 1
+        backoff = min(self.restart_backoff * 2 ** (site.failures - 1), self.max_restart_backoff)
+        site.state = 'failed'
+        site.last_error = reason
+        site.restart_at = time.monotonic() + backoff
+        logger.error(f"Site {site.spec.site_id} {reason}; restart in {backoff:.0f} s (failure {site.failures})")
+        self._stop(site)
+
+    def _check(self, site: Site):
+        if site.state == 'running':
+            dead = [thread.name for thread in site.threads if not thread.is_alive()]
+            if dead:
+                self._failed(site, f"loop exited: {', '.join(dead)}")
+            elif site.failures and time.monotonic() - site.started_at > self.max_restart_backoff:
+                site.failures = 0
+        elif site.state == 'failed' and time.monotonic() >= site.restart_at:
+            logger.info(f"Restarting site {site.spec.site_id}")
+            self._start(site)
+
+    # ── Host loop ─────────────────────────────────────────────────────────────
+
+    def run(self):
+        """Start all sites and supervise them until stop() or Ctrl+C."""
+        logger.info(f"Hosting {len(self.sites)} sites, {self.solver_pool.workers} solver workers")
+        self.running = True
+        self._stopped.clear()
+        try:
+            for site in self.sites.values():
+                self._start(site)
+            while self.running:
+                for site in self.sites.values():
+                    self._check(site)
+                self._stopped.wait(self.check_interval)
+        except KeyboardInterrupt:
+            logger.info("Received keyboard interrupt, shutting down...")
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        """Ask run() to return (it then calls shutdown())."""
+        self.running = False
+        self._stopped.set()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """State, failures and last error of every site."""
+        return {site_id: {'state': site.state, 'failures': site.failures, 'last_error': site.last_error}
+                for site_id, site in self.sites.items()}
+
+    def shutdown(self):
+        """Stop all sites."""
+        self.running = False
+        self._stopped.set()
+        running = [site for site in self.sites.values() if site.state == 'running']
+        for site in running:
+            self._signal_stop(site)
+        for site in running:
+            self._stop(site)
+            site.state = 'stopped'
+        logger.info(f"Site status: {self.status()}")
+        logger.info(f"Solver pool: {self.solver_pool.stats()}")
+        log_query_stats()
+        logger.info("Multi-site host shutdown complete")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the optimizer and measurement loops of several sites")
+    parser.add_argument('--sites', default='./conf/sites.json', help="Site list (see module docstring)")
+    args = parser.parse_args()
+
+    setup_logging(thread_names=True)
+    # The web-app tables in public
+    run_migrations()
+
+    host = SiteHost.from_file(args.sites)
+    host.run()
@@ -0,0 +1,248 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: aggregation.py
+@Description: Symmetry aggregation - identical BESS racks and EV chargers in the same state bucket
+              are merged into one device before the solve, so that a bank of N units needs one
+              charge/discharge binary instead of N, and the cluster result is split back onto the
+              units in proportion to their headroom. Opt-in per device type with
+              generalSiteConfig.optimizerSettings.aggregation:
+                {"types": ["BESS", "UNI_EV", "BI_EV"], "socBucket": 0.05}
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import math
+from collections import defaultdict
+from typing import Dict, Any, List, Tuple
+
+# Device type -> inputs group that can be aggregated
+AGGREGATABLE = {'BESS': 'bess', 'UNI_EV': 'unidir', 'BI_EV': 'bidir'}
+
+# Input fields that add up over the units of a cluster; the other fields are averaged
+EXTENSIVE = {
+    'bess':   ('level_min_kWh', 'level_max_kWh', 'power_max_kW', 'level_init_kWh', 'level_fault_kWh', 'capacity_kWh'),
+    'unidir': ('car_capacity_kWh', 'car_power_max_kW', 'charger_power_max_kW'),
+    'bidir':  ('car_capacity_kWh', 'car_power_max_kW', 'charger_power_max_kW'),
+}
+
+# Parameters that must be equal for units to be aggregated
+IDENTICAL = {
+    'bess':   ('efficiency', 'capacity_kWh', 'power_max_kW', 'level_min_kWh', 'level_max_kWh', 'level_fault_kWh'),
+    'unidir': ('efficiency', 'car_capacity_kWh', 'car_power_max_kW', 'charger_power_max_kW'),
+    'bidir':  ('efficiency', 'car_capacity_kWh', 'car_power_max_kW', 'charger_power_max_kW',
+               'target_soc', 'is_available'),
+}
+
+# Minimum car capacity for the SoC dynamics (see BaseOptimizer.build_pyomo_model())
+MIN_CAR_CAPACITY_KWH = 0.2
+
+
+def _bucket(value: float, width: float) -> int:
+    return int(math.floor(min(1.0, max(0.0, value)) / width))
+
+
+def _cluster_key(group: str, data: Dict[str, Any], soc_bucket: float, afe_abl_aggregate: float):
+    """
+    Cluster of a unit, or None if it stays on its own (no car connected).
+
+    Besides the parameters and the SoC bucket, the key holds which limit (power or energy)
+    binds in each direction, so that the summed limits of a cluster equal the sum of its
+    units' limits and the split in proportion to headroom keeps every unit within its own.
+    """
+    key = tuple(round(data[field], 6) for field in IDENTICAL[group])
+    if group == 'bess':
+        if data['capacity_kWh'] <= 0:
+            return None
+        soc = data['level_init_kWh'] / data['capacity_kWh']
+        limits = _bess_limits(data, afe_abl_aggregate)
+    else:
+        if data['car_capacity_kWh'] <= MIN_CAR_CAPACITY_KWH:
+            return None
+        soc = data['soc_init']
+        limits = _ev_limits(data, afe_abl_aggregate)
+    key += (_bucket(soc, soc_bucket),) + tuple(energy < power for power, energy in limits)
+    if group == 'bidir':
+        # V2G must be allowed for all units of a cluster or for none
+        key += (_bucket(data['arrival_soc'], soc_bucket), limits[1][1] >= 0)
+    return key
+
+
+def aggregate_inputs(inputs: Dict[str, Any], groups: List[str],
+                     soc_bucket: float = 0.05) -> Tuple[Dict[str, Any], Dict[str, Dict[str, List[str]]]]:
+    """
+    Merge identical units of `groups` whose SoC falls into the same `soc_bucket`-wide bucket.
+
+    A cluster is one device of the inputs dict: energies and power limits are summed,
+    efficiencies and SoCs are capacity-weighted means. Its id is that of its first unit.
+    All units of a cluster charge or all discharge (one mode binary), so objectives that
+    reward shifting energy between racks (bess_charge + bess_discharge > 0) lose that gain.
+
+    Args:
+        inputs: Output of prepare_inputs()
+        groups: Input groups to aggregate ('bess', 'unidir', 'bidir')
+        soc_bucket: Width of the SoC buckets (fraction)
+
+    Returns:
+        (aggregated inputs, {group: {cluster id: [unit ids]}} for clusters of two or more units)
+    """
+    afe_abl_aggregate = min((data['available'] for data in inputs.get('afe', {}).values()), default=1)
+    aggregated = dict(inputs)
+    clusters: Dict[str, Dict[str, List[str]]] = {}
+
+    for group in groups:
+        units = inputs.get(group) or {}
+        members: Dict[Any, List[str]] = defaultdict(list)
+        for unit_id, data in units.items():
+            key = _cluster_key(group, data, soc_bucket, afe_abl_aggregate)
+            members[key if key is not None else ('unit', unit_id)].append(unit_id)
+
+        merged = {}
+        clusters[group] = {}
+        for unit_ids in members.values():
+            cluster_id = unit_ids[0]
+            if len(unit_ids) == 1:
+                merged[cluster_id] = units[cluster_id]
+                continue
+            clusters[group][cluster_id] = unit_ids
+            merged[cluster_id] = _merge(group, [units[unit_id] for unit_id in unit_ids])
+        aggregated[group] = merged
+
+    return aggregated, clusters
+
+
+def _merge(group: str, units: List[Dict[str, Any]]) -> Dict[str, Any]:
+    capacity_field = 'capacity_kWh' if group == 'bess' else 'car_capacity_kWh'
+    capacity = sum(data[capacity_field] for data in units)
+    merged = {}
+    for field in units[0]:
+        if field in EXTENSIVE[group]:
+            merged[field] = sum(data[field] for data in units)
+        else:
+            merged[field] = sum(data[field] * data[capacity_field] for data in units) / capacity
+    return merged
+
+
+# ── Disaggregation ───────────────────────────────────────────────────────────
+
+def _split(total: float, headroom: List[float]) -> List[float]:
+    """Share `total` in proportion to `headroom` (equally if there is none)."""
+    room = sum(headroom)
+    if room <= 0:
+        return [total / len(headroom)] * len(headroom)
+    return [total * h / room for h in headroom]
+
+
+def disaggregate_output(output: Dict[str, Any], inputs: Dict[str, Any],
+                        clusters: Dict[str, Dict[str, List[str]]]) -> Dict[str, Any]:
+    """
+    Split the cluster results of an output dict back onto the units.
+
+    Charge and discharge are shared in proportion to each unit's headroom in that direction
+    (power limit and distance to its level / SoC bound) and the unit levels and SoCs are
+    recomputed with the unit's own state.
+
+    Args:
+        output: Output dict of a solve of aggregate_inputs()
+        inputs: The original (unaggregated) inputs
+        clusters: Clusters returned by aggregate_inputs()
+
+    Returns:
+        Output dict with one entry per unit, in the order of `inputs`
+    """
+    afe_abl_aggregate = min((data['available'] for data in inputs.get('afe', {}).values()), default=1)
+    output = dict(output)
+
+    for group, group_clusters in clusters.items():
+        if group not in output:
+            continue
+        results = dict(output[group])
+        for cluster_id, unit_ids in group_clusters.items():
+            cluster = results.pop(cluster_id)
+            units = [inputs[group][unit_id] for unit_id in unit_ids]
+            limits = _bess_limits if group == 'bess' else _ev_limits
+            charge_room, discharge_room = zip(*(_headroom(limits(data, afe_abl_aggregate)) for data in units))
+            charges = _split(cluster['charge'], list(charge_room))
+            discharges = _split(cluster.get('discharge', 0.0), list(discharge_room))
+            for unit_id, data, charge, discharge in zip(unit_ids, units, charges, discharges):
+                results[unit_id] = _unit_result(group, data, charge, discharge)
+        output[group] = {unit_id: results[unit_id] for unit_id in inputs[group]}
+
+    return output
+
+
+def _bess_limits(data: Dict[str, Any], afe_abl_aggregate: float) -> Tuple[Tuple[float, float], ...]:
+    """(power limit, energy limit) of charging and of discharging within the interval."""
+    efficiency, level_init = data['efficiency'], data['level_init_kWh']
+    level_lb = data['level_min_kWh'] if afe_abl_aggregate == 1 else data['level_fault_kWh']
+    return ((data['power_max_kW'], (data['level_max_kWh'] - level_init) / efficiency),
+            (data['power_max_kW'], (level_init - level_lb) * efficiency))
+
+
+def _ev_limits(data: Dict[str, Any], afe_abl_aggregate: float) -> Tuple[Tuple[float, float], ...]:
+    """(power limit, energy limit) of charging and, for V2G, of discharging within the interval."""
+    power_max = min(data['car_power_max_kW'], data['charger_power_max_kW'])
+    limits = ((power_max, (1 - data['soc_init']) * data['car_capacity_kWh'] / data['efficiency']),)
+    if 'arrival_soc' in data:
+        buffer = data['arrival_soc'] + data['target_soc']
+        if data['soc_init'] >= buffer and data['is_available'] == 1 and afe_abl_aggregate != 1:
+            energy = (data['soc_init'] - buffer) * data['efficiency'] * data['car_capacity_kWh']
+        else:
+            energy = -1.0  # V2G not allowed
+        limits += ((power_max, energy),)
+    return limits
+
+
+def _headroom(limits) -> Tuple[float, float]:
+    headroom = [max(0.0, min(power, energy)) for power, energy in limits]
+    return headroom[0], headroom[1] if len(headroom) > 1 else 0.0
+
+
+def _unit_result(group: str, data: Dict[str, Any], charge: float, discharge: float) -> Dict[str, float]:
+    efficiency = data['efficiency']
+    if group == 'bess':
+        level = data['level_init_kWh'] + efficiency * charge - discharge / efficiency
+        return {'charge': round(charge, 4), 'discharge': round(discharge, 4), 'level': round(level, 4)}
+
+    car_cap = data['car_capacity_kWh']
+    soc = data['soc_init'] + efficiency * charge / car_cap - discharge / (efficiency * car_cap)
+    if group == 'unidir':
+        return {'charge': round(charge, 4), 'soc': round(soc, 4)}
+    return {'charge': round(charge, 4), 'discharge': round(discharge, 4), 'soc': round(soc, 4)}
+
+
+def aggregation_groups(settings: Dict[str, Any]) -> Tuple[List[str], float]:
+    """
+    Groups to aggregate and the SoC bucket width from optimizerSettings.aggregation.
+
+    Returns:
+        ([] if aggregation is off, bucket width)
+    """
+    aggregation = settings.get('aggregation') or {}
+    types = aggregation.get('types') or []
+    unknown = [device_type for device_type in types if device_type not in AGGREGATABLE]
+    if unknown:
+        raise ValueError(f"Cannot aggregate device types {unknown}. Supported types: {list(AGGREGATABLE)}")
+    soc_bucket = float(aggregation.get('socBucket', 0.05))
+    if not 0 < soc_bucket <= 1:
+        raise ValueError(f"Invalid aggregation socBucket: {soc_bucket}")
+    return [AGGREGATABLE[device_type] for device_type in types], soc_bucket
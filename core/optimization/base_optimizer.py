@@ -19,7 +19,7 @@ limitations under the License.
 @Description: Base class for all optimization objectives with multi-asset support
 
 @Created: 6th February 2026
-@Last Modified: 22 April 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -27,10 +27,30 @@ limitations under the License.
 
 
 import logging
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, NamedTuple, Optional
 from abc import ABC, abstractmethod
 import pyomo.environ as pyo
 
+from optimization.aggregation import aggregate_inputs, aggregation_groups, disaggregate_output
+from optimization.fallback_dispatch import merit_order_dispatch
+from optimization.presolve import presolve_enabled, presolve_inputs, restore_output
+from optimization.result_cache import create_result_cache
+from optimization.solver_backends import create_backend, highs_info, pyomo_model_size
+
+
+class VariableBound(NamedTuple):
+    """
+    Objective-specific bound on a model variable.
+
+    `var` is the component name used by run_optimization() (e.g. 'bess_level', 'imp');
+    `index` is the device id, or None for a scalar variable / every index of an indexed one.
+    """
+    var: str
+    index: Optional[str] = None
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+
 
 class BaseOptimizer(ABC):
     """Base class for all optimizer implementations with multi-device support"""
@@ -38,9 +58,28 @@ class BaseOptimizer(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.logger = logging.getLogger(f'ems.optimizer.{self.__class__.__name__}')
         self.config = config
+        self.settings = config.get('generalSiteConfig', {}).get('optimizerSettings') or {}
         self.devices = {device['id']: device for device in config['devices']}
         self._parse_configuration()
 
+        # Solver backend (optimizerSettings.backend, see solver_backends.py)
+        self.backend = create_backend(self)
+
+        # Devices fixed by the inputs removed before the solve (optimizerSettings.presolve, see presolve.py)
+        self.presolve = presolve_enabled(self.settings, self.backend.name)
+        self.presolve_stats: Dict[str, Any] = {}
+
+        # Identical units merged before the solve (optimizerSettings.aggregation, see aggregation.py)
+        self.aggregate_groups, self.soc_bucket = aggregation_groups(self.settings)
+        self.aggregation_stats: Dict[str, Any] = {}
+
+        # Merit-order dispatch when the solve fails or exceeds its time budget
+        self.fallback = bool(self.settings.get('fallback', True))
+        self.fallback_count = 0
+
+        # Results of unchanged inputs reused (optimizerSettings.resultCache, see result_cache.py)
+        self.result_cache = create_result_cache(self)
+
     def _parse_configuration(self):
         """Parse and store configuration for all devices by type"""
         self.afes = self._get_devices_by_type('AFE')
@@ -98,6 +137,32 @@ class BaseOptimizer(ABC):
     def _get_devices_by_type(self, device_type: str) -> List[Dict[str, Any]]:
         return [d for d in self.config['devices'] if d.get('type') == device_type]
 
+    def required_parameters(self) -> Dict[str, List[str]]:
+        """
+        Measurement parameters read by prepare_inputs(), so that only these are fetched.
+
+        Returns:
+            {'averaged': [...15-minute averages...], 'recent': [...latest values...]}
+        """
+        averaged = [f"{d['id']}_POWER" for d in self.pvs + self.winds + self.loads + self.critical_loads]
+
+        recent = []
+        for afe in self.afes:
+            recent += [f"{afe['id']}_AVBL", f"{afe['id']}_GRIDSRVC"]
+        for bess in self.bess_units:
+            recent.append(f"{bess['id']}_SoC")
+        for charger in self.unidir_chargers:
+            recent += [f"{charger['id']}_{suffix}" for suffix in ('SoC', 'CAR_CAP', 'CAR_MAX_P')]
+        for charger in self.bidir_chargers:
+            recent += [f"{charger['id']}_{suffix}"
+                       for suffix in ('SoC', 'CAR_CAP', 'CAR_MAX_P', 'CAR_ARRIVAL', 'CAR_AVBL')]
+
+        return {'averaged': averaged, 'recent': recent}
+
+    def forecast_assets(self) -> List[str]:
+        """Devices whose power limit can follow a stored forecast (PV, wind, loads)."""
+        return [d['id'] for d in self.pvs + self.winds + self.loads + self.critical_loads]
+
     def prepare_inputs(self, averaged_data: Dict, recent_data: Dict) -> Dict[str, Any]:
         """
         Prepare optimizer inputs from database data.
@@ -191,13 +256,98 @@ class BaseOptimizer(ABC):
     def get_objective_weights(self) -> Dict[str, float]:
         pass
 
-    @abstractmethod
+    def get_additional_bounds(self, inputs: Dict[str, Any]) -> List[VariableBound]:
+        """Objective-specific variable bounds (none by default)."""
+        return []
+
     def get_additional_constraints(self, model, inputs: Dict[str, Any]) -> List:
-        pass
+        """
+        Objective-specific constraints, built from get_additional_bounds(). Bounds on
+        variables the model does not have (no devices of that type) are skipped.
+        """
+        constraints = []
+        for bound in self.get_additional_bounds(inputs):
+            var = getattr(model, bound.var, None)
+            if var is None:
+                continue
+            if bound.index is not None:
+                targets = [var[bound.index]]
+            elif var.is_indexed():
+                targets = list(var.values())
+            else:
+                targets = [var]
+            for target in targets:
+                if bound.lower is not None:
+                    constraints.append(target >= bound.lower)
+                if bound.upper is not None:
+                    constraints.append(target <= bound.upper)
+        return constraints
 
     def run_optimization(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Run the optimization model.
+        Run the optimization model through the configured solver backend, on clusters of
+        identical units when aggregation is configured.
+
+        With the result cache, inputs that quantize to a stored fingerprint return the stored
+        result (result['cached'] is set) without building or solving the model.
+
+        If the backend returns no solution (infeasible, error, or time budget exhausted without
+        a feasible plan), the rule-based merit-order dispatch of fallback_dispatch.py is returned
+        instead, with result['fallback'] set to the reason, so the cycle still has setpoints.
+        """
+        key = None
+        if self.result_cache:
+            key = self.result_cache.fingerprint(inputs)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return {**cached, 'cached': True}
+
+        result = self._solve(inputs)
+        if result['status'] == 'success' and key is not None:
+            self.result_cache.put(key, result)
+        if result['status'] == 'success' or not self.fallback:
+            return result
+
+        reason = result.get('solver_status') or result.get('message', 'error')
+        try:
+            start = time.perf_counter()
+            output = merit_order_dispatch(self, inputs)
+            dispatch_us = (time.perf_counter() - start) * 1e6
+        except Exception as e:
+            self.logger.error(f"Fallback dispatch failed: {e}")
+            return result
+
+        self.fallback_count += 1
+        self.logger.warning(f"Solver returned no solution ({reason}) - using the merit-order fallback dispatch")
+        return {'status': 'success', 'output': output, 'solver_status': result.get('solver_status'),
+                'fallback': reason, 'message': result.get('message'), 'fallback_us': round(dispatch_us, 1)}
+
+    def _solve(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Solve with the backend, after presolve and on aggregated inputs if configured."""
+        solve_inputs, removed = inputs, {}
+        if self.presolve:
+            solve_inputs, removed, stats = presolve_inputs(inputs)
+            self.presolve_stats = {'devices': {group: len(ids) for group, ids in removed.items()}, **stats}
+
+        if self.aggregate_groups:
+            units = solve_inputs
+            solve_inputs, clusters = aggregate_inputs(units, self.aggregate_groups, self.soc_bucket)
+            self.aggregation_stats = {
+                group: {'units': len(units.get(group) or {}), 'devices': len(solve_inputs.get(group) or {})}
+                for group in self.aggregate_groups
+            }
+
+        result = self.backend.solve(solve_inputs)
+        if result['status'] == 'success':
+            if self.aggregate_groups:
+                result['output'] = disaggregate_output(result['output'], units, clusters)
+            if removed:
+                result['output'] = restore_output(result['output'], inputs, removed)
+        return result
+
+    def build_pyomo_model(self, inputs: Dict[str, Any]) -> pyo.ConcreteModel:
+        """
+        Build the Pyomo model of one interval.
         All device types use per-device Pyomo variables.
         Aggregate grid variables (imp, exp, exp1, exp2) are coupled to per-AFE vars via constraints.
         """
@@ -390,7 +540,9 @@ class BaseOptimizer(ABC):
                         m.bidir_discharge[charger_id] <= (1 - m.bidir_mode[charger_id]) * max_discharge
                     )
                 else:
-                    m.constraints.add(m.bidir_discharge[charger_id] <= 0)
+                    # No V2G: discharge and the mode binary are fixed (charging)
+                    m.bidir_discharge[charger_id].fix(0)
+                    m.bidir_mode[charger_id].fix(1)
 
         # ── Power balance ────────────────────────────────────────────────────────
         total_pv       = sum(m.pv[pid]   for pid in pv_ids)    if pv_ids    else 0
@@ -448,99 +600,137 @@ class BaseOptimizer(ABC):
         for constraint in self.get_additional_constraints(m, inputs):
             m.constraints.add(constraint)
 
+        return m
+
+    def solve_pyomo(self, inputs: Dict[str, Any], time_limit: float = None,
+                    stats: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Build and solve the Pyomo model (the 'pyomo' backend), within `time_limit` seconds.
+        If given, `stats` receives the build time, model size and HiGHS solve statistics.
+        """
+        start = time.perf_counter()
+        m = self.build_pyomo_model(inputs)
+        if stats is not None:
+            stats.update(build_ms=(time.perf_counter() - start) * 1000, **pyomo_model_size(m))
+
         # ── Solve ────────────────────────────────────────────────────────────────
         try:
             solver = pyo.SolverFactory('highs')
-            result = solver.solve(m)
+            # Loaded below only if optimal - loading raises when there is no feasible solution,
+            # which would hide the termination condition (e.g. 'infeasible')
+            result = solver.solve(m, timelimit=time_limit, load_solutions=False)
+            solver_status = str(result.solver.termination_condition)
+            if stats is not None and getattr(solver, '_solver_model', None) is not None:
+                stats.update(highs_info(solver._solver_model))
 
             if (result.solver.status == pyo.SolverStatus.ok and
                     result.solver.termination_condition == pyo.TerminationCondition.optimal):
 
-                output = {
-                    "obj":  round(pyo.value(m.obj),  4),
-                    "imp":  round(pyo.value(m.imp),  4),
-                    "exp":  round(pyo.value(m.exp),  4),
-                    "exp1": round(pyo.value(m.exp1), 4),
-                    "exp2": round(pyo.value(m.exp2), 4),
-                }
+                m.solutions.load_from(result)
+                output = self.extract_output(m, inputs)
 
-                # Per-AFE results
-                if afe_ids:
-                    output['afe'] = {}
-                    for afe_id in afe_ids:
-                        output['afe'][afe_id] = {
-                            'imp':  round(pyo.value(m.afe_imp[afe_id]),  4),
-                            'exp':  round(pyo.value(m.afe_exp[afe_id]),  4),
-                            'exp1': round(pyo.value(m.afe_exp1[afe_id]), 4),
-                            'exp2': round(pyo.value(m.afe_exp2[afe_id]), 4),
-                        }
-
-                # Per-PV results
-                if pv_ids:
-                    output['pv'] = {
-                        pv_id: {'power': round(pyo.value(m.pv[pv_id]), 4)}
-                        for pv_id in pv_ids
-                    }
-
-                # Per-Wind results
-                if wind_ids:
-                    output['wind'] = {
-                        wind_id: {'power': round(pyo.value(m.wind[wind_id]), 4)}
-                        for wind_id in wind_ids
-                    }
-
-                # Per-Load results
-                if load_ids:
-                    output['load'] = {
-                        load_id: {'power': round(pyo.value(m.ld[load_id]), 4)}
-                        for load_id in load_ids
-                    }
-
-                # Per-Critical-Load results
-                if cload_ids:
-                    output['cload'] = {
-                        cload_id: {'power': round(pyo.value(m.cld[cload_id]), 4)}
-                        for cload_id in cload_ids
-                    }
-
-                # Per-BESS results
-                if bess_ids:
-                    output['bess'] = {
-                        bess_id: {
-                            'charge':    round(pyo.value(m.bess_charge[bess_id]),    4),
-                            'discharge': round(pyo.value(m.bess_discharge[bess_id]), 4),
-                            'level':     round(pyo.value(m.bess_level[bess_id]),     4),
-                        }
-                        for bess_id in bess_ids
-                    }
-
-                # Per-Unidirectional-EV results
-                if unidir_ids:
-                    output['unidir'] = {
-                        charger_id: {
-                            'charge': round(pyo.value(m.unidir_charge[charger_id]), 4),
-                            'soc':    round(pyo.value(m.unidir_soc[charger_id]),    4),
-                        }
-                        for charger_id in unidir_ids
-                    }
-
-                # Per-Bidirectional-EV results
-                if bidir_ids:
-                    output['bidir'] = {
-                        charger_id: {
-                            'charge':    round(pyo.value(m.bidir_charge[charger_id]),    4),
-                            'discharge': round(pyo.value(m.bidir_discharge[charger_id]), 4),
-                            'soc':       round(pyo.value(m.bidir_soc[charger_id]),       4),
-                        }
-                        for charger_id in bidir_ids
-                    }
-
-                return {'status': 'success', 'output': output}
+                return {'status': 'success', 'output': output, 'solver_status': solver_status}
 
             else:
                 self.logger.error("Optimizer failed to find solution")
-                return {'status': 'error', 'message': 'Solver did not find optimal solution'}
+                return {'status': 'error', 'message': 'Solver did not find optimal solution',
+                        'solver_status': solver_status}
 
         except Exception as e:
             self.logger.error(f"Error running optimization: {e}")
-            return {'status': 'error', 'message': str(e)}
\ No newline at end of file
+            return {'status': 'error', 'message': str(e)}
+
+    def extract_output(self, m, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Read the solved variable values into the multi-device output dict.
+        Works for any model that uses the component names of run_optimization().
+        """
+        afe_ids    = list(inputs.get('afe', {}).keys())
+        pv_ids     = list(inputs.get('pv', {}).keys())
+        wind_ids   = list(inputs.get('wind', {}).keys())
+        load_ids   = list(inputs.get('load', {}).keys())
+        cload_ids  = list(inputs.get('cload', {}).keys())
+        bess_ids   = list(inputs.get('bess', {}).keys())
+        unidir_ids = list(inputs.get('unidir', {}).keys())
+        bidir_ids  = list(inputs.get('bidir', {}).keys())
+
+        output = {
+            "obj":  round(pyo.value(m.obj),  4),
+            "imp":  round(pyo.value(m.imp),  4),
+            "exp":  round(pyo.value(m.exp),  4),
+            "exp1": round(pyo.value(m.exp1), 4),
+            "exp2": round(pyo.value(m.exp2), 4),
+        }
+
+        # Per-AFE results
+        if afe_ids:
+            output['afe'] = {}
+            for afe_id in afe_ids:
+                output['afe'][afe_id] = {
+                    'imp':  round(pyo.value(m.afe_imp[afe_id]),  4),
+                    'exp':  round(pyo.value(m.afe_exp[afe_id]),  4),
+                    'exp1': round(pyo.value(m.afe_exp1[afe_id]), 4),
+                    'exp2': round(pyo.value(m.afe_exp2[afe_id]), 4),
+                }
+
+        # Per-PV results
+        if pv_ids:
+            output['pv'] = {
+                pv_id: {'power': round(pyo.value(m.pv[pv_id]), 4)}
+                for pv_id in pv_ids
+            }
+
+        # Per-Wind results
+        if wind_ids:
+            output['wind'] = {
+                wind_id: {'power': round(pyo.value(m.wind[wind_id]), 4)}
+                for wind_id in wind_ids
+            }
+
+        # Per-Load results
+        if load_ids:
+            output['load'] = {
+                load_id: {'power': round(pyo.value(m.ld[load_id]), 4)}
+                for load_id in load_ids
+            }
+
+        # Per-Critical-Load results
+        if cload_ids:
+            output['cload'] = {
+                cload_id: {'power': round(pyo.value(m.cld[cload_id]), 4)}
+                for cload_id in cload_ids
+            }
+
+        # Per-BESS results
+        if bess_ids:
+            output['bess'] = {
+                bess_id: {
+                    'charge':    round(pyo.value(m.bess_charge[bess_id]),    4),
+                    'discharge': round(pyo.value(m.bess_discharge[bess_id]), 4),
+                    'level':     round(pyo.value(m.bess_level[bess_id]),     4),
+                }
+                for bess_id in bess_ids
+            }
+
+        # Per-Unidirectional-EV results
+        if unidir_ids:
+            output['unidir'] = {
+                charger_id: {
+                    'charge': round(pyo.value(m.unidir_charge[charger_id]), 4),
+                    'soc':    round(pyo.value(m.unidir_soc[charger_id]),    4),
+                }
+                for charger_id in unidir_ids
+            }
+
+        # Per-Bidirectional-EV results
+        if bidir_ids:
+            output['bidir'] = {
+                charger_id: {
+                    'charge':    round(pyo.value(m.bidir_charge[charger_id]),    4),
+                    'discharge': round(pyo.value(m.bidir_discharge[charger_id]), 4),
+                    'soc':       round(pyo.value(m.bidir_soc[charger_id]),       4),
+                }
+                for charger_id in bidir_ids
+            }
+
+        return output
@@ -0,0 +1,312 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: fallback_dispatch.py
+@Description: Rule-based merit-order dispatch, used by BaseOptimizer.run_optimization() when the
+              solver fails or runs out of its time budget (optimizerSettings.solveTimeLimit).
+              Works from the same inputs dict and objective weights as the MIP and returns the
+              same output dict, so the cycle still sends setpoints.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import math
+from typing import Dict, Any, List, Optional, Tuple
+
+EPS = 1e-9
+
+
+class _Source:
+    """Power that can be drawn by the demands: a PV/wind unit, a BESS, a V2G car or the grid."""
+    __slots__ = ('group', 'id', 'available', 'value', 'used')
+
+    def __init__(self, group: str, device_id: Optional[str], available: float, value: float):
+        self.group = group
+        self.id = device_id
+        self.available = max(0.0, available)
+        self.value = value
+        self.used = 0.0
+
+
+def _limits(bounds) -> Tuple[Dict, Dict]:
+    """Index the objective's VariableBounds by (var, index)."""
+    lower: Dict[Tuple[str, Any], float] = {}
+    upper: Dict[Tuple[str, Any], float] = {}
+    for bound in bounds:
+        key = (bound.var, bound.index)
+        if bound.lower is not None:
+            lower[key] = max(lower.get(key, -math.inf), bound.lower)
+        if bound.upper is not None:
+            upper[key] = min(upper.get(key, math.inf), bound.upper)
+    return lower, upper
+
+
+def _bound(limits: Dict, var: str, index: Any, default: float, tighter) -> float:
+    """`default` tightened by the bounds on every index of `var` and on `var[index]`."""
+    value = default
+    for key in ((var, None), (var, index)):
+        if key in limits:
+            value = tighter(value, limits[key])
+    return value
+
+
+def _draw(sources: List[_Source], amount: float, value: float, mandatory: bool = False,
+          exclude: Tuple = ()) -> float:
+    """
+    Serve up to `amount` kW from the sources in merit order.
+
+    A source is only used when serving the demand from it adds to the objective
+    (value + source value > 0), unless the demand is mandatory (critical loads).
+
+    Returns:
+        float: The power served
+    """
+    served = 0.0
+    for source in sources:
+        remaining = amount - served
+        if remaining <= EPS:
+            break
+        headroom = source.available - source.used
+        if headroom <= EPS or source.group in exclude or (source.group, source.id) in exclude:
+            continue
+        if not mandatory and value + source.value <= 0:
+            continue
+        take = min(remaining, headroom)
+        source.used += take
+        served += take
+    return served
+
+
+def merit_order_dispatch(optimizer, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Dispatch one interval without a solver.
+
+    Renewables are used first, then (in order) critical loads, loads, EVs by their SoC weight
+    and BESS charging are served; what the renewables do not cover comes from the BESS, the
+    grid or V2G, ranked by their objective weights, wherever that adds to the objective.
+    Leftover energy is exported (grid service first) and the rest of the renewables curtailed.
+    Device limits, AFE availability and the objective's upper bounds are respected; lower
+    bounds on levels and SoC only limit discharging.
+
+    Args:
+        optimizer: The BaseOptimizer (objective weights and bounds)
+        inputs: Output of prepare_inputs()
+
+    Returns:
+        Output dict with the structure of BaseOptimizer.extract_output()
+    """
+    weights = optimizer.get_objective_weights()
+    lower, upper = _limits(optimizer.get_additional_bounds(inputs))
+
+    afe_inputs = inputs.get('afe', {})
+    afe_abl_aggregate = min((data['available'] for data in afe_inputs.values()), default=1)
+
+    # ── Sources ───────────────────────────────────────────────────────────────
+    renewables: List[_Source] = []
+    for group, var, weight in (('pv', 'pv', 'pv'), ('wind', 'wind', 'wind')):
+        for device_id, data in inputs.get(group, {}).items():
+            available = _bound(upper, var, device_id, data['power_fct_kW'], min)
+            renewables.append(_Source(group, device_id, available, weights.get(weight, 0)))
+
+    dispatchable: List[_Source] = []
+    bess_sources: Dict[str, _Source] = {}
+    bess_headroom: Dict[str, float] = {}
+    for bess_id, data in inputs.get('bess', {}).items():
+        efficiency = data['efficiency']
+        level_init = data['level_init_kWh']
+        level_lb = data['level_min_kWh'] if afe_abl_aggregate == 1 else data['level_fault_kWh']
+        level_lb = _bound(lower, 'bess_level', bess_id, level_lb, max)
+        level_ub = _bound(upper, 'bess_level', bess_id, data['level_max_kWh'], min)
+        discharge_max = min(_bound(upper, 'bess_discharge', bess_id, data['power_max_kW'], min),
+                            (level_init - level_lb) * efficiency)
+        bess_headroom[bess_id] = min(_bound(upper, 'bess_charge', bess_id, data['power_max_kW'], min),
+                                     (level_ub - level_init) / efficiency)
+        source = _Source('bess', bess_id, discharge_max, weights.get('bess_discharge', 0))
+        bess_sources[bess_id] = source
+        dispatchable.append(source)
+
+    import_capacity = sum(_bound(upper, 'afe_imp', afe_id, data['max_kW'] * data['available'], min)
+                          for afe_id, data in afe_inputs.items() if data['grid_svc_kW'] == 0)
+    import_capacity = _bound(upper, 'imp', None, import_capacity, min)
+    grid = _Source('grid', None, import_capacity, weights.get('grid_import', 0))
+    dispatchable.append(grid)
+
+    v2g_sources: Dict[str, _Source] = {}
+    for charger_id, data in inputs.get('bidir', {}).items():
+        soc_init, car_cap = data['soc_init'], data['car_capacity_kWh']
+        buffer = data['arrival_soc'] + data['target_soc']
+        if soc_init >= buffer and data['is_available'] == 1 and afe_abl_aggregate != 1:
+            soc_lb = _bound(lower, 'bidir_soc', charger_id, buffer, max)
+            discharge_max = min(data['car_power_max_kW'], data['charger_power_max_kW'],
+                                (soc_init - soc_lb) * data['efficiency'] * car_cap)
+            discharge_max = _bound(upper, 'bidir_discharge', charger_id, discharge_max, min)
+            source = _Source('bidir', charger_id, discharge_max, weights.get('bidir_discharge', 0))
+            v2g_sources[charger_id] = source
+            dispatchable.append(source)
+
+    # Stable sort: ties keep the BESS, grid, V2G order
+    dispatchable.sort(key=lambda source: -source.value)
+    sources = renewables + dispatchable
+
+    # ── Demands ───────────────────────────────────────────────────────────────
+    served: Dict[str, Dict[str, float]] = {'load': {}, 'cload': {}, 'unidir': {}, 'bidir': {}, 'bess': {}}
+
+    for cload_id, data in inputs.get('cload', {}).items():
+        demand = _bound(upper, 'cld', cload_id, data['power_fct_kW'], min)
+        served['cload'][cload_id] = _draw(sources, demand, weights.get('critical_load', 0), mandatory=True)
+
+    for load_id, data in inputs.get('load', {}).items():
+        demand = _bound(upper, 'ld', load_id, data['power_fct_kW'], min)
+        served['load'][load_id] = _draw(sources, demand, weights.get('load', 0))
+
+    chargers = []
+    for group in ('unidir', 'bidir'):
+        for charger_id, data in inputs.get(group, {}).items():
+            soc_weight = min(0.8, max(0.2, data['soc_init']))
+            chargers.append((soc_weight, group, charger_id, data))
+    chargers.sort(key=lambda charger: -charger[0])
+    for soc_weight, group, charger_id, data in chargers:
+        demand = _bound(upper, f'{group}_charge', charger_id,
+                        min(data['car_power_max_kW'], data['charger_power_max_kW']), min)
+        if data['car_capacity_kWh'] > 0.2:
+            soc_ub = _bound(upper, f'{group}_soc', charger_id, 1.0, min)
+            demand = min(demand, (soc_ub - data['soc_init']) * data['car_capacity_kWh'] / data['efficiency'])
+        v2g = v2g_sources.get(charger_id) if group == 'bidir' else None
+        if v2g is not None and v2g.used > EPS:
+            served[group][charger_id] = 0.0
+            continue
+        served[group][charger_id] = _draw(sources, max(0.0, demand), weights.get('chargers', 0) * soc_weight,
+                                          exclude=(('bidir', charger_id),) if v2g else ())
+        if v2g is not None and served[group][charger_id] > EPS:
+            v2g.available = 0.0
+
+    for bess_id, source in bess_sources.items():
+        charge = 0.0
+        if source.used <= EPS:
+            charge = _draw(sources, max(0.0, bess_headroom[bess_id]), weights.get('bess_charge', 0),
+                           exclude=('bess',))
+            if charge > EPS:
+                source.available = 0.0
+        served['bess'][bess_id] = charge
+
+    # ── Grid ──────────────────────────────────────────────────────────────────
+    # Import goes to the AFEs that may import in order; an importing AFE cannot export
+    afe_flows = {afe_id: {'imp': 0.0, 'exp1': 0.0, 'exp2': 0.0} for afe_id in afe_inputs}
+    remaining = grid.used
+    for afe_id, data in afe_inputs.items():
+        if data['grid_svc_kW'] == 0 and remaining > EPS:
+            take = min(remaining, _bound(upper, 'afe_imp', afe_id, data['max_kW'] * data['available'], min))
+            afe_flows[afe_id]['imp'] = take
+            remaining -= take
+
+    export_sources = [source for source in sources if source.group != 'grid']
+    export_room = {
+        afe_id: data['max_kW'] * data['available']
+        for afe_id, data in afe_inputs.items() if afe_flows[afe_id]['imp'] <= EPS
+    }
+
+    service_total = _bound(upper, 'exp2', None, math.inf, min)
+    for afe_id, room in export_room.items():
+        grid_svc = afe_inputs[afe_id]['grid_svc_kW']
+        if grid_svc <= 0 or service_total <= EPS:
+            continue
+        exp2 = _draw(export_sources, min(room, grid_svc, service_total), weights.get('grid_service_export', 0))
+        afe_flows[afe_id]['exp2'] = exp2
+        export_room[afe_id] = room - exp2
+        service_total -= exp2
+
+    export_total = min(_bound(upper, 'exp1', None, math.inf, min),
+                       _bound(upper, 'exp', None, math.inf, min) - sum(f['exp2'] for f in afe_flows.values()))
+    for afe_id, room in export_room.items():
+        if export_total <= EPS:
+            break
+        exp1 = _draw(export_sources, min(room, export_total), weights.get('grid_export', 0))
+        afe_flows[afe_id]['exp1'] = exp1
+        export_total -= exp1
+
+    # ── Output ────────────────────────────────────────────────────────────────
+    used = {(source.group, source.id): source.used for source in sources}
+    imp = sum(f['imp'] for f in afe_flows.values())
+    exp1 = sum(f['exp1'] for f in afe_flows.values())
+    exp2 = sum(f['exp2'] for f in afe_flows.values())
+
+    obj = (weights.get('grid_service_export', 0) * exp2
+           + weights.get('grid_import', 0) * imp
+           + weights.get('grid_export', 0) * exp1)
+    output: Dict[str, Any] = {
+        'obj': 0.0, 'imp': round(imp, 4), 'exp': round(exp1 + exp2, 4), 'exp1': round(exp1, 4), 'exp2': round(exp2, 4),
+    }
+
+    if afe_inputs:
+        output['afe'] = {
+            afe_id: {'imp': round(f['imp'], 4), 'exp': round(f['exp1'] + f['exp2'], 4),
+                     'exp1': round(f['exp1'], 4), 'exp2': round(f['exp2'], 4)}
+            for afe_id, f in afe_flows.items()
+        }
+
+    for group, weight in (('pv', 'pv'), ('wind', 'wind')):
+        if inputs.get(group):
+            output[group] = {}
+            for device_id in inputs[group]:
+                power = used[(group, device_id)]
+                obj += weights.get(weight, 0) * power
+                output[group][device_id] = {'power': round(power, 4)}
+
+    for group, weight in (('load', 'load'), ('cload', 'critical_load')):
+        if inputs.get(group):
+            output[group] = {}
+            for device_id in inputs[group]:
+                power = served[group][device_id]
+                obj += weights.get(weight, 0) * power
+                output[group][device_id] = {'power': round(power, 4)}
+
+    if inputs.get('bess'):
+        output['bess'] = {}
+        for bess_id, data in inputs['bess'].items():
+            charge, discharge = served['bess'][bess_id], bess_sources[bess_id].used
+            level = data['level_init_kWh'] + data['efficiency'] * charge - discharge / data['efficiency']
+            obj += weights.get('bess_charge', 0) * charge + weights.get('bess_discharge', 0) * discharge
+            output['bess'][bess_id] = {
+                'charge': round(charge, 4), 'discharge': round(discharge, 4), 'level': round(level, 4),
+            }
+
+    for group in ('unidir', 'bidir'):
+        if not inputs.get(group):
+            continue
+        output[group] = {}
+        for charger_id, data in inputs[group].items():
+            car_cap, efficiency = data['car_capacity_kWh'], data['efficiency']
+            charge = served[group][charger_id]
+            v2g = v2g_sources.get(charger_id) if group == 'bidir' else None
+            discharge = v2g.used if v2g else 0.0
+            soc = data['soc_init']
+            if car_cap > 0.2:
+                soc += efficiency * charge / car_cap - discharge / (efficiency * car_cap)
+            obj += weights.get('chargers', 0) * min(0.8, max(0.2, data['soc_init'])) * charge
+            obj += weights.get('bidir_discharge', 0) * discharge
+            result = {'charge': round(charge, 4), 'soc': round(soc, 4)}
+            if group == 'bidir':
+                result = {'charge': round(charge, 4), 'discharge': round(discharge, 4), 'soc': round(soc, 4)}
+            output[group][charger_id] = result
+
+    output['obj'] = round(obj, 4)
+    return output
@@ -0,0 +1,477 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: horizon_model.py
+@Description: Receding-horizon (MPC) formulation of the BaseOptimizer model: every variable
+              gets a step axis, BESS levels and EV SoCs are linked from step to step, and
+              PV/wind/load limits follow the stored forecasts. The model is built block-wise
+              with NumPy (one array operation per constraint family, not per device and step)
+              from per-type device tables and compiled to a scipy.sparse matrix; only the
+              first step is applied. With one step of one hour it is the single-interval
+              model of run_optimization() (the 'sparse' backend).
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import math
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import highspy
+import numpy as np
+from scipy import sparse
+
+INF = math.inf
+
+# EV SoC bounds are targets: applied at the end of the horizon, not at every step
+TERMINAL_BOUNDS = ('unidir_soc', 'bidir_soc')
+
+
+class HorizonModel:
+    """
+    LP/MILP assembled from blocks of columns (one row per device, one column per step) and
+    families of rows added with one call each. Coefficients are kept as arrays of
+    (row, column, value) triplets and compiled to a scipy.sparse CSC matrix once.
+    """
+
+    def __init__(self, steps: int, maximize: bool = True):
+        self.steps = steps
+        self.maximize = maximize
+        self.blocks: Dict[str, Tuple[List[Any], np.ndarray]] = {}
+        self.num_col = 0
+        self.num_row = 0
+        self._col_lower: List[np.ndarray] = []
+        self._col_upper: List[np.ndarray] = []
+        self._col_cost: List[np.ndarray] = []
+        self._integer: List[np.ndarray] = []
+        self._row_lower: List[np.ndarray] = []
+        self._row_upper: List[np.ndarray] = []
+        self._triplets: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._compiled = None
+
+    # ── Columns ───────────────────────────────────────────────────────────────
+
+    def add_block(self, name: str, ids: Sequence[Any] = None, lower=0.0, upper=INF, cost=0.0,
+                  integer: bool = False) -> np.ndarray:
+        """
+        Add one column per device and step.
+
+        Args:
+            name: Component name (as in BaseOptimizer.run_optimization(), e.g. 'bess_level')
+            ids: Device ids, or None for a scalar variable (a single row of steps)
+            lower, upper, cost: Scalars or arrays broadcastable to (devices, steps)
+
+        Returns:
+            (devices, steps) array of column positions
+        """
+        n = 1 if ids is None else len(ids)
+        shape = (n, self.steps)
+        cols = self.num_col + np.arange(n * self.steps).reshape(shape)
+        self.num_col += n * self.steps
+        self.blocks[name] = ([None] if ids is None else list(ids), cols)
+        self._col_lower.append(np.broadcast_to(np.asarray(lower, dtype=np.float64), shape).ravel())
+        self._col_upper.append(np.broadcast_to(np.asarray(upper, dtype=np.float64), shape).ravel())
+        self._col_cost.append(np.broadcast_to(np.asarray(cost, dtype=np.float64), shape).ravel())
+        self._integer.append(np.full(n * self.steps, integer))
+        self._compiled = None
+        return cols
+
+    def has(self, name: str) -> bool:
+        return name in self.blocks
+
+    def cols(self, name: str) -> np.ndarray:
+        return self.blocks[name][1]
+
+    def device_cols(self, name: str) -> Dict[Any, np.ndarray]:
+        """Column positions of a component per device, {device id: columns of all steps}."""
+        if name not in self.blocks:
+            return {}
+        ids, cols = self.blocks[name]
+        return dict(zip(ids, cols))
+
+    def tighten(self, cols: np.ndarray, lower: Optional[float] = None, upper: Optional[float] = None):
+        """Intersect the bounds of `cols` with [lower, upper]."""
+        lower_all, upper_all = self._flat_bounds()
+        if lower is not None:
+            lower_all[cols] = np.maximum(lower_all[cols], lower)
+        if upper is not None:
+            upper_all[cols] = np.minimum(upper_all[cols], upper)
+
+    def _flat_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self._col_lower) != 1:
+            self._col_lower = [np.concatenate(self._col_lower)] if self._col_lower else [np.empty(0)]
+            self._col_upper = [np.concatenate(self._col_upper)] if self._col_upper else [np.empty(0)]
+        elif not self._col_lower[0].flags.writeable:
+            self._col_lower = [self._col_lower[0].copy()]
+            self._col_upper = [self._col_upper[0].copy()]
+        return self._col_lower[0], self._col_upper[0]
+
+    # ── Rows ──────────────────────────────────────────────────────────────────
+
+    def add_rows(self, shape: Tuple[int, ...], terms: Sequence[Tuple[np.ndarray, Any]],
+                 lower=-INF, upper=INF) -> np.ndarray:
+        """
+        Add a family of rows `lower <= sum(coef * x[cols]) <= upper`, one per element of `shape`.
+
+        Each term is (cols, coef). `cols` has the row shape, or extra leading axes that are
+        summed over (e.g. (devices, steps) columns on (steps,) rows gives one sum per step);
+        `coef` is broadcast to the shape of `cols`.
+
+        Returns:
+            Array of row positions with the given shape
+        """
+        size = int(np.prod(shape))
+        rows = self.num_row + np.arange(size).reshape(shape)
+        self.num_row += size
+        for cols, coef in terms:
+            self.add_entries(rows, cols, coef)
+        self._row_lower.append(np.broadcast_to(np.asarray(lower, dtype=np.float64), shape).ravel())
+        self._row_upper.append(np.broadcast_to(np.asarray(upper, dtype=np.float64), shape).ravel())
+        self._compiled = None
+        return rows
+
+    def add_entries(self, rows: np.ndarray, cols: np.ndarray, coef):
+        """Add coefficients to existing rows (`rows` is broadcast to the shape of `cols`)."""
+        cols = np.asarray(cols)
+        if cols.size == 0:
+            return
+        rows = np.broadcast_to(rows, cols.shape)
+        values = np.broadcast_to(np.asarray(coef, dtype=np.float64), cols.shape)
+        self._triplets.append((rows.ravel(), cols.ravel(), values.ravel()))
+        self._compiled = None
+
+    # ── Compilation ───────────────────────────────────────────────────────────
+
+    def to_csc(self) -> sparse.csc_matrix:
+        """The constraint matrix; repeated (row, column) entries are summed."""
+        if self._compiled is None:
+            if self._triplets:
+                rows = np.concatenate([t[0] for t in self._triplets])
+                cols = np.concatenate([t[1] for t in self._triplets])
+                values = np.concatenate([t[2] for t in self._triplets])
+            else:
+                rows = cols = np.empty(0, dtype=np.int64)
+                values = np.empty(0)
+            matrix = sparse.coo_matrix((values, (rows, cols)), shape=(self.num_row, self.num_col)).tocsc()
+            matrix.eliminate_zeros()
+            self._compiled = matrix
+        return self._compiled
+
+    @property
+    def num_nz(self) -> int:
+        return self.to_csc().nnz
+
+    @property
+    def col_cost(self) -> np.ndarray:
+        return np.concatenate(self._col_cost) if self._col_cost else np.empty(0)
+
+    @property
+    def integer(self) -> np.ndarray:
+        return np.concatenate(self._integer) if self._integer else np.empty(0, dtype=bool)
+
+    def to_highs_lp(self) -> highspy.HighsLp:
+        col_lower, col_upper = self._flat_bounds()
+        matrix = self.to_csc()
+        lp = highspy.HighsLp()
+        lp.num_col_ = self.num_col
+        lp.num_row_ = self.num_row
+        lp.col_cost_ = self.col_cost
+        lp.col_lower_ = col_lower
+        lp.col_upper_ = col_upper
+        lp.row_lower_ = np.concatenate(self._row_lower) if self._row_lower else np.empty(0)
+        lp.row_upper_ = np.concatenate(self._row_upper) if self._row_upper else np.empty(0)
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.num_col_ = self.num_col
+        lp.a_matrix_.num_row_ = self.num_row
+        lp.a_matrix_.start_ = matrix.indptr.astype(np.int32)
+        lp.a_matrix_.index_ = matrix.indices.astype(np.int32)
+        lp.a_matrix_.value_ = matrix.data
+        integer = self.integer
+        if integer.any():
+            lp.integrality_ = np.where(integer, highspy.HighsVarType.kInteger,
+                                       highspy.HighsVarType.kContinuous).tolist()
+        lp.sense_ = highspy.ObjSense.kMaximize if self.maximize else highspy.ObjSense.kMinimize
+        return lp
+
+    # ── Solutions ─────────────────────────────────────────────────────────────
+
+    def shift_map(self) -> np.ndarray:
+        """
+        Source column of every column when a solution is moved one step forward (step t
+        takes step t+1, the last step keeps its value) - the warm start of the next cycle.
+        """
+        source = np.arange(self.num_col)
+        for _, cols in self.blocks.values():
+            source[cols[:, :-1]] = cols[:, 1:]
+        return source
+
+    def step_view(self, values: np.ndarray, step: int = 0) -> SimpleNamespace:
+        """
+        The values of one step in the shape of the Pyomo model (view.imp,
+        view.bess_level['bess1'], view.obj), so BaseOptimizer.extract_output() can read it.
+        """
+        view = SimpleNamespace()
+        for name, (ids, cols) in self.blocks.items():
+            step_values = values[cols[:, step]]
+            if ids == [None]:
+                setattr(view, name, float(step_values[0]))
+            else:
+                setattr(view, name, dict(zip(ids, step_values.tolist())))
+        step_cols = np.concatenate([cols[:, step] for _, cols in self.blocks.values()])
+        view.obj = float(np.dot(self.col_cost[step_cols], values[step_cols]))
+        return view
+
+    def trajectories(self, values: np.ndarray, names: Sequence[str]) -> Dict[str, Dict[Any, List[float]]]:
+        """Per-step values of the given components, {name: {device id: [values per step]}}."""
+        result = {}
+        for name in names:
+            if name in self.blocks:
+                ids, cols = self.blocks[name]
+                result[name] = {device_id: np.round(values[row], 4).tolist()
+                                for device_id, row in zip(ids, cols)}
+        return result
+
+
+# ── Device tables ─────────────────────────────────────────────────────────────
+
+class DeviceTable:
+    """
+    The inputs of one device type as columns: table.ids, and table['efficiency'] etc. as
+    (devices, 1) arrays that broadcast over steps.
+    """
+
+    def __init__(self, devices: Dict[str, Dict[str, float]]):
+        self.ids = list(devices.keys())
+        rows = list(devices.values())
+        fields = rows[0].keys() if rows else ()
+        self._columns = {field: np.fromiter((row[field] for row in rows), dtype=np.float64,
+                                            count=len(rows)).reshape(-1, 1)
+                         for field in fields}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self._columns[field]
+
+
+def device_tables(inputs: Dict[str, Any]) -> Dict[str, DeviceTable]:
+    """One DeviceTable per device group of prepare_inputs()."""
+    return {group: DeviceTable(inputs.get(group, {}))
+            for group in ('afe', 'pv', 'wind', 'load', 'cload', 'bess', 'unidir', 'bidir')}
+
+
+# ── BaseOptimizer formulation over a horizon ──────────────────────────────────
+
+def forecast_matrix(table: DeviceTable, forecasts: Dict[str, Any], steps: int) -> np.ndarray:
+    """
+    (devices, steps) power limits of a PV/wind/load group in kW: step 0 is the measured
+    15-minute average, later steps come from `forecasts`[device id] (kW per step).
+    Devices without a forecast keep their measured value.
+    """
+    matrix = np.repeat(table['power_fct_kW'], steps, axis=1)
+    if steps > 1 and forecasts:
+        for i, device_id in enumerate(table.ids):
+            forecast = forecasts.get(device_id)
+            if forecast is not None and len(forecast) >= steps:
+                matrix[i, 1:] = np.abs(np.asarray(forecast[1:steps], dtype=np.float64))
+    # Interpolated forecasts around zero leave limits like 1e-15 kW
+    matrix[matrix < 1e-6] = 0.0
+    return matrix
+
+
+def apply_horizon_bounds(model: HorizonModel, bounds):
+    """Apply VariableBound entries to every step (EV SoC targets to the last step only)."""
+    positions: Dict[str, Dict[Any, int]] = {}
+    for bound in bounds:
+        if not model.has(bound.var):
+            continue
+        ids, cols = model.blocks[bound.var]
+        if bound.index is not None:
+            if bound.var not in positions:
+                positions[bound.var] = {device_id: i for i, device_id in enumerate(ids)}
+            position = positions[bound.var].get(bound.index)
+            if position is None:
+                continue
+            cols = cols[position][None, :]
+        if bound.var in TERMINAL_BOUNDS:
+            cols = cols[:, -1]
+        model.tighten(cols, bound.lower, bound.upper)
+
+
+def build_horizon_model(optimizer, inputs: Dict[str, Any], steps: int, step_hours: float) -> HorizonModel:
+    """
+    Build the multi-period model.
+
+    Per step the constraints are those of BaseOptimizer.run_optimization() with energy
+    terms scaled by the step length; BESS levels and EV SoCs start from the measured state
+    and carry over from one step to the next. Availability, grid service requests and
+    connected cars are taken as constant over the horizon.
+
+    Args:
+        optimizer: BaseOptimizer providing the weights and objective-specific bounds
+        inputs: Output of prepare_inputs(), optionally with a 'forecast' entry
+        steps: Number of steps
+        step_hours: Step length in hours
+
+    Returns:
+        HorizonModel
+    """
+    T = steps
+    dt = step_hours
+    weights = optimizer.get_objective_weights()
+    w = lambda key: weights.get(key, 0)
+
+    tables = device_tables(inputs)
+    ids = {group: table.ids for group, table in tables.items()}
+    hm = HorizonModel(steps)
+    step_shape = (T,)
+
+    # ── Aggregate grid variables ──────────────────────────────────────────────
+    imp  = hm.add_block('imp',  cost=w('grid_import'))[0]
+    exp  = hm.add_block('exp')[0]
+    exp1 = hm.add_block('exp1', cost=w('grid_export'))[0]
+    exp2 = hm.add_block('exp2', cost=w('grid_service_export'))[0]
+
+    # ── Per-AFE ───────────────────────────────────────────────────────────────
+    afe = tables['afe']
+    afe_abl_aggregate = afe['available'].min() if len(afe) else 1
+    if len(afe):
+        afe_cap = afe['max_kW'] * afe['available']
+        grid_svc = afe['grid_svc_kW']
+        import_cap = np.where(grid_svc == 0, afe_cap, 0.0)
+
+        afe_imp  = hm.add_block('afe_imp',  ids['afe'])
+        afe_exp  = hm.add_block('afe_exp',  ids['afe'])
+        afe_exp1 = hm.add_block('afe_exp1', ids['afe'])
+        afe_exp2 = hm.add_block('afe_exp2', ids['afe'], upper=grid_svc)
+        afe_mod  = hm.add_block('afe_mod',  ids['afe'], upper=1.0, integer=True)
+
+        for total, per_afe in ((imp, afe_imp), (exp, afe_exp), (exp1, afe_exp1), (exp2, afe_exp2)):
+            hm.add_rows(step_shape, [(total, 1.0), (per_afe, -1.0)], 0.0, 0.0)
+
+        shape = afe_imp.shape
+        hm.add_rows(shape, [(afe_imp, 1.0), (afe_mod, -import_cap)], upper=0.0)
+        hm.add_rows(shape, [(afe_exp, 1.0), (afe_mod, afe_cap)], upper=afe_cap)
+        hm.add_rows(shape, [(afe_exp, 1.0), (afe_exp1, -1.0), (afe_exp2, -1.0)], 0.0, 0.0)
+    else:
+        for total in (imp, exp, exp1, exp2):
+            hm.tighten(total, upper=0.0)
+
+    # ── PV / wind / loads: limits from forecasts ──────────────────────────────
+    supply = [(imp, 1.0)]
+    demand = [(exp, 1.0)]
+    for group, name, weight_key, side in (('pv', 'pv', 'pv', supply), ('wind', 'wind', 'wind', supply),
+                                          ('load', 'ld', 'load', demand), ('cload', 'cld', 'critical_load', demand)):
+        if ids[group]:
+            limits = forecast_matrix(tables[group], inputs.get('forecast'), T)
+            cols = hm.add_block(name, ids[group], upper=limits, cost=w(weight_key))
+            side.append((cols, 1.0))
+
+    # ── Per-BESS: level[t] = level[t-1] + dt * (eff * charge[t] - discharge[t] / eff) ─
+    if ids['bess']:
+        bess = tables['bess']
+        eff = bess['efficiency']
+        power_max = bess['power_max_kW']
+        level_init = bess['level_init_kWh']
+        level_lb = bess['level_min_kWh'] if afe_abl_aggregate == 1 else bess['level_fault_kWh']
+        level_max = bess['level_max_kWh']
+
+        charge    = hm.add_block('bess_charge',    ids['bess'], cost=w('bess_charge'))
+        discharge = hm.add_block('bess_discharge', ids['bess'], cost=w('bess_discharge'))
+        mode      = hm.add_block('bess_mode',      ids['bess'], upper=1.0, integer=True)
+        level     = hm.add_block('bess_level',     ids['bess'], lower=np.maximum(level_lb, 0.0), upper=level_max)
+        shape = charge.shape
+
+        rhs = np.zeros(shape)
+        rhs[:, :1] = level_init
+        rows = hm.add_rows(shape, [(level, 1.0), (charge, -dt * eff), (discharge, dt / eff)], rhs, rhs)
+        hm.add_entries(rows[:, 1:], level[:, :-1], -1.0)
+        hm.add_rows(shape, [(charge, 1.0), (mode, -power_max)], upper=0.0)
+        hm.add_rows(shape, [(discharge, 1.0), (mode, power_max)], upper=power_max)
+
+        supply.append((discharge, 1.0))
+        demand.append((charge, 1.0))
+
+    # ── Per-unidirectional EV: soc[t] = soc[t-1] + dt * eff * charge[t] / capacity ─
+    if ids['unidir']:
+        unidir = tables['unidir']
+        car_cap = unidir['car_capacity_kWh']
+        has_car = car_cap > 0.2
+        charge_coef = np.where(has_car, unidir['efficiency'] / np.where(has_car, car_cap, 1.0), 0.0)
+        charge_max = np.minimum(unidir['car_power_max_kW'], unidir['charger_power_max_kW'])
+        soc_init = unidir['soc_init']
+        soc_weight = np.clip(soc_init, 0.2, 0.8)
+
+        charge = hm.add_block('unidir_charge', ids['unidir'], upper=charge_max, cost=w('chargers') * soc_weight)
+        soc    = hm.add_block('unidir_soc',    ids['unidir'], upper=1.0)
+        shape = charge.shape
+
+        rhs = np.zeros(shape)
+        rhs[:, :1] = soc_init
+        rows = hm.add_rows(shape, [(soc, 1.0), (charge, -dt * charge_coef)], rhs, rhs)
+        hm.add_entries(rows[:, 1:], soc[:, :-1], -1.0)
+
+        demand.append((charge, 1.0))
+
+    # ── Per-bidirectional EV ──────────────────────────────────────────────────
+    if ids['bidir']:
+        bidir = tables['bidir']
+        car_cap = bidir['car_capacity_kWh']
+        has_car = car_cap > 0.2
+        eff = bidir['efficiency']
+        safe_cap = np.where(has_car, car_cap, 1.0)
+        charge_coef = np.where(has_car, eff / safe_cap, 0.0)
+        discharge_coef = np.where(has_car, 1.0 / (eff * safe_cap), 0.0)
+        soc_init = bidir['soc_init']
+        buffer_soc = bidir['arrival_soc'] + bidir['target_soc']
+        power_max = np.minimum(bidir['car_power_max_kW'], bidir['charger_power_max_kW'])
+        can_discharge = (soc_init >= buffer_soc) & (bidir['is_available'] == 1) & (afe_abl_aggregate != 1)
+        # Without a car model the energy limit of run_optimization() is applied per step
+        energy_limit = np.where(has_car, power_max, np.minimum(power_max, (soc_init - buffer_soc) * eff * car_cap))
+        discharge_max = np.where(can_discharge, energy_limit, 0.0)
+        soc_weight = np.clip(soc_init, 0.2, 0.8)
+
+        charge    = hm.add_block('bidir_charge',    ids['bidir'], cost=w('chargers') * soc_weight)
+        discharge = hm.add_block('bidir_discharge', ids['bidir'], upper=discharge_max, cost=w('bidir_discharge'))
+        soc       = hm.add_block('bidir_soc',       ids['bidir'], lower=np.where(can_discharge, buffer_soc, 0.0),
+                                 upper=1.0)
+        # Without V2G the mode binary is fixed to charging
+        mode      = hm.add_block('bidir_mode',      ids['bidir'], lower=np.where(can_discharge, 0.0, 1.0),
+                                 upper=1.0, integer=True)
+        shape = charge.shape
+
+        rhs = np.zeros(shape)
+        rhs[:, :1] = soc_init
+        rows = hm.add_rows(shape, [(soc, 1.0), (charge, -dt * charge_coef), (discharge, dt * discharge_coef)], rhs, rhs)
+        hm.add_entries(rows[:, 1:], soc[:, :-1], -1.0)
+        hm.add_rows(shape, [(charge, 1.0), (mode, -power_max)], upper=0.0)
+        hm.add_rows(shape, [(discharge, 1.0), (mode, discharge_max)], upper=discharge_max)
+
+        supply.append((discharge, 1.0))
+        demand.append((charge, 1.0))
+
+    # ── Power balance per step ────────────────────────────────────────────────
+    hm.add_rows(step_shape, supply + [(cols, -coef) for cols, coef in demand], 0.0, 0.0)
+
+    apply_horizon_bounds(hm, optimizer.get_additional_bounds(inputs))
+    return hm
@@ -0,0 +1,333 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: linear_model.py
+@Description: Solver-independent LP/MILP container (columns, rows, coefficients) and the
+              BaseOptimizer formulation expressed on it, for backends that talk to HiGHS
+              directly instead of going through Pyomo.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import math
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import highspy
+import numpy as np
+
+INF = math.inf
+
+
+class LinearModel:
+    """
+    Columns are registered under a (name, index) key that mirrors the Pyomo component names
+    of BaseOptimizer.run_optimization(), e.g. ('bess_charge', 'bess1') or ('imp', None).
+    Coefficients are collected as (row, column, value) triplets and compiled to CSC once.
+    """
+
+    def __init__(self, maximize: bool = True):
+        self.maximize = maximize
+        self.columns: Dict[str, Dict[Any, int]] = {}
+        self.keys: List[Tuple[str, Any]] = []
+        self.col_lower: List[float] = []
+        self.col_upper: List[float] = []
+        self.col_cost: List[float] = []
+        self.integer: List[bool] = []
+        self.row_lower: List[float] = []
+        self.row_upper: List[float] = []
+        self._rows: List[int] = []
+        self._cols: List[int] = []
+        self._values: List[float] = []
+
+    @property
+    def num_col(self) -> int:
+        return len(self.col_cost)
+
+    @property
+    def num_row(self) -> int:
+        return len(self.row_lower)
+
+    @property
+    def num_nz(self) -> int:
+        return len(self._values)
+
+    def add_var(self, name: str, index=None, lower: float = 0.0, upper: float = INF,
+                cost: float = 0.0, integer: bool = False) -> int:
+        """Add a column and return its position."""
+        col = self.num_col
+        self.columns.setdefault(name, {})[index] = col
+        self.keys.append((name, index))
+        self.col_lower.append(lower)
+        self.col_upper.append(upper)
+        self.col_cost.append(cost)
+        self.integer.append(integer)
+        return col
+
+    def add_binary(self, name: str, index=None, cost: float = 0.0) -> int:
+        return self.add_var(name, index, 0.0, 1.0, cost, integer=True)
+
+    def add_row(self, terms: Sequence[Tuple[int, float]], lower: float = -INF, upper: float = INF) -> int:
+        """Add `lower <= sum(coef * x[col]) <= upper` and return the row position."""
+        row = self.num_row
+        for col, coef in terms:
+            if coef != 0:
+                self._rows.append(row)
+                self._cols.append(col)
+                self._values.append(coef)
+        self.row_lower.append(lower)
+        self.row_upper.append(upper)
+        return row
+
+    def col(self, name: str, index=None) -> int:
+        return self.columns[name][index]
+
+    def has(self, name: str) -> bool:
+        return name in self.columns
+
+    def indices(self, name: str) -> list:
+        return list(self.columns.get(name, {}).keys())
+
+    def device_cols(self, name: str) -> Dict[Any, np.ndarray]:
+        """Column positions of a component per device, {device id: columns}."""
+        return {index: np.array([col]) for index, col in self.columns.get(name, {}).items()}
+
+    def tighten(self, col: int, lower: Optional[float] = None, upper: Optional[float] = None):
+        """Intersect the bounds of a column with [lower, upper]."""
+        if lower is not None:
+            self.col_lower[col] = max(self.col_lower[col], lower)
+        if upper is not None:
+            self.col_upper[col] = min(self.col_upper[col], upper)
+
+    def add_cost(self, col: int, cost: float):
+        self.col_cost[col] += cost
+
+    def to_csc(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Column-wise (start, index, value) arrays of the constraint matrix."""
+        cols = np.asarray(self._cols, dtype=np.int64)
+        order = np.argsort(cols, kind='stable')
+        start = np.zeros(self.num_col + 1, dtype=np.int32)
+        np.cumsum(np.bincount(cols, minlength=self.num_col), out=start[1:])
+        index = np.asarray(self._rows, dtype=np.int32)[order]
+        value = np.asarray(self._values, dtype=np.float64)[order]
+        return start, index, value
+
+    def to_highs_lp(self) -> highspy.HighsLp:
+        lp = highspy.HighsLp()
+        lp.num_col_ = self.num_col
+        lp.num_row_ = self.num_row
+        lp.col_cost_ = np.asarray(self.col_cost, dtype=np.float64)
+        lp.col_lower_ = np.asarray(self.col_lower, dtype=np.float64)
+        lp.col_upper_ = np.asarray(self.col_upper, dtype=np.float64)
+        lp.row_lower_ = np.asarray(self.row_lower, dtype=np.float64)
+        lp.row_upper_ = np.asarray(self.row_upper, dtype=np.float64)
+        start, index, value = self.to_csc()
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.num_col_ = self.num_col
+        lp.a_matrix_.num_row_ = self.num_row
+        lp.a_matrix_.start_ = start
+        lp.a_matrix_.index_ = index
+        lp.a_matrix_.value_ = value
+        if any(self.integer):
+            lp.integrality_ = [highspy.HighsVarType.kInteger if is_int else highspy.HighsVarType.kContinuous
+                               for is_int in self.integer]
+        lp.sense_ = highspy.ObjSense.kMaximize if self.maximize else highspy.ObjSense.kMinimize
+        return lp
+
+    def solution_view(self, values: np.ndarray) -> 'SolutionView':
+        return SolutionView(self, np.asarray(values, dtype=np.float64))
+
+
+class _IndexedValues:
+    def __init__(self, columns: Dict[Any, int], values: np.ndarray):
+        self._columns = columns
+        self._values = values
+
+    def __getitem__(self, index) -> float:
+        return float(self._values[self._columns[index]])
+
+
+class SolutionView:
+    """
+    Attribute access to a solution vector in the shape of the Pyomo model (view.imp,
+    view.bess_level['bess1'], view.obj), so BaseOptimizer.extract_output() can read it.
+    """
+
+    def __init__(self, model: LinearModel, values: np.ndarray):
+        self._model = model
+        self.values = values
+        self.obj = float(np.dot(np.asarray(model.col_cost, dtype=np.float64), values))
+
+    def __getattr__(self, name: str):
+        columns = self._model.columns.get(name)
+        if columns is None:
+            raise AttributeError(name)
+        if None in columns and len(columns) == 1:
+            return float(self.values[columns[None]])
+        return _IndexedValues(columns, self.values)
+
+
+# ── BaseOptimizer formulation ─────────────────────────────────────────────────
+
+def apply_additional_bounds(lm: LinearModel, bounds):
+    """Apply VariableBound entries as column bounds (skipping variables the model lacks)."""
+    for bound in bounds:
+        if not lm.has(bound.var):
+            continue
+        indices = [bound.index] if bound.index is not None else lm.indices(bound.var)
+        for index in indices:
+            lm.tighten(lm.col(bound.var, index), bound.lower, bound.upper)
+
+
+def build_linear_model(optimizer, inputs: Dict[str, Any]) -> LinearModel:
+    """
+    Build the single-interval model of BaseOptimizer.run_optimization() as a LinearModel.
+
+    Args:
+        optimizer: BaseOptimizer providing the objective weights and additional bounds
+        inputs: Inputs from prepare_inputs()
+
+    Returns:
+        LinearModel with the same variables, constraints and objective as the Pyomo path
+    """
+    weights = optimizer.get_objective_weights()
+    w = lambda key: weights.get(key, 0)
+    lm = LinearModel(maximize=True)
+
+    afe_in    = inputs.get('afe', {})
+    bess_in   = inputs.get('bess', {})
+    unidir_in = inputs.get('unidir', {})
+    bidir_in  = inputs.get('bidir', {})
+
+    # ── Aggregate grid variables ──────────────────────────────────────────────
+    imp  = lm.add_var('imp',  cost=w('grid_import'))
+    exp  = lm.add_var('exp')
+    exp1 = lm.add_var('exp1', cost=w('grid_export'))
+    exp2 = lm.add_var('exp2', cost=w('grid_service_export'))
+
+    # ── Per-AFE ───────────────────────────────────────────────────────────────
+    if afe_in:
+        afe = {}
+        for afe_id in afe_in:
+            afe[afe_id] = (lm.add_var('afe_imp', afe_id), lm.add_var('afe_exp', afe_id),
+                           lm.add_var('afe_exp1', afe_id), lm.add_var('afe_exp2', afe_id),
+                           lm.add_binary('afe_mod', afe_id))
+
+        for total, position in ((imp, 0), (exp, 1), (exp1, 2), (exp2, 3)):
+            lm.add_row([(total, 1.0)] + [(cols[position], -1.0) for cols in afe.values()], 0.0, 0.0)
+
+        for afe_id, data in afe_in.items():
+            a_imp, a_exp, a_exp1, a_exp2, a_mod = afe[afe_id]
+            capacity = data['max_kW'] * data['available']
+            if data['grid_svc_kW'] == 0:
+                lm.add_row([(a_imp, 1.0), (a_mod, -capacity)], upper=0.0)
+            else:
+                lm.add_row([(a_imp, 1.0)], upper=0.0)
+            lm.add_row([(a_exp, 1.0), (a_mod, capacity)], upper=capacity)
+            lm.add_row([(a_exp, 1.0), (a_exp1, -1.0), (a_exp2, -1.0)], 0.0, 0.0)
+            lm.add_row([(a_exp2, 1.0)], upper=data['grid_svc_kW'])
+    else:
+        for col in (imp, exp, exp1, exp2):
+            lm.add_row([(col, 1.0)], 0.0, 0.0)
+
+    afe_abl_aggregate = min((data['available'] for data in afe_in.values()), default=1)
+
+    # Power balance terms: supply positive, demand negative
+    balance = [(imp, 1.0), (exp, -1.0)]
+
+    # ── Forecast-limited sources and loads ────────────────────────────────────
+    for group, var_name, weight, sign in (('pv', 'pv', 'pv', 1.0), ('wind', 'wind', 'wind', 1.0),
+                                          ('load', 'ld', 'load', -1.0), ('cload', 'cld', 'critical_load', -1.0)):
+        for device_id, data in inputs.get(group, {}).items():
+            col = lm.add_var(var_name, device_id, cost=w(weight))
+            lm.add_row([(col, 1.0)], upper=data['power_fct_kW'])
+            balance.append((col, sign))
+
+    # ── Per-BESS ──────────────────────────────────────────────────────────────
+    for bess_id, data in bess_in.items():
+        efficiency = data['efficiency']
+        power_max = data['power_max_kW']
+        charge    = lm.add_var('bess_charge', bess_id, cost=w('bess_charge'))
+        discharge = lm.add_var('bess_discharge', bess_id, cost=w('bess_discharge'))
+        mode      = lm.add_binary('bess_mode', bess_id)
+        level     = lm.add_var('bess_level', bess_id, 0.0, data['level_max_kWh'])
+
+        lm.add_row([(level, 1.0), (charge, -efficiency), (discharge, 1.0 / efficiency)],
+                   data['level_init_kWh'], data['level_init_kWh'])
+        lm.add_row([(charge, 1.0), (mode, -power_max)], upper=0.0)
+        lm.add_row([(discharge, 1.0), (mode, power_max)], upper=power_max)
+        level_lb = data['level_min_kWh'] if afe_abl_aggregate == 1 else data['level_fault_kWh']
+        lm.add_row([(level, 1.0)], lower=level_lb)
+        balance += [(discharge, 1.0), (charge, -1.0)]
+
+    # ── Per-Unidirectional-EV ─────────────────────────────────────────────────
+    for charger_id, data in unidir_in.items():
+        car_cap = data['car_capacity_kWh']
+        soc_weight = min(0.8, max(0.2, data['soc_init']))
+        charge = lm.add_var('unidir_charge', charger_id, cost=w('chargers') * soc_weight)
+        soc    = lm.add_var('unidir_soc', charger_id, 0.0, 1.0)
+
+        terms = [(soc, 1.0)]
+        if car_cap > 0.2:
+            terms.append((charge, -data['efficiency'] / car_cap))
+        lm.add_row(terms, data['soc_init'], data['soc_init'])
+        lm.add_row([(charge, 1.0)], upper=min(data['car_power_max_kW'], data['charger_power_max_kW']))
+        balance.append((charge, -1.0))
+
+    # ── Per-Bidirectional-EV ──────────────────────────────────────────────────
+    for charger_id, data in bidir_in.items():
+        car_cap       = data['car_capacity_kWh']
+        soc_init      = data['soc_init']
+        efficiency    = data['efficiency']
+        car_power     = data['car_power_max_kW']
+        charger_power = data['charger_power_max_kW']
+        soc_weight = min(0.8, max(0.2, soc_init))
+
+        charge    = lm.add_var('bidir_charge', charger_id, cost=w('chargers') * soc_weight)
+        discharge = lm.add_var('bidir_discharge', charger_id, cost=w('bidir_discharge'))
+        soc       = lm.add_var('bidir_soc', charger_id, 0.0, 1.0)
+        mode      = lm.add_binary('bidir_mode', charger_id)
+
+        terms = [(soc, 1.0)]
+        if car_cap > 0.2:
+            terms += [(charge, -efficiency / car_cap), (discharge, 1.0 / (efficiency * car_cap))]
+        lm.add_row(terms, soc_init, soc_init)
+
+        charge_max = min(car_power, charger_power)
+        lm.add_row([(charge, 1.0), (mode, -charge_max)], upper=0.0)
+
+        if (soc_init >= data['arrival_soc'] + data['target_soc'] and data['is_available'] == 1
+                and afe_abl_aggregate != 1):
+            max_discharge = min(car_power, charger_power,
+                                (soc_init - data['arrival_soc'] - data['target_soc']) * efficiency * car_cap)
+            lm.add_row([(discharge, 1.0), (mode, max_discharge)], upper=max_discharge)
+        else:
+            # No V2G: discharge and the mode binary are fixed (charging)
+            lm.tighten(discharge, upper=0.0)
+            lm.tighten(mode, lower=1.0)
+        balance += [(discharge, 1.0), (charge, -1.0)]
+
+    # ── Power balance ─────────────────────────────────────────────────────────
+    lm.add_row(balance, 0.0, 0.0)
+
+    # ── Objective-specific bounds ─────────────────────────────────────────────
+    apply_additional_bounds(lm, optimizer.get_additional_bounds(inputs))
+    return lm
@@ -0,0 +1,82 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: lp_mode.py
+@Description: LP mode (optimizerSettings.lpMode, 'highs', 'sparse' and 'horizon' backends) -
+              the afe_mod, bess_mode and bidir_mode binaries only keep the two flows of a
+              device apart (import/export, charge/discharge). The relaxation is solved first;
+              the devices whose flows are both non-zero are then re-solved with only their
+              binaries integer, until no device has simultaneous flows. Such a solution is
+              feasible for the MILP and optimal for a relaxation of it, so it is a MILP optimum.
+              If other devices of a type take over the simultaneous flows, all binaries of
+              the type become integer; after at most two re-solves per type the model is the
+              full MILP.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+from typing import Dict, Any, List, Set
+
+import numpy as np
+
+# Binary of each device type and the two flows it keeps apart
+COMPLEMENTARY_FLOWS = {
+    'afe_mod': ('afe_imp', 'afe_exp'),
+    'bess_mode': ('bess_charge', 'bess_discharge'),
+    'bidir_mode': ('bidir_charge', 'bidir_discharge'),
+}
+
+# Flows at or below this (kW) count as zero
+FLOW_TOLERANCE = 1e-6
+
+
+def simultaneous_flows(model, values: np.ndarray, tolerance: float = FLOW_TOLERANCE) -> Dict[str, List[Any]]:
+    """
+    Devices with both flows non-zero (in any step).
+
+    Args:
+        model: LinearModel or HorizonModel
+        values: Column values of a solution of `model`
+
+    Returns:
+        {binary name: device ids}, only binaries with such devices
+    """
+    conflicts = {}
+    for binary, (first, second) in COMPLEMENTARY_FLOWS.items():
+        first_cols, second_cols = model.device_cols(first), model.device_cols(second)
+        ids = [device_id for device_id, cols in first_cols.items()
+               if device_id in second_cols
+               and np.any((values[cols] > tolerance) & (values[second_cols[device_id]] > tolerance))]
+        if ids:
+            conflicts[binary] = ids
+    return conflicts
+
+
+def integer_mask(model, devices: Dict[str, Set[Any]]) -> np.ndarray:
+    """Integrality of the columns of `model` with only the binaries of `devices` integer."""
+    mask = np.zeros(model.num_col, dtype=bool)
+    for binary, ids in devices.items():
+        cols = model.device_cols(binary)
+        for device_id in ids:
+            mask[cols[device_id]] = True
+    return mask
@@ -19,7 +19,7 @@ limitations under the License.
 @Description: Specific optimizer implementations for each objective function
 
 @Created: 6th February 2026
-@Last Modified: 16 February 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -27,7 +27,7 @@ limitations under the License.
 
 
 from typing import Dict, List, Any
-from optimization.base_optimizer import BaseOptimizer
+from optimization.base_optimizer import BaseOptimizer, VariableBound
 
 
 class MaxWeightedPowerFlow(BaseOptimizer):
@@ -55,7 +55,7 @@ class MaxWeightedPowerFlow(BaseOptimizer):
             'bidir_discharge': -42,        # Penalty for V2G discharge
         }
     
-    def get_additional_constraints(self, model, inputs: Dict[str, float]) -> List:
+    def get_additional_bounds(self, inputs: Dict[str, float]) -> List[VariableBound]:
         """No additional constraints for max weighted power flow"""
         return []
 
@@ -86,7 +86,7 @@ class MaxSelfConsumptionOptimizer(BaseOptimizer):
             'bidir_discharge': -2,         # Small penalty for V2G discharge
         }
     
-    def get_additional_constraints(self, model, inputs: Dict[str, float]) -> List:
+    def get_additional_bounds(self, inputs: Dict[str, float]) -> List[VariableBound]:
         """No additional constraints for max self-consumption"""
         return []
 
@@ -116,28 +116,26 @@ class MaxEVSatisfactionOptimizer(BaseOptimizer):
             'bidir_discharge': -50,        # Strong penalty for V2G discharge
         }
     
-    def get_additional_constraints(self, model, inputs: Dict[str, float]) -> List:
+    def get_additional_bounds(self, inputs: Dict[str, float]) -> List[VariableBound]:
         """
         Add constraints to ensure EV targets are met
         """
-        constraints = []
+        bounds = []
         
         # Ensure V1G charges toward high SoC for all unidirectional chargers
         for charger_id, data in inputs.get('unidir', {}).items():
             if data.get('car_capacity_kWh', 0) > 0.2:
                 # Target at least 80% SoC
-                if hasattr(model, 'unidir_soc'):
-                    constraints.append(model.unidir_soc[charger_id] >= 0.8)
+                bounds.append(VariableBound('unidir_soc', charger_id, lower=0.8))
         
         # Ensure V2G maintains buffer above arrival SoC + target for all bidirectional chargers
         for charger_id, data in inputs.get('bidir', {}).items():
             if data.get('car_capacity_kWh', 0) > 0.2:
                 arrival_soc = data.get('arrival_soc', 0)
                 target_soc = data.get('target_soc', 0.2)
-                if hasattr(model, 'bidir_soc'):
-                    constraints.append(model.bidir_soc[charger_id] >= arrival_soc + target_soc)
+                bounds.append(VariableBound('bidir_soc', charger_id, lower=arrival_soc + target_soc))
         
-        return constraints
+        return bounds
 
 
 class MinFossilEmissionsOptimizer(BaseOptimizer):
@@ -166,11 +164,11 @@ class MinFossilEmissionsOptimizer(BaseOptimizer):
             'bidir_discharge': 5,          # Use V2G to avoid grid import
         }
     
-    def get_additional_constraints(self, model, inputs: Dict[str, float]) -> List:
+    def get_additional_bounds(self, inputs: Dict[str, float]) -> List[VariableBound]:
         """
         Add constraints to minimize emissions
         """
-        constraints = []
+        bounds = []
         
         # If renewables + storage can cover critical loads, zero grid import
         renewable_available = inputs.get('pv_fct', 0) + inputs.get('wind_fct', 0)
@@ -186,7 +184,7 @@ class MinFossilEmissionsOptimizer(BaseOptimizer):
             # Soft constraint through objective weights already handles this
             pass
         
-        return constraints
+        return bounds
 
 
 class MaxReliabilityOptimizer(BaseOptimizer):
@@ -215,24 +213,24 @@ class MaxReliabilityOptimizer(BaseOptimizer):
             'bidir_discharge': -5,         # Penalty for V2G (preserve backup)
         }
     
-    def get_additional_constraints(self, model, inputs: Dict[str, float]) -> List:
+    def get_additional_bounds(self, inputs: Dict[str, float]) -> List[VariableBound]:
         """
         Add constraints to ensure reliability
         """
-        constraints = []
+        bounds = []
         
         # Maintain each BESS at least 60% of max capacity for backup
         for bess_id, bess_data in inputs.get('bess', {}).items():
             level_max = bess_data.get('level_max_kWh', 0)
-            if level_max > 0 and hasattr(model, 'bess_level'):
-                constraints.append(model.bess_level[bess_id] >= 0.6 * level_max)
+            if level_max > 0:
+                bounds.append(VariableBound('bess_level', bess_id, lower=0.6 * level_max))
         
         # Critical loads must always be fully served
         cld_fct = inputs.get('cld_fct', 0)
         if cld_fct > 0:
-            constraints.append(model.cld >= cld_fct)
+            bounds.append(VariableBound('cld', lower=cld_fct))
         
-        return constraints
+        return bounds
 
 
 class LifeExtentBESSOptimizer(BaseOptimizer):
@@ -261,27 +259,26 @@ class LifeExtentBESSOptimizer(BaseOptimizer):
             'bidir_discharge': 2,          # Small reward for using V2G instead of BESS
         }
     
-    def get_additional_constraints(self, model, inputs: Dict[str, float]) -> List:
+    def get_additional_bounds(self, inputs: Dict[str, float]) -> List[VariableBound]:
         """
         Add constraints to protect BESS
         """
-        constraints = []
+        bounds = []
         
         # Keep each BESS in optimal SoC range (40-70% of max capacity)
         for bess_id, bess_data in inputs.get('bess', {}).items():
             level_max = bess_data.get('level_max_kWh', 0)
             power_max = bess_data.get('power_max_kW', 0)
             
-            if level_max > 0 and hasattr(model, 'bess_level'):
-                constraints.append(model.bess_level[bess_id] >= 0.4 * level_max)
-                constraints.append(model.bess_level[bess_id] <= 0.7 * level_max)
+            if level_max > 0:
+                bounds.append(VariableBound('bess_level', bess_id, lower=0.4 * level_max, upper=0.7 * level_max))
             
             # Limit power throughput to reduce stress
-            if power_max > 0 and hasattr(model, 'bess_charge'):
-                constraints.append(model.bess_charge[bess_id] <= 0.5 * power_max)
-                constraints.append(model.bess_discharge[bess_id] <= 0.5 * power_max)
+            if power_max > 0:
+                bounds.append(VariableBound('bess_charge', bess_id, upper=0.5 * power_max))
+                bounds.append(VariableBound('bess_discharge', bess_id, upper=0.5 * power_max))
         
-        return constraints
+        return bounds
 
 
 class PeakShavingOptimizer(BaseOptimizer):
@@ -310,25 +307,37 @@ class PeakShavingOptimizer(BaseOptimizer):
             'bidir_discharge': 10,         # Use V2G for peak shaving
         }
     
-    def get_additional_constraints(self, model, inputs: Dict[str, float]) -> List:
+    def get_additional_bounds(self, inputs: Dict[str, float]) -> List[VariableBound]:
         """
         Add constraints for peak shaving
         """
-        constraints = []
+        bounds = []
         
         # If grid service is requested, prioritize it
         grid_svc = inputs.get('grid_svc', 0)
         if grid_svc > 0:
             # Ensure grid service need is met
-            constraints.append(model.exp2 >= 0.9 * grid_svc)
+            bounds.append(VariableBound('exp2', lower=0.9 * grid_svc))
         
         # Limit grid import to reduce peak demand
         afe_max = inputs.get('afe_max', 0)
         if afe_max > 0:
             # Limit import to 50% of AFE capacity (peak shaving threshold)
-            constraints.append(model.imp <= 0.5 * afe_max)
+            bounds.append(VariableBound('imp', upper=0.5 * afe_max))
         
-        return constraints
+        return bounds
+
+
+# Optimizer per objectiveFunction
+OPTIMIZERS = {
+    'maxWeightPowerFlow': MaxWeightedPowerFlow,
+    'maxSelfConsumption': MaxSelfConsumptionOptimizer,
+    'maxEVSatisfaction': MaxEVSatisfactionOptimizer,
+    'minFossilEmissions': MinFossilEmissionsOptimizer,
+    'maxReliability': MaxReliabilityOptimizer,
+    'lifeExtentBESS': LifeExtentBESSOptimizer,
+    'peakShaving': PeakShavingOptimizer,
+}
 
 
 # Optimizer factory
@@ -347,20 +356,10 @@ def create_optimizer(config: Dict[str, Any]) -> BaseOptimizer:
     """
     objective = config.get('generalSiteConfig', {}).get('objectiveFunction', 'maxSelfConsumption')
     
-    optimizers = {
-        'maxWeightPowerFlow': MaxWeightedPowerFlow,
-        'maxSelfConsumption': MaxSelfConsumptionOptimizer,
-        'maxEVSatisfaction': MaxEVSatisfactionOptimizer,
-        'minFossilEmissions': MinFossilEmissionsOptimizer,
-        'maxReliability': MaxReliabilityOptimizer,
-        'lifeExtentBESS': LifeExtentBESSOptimizer,
-        'peakShaving': PeakShavingOptimizer,
-    }
-    
-    if objective not in optimizers:
+    if objective not in OPTIMIZERS:
         raise ValueError(
             f"Unsupported objective function: {objective}. "
-            f"Supported objectives: {list(optimizers.keys())}"
+            f"Supported objectives: {list(OPTIMIZERS.keys())}"
         )
     
-    return optimizers[objective](config)
\ No newline at end of file
+    return OPTIMIZERS[objective](config)
\ No newline at end of file
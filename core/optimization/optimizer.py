@@ -19,7 +19,7 @@ limitations under the License.
 @Description: Multi-objective optimizer utilities with asset validation
 
 @Created: 3rd February 2026
-@Last Modified: 22 April 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -27,9 +27,10 @@ limitations under the License.
 
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from optimization.asset_validator import AssetValidator
 from optimization.objective_optimizers import create_optimizer
+from optimization.solver_pool import SolverPool
 
 
 class OptimizerRunner:
@@ -40,18 +41,23 @@ class OptimizerRunner:
     objectives on DC microgrid configurations with multiple assets.
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], solver_pool: SolverPool = None, site_id: str = None):
         """
         Initialize optimizer with configuration validation
         
         Args:
             config: Configuration dictionary with 'devices' and 'generalSiteConfig'
+            solver_pool: Solve slots shared with other sites of the process (None: solve directly)
+            site_id: Site the solves are scheduled as in `solver_pool`
             
         Raises:
             ValueError: If configuration is invalid for the specified objective
         """
         self.logger = logging.getLogger('ems.optimizer')
         self.config = config
+        self.solver_pool = solver_pool
+        self.site_id = site_id or 'default'
+        self.solver_wait_ms = None
         
         # Validate configuration
         validator = AssetValidator()
@@ -79,6 +85,36 @@ class OptimizerRunner:
             self.logger.error(f"Failed to create optimizer: {e}")
             raise
     
+    def required_parameters(self) -> Dict[str, List[str]]:
+        """
+        Measurement parameters the active optimizer reads
+        
+        Returns:
+            Dictionary with 'averaged' and 'recent' parameter lists
+        """
+        return self.optimizer.required_parameters()
+    
+    def forecast_horizon(self) -> Optional[Tuple[int, float]]:
+        """
+        Horizon of a receding-horizon backend
+        
+        Returns:
+            (steps, step minutes), or None if the backend does not read forecasts
+        """
+        backend = self.optimizer.backend
+        if not backend.uses_forecasts:
+            return None
+        return backend.steps, backend.step_minutes
+    
+    def forecast_assets(self) -> List[str]:
+        """
+        Devices whose forecasts the optimizer reads
+        
+        Returns:
+            List of device ids (asset keys of the forecasts table)
+        """
+        return self.optimizer.forecast_assets()
+    
     def prepare_inputs(self, averaged_data: Dict, recent_data: Dict) -> Dict[str, float]:
         """
         Prepare optimizer inputs from database data
@@ -104,8 +140,39 @@ class OptimizerRunner:
                 - 'status': 'success' or 'error'
                 - 'output': optimizer results (if success)
                 - 'message': error message (if error)
+                - 'solver_status': solver termination condition (if the solver ran)
+                - 'fallback': why the merit-order fallback dispatch was used (if it was)
+                - 'cached': True if the result was reused from the result cache
+        """
+        if self.solver_pool is None:
+            return self.optimizer.run_optimization(inputs)
+        with self.solver_pool.slot(self.site_id) as wait_ms:
+            self.solver_wait_ms = wait_ms
+            return self.optimizer.run_optimization(inputs)
+    
+    def solver_stats(self) -> Dict[str, Any]:
+        """
+        Stats of the last solve from the solver backend
+        
+        Returns:
+            Dictionary with backend name, timings, whether the solve was warm-started,
+            the mean warm/cold solve times (warm_start_saved_ms is their difference)
+            and the number of fallback dispatches since startup; with presolve, the
+            removed devices per group and variables; with aggregation, the
+            number of units and solved devices per group; with the result cache, its
+            hit/miss counters (the solve stats are those of the last actual solve); with a
+            shared solver pool, the time the last solve waited for its slot
         """
-        return self.optimizer.run_optimization(inputs)
+        stats = {**self.optimizer.backend.solver_stats(), 'fallbacks': self.optimizer.fallback_count}
+        if self.solver_pool is not None:
+            stats['solver_wait_ms'] = round(self.solver_wait_ms or 0.0, 3)
+        if self.optimizer.presolve_stats:
+            stats['presolve'] = self.optimizer.presolve_stats
+        if self.optimizer.aggregation_stats:
+            stats['aggregation'] = self.optimizer.aggregation_stats
+        if self.optimizer.result_cache:
+            stats['result_cache'] = self.optimizer.result_cache.stats()
+        return stats
     
     def get_optimizer_info(self) -> Dict[str, Any]:
         """
@@ -120,6 +187,8 @@ class OptimizerRunner:
         return {
             'objective': objective,
             'optimizer_class': self.optimizer.__class__.__name__,
+            'backend': self.optimizer.backend.name,
+            'horizon': self.forecast_horizon(),
             'weights': weights,
             'asset_types': list(set(d['type'] for d in self.config['devices'])),
             'device_count': len(self.config['devices'])
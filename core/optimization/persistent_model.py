@@ -0,0 +1,411 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: persistent_model.py
+@Description: Persistent variant of the BaseOptimizer model. The structure is built once per
+              device set with every changing input held in a mutable Param; each cycle only
+              updates Param values and variable bounds and re-solves through the APPSI HiGHS
+              persistent interface, which pushes just the changed coefficients to the solver.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import logging
+import time
+from typing import Dict, Any, Tuple
+
+import pyomo.environ as pyo
+from pyomo.contrib.appsi.base import TerminationCondition
+from pyomo.contrib.appsi.solvers import Highs
+
+GROUPS = ('afe', 'pv', 'wind', 'load', 'cload', 'bess', 'unidir', 'bidir')
+
+WEIGHT_KEYS = (
+    'pv', 'wind', 'load', 'critical_load', 'chargers', 'grid_service_export',
+    'bess_charge', 'bess_discharge', 'grid_import', 'grid_export', 'bidir_discharge',
+)
+
+
+def _mutable(index_set=None):
+    if index_set is None:
+        return pyo.Param(mutable=True, initialize=0, within=pyo.Reals)
+    return pyo.Param(index_set, mutable=True, initialize=0, within=pyo.Reals)
+
+
+class PersistentModel:
+    """
+    Same formulation as BaseOptimizer.run_optimization(), with the input-dependent branches
+    folded into Params (e.g. an AFE in grid-service mode gets an import limit factor of 0,
+    an EV without a car gets a SoC coefficient of 0), so the structure never depends on inputs.
+    Objective-specific constraints come from get_additional_bounds() and are applied as
+    variable bounds.
+    """
+
+    def __init__(self, optimizer, warm_start: bool = False, time_limit: float = None):
+        """
+        Args:
+            optimizer: The BaseOptimizer that owns this model (weights and bounds)
+            warm_start: Pass the previous cycle's variable values to HiGHS as a MIP start
+            time_limit: Solver time limit in seconds (default: none)
+        """
+        self.optimizer = optimizer
+        self.warm_start = warm_start
+        self.time_limit = time_limit
+        self.has_solution = False
+        self.logger = logging.getLogger('ems.optimizer.persistent')
+        self.model = None
+        self.signature = None
+        self.solver = None
+        self._bounded = set()
+        self.stats = {'builds': 0, 'solves': 0, 'build_ms': 0.0, 'update_ms': 0.0, 'solve_ms': 0.0}
+
+    @staticmethod
+    def signature_of(inputs: Dict[str, Any]) -> Tuple:
+        """The device set of an input dict - the model is rebuilt when it changes."""
+        return tuple((group, tuple(inputs.get(group, {}).keys())) for group in GROUPS)
+
+    # ── Structure ─────────────────────────────────────────────────────────────
+
+    def build(self, inputs: Dict[str, Any]):
+        """Build the model structure for the device set of `inputs`."""
+        start = time.perf_counter()
+        ids = {group: list(inputs.get(group, {}).keys()) for group in GROUPS}
+
+        m = pyo.ConcreteModel()
+        m.constraints = pyo.ConstraintList()
+        m.w = pyo.Param(WEIGHT_KEYS, mutable=True, initialize=0, within=pyo.Reals)
+
+        # ── Aggregate grid variables ──────────────────────────────────────────
+        m.imp  = pyo.Var(domain=pyo.NonNegativeReals)
+        m.exp  = pyo.Var(domain=pyo.NonNegativeReals)
+        m.exp1 = pyo.Var(domain=pyo.NonNegativeReals)
+        m.exp2 = pyo.Var(domain=pyo.NonNegativeReals)
+
+        # ── Per-AFE ───────────────────────────────────────────────────────────
+        if ids['afe']:
+            m.afe_id_set = pyo.Set(initialize=ids['afe'])
+            m.afe_imp  = pyo.Var(m.afe_id_set, domain=pyo.NonNegativeReals)
+            m.afe_exp  = pyo.Var(m.afe_id_set, domain=pyo.NonNegativeReals)
+            m.afe_exp1 = pyo.Var(m.afe_id_set, domain=pyo.NonNegativeReals)
+            m.afe_exp2 = pyo.Var(m.afe_id_set, domain=pyo.NonNegativeReals)
+            m.afe_mod  = pyo.Var(m.afe_id_set, domain=pyo.Binary)
+            m.afe_max_kW         = _mutable(m.afe_id_set)
+            m.afe_available      = _mutable(m.afe_id_set)
+            m.afe_import_allowed = _mutable(m.afe_id_set)
+            m.afe_grid_svc       = _mutable(m.afe_id_set)
+
+            m.constraints.add(m.imp  == sum(m.afe_imp[aid]  for aid in ids['afe']))
+            m.constraints.add(m.exp  == sum(m.afe_exp[aid]  for aid in ids['afe']))
+            m.constraints.add(m.exp1 == sum(m.afe_exp1[aid] for aid in ids['afe']))
+            m.constraints.add(m.exp2 == sum(m.afe_exp2[aid] for aid in ids['afe']))
+
+            for aid in ids['afe']:
+                capacity = m.afe_max_kW[aid] * m.afe_available[aid]
+                m.constraints.add(m.afe_imp[aid] <= m.afe_mod[aid] * capacity * m.afe_import_allowed[aid])
+                m.constraints.add(m.afe_exp[aid] <= (1 - m.afe_mod[aid]) * capacity)
+                m.constraints.add(m.afe_exp[aid] == m.afe_exp1[aid] + m.afe_exp2[aid])
+                m.constraints.add(m.afe_exp2[aid] <= m.afe_grid_svc[aid])
+        else:
+            m.constraints.add(m.imp == 0)
+            m.constraints.add(m.exp == 0)
+            m.constraints.add(m.exp1 == 0)
+            m.constraints.add(m.exp2 == 0)
+
+        # ── Forecast-limited sources and loads ────────────────────────────────
+        for group, var_name in (('pv', 'pv'), ('wind', 'wind'), ('load', 'ld'), ('cload', 'cld')):
+            if not ids[group]:
+                continue
+            id_set = pyo.Set(initialize=ids[group])
+            setattr(m, f'{group}_id_set', id_set)
+            var = pyo.Var(id_set, domain=pyo.NonNegativeReals)
+            setattr(m, var_name, var)
+            fct = _mutable(id_set)
+            setattr(m, f'{group}_fct', fct)
+            for device_id in ids[group]:
+                m.constraints.add(var[device_id] <= fct[device_id])
+
+        # ── Per-BESS ──────────────────────────────────────────────────────────
+        if ids['bess']:
+            m.bess_id_set = pyo.Set(initialize=ids['bess'])
+            m.bess_charge    = pyo.Var(m.bess_id_set, domain=pyo.NonNegativeReals)
+            m.bess_discharge = pyo.Var(m.bess_id_set, domain=pyo.NonNegativeReals)
+            m.bess_mode      = pyo.Var(m.bess_id_set, domain=pyo.Binary)
+            m.bess_level     = pyo.Var(m.bess_id_set, bounds=(0, None))
+            m.bess_efficiency     = _mutable(m.bess_id_set)
+            m.bess_inv_efficiency = _mutable(m.bess_id_set)
+            m.bess_level_init     = _mutable(m.bess_id_set)
+            m.bess_level_lb       = _mutable(m.bess_id_set)
+            m.bess_power_max      = _mutable(m.bess_id_set)
+
+            for bid in ids['bess']:
+                m.constraints.add(
+                    m.bess_level[bid] == m.bess_level_init[bid]
+                    + m.bess_efficiency[bid] * m.bess_charge[bid]
+                    - m.bess_inv_efficiency[bid] * m.bess_discharge[bid]
+                )
+                m.constraints.add(m.bess_charge[bid]    <= m.bess_mode[bid] * m.bess_power_max[bid])
+                m.constraints.add(m.bess_discharge[bid] <= (1 - m.bess_mode[bid]) * m.bess_power_max[bid])
+                m.constraints.add(m.bess_level[bid] >= m.bess_level_lb[bid])
+
+        # ── Per-Unidirectional-EV ─────────────────────────────────────────────
+        if ids['unidir']:
+            m.unidir_id_set = pyo.Set(initialize=ids['unidir'])
+            m.unidir_charge = pyo.Var(m.unidir_id_set, domain=pyo.NonNegativeReals)
+            m.unidir_soc    = pyo.Var(m.unidir_id_set, bounds=(0, 1))
+            m.unidir_soc_init    = _mutable(m.unidir_id_set)
+            m.unidir_charge_coef = _mutable(m.unidir_id_set)
+            m.unidir_charge_max  = _mutable(m.unidir_id_set)
+            m.unidir_soc_weight  = _mutable(m.unidir_id_set)
+
+            for cid in ids['unidir']:
+                m.constraints.add(
+                    m.unidir_soc[cid] == m.unidir_soc_init[cid] + m.unidir_charge_coef[cid] * m.unidir_charge[cid]
+                )
+                m.constraints.add(m.unidir_charge[cid] <= m.unidir_charge_max[cid])
+
+        # ── Per-Bidirectional-EV ──────────────────────────────────────────────
+        if ids['bidir']:
+            m.bidir_id_set    = pyo.Set(initialize=ids['bidir'])
+            m.bidir_charge    = pyo.Var(m.bidir_id_set, domain=pyo.NonNegativeReals)
+            m.bidir_discharge = pyo.Var(m.bidir_id_set, domain=pyo.NonNegativeReals)
+            m.bidir_soc       = pyo.Var(m.bidir_id_set, bounds=(0, 1))
+            m.bidir_mode      = pyo.Var(m.bidir_id_set, domain=pyo.Binary)
+            m.bidir_soc_init       = _mutable(m.bidir_id_set)
+            m.bidir_charge_coef    = _mutable(m.bidir_id_set)
+            m.bidir_discharge_coef = _mutable(m.bidir_id_set)
+            m.bidir_charge_max     = _mutable(m.bidir_id_set)
+            m.bidir_discharge_max  = _mutable(m.bidir_id_set)
+            m.bidir_soc_weight     = _mutable(m.bidir_id_set)
+
+            for cid in ids['bidir']:
+                m.constraints.add(
+                    m.bidir_soc[cid] == m.bidir_soc_init[cid]
+                    + m.bidir_charge_coef[cid] * m.bidir_charge[cid]
+                    - m.bidir_discharge_coef[cid] * m.bidir_discharge[cid]
+                )
+                m.constraints.add(m.bidir_charge[cid] <= m.bidir_mode[cid] * m.bidir_charge_max[cid])
+                m.constraints.add(m.bidir_discharge[cid] <= (1 - m.bidir_mode[cid]) * m.bidir_discharge_max[cid])
+
+        # ── Power balance ─────────────────────────────────────────────────────
+        supply = m.imp
+        demand = m.exp
+        for group, var_name in (('pv', 'pv'), ('wind', 'wind')):
+            supply = supply + sum(getattr(m, var_name)[i] for i in ids[group])
+        supply = supply + sum(m.bess_discharge[i] for i in ids['bess'])
+        supply = supply + sum(m.bidir_discharge[i] for i in ids['bidir'])
+        for group, var_name in (('load', 'ld'), ('cload', 'cld')):
+            demand = demand + sum(getattr(m, var_name)[i] for i in ids[group])
+        demand = demand + sum(m.bess_charge[i] for i in ids['bess'])
+        demand = demand + sum(m.unidir_charge[i] for i in ids['unidir'])
+        demand = demand + sum(m.bidir_charge[i] for i in ids['bidir'])
+        m.constraints.add(supply == demand)
+
+        # ── Objective ─────────────────────────────────────────────────────────
+        obj_expr = m.w['grid_service_export'] * m.exp2 + m.w['grid_import'] * m.imp + m.w['grid_export'] * m.exp1
+        for group, var_name, weight in (('pv', 'pv', 'pv'), ('wind', 'wind', 'wind'),
+                                        ('load', 'ld', 'load'), ('cload', 'cld', 'critical_load')):
+            for i in ids[group]:
+                obj_expr += m.w[weight] * getattr(m, var_name)[i]
+        for i in ids['bess']:
+            obj_expr += m.w['bess_charge'] * m.bess_charge[i] + m.w['bess_discharge'] * m.bess_discharge[i]
+        for i in ids['unidir']:
+            obj_expr += m.w['chargers'] * m.unidir_soc_weight[i] * m.unidir_charge[i]
+        for i in ids['bidir']:
+            obj_expr += m.w['chargers'] * m.bidir_soc_weight[i] * m.bidir_charge[i]
+            obj_expr += m.w['bidir_discharge'] * m.bidir_discharge[i]
+        m.obj = pyo.Objective(expr=obj_expr, sense=pyo.maximize)
+
+        self.model = m
+        self.signature = self.signature_of(inputs)
+        self.solver = self._create_solver()
+        self.has_solution = False
+        self._bounded = set()
+        self.stats['builds'] += 1
+        self.stats['build_ms'] = (time.perf_counter() - start) * 1000
+        self.logger.info(f"Built persistent model in {self.stats['build_ms']:.0f} ms "
+                         f"({sum(len(v) for v in ids.values())} devices)")
+
+    def _create_solver(self) -> Highs:
+        solver = Highs()
+        solver.config.load_solution = False
+        solver.config.warmstart = self.warm_start
+        solver.config.time_limit = self.time_limit
+        # The structure is fixed - only push Param values and variable bounds each cycle
+        update = solver.update_config
+        update.check_for_new_or_removed_constraints = False
+        update.check_for_new_or_removed_vars = False
+        update.check_for_new_or_removed_params = False
+        update.check_for_new_objective = False
+        update.update_constraints = False
+        update.update_named_expressions = False
+        update.update_objective = False
+        update.update_vars = True
+        update.update_params = True
+        return solver
+
+    # ── Per-cycle update ──────────────────────────────────────────────────────
+
+    def update(self, inputs: Dict[str, Any]):
+        """Load the values of one cycle's inputs into the Params and variable bounds."""
+        m = self.model
+        weights = self.optimizer.get_objective_weights()
+        for key in WEIGHT_KEYS:
+            m.w[key] = weights.get(key, 0)
+
+        afe_inputs = inputs.get('afe', {})
+        afe_abl_aggregate = min((data['available'] for data in afe_inputs.values()), default=1)
+        for aid, data in afe_inputs.items():
+            m.afe_max_kW[aid] = data['max_kW']
+            m.afe_available[aid] = data['available']
+            m.afe_import_allowed[aid] = 1 if data['grid_svc_kW'] == 0 else 0
+            m.afe_grid_svc[aid] = data['grid_svc_kW']
+
+        for group in ('pv', 'wind', 'load', 'cload'):
+            if inputs.get(group):
+                fct = getattr(m, f'{group}_fct')
+                for device_id, data in inputs[group].items():
+                    fct[device_id] = data['power_fct_kW']
+
+        for bid, data in inputs.get('bess', {}).items():
+            m.bess_efficiency[bid] = data['efficiency']
+            m.bess_inv_efficiency[bid] = 1 / data['efficiency']
+            m.bess_level_init[bid] = data['level_init_kWh']
+            m.bess_level_lb[bid] = data['level_min_kWh'] if afe_abl_aggregate == 1 else data['level_fault_kWh']
+            m.bess_power_max[bid] = data['power_max_kW']
+
+        for cid, data in inputs.get('unidir', {}).items():
+            car_cap = data['car_capacity_kWh']
+            m.unidir_soc_init[cid] = data['soc_init']
+            m.unidir_charge_coef[cid] = data['efficiency'] / car_cap if car_cap > 0.2 else 0
+            m.unidir_charge_max[cid] = min(data['car_power_max_kW'], data['charger_power_max_kW'])
+            m.unidir_soc_weight[cid] = min(0.8, max(0.2, data['soc_init']))
+
+        for cid, data in inputs.get('bidir', {}).items():
+            car_cap = data['car_capacity_kWh']
+            soc_init = data['soc_init']
+            efficiency = data['efficiency']
+            car_power = data['car_power_max_kW']
+            charger_power = data['charger_power_max_kW']
+            m.bidir_soc_init[cid] = soc_init
+            m.bidir_charge_coef[cid] = efficiency / car_cap if car_cap > 0.2 else 0
+            m.bidir_discharge_coef[cid] = 1 / (efficiency * car_cap) if car_cap > 0.2 else 0
+            m.bidir_charge_max[cid] = min(car_power, charger_power)
+            m.bidir_soc_weight[cid] = min(0.8, max(0.2, soc_init))
+            if (soc_init >= data['arrival_soc'] + data['target_soc'] and data['is_available'] == 1
+                    and afe_abl_aggregate != 1):
+                m.bidir_discharge_max[cid] = min(
+                    car_power, charger_power,
+                    (soc_init - data['arrival_soc'] - data['target_soc']) * efficiency * car_cap
+                )
+            else:
+                m.bidir_discharge_max[cid] = 0
+
+        self._apply_bounds(inputs)
+
+    def _base_bounds(self, var_name: str, index, inputs: Dict[str, Any]) -> Tuple:
+        if var_name == 'bess_level':
+            return 0, inputs['bess'][index]['level_max_kWh']
+        if var_name in ('unidir_soc', 'bidir_soc'):
+            return 0, 1
+        return 0, None
+
+    def _apply_bounds(self, inputs: Dict[str, Any]):
+        """Reset last cycle's objective bounds, then intersect the new ones with the base bounds."""
+        m = self.model
+        for bid, data in inputs.get('bess', {}).items():
+            m.bess_level[bid].setub(data['level_max_kWh'])
+
+        targets: Dict[Tuple, list] = {}
+        for bound in self.optimizer.get_additional_bounds(inputs):
+            var = getattr(m, bound.var, None)
+            if var is None:
+                continue
+            if bound.index is not None:
+                indices = [bound.index]
+            elif var.is_indexed():
+                indices = list(var.keys())
+            else:
+                indices = [None]
+            for index in indices:
+                key = (bound.var, index)
+                lower, upper = targets.get(key) or self._base_bounds(bound.var, index, inputs)
+                if bound.lower is not None:
+                    lower = bound.lower if lower is None else max(lower, bound.lower)
+                if bound.upper is not None:
+                    upper = bound.upper if upper is None else min(upper, bound.upper)
+                targets[key] = [lower, upper]
+
+        for key in self._bounded - set(targets):
+            var_name, index = key
+            lower, upper = self._base_bounds(var_name, index, inputs)
+            self._var(var_name, index).setlb(lower)
+            self._var(var_name, index).setub(upper)
+
+        for (var_name, index), (lower, upper) in targets.items():
+            self._var(var_name, index).setlb(lower)
+            self._var(var_name, index).setub(upper)
+        self._bounded = set(targets)
+
+    def _var(self, var_name: str, index):
+        var = getattr(self.model, var_name)
+        return var if index is None else var[index]
+
+    # ── Solve ─────────────────────────────────────────────────────────────────
+
+    def solve(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update and re-solve the model, rebuilding it first if the device set changed.
+
+        Returns:
+            Same result dict as BaseOptimizer.run_optimization()
+        """
+        try:
+            if self.model is None or self.signature_of(inputs) != self.signature:
+                self.build(inputs)
+
+            start = time.perf_counter()
+            self.update(inputs)
+            self.stats['update_ms'] = (time.perf_counter() - start) * 1000
+
+            # Variable values of the last optimal solve stay on the model and are the MIP start
+            self.stats['warm_start'] = self.warm_start and self.has_solution
+            start = time.perf_counter()
+            result = self.solver.solve(self.model)
+            self.stats['solve_ms'] = (time.perf_counter() - start) * 1000
+            self.stats['solves'] += 1
+            solver_status = result.termination_condition.name
+
+            if result.termination_condition == TerminationCondition.optimal:
+                result.solution_loader.load_vars()
+                self.has_solution = True
+                output = self.optimizer.extract_output(self.model, inputs)
+                return {'status': 'success', 'output': output, 'solver_status': solver_status}
+
+            self.logger.error("Optimizer failed to find solution")
+            return {'status': 'error', 'message': 'Solver did not find optimal solution',
+                    'solver_status': solver_status}
+
+        except Exception as e:
+            # Solver state may be inconsistent with the model - start over next cycle
+            self.model = None
+            self.logger.error(f"Error running optimization: {e}")
+            return {'status': 'error', 'message': str(e)}
@@ -0,0 +1,158 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+@File: presolve.py
+@Description: Presolve - devices whose variables the inputs already fix are removed from the inputs
+              before the model is built, and put back into the output with their fixed values
+              (zero power, unchanged SoC), so map_optimizer_to_setpoints() sees every device:
+                - an unavailable AFE (available = 0): no import or export; one unavailable AFE
+                  is kept so the grid outage rules (BESS fault level, V2G) still apply
+                - a PV, wind or (critical) load with a zero power forecast
+                - an EV charger without a car (capacity <= 0.2 kWh and no charging power),
+                  for a bidirectional one also with V2G ruled out
+              Devices with a forecast trajectory (receding-horizon backend) are kept. Connected
+              bidirectional EVs with V2G ruled out keep their charge variable; the model builders
+              fix their discharge to 0 and their mode binary to charging.
+              On by default (optimizerSettings.presolve), except for the 'pyomo_persistent'
+              backend, which would rebuild its model whenever the set of removed devices changes.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+from typing import Dict, Any, List, Tuple
+
+from optimization.aggregation import MIN_CAR_CAPACITY_KWH
+
+# Variables (and binaries) of one device per inputs group, as built by build_pyomo_model()
+VARIABLES = {'afe': 5, 'pv': 1, 'wind': 1, 'load': 1, 'cload': 1, 'unidir': 2, 'bidir': 4}
+BINARIES = {'afe': 1, 'bidir': 1}
+
+FORECAST_LIMITED = ('pv', 'wind', 'load', 'cload')
+
+
+def v2g_allowed(data: Dict[str, Any], afe_abl_aggregate: float) -> bool:
+    """The V2G rule of the model: car above its buffer, available for V2G, and a grid outage."""
+    return (data['soc_init'] >= data['arrival_soc'] + data['target_soc']
+            and data['is_available'] == 1 and afe_abl_aggregate != 1)
+
+
+def _no_car(data: Dict[str, Any]) -> bool:
+    return (data['car_capacity_kWh'] <= MIN_CAR_CAPACITY_KWH
+            and min(data['car_power_max_kW'], data['charger_power_max_kW']) <= 0
+            and 0 <= data['soc_init'] <= 1)
+
+
+def presolve_inputs(inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[str]], Dict[str, int]]:
+    """
+    Remove the devices whose variables are fixed by the inputs.
+
+    Args:
+        inputs: Inputs from prepare_inputs()
+
+    Returns:
+        (reduced inputs, {group: removed device ids}, stats) - stats count the removed
+        variables and binaries and the bidirectional chargers whose discharge the model fixes
+    """
+    forecasts = inputs.get('forecast') or {}
+    afe_abl_aggregate = min((data['available'] for data in (inputs.get('afe') or {}).values()), default=1)
+    removed: Dict[str, List[str]] = {}
+
+    def remove(group, device_id):
+        removed.setdefault(group, []).append(device_id)
+
+    unavailable = [afe_id for afe_id, data in (inputs.get('afe') or {}).items() if data['available'] == 0]
+    for afe_id in unavailable[1:]:
+        remove('afe', afe_id)
+
+    for group in FORECAST_LIMITED:
+        for device_id, data in (inputs.get(group) or {}).items():
+            if data['power_fct_kW'] <= 0 and device_id not in forecasts:
+                remove(group, device_id)
+
+    for charger_id, data in (inputs.get('unidir') or {}).items():
+        if _no_car(data):
+            remove('unidir', charger_id)
+
+    v2g_fixed = 0
+    for charger_id, data in (inputs.get('bidir') or {}).items():
+        if v2g_allowed(data, afe_abl_aggregate):
+            continue
+        if _no_car(data):
+            remove('bidir', charger_id)
+        else:
+            v2g_fixed += 1
+
+    if not removed:
+        return inputs, removed, {'variables': 0, 'binaries': 0, 'v2g_fixed': v2g_fixed}
+
+    reduced = dict(inputs)
+    for group, device_ids in removed.items():
+        dropped = set(device_ids)
+        reduced[group] = {device_id: data for device_id, data in inputs[group].items() if device_id not in dropped}
+
+    stats = {
+        'variables': sum(VARIABLES[group] * len(device_ids) for group, device_ids in removed.items()),
+        'binaries': sum(BINARIES.get(group, 0) * len(device_ids) for group, device_ids in removed.items()),
+        'v2g_fixed': v2g_fixed,
+    }
+    return reduced, removed, stats
+
+
+def _fixed_result(group: str, data: Dict[str, Any]) -> Dict[str, float]:
+    """Output entry of a removed device."""
+    if group == 'afe':
+        return {'imp': 0.0, 'exp': 0.0, 'exp1': 0.0, 'exp2': 0.0}
+    if group == 'unidir':
+        return {'charge': 0.0, 'soc': round(data['soc_init'], 4)}
+    if group == 'bidir':
+        return {'charge': 0.0, 'discharge': 0.0, 'soc': round(data['soc_init'], 4)}
+    return {'power': 0.0}
+
+
+def restore_output(output: Dict[str, Any], inputs: Dict[str, Any],
+                   removed: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    Put the removed devices back into a solved output, in the order of `inputs`.
+
+    Args:
+        output: Output of the reduced model
+        inputs: Full inputs (before presolve_inputs())
+        removed: Removed device ids per group
+
+    Returns:
+        Output with an entry for every device of `inputs`
+    """
+    output = dict(output)
+    for group, device_ids in removed.items():
+        solved = output.get(group) or {}
+        dropped = set(device_ids)
+        output[group] = {
+            device_id: _fixed_result(group, data) if device_id in dropped else solved[device_id]
+            for device_id, data in inputs[group].items()
+        }
+    return output
+
+
+def presolve_enabled(settings: Dict[str, Any], backend_name: str) -> bool:
+    """optimizerSettings.presolve, by default on for every backend but 'pyomo_persistent'."""
+    return bool(settings.get('presolve', backend_name != 'pyomo_persistent'))
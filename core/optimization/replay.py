@@ -0,0 +1,288 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: replay.py
+@Description: Historical replay - the optimizer inputs of every 15-minute interval of a period
+              rebuilt from the stored measurements and solved offline by several objectives,
+              with per-objective KPI summaries that can be compared side by side.
+                - the measurements are read in bulk, one grouped query per chunk of days
+                  ('interval_history'): per parameter and interval the average, the sample
+                  count and the last sample, from which averaged_data (interval averages) and
+                  recent_data (last values at most RECENT_MAX_AGE old at the interval end) are
+                  built as OptimizerInputProvider.fetch() does for the live interval
+                - intervals are solved in chunks of consecutive intervals across a process
+                  pool; every worker builds one OptimizerRunner per objective once, so warm
+                  starts carry over within a chunk
+              The replay is open loop: SoC and EV states come from the measurements, not from
+              the replayed setpoints, so every interval is independent. Stored forecasts are
+              not replayed; the horizon backend plans with flat forecasts.
+              Entry point: replay.py in the core directory.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import copy
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+
+from db.pool import DatabasePool
+from db.queries import run_query
+from optimization.optimizer import OptimizerRunner
+from utils.profiling_utils import percentile
+
+logger = logging.getLogger('ems.replay')
+
+INTERVAL = timedelta(minutes=15)
+RECENT_MAX_AGE = timedelta(minutes=2)
+INTERVAL_HOURS = INTERVAL.total_seconds() / 3600
+
+# Energies of an interval (kWh) recorded by interval_kpis()
+ENERGY_KPIS = ('import_kWh', 'export_kWh', 'renewable_available_kWh', 'renewable_kWh', 'load_demand_kWh',
+               'load_served_kWh', 'bess_charge_kWh', 'bess_discharge_kWh', 'ev_charge_kWh', 'v2g_kWh')
+
+
+@dataclass
+class ReplayInterval:
+    """Measurements of one 15-minute interval in the shape of OptimizerData.averaged/recent."""
+    start: datetime
+    averaged: Dict[str, float] = field(default_factory=dict)
+    recent: Dict[str, float] = field(default_factory=dict)
+
+
+def site_config(config: Dict[str, Any], objective: str, settings: Dict[str, Any] = None) -> Dict[str, Any]:
+    """A copy of the site config with another objective and optimizerSettings overrides."""
+    site = copy.deepcopy(config)
+    general = site.setdefault('generalSiteConfig', {})
+    general['objectiveFunction'] = objective
+    if settings:
+        general['optimizerSettings'] = {**(general.get('optimizerSettings') or {}), **settings}
+    return site
+
+
+# ── Loading ───────────────────────────────────────────────────────────────────
+
+def _chunks(start: datetime, end: datetime, length: timedelta) -> Iterator[tuple]:
+    while start < end:
+        yield start, min(start + length, end)
+        start += length
+
+
+def load_intervals(required: Dict[str, List[str]], start: datetime, end: datetime,
+                   db: DatabasePool = None, chunk: timedelta = timedelta(days=7)) -> List[ReplayInterval]:
+    """
+    Rebuild averaged_data/recent_data of every interval in [start, end) with measurements.
+
+    Args:
+        required: {'averaged': [...], 'recent': [...]} as returned by required_parameters()
+        start, end: Replay period (aligned to the interval grid by the query)
+        db: Connection pool (default: the shared pool)
+        chunk: Period read per query
+
+    Returns:
+        Intervals in time order; intervals without any measurement are left out
+    """
+    averaged = set(required.get('averaged', []))
+    recent = set(required.get('recent', []))
+    parameters = sorted(averaged | recent)
+    intervals: Dict[datetime, ReplayInterval] = {}
+
+    for chunk_start, chunk_end in _chunks(start, end, chunk):
+        for row in run_query('interval_history', (parameters, chunk_start, chunk_end), db=db):
+            interval_start = row['interval_start']
+            interval = intervals.setdefault(interval_start, ReplayInterval(interval_start))
+            parameter = row['parameter']
+            if parameter in averaged and row['sample_count']:
+                interval.averaged[parameter] = row['average_value']
+            if parameter in recent and row['latest_time'] >= interval_start + INTERVAL - RECENT_MAX_AGE:
+                interval.recent[parameter] = row['latest_value']
+
+    return [intervals[key] for key in sorted(intervals)]
+
+
+# ── KPIs ──────────────────────────────────────────────────────────────────────
+
+def _total(section: Dict[str, Dict[str, float]], key: str) -> float:
+    return sum(device.get(key, 0.0) for device in (section or {}).values())
+
+
+def interval_kpis(interval_start: datetime, inputs: Dict[str, Any], result: Dict[str, Any],
+                  solve_ms: float) -> Dict[str, Any]:
+    """
+    KPIs of one solved interval.
+
+    Returns:
+        Status, fallback, solve time and, with an output, the objective value, the grid
+        import power and the ENERGY_KPIS energies over the interval
+    """
+    record = {'start': interval_start.isoformat(), 'status': result['status'],
+              'fallback': bool(result.get('fallback')), 'solve_ms': round(solve_ms, 3)}
+    output = result.get('output')
+    if result['status'] != 'success' or not output:
+        return record
+
+    def forecast(group):
+        return sum(device['power_fct_kW'] for device in (inputs.get(group) or {}).values())
+
+    power = {
+        'import_kWh': output['imp'],
+        'export_kWh': output['exp'],
+        'renewable_available_kWh': forecast('pv') + forecast('wind'),
+        'renewable_kWh': _total(output.get('pv'), 'power') + _total(output.get('wind'), 'power'),
+        'load_demand_kWh': forecast('load') + forecast('cload'),
+        'load_served_kWh': _total(output.get('load'), 'power') + _total(output.get('cload'), 'power'),
+        'bess_charge_kWh': _total(output.get('bess'), 'charge'),
+        'bess_discharge_kWh': _total(output.get('bess'), 'discharge'),
+        'ev_charge_kWh': _total(output.get('unidir'), 'charge') + _total(output.get('bidir'), 'charge'),
+        'v2g_kWh': _total(output.get('bidir'), 'discharge'),
+    }
+    record.update(obj=output['obj'], import_kW=round(output['imp'], 4),
+                  **{kpi: round(value * INTERVAL_HOURS, 4) for kpi, value in power.items()})
+    return record
+
+
+def _share(part: float, total: float) -> Optional[float]:
+    return round(part / total, 4) if total > 0 else None
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    KPIs of one objective over the replay period.
+
+    Returns:
+        Interval counts, ENERGY_KPIS totals, peak grid import, self-consumption (renewable
+        energy not exported), self-sufficiency (demand not imported), curtailment and load
+        shedding shares, objective sum and solve time percentiles
+    """
+    solved = [r for r in records if r['status'] == 'success' and 'obj' in r]
+    totals = {kpi: round(sum(r[kpi] for r in solved), 3) for kpi in ENERGY_KPIS}
+    consumed = totals['load_served_kWh'] + totals['ev_charge_kWh'] + totals['bess_charge_kWh']
+    solve_ms = [r['solve_ms'] for r in records]
+    return {
+        'intervals': len(records),
+        'solved': len(solved),
+        'failed': len(records) - len(solved),
+        'fallbacks': sum(r['fallback'] for r in records),
+        **totals,
+        'peak_import_kW': max((r['import_kW'] for r in solved), default=0.0),
+        'self_consumption': _share(totals['renewable_kWh'] - min(totals['export_kWh'], totals['renewable_kWh']),
+                                   totals['renewable_kWh']),
+        'self_sufficiency': _share(consumed - min(totals['import_kWh'], consumed), consumed),
+        'curtailment': _share(totals['renewable_available_kWh'] - totals['renewable_kWh'],
+                              totals['renewable_available_kWh']),
+        'load_shed': _share(totals['load_demand_kWh'] - totals['load_served_kWh'], totals['load_demand_kWh']),
+        'objective_sum': round(sum(r['obj'] for r in solved), 3),
+        'solve_ms_p50': round(percentile(solve_ms, 50), 3) if solve_ms else None,
+        'solve_ms_p95': round(percentile(solve_ms, 95), 3) if solve_ms else None,
+    }
+
+
+# ── Solving ───────────────────────────────────────────────────────────────────
+
+# Runners of the worker process, one per objective (set by _init_worker)
+_runners: Dict[str, OptimizerRunner] = {}
+
+
+def _init_worker(config: Dict[str, Any], objectives: Sequence[str], settings: Dict[str, Any]):
+    logging.basicConfig(level=logging.ERROR)
+    # workers=0 reuses this process: drop the runners of a previous replay()
+    _runners.clear()
+    for objective in objectives:
+        _runners[objective] = OptimizerRunner(site_config(config, objective, settings))
+
+
+def _replay_chunk(intervals: List[ReplayInterval]) -> Dict[str, List[Dict[str, Any]]]:
+    records = {objective: [] for objective in _runners}
+    for interval in intervals:
+        for objective, runner in _runners.items():
+            inputs = runner.prepare_inputs(interval.averaged, interval.recent)
+            start = time.perf_counter()
+            result = runner.run_optimization(inputs)
+            records[objective].append(
+                interval_kpis(interval.start, inputs, result, (time.perf_counter() - start) * 1000))
+    return records
+
+
+def replay(config: Dict[str, Any], objectives: Sequence[str], start: datetime, end: datetime,
+           workers: int = None, settings: Dict[str, Any] = None, chunk_intervals: int = 96,
+           db: DatabasePool = None) -> Dict[str, Any]:
+    """
+    Replay a period of history through several objectives.
+
+    Args:
+        config: Site config (devices and generalSiteConfig)
+        objectives: objectiveFunction names to compare
+        start, end: Replay period
+        workers: Worker processes (default: one per CPU; 0 solves in this process)
+        settings: optimizerSettings overrides (e.g. {'backend': 'highs'})
+        chunk_intervals: Consecutive intervals per task
+        db: Connection pool (default: the shared pool)
+
+    Returns:
+        {'start', 'end', 'intervals', 'load_s', 'solve_s', 'summary': {objective: summarize()},
+         'records': {objective: [interval_kpis()...]}}
+    """
+    settings = {'resultCache': None, **(settings or {})}
+    required: Dict[str, List[str]] = {'averaged': [], 'recent': []}
+    for objective in objectives:
+        for kind, parameters in OptimizerRunner(site_config(config, objective, settings)).required_parameters().items():
+            required[kind] += [p for p in parameters if p not in required[kind]]
+
+    started = time.perf_counter()
+    intervals = load_intervals(required, start, end, db=db)
+    load_s = time.perf_counter() - started
+    logger.info(f"Loaded {len(intervals)} intervals in {load_s:.1f} s")
+
+    started = time.perf_counter()
+    chunks = [intervals[i:i + chunk_intervals] for i in range(0, len(intervals), chunk_intervals)]
+    records: Dict[str, List[Dict[str, Any]]] = {objective: [] for objective in objectives}
+    if workers == 0:
+        _init_worker(config, objectives, settings)
+        results = map(_replay_chunk, chunks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_worker, initargs=(config, list(objectives), settings))
+        results = executor.map(_replay_chunk, chunks)
+    try:
+        for chunk_records in results:
+            for objective, objective_records in chunk_records.items():
+                records[objective] += objective_records
+    finally:
+        if workers != 0:
+            executor.shutdown()
+    solve_s = time.perf_counter() - started
+    logger.info(f"Solved {len(intervals)} intervals x {len(objectives)} objectives in {solve_s:.1f} s")
+
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'intervals': len(intervals),
+        'load_s': round(load_s, 2),
+        'solve_s': round(solve_s, 2),
+        'summary': {objective: summarize(objective_records) for objective, objective_records in records.items()},
+        'records': records,
+    }
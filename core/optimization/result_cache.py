@@ -0,0 +1,133 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: result_cache.py
+@Description: Memoized optimizer results. Cycles whose inputs quantize to the same fingerprint
+              (idle site, night) reuse the stored output instead of building and solving the
+              model again. Enabled with generalSiteConfig.optimizerSettings.resultCache:
+                {"size": 64, "resolution": 0.01}
+              `resolution` is the quantization step of every input value (kW, kWh and SoC
+              fractions alike), i.e. the tolerance within which two inputs are the same.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+
+def config_version(config: Dict[str, Any]) -> str:
+    """Digest of a site configuration; any change to it gives a different version."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Bounded LRU map from an input fingerprint to a run_optimization() result.
+
+    The fingerprint contains the objective and the config version, so a result is never
+    served after either changes, even if the cache instance were kept.
+    """
+
+    def __init__(self, objective: str, version: str, size: int = 64, resolution: float = 0.01):
+        """
+        Args:
+            objective: Name of the objective the results belong to
+            version: Config version (see config_version())
+            size: Maximum number of stored results
+            resolution: Quantization step of the input values
+        """
+        if size < 1 or resolution <= 0:
+            raise ValueError(f"Invalid result cache settings: size {size}, resolution {resolution}")
+        self.objective = objective
+        self.version = version
+        self.size = size
+        self.resolution = resolution
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self.last_hit = False
+
+    def _quantize(self, value):
+        if isinstance(value, dict):
+            return {str(key): self._quantize(value[key]) for key in sorted(value, key=str)}
+        if isinstance(value, np.ndarray):
+            return np.rint(value / self.resolution).astype(np.int64).tolist()
+        if isinstance(value, (list, tuple)):
+            return [self._quantize(item) for item in value]
+        if isinstance(value, (bool, np.bool_)):
+            return bool(value)
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            return int(round(float(value) / self.resolution))
+        return value
+
+    def fingerprint(self, inputs: Dict[str, Any]) -> str:
+        """Key of an inputs dict: its values rounded to `resolution`, the objective and config version."""
+        payload = json.dumps([self.objective, self.version, self._quantize(inputs)], default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Copy of the stored result, or None (counted as a hit / miss)."""
+        result = self._entries.get(key)
+        self.last_hit = result is not None
+        if result is None:
+            self._stats['misses'] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats['hits'] += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store a result, evicting the least recently used one when full."""
+        self._entries[key] = copy.deepcopy(result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters, hit rate, current size and whether the last lookup hit."""
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {**self._stats, 'entries': len(self._entries), 'last_hit': self.last_hit,
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else None}
+
+
+def create_result_cache(optimizer) -> Optional[ResultCache]:
+    """The cache configured in optimizerSettings.resultCache, or None if it is off."""
+    settings = optimizer.settings.get('resultCache')
+    if settings is None or settings is False:
+        return None
+    if settings is True:
+        settings = {}
+    return ResultCache(
+        objective=type(optimizer).__name__,
+        version=config_version(optimizer.config),
+        size=int(settings.get('size', 64)),
+        resolution=float(settings.get('resolution', 0.01)),
+    )
@@ -0,0 +1,189 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: shadow.py
+@Description: Shadow evaluation - the inputs of every live cycle are solved again for the other
+              objectives, so the debug page can show what they would have done. Configured with
+              generalSiteConfig.shadowEvaluation:
+                {"objectives": [...],   // default: every objective but the live one
+                 "workers": 2,          // worker processes (default: one per objective)
+                 "timeBudget": 60}      // seconds per evaluation (default 60)
+              The solves run in a process pool, submitted after the live setpoints are written,
+              so they never hold the GIL or delay the live loop. A new evaluation is skipped
+              while the previous one is still running. Every shadow solve has the time budget
+              as its solveTimeLimit; objectives still queued when it has passed are not solved
+              ('expired'). Results go to optimization_shadows, keyed by the live cycle_id.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional
+
+from optimization.objective_optimizers import OPTIMIZERS
+from optimization.optimizer import OptimizerRunner
+from optimization.replay import site_config
+from utils.database_utils import DatabaseOperations, flatten_outputs
+
+
+def shadow_settings_enabled(config: Dict[str, Any]) -> bool:
+    """True if generalSiteConfig.shadowEvaluation is configured and not disabled."""
+    settings = config.get('generalSiteConfig', {}).get('shadowEvaluation')
+    return bool(settings) and settings.get('enabled', True) is not False
+
+
+# ── Worker process ────────────────────────────────────────────────────────────
+
+# Site config and settings of the worker process (set by _init_worker), runners built on first use
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(config: Dict[str, Any], settings: Dict[str, Any]):
+    logging.basicConfig(level=logging.WARNING)
+    _worker.update(config=config, settings=settings, runners={})
+
+
+def _solve_shadow(objective: str, inputs: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+    """Solve `inputs` for `objective` unless the evaluation's deadline (time.time()) has passed."""
+    if time.time() > deadline:
+        return {'status': 'expired', 'message': 'Time budget used up before the solve started'}
+    runners = _worker['runners']
+    if objective not in runners:
+        runners[objective] = OptimizerRunner(site_config(_worker['config'], objective, _worker['settings']))
+    start = time.perf_counter()
+    result = runners[objective].run_optimization(inputs)
+    shadow = {'status': result['status'], 'solver_status': result.get('solver_status'),
+              'message': result.get('message'), 'solve_ms': round((time.perf_counter() - start) * 1000, 3)}
+    if result['status'] == 'success':
+        shadow['outputs'] = flatten_outputs(result['output'])
+    return shadow
+
+
+# ── Evaluator ─────────────────────────────────────────────────────────────────
+
+class ShadowEvaluator:
+    """Submits the inputs of live cycles to the shadow worker pool and records the results."""
+
+    def __init__(self, config: Dict[str, Any], db_ops: DatabaseOperations):
+        """
+        Args:
+            config: Site configuration (generalSiteConfig.shadowEvaluation, see module docstring)
+            db_ops: Database layer whose background writer stores the results
+        """
+        self.logger = logging.getLogger('ems.shadow')
+        self.config = config
+        self.db_ops = db_ops
+        general = config.get('generalSiteConfig', {})
+        settings = general.get('shadowEvaluation') or {}
+        live = general.get('objectiveFunction')
+
+        objectives = settings.get('objectives') or list(OPTIMIZERS)
+        unknown = [objective for objective in objectives if objective not in OPTIMIZERS]
+        if unknown:
+            raise ValueError(f"Unsupported shadow objectives: {unknown}. Supported objectives: {list(OPTIMIZERS)}")
+        self.objectives: List[str] = [objective for objective in objectives if objective != live]
+        self.workers = int(settings.get('workers') or len(self.objectives) or 1)
+        self.time_budget = float(settings.get('timeBudget', 60))
+        if self.time_budget <= 0:
+            raise ValueError(f"Invalid shadowEvaluation.timeBudget: {self.time_budget}")
+        # The shadows never fall back or reuse results, and stop at the time budget
+        self.solve_settings = {'solveTimeLimit': self.time_budget, 'fallback': False, 'resultCache': None}
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {'evaluations': 0, 'skipped': 0, 'success': 0, 'error': 0, 'expired': 0}
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker, initargs=(self.config, self.solve_settings))
+        return self._executor
+
+    def submit(self, cycle_id: str, inputs: Dict[str, Any]) -> bool:
+        """
+        Start the shadow evaluation of a cycle without waiting for it.
+
+        Args:
+            cycle_id: cycle_id of the live cycle
+            inputs: Inputs the live objective was solved with
+
+        Returns:
+            bool: False if it was skipped because the previous evaluation is still running
+        """
+        if not self.objectives:
+            return False
+        with self._lock:
+            if self._pending:
+                self._stats['skipped'] += 1
+                self.logger.debug(f"Shadow evaluation of cycle {cycle_id} skipped, {self._pending} still running")
+                return False
+            self._pending = len(self.objectives)
+            self._stats['evaluations'] += 1
+
+        submitted = time.perf_counter()
+        deadline = time.time() + self.time_budget
+        for objective in self.objectives:
+            try:
+                future = self.executor.submit(_solve_shadow, objective, inputs, deadline)
+            except Exception as e:
+                future = Future()
+                future.set_exception(e)
+            future.add_done_callback(partial(self._done, cycle_id, objective, submitted))
+        return True
+
+    def _done(self, cycle_id: str, objective: str, submitted: float, future: Future):
+        if future.cancelled():
+            with self._lock:
+                self._pending -= 1
+            return
+        try:
+            shadow = future.result()
+        except Exception as e:
+            shadow = {'status': 'error', 'message': str(e)}
+        shadow['wall_ms'] = round((time.perf_counter() - submitted) * 1000, 3)
+        if shadow['status'] != 'success':
+            self.logger.debug(f"Shadow {objective} of cycle {cycle_id}: {shadow['status']} {shadow.get('message')}")
+        self.db_ops.record_shadow(cycle_id, objective, shadow)
+        with self._lock:
+            self._pending -= 1
+            status = shadow['status'] if shadow['status'] in self._stats else 'error'
+            self._stats[status] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Evaluations started and skipped, and shadow solves per result status."""
+        with self._lock:
+            return {**self._stats, 'running': self._pending}
+
+    def close(self):
+        """Stop the worker pool; running shadow solves are abandoned."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,502 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: solver_backends.py
+@Description: Solver backends for BaseOptimizer. Selected with
+              generalSiteConfig.optimizerSettings.backend:
+                'pyomo'            - Pyomo model rebuilt every cycle, solved with HiGHS (default)
+                'pyomo_persistent' - Pyomo model built once, updated via mutable Params
+                'highs'            - column/row arrays passed to HiGHS in-process via highspy
+                'sparse'           - the same model assembled from per-type device tables as
+                                     NumPy / scipy.sparse arrays (horizon_model.py, one step)
+                'horizon'          - receding-horizon model over optimizerSettings.horizon
+                                     ({"steps": 96, "stepMinutes": 15}) using stored forecasts;
+                                     only the first step is returned
+              optimizerSettings.warmStart (default false) passes the previous cycle's solution
+              to HiGHS as a MIP start on the 'pyomo_persistent', 'highs' and 'horizon'
+              backends. Loading the start costs more than it saves on small sites; turn it
+              on for larger models whose consecutive cycles change little, after checking
+              the gain with benchmarks/warm_start_benchmark.py.
+              optimizerSettings.solveTimeLimit (seconds, default 120) is the time budget of
+              every solve; see fallback_dispatch.py for what happens when it runs out.
+              optimizerSettings.lpMode (default false) solves the LP relaxation on the
+              'highs', 'sparse' and 'horizon' backends (see lp_mode.py).
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, Set, Tuple
+
+import highspy
+import numpy as np
+import pyomo.environ as pyo
+
+from optimization.horizon_model import HorizonModel, build_horizon_model
+from optimization.linear_model import LinearModel, build_linear_model
+from optimization.lp_mode import integer_mask, simultaneous_flows
+from optimization.persistent_model import PersistentModel
+
+logger = logging.getLogger('ems.optimizer.backends')
+
+# Pyomo's HiGHS interfaces redirect the process' stdout/stderr file descriptors around every
+# solve (capture_output(capture_fd=True)), which deadlocks when two threads do it at once -
+# e.g. the sites of a multi-site process. The highspy backends need no lock.
+PYOMO_SOLVE_LOCK = threading.Lock()
+
+
+def highs_info(highs: highspy.Highs) -> Dict[str, Any]:
+    """Branch-and-bound nodes, relative MIP gap and simplex iterations of the last HiGHS run."""
+    info = highs.getInfo()
+    return {'mip_nodes': int(info.mip_node_count),
+            'mip_gap': float(info.mip_gap) if math.isfinite(info.mip_gap) else None,
+            'simplex_iterations': int(info.simplex_iteration_count)}
+
+
+def pyomo_model_size(m) -> Dict[str, int]:
+    """Columns, rows and integer columns of a Pyomo model (the num_* keys of the HiGHS backends)."""
+    variables = list(m.component_data_objects(pyo.Var, active=True))
+    return {'num_col': len(variables), 'num_row': m.nconstraints(),
+            'num_int': sum(1 for v in variables if v.is_integer())}
+
+
+class WarmStartStats:
+    """
+    Running means of warm- and cold-started solve times (and simplex iterations where the
+    backend reports them). Their difference is the per-solve saving of the warm start.
+    """
+
+    def __init__(self):
+        self._count = {True: 0, False: 0}
+        self._ms = {True: 0.0, False: 0.0}
+        self._iterations = {True: 0, False: 0}
+        self._iteration_count = {True: 0, False: 0}
+
+    def record(self, warm: bool, solve_ms: float, iterations: Optional[int] = None):
+        self._count[warm] += 1
+        self._ms[warm] += solve_ms
+        if iterations is not None:
+            self._iterations[warm] += iterations
+            self._iteration_count[warm] += 1
+
+    @staticmethod
+    def _mean(total, count) -> Optional[float]:
+        return round(total / count, 2) if count else None
+
+    def summary(self) -> Dict[str, Any]:
+        warm_ms = self._mean(self._ms[True], self._count[True])
+        cold_ms = self._mean(self._ms[False], self._count[False])
+        warm_iterations = self._mean(self._iterations[True], self._iteration_count[True])
+        cold_iterations = self._mean(self._iterations[False], self._iteration_count[False])
+        both = warm_ms is not None and cold_ms is not None
+        both_iterations = warm_iterations is not None and cold_iterations is not None
+        return {
+            'warm_solves': self._count[True],
+            'cold_solves': self._count[False],
+            'mean_warm_solve_ms': warm_ms,
+            'mean_cold_solve_ms': cold_ms,
+            'warm_start_saved_ms': round(cold_ms - warm_ms, 2) if both else None,
+            'warm_start_saved_iterations': round(cold_iterations - warm_iterations, 1) if both_iterations else None,
+        }
+
+
+class SolverBackend(ABC):
+    """Builds and solves the model for one cycle; returns the run_optimization() result dict."""
+    name = ''
+    supports_warm_start = False
+    uses_forecasts = False
+
+    def __init__(self, optimizer):
+        self.optimizer = optimizer
+        self.logger = logging.getLogger(f'ems.optimizer.backends.{self.name}')
+        self.stats: Dict[str, Any] = {}
+        self.warm_start = self.supports_warm_start and bool(optimizer.settings.get('warmStart', False))
+        self.warm_start_stats = WarmStartStats()
+        self.time_budget = float(optimizer.settings.get('solveTimeLimit', 120))
+        if self.time_budget <= 0:
+            raise ValueError(f"Invalid solveTimeLimit: {self.time_budget}")
+
+    @abstractmethod
+    def solve(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        pass
+
+    def solver_stats(self) -> Dict[str, Any]:
+        """Stats of the last solve plus the warm start summary."""
+        return {'backend': self.name, 'time_budget_s': self.time_budget,
+                **self.stats, **self.warm_start_stats.summary()}
+
+
+class PyomoBackend(SolverBackend):
+    """
+    The original path: a fresh ConcreteModel and SolverFactory('highs') every cycle.
+    The legacy solver interface takes no MIP start, so every solve is cold.
+    """
+    name = 'pyomo'
+
+    def solve(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self.stats.clear()
+        with PYOMO_SOLVE_LOCK:
+            result = self.optimizer.solve_pyomo(inputs, time_limit=self.time_budget, stats=self.stats)
+        solve_ms = (time.perf_counter() - start) * 1000 - self.stats.get('build_ms', 0.0)
+        self.stats.update(solve_ms=solve_ms, warm_start=False)
+        self.warm_start_stats.record(False, solve_ms, self.stats.get('simplex_iterations'))
+        return result
+
+
+class PersistentPyomoBackend(SolverBackend):
+    """Pyomo model kept across cycles (see persistent_model.py)."""
+    name = 'pyomo_persistent'
+    supports_warm_start = True
+
+    def __init__(self, optimizer):
+        super().__init__(optimizer)
+        self.model = PersistentModel(optimizer, warm_start=self.warm_start, time_limit=self.time_budget)
+        self.stats = self.model.stats
+
+    def solve(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        builds = self.stats['builds']
+        with PYOMO_SOLVE_LOCK:
+            result = self.model.solve(inputs)
+        if 'solver_status' in result:
+            if self.stats['builds'] != builds:
+                self.stats.update(pyomo_model_size(self.model.model))
+            self.stats.update(highs_info(self.model.solver._solver_model))
+            self.warm_start_stats.record(self.stats['warm_start'], self.stats['solve_ms'],
+                                         self.stats['simplex_iterations'])
+        return result
+
+
+class HighsBackend(SolverBackend):
+    """
+    Builds the model as column/row arrays (LinearModel) and solves it with highspy in-process;
+    the solution comes back as a NumPy array and is mapped onto the usual output dict.
+
+    With warm starting, the last optimal solution (including the afe_mod, bess_mode and
+    bidir_mode binaries) is passed to HiGHS as a MIP start. Columns are matched by name, so
+    a changed device set only drops the start of the devices that changed; HiGHS completes
+    a partial or no longer feasible start from its integer values.
+
+    In LP mode the binaries are relaxed and only made integer again for the devices that
+    charge and discharge (or import and export) at once in the relaxed solution.
+    """
+    name = 'highs'
+    supports_warm_start = True
+
+    def __init__(self, optimizer):
+        super().__init__(optimizer)
+        self.lp_mode = bool(optimizer.settings.get('lpMode', False))
+        self._previous: Optional[Dict[Any, float]] = None
+        self._previous_keys = None
+        self._previous_values: Optional[np.ndarray] = None
+
+    def build(self, inputs: Dict[str, Any]) -> LinearModel:
+        return build_linear_model(self.optimizer, inputs)
+
+    def _new_highs(self, time_budget: Optional[float] = None) -> highspy.Highs:
+        """A quiet Highs instance limited to `time_budget` seconds (default: solveTimeLimit)."""
+        highs = highspy.Highs()
+        highs.setOptionValue('output_flag', False)
+        highs.setOptionValue('time_limit', self.time_budget if time_budget is None else time_budget)
+        return highs
+
+    def mip_start(self, lm: LinearModel) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Columns of `lm` that were in the previous solution, with their values.
+
+        Returns:
+            (column indices, values), or None without a previous solution
+        """
+        if self._previous_values is None:
+            return None
+        if lm.keys == self._previous_keys:
+            return np.arange(lm.num_col, dtype=np.int32), self._previous_values
+
+        if self._previous is None:
+            self._previous = dict(zip(self._previous_keys, self._previous_values.tolist()))
+        cols = [col for col, key in enumerate(lm.keys) if key in self._previous]
+        if not cols:
+            return None
+        values = [self._previous[lm.keys[col]] for col in cols]
+        return np.asarray(cols, dtype=np.int32), np.asarray(values, dtype=np.float64)
+
+    def remember(self, lm: LinearModel, values: np.ndarray):
+        """Keep an optimal solution as the start of the next solve."""
+        self._previous_keys = lm.keys
+        self._previous_values = values
+        self._previous = None
+
+    def run(self, lm: LinearModel, highs: highspy.Highs = None,
+            start: Optional[Tuple[np.ndarray, np.ndarray]] = None, integer: Optional[np.ndarray] = None):
+        """
+        Pass a LinearModel to HiGHS and solve it.
+
+        Args:
+            lm: Model to solve
+            highs: Highs instance to use (default: a new one)
+            start: Optional (column indices, values) MIP start
+            integer: Optional integrality mask replacing the model's (False everywhere: the LP relaxation)
+
+        Returns:
+            (model status string, column values or None if there is no feasible solution, Highs)
+        """
+        highs = highs or self._new_highs()
+        lp = lm.to_highs_lp()
+        if integer is not None:
+            lp.integrality_ = [highspy.HighsVarType.kInteger if is_int else highspy.HighsVarType.kContinuous
+                               for is_int in integer]
+        highs.passModel(lp)
+        if start is not None and len(start[0]):
+            highs.setSolution(len(start[0]), start[0], start[1])
+        highs.run()
+        status = highs.getModelStatus()
+        values = None
+        # A time limit with an incumbent still gives a usable (if not proven optimal) plan
+        feasible = status == highspy.HighsModelStatus.kTimeLimit and \
+            highs.getInfo().primal_solution_status == highspy.SolutionStatus.kSolutionStatusFeasible
+        if status == highspy.HighsModelStatus.kOptimal or feasible:
+            values = np.asarray(highs.getSolution().col_value, dtype=np.float64)
+        return highs.modelStatusToString(status).lower(), values, highs
+
+    def run_lp_mode(self, model, start: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        """
+        Solve the LP relaxation of `model`, then re-solve with the binaries of the devices with
+        simultaneous flows integer until there are none (see lp_mode.py).
+
+        All solves share one solveTimeLimit budget: each gets only what the previous ones left.
+        When it runs out before a solution without simultaneous flows, there is no solution
+        (the relaxed ones are not valid plans) and the fallback dispatch takes over.
+
+        Returns:
+            As run()
+        """
+        deadline = time.perf_counter() + self.time_budget
+        devices: Dict[str, Set[Any]] = {}
+        conflicts = None
+        resolves = 0
+        while True:
+            integer = integer_mask(model, devices)
+            highs = self._new_highs(max(deadline - time.perf_counter(), 0.0))
+            solver_status, values, highs = self.run(model, highs=highs, start=start if integer.any() else None,
+                                                    integer=integer)
+            if values is None:
+                break
+            found = simultaneous_flows(model, values)
+            if conflicts is None:
+                conflicts = sum(len(ids) for ids in found.values())
+            if not found:
+                break
+            if time.perf_counter() >= deadline:
+                self.logger.warning("LP mode ran out of its solve time budget with simultaneous flows left")
+                solver_status, values = 'time limit reached', None
+                break
+            for binary, ids in found.items():
+                # Other devices of a type took over the flows: all of its binaries are integer
+                devices[binary] = set(model.device_cols(binary)) if binary in devices else set(ids)
+            resolves += 1
+
+        self.stats.update(lp_conflicts=conflicts or 0, lp_resolves=resolves, lp_integer=int(integer.sum()))
+        return solver_status, values, highs
+
+    def run_model(self, model, start: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        """Solve `model` as configured: the MILP, or in LP mode its relaxation (see run_lp_mode())."""
+        if self.lp_mode:
+            return self.run_lp_mode(model, start)
+        return self.run(model, start=start)
+
+    def solve(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            start = time.perf_counter()
+            lm = self.build(inputs)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            mip_start = self.mip_start(lm) if self.warm_start else None
+            start = time.perf_counter()
+            solver_status, values, highs = self.run_model(lm, start=mip_start)
+            solve_ms = (time.perf_counter() - start) * 1000
+            self.stats.update(build_ms=build_ms, solve_ms=solve_ms,
+                              num_col=lm.num_col, num_row=lm.num_row, num_nz=lm.num_nz,
+                              num_int=sum(lm.integer), warm_start=mip_start is not None,
+                              **highs_info(highs))
+            self.warm_start_stats.record(mip_start is not None, solve_ms, self.stats['simplex_iterations'])
+
+            if values is not None:
+                if self.warm_start:
+                    self.remember(lm, values)
+                output = self.optimizer.extract_output(lm.solution_view(values), inputs)
+                return {'status': 'success', 'output': output, 'solver_status': solver_status}
+
+            self.logger.error("Optimizer failed to find solution")
+            return {'status': 'error', 'message': 'Solver did not find optimal solution',
+                    'solver_status': solver_status}
+
+        except Exception as e:
+            self.logger.error(f"Error running optimization: {e}")
+            return {'status': 'error', 'message': str(e)}
+
+
+class HorizonBackend(HighsBackend):
+    """
+    Receding horizon: solves `steps` steps of `step_minutes` (see horizon_model.py) every
+    cycle and returns the first step in the usual output dict. The PV/wind/load limits of
+    later steps come from inputs['forecast'] (added by the mode when uses_forecasts is set).
+
+    With warmStart on, the MIP start is the previous plan moved one step forward. The MIP stops at
+    horizon.mipGap (default 1 %) or horizon.timeLimit seconds (default 120, capped by the
+    solveTimeLimit budget; the best plan found so far is used); root cut rounds on the full 96-step model otherwise take tens
+    of seconds for little change in the first step.
+    """
+    name = 'horizon'
+    uses_forecasts = True
+
+    def __init__(self, optimizer):
+        super().__init__(optimizer)
+        horizon = optimizer.settings.get('horizon') or {}
+        self.steps = int(horizon.get('steps', 96))
+        self.step_minutes = float(horizon.get('stepMinutes', 15))
+        self.mip_gap = float(horizon.get('mipGap', 0.01))
+        self.time_limit = float(horizon.get('timeLimit', 120))
+        if self.steps < 1 or self.step_minutes <= 0:
+            raise ValueError(f"Invalid horizon: {self.steps} steps of {self.step_minutes} minutes")
+        self.last_plan: Dict[str, Any] = {}
+        self._layout = None
+        self._shift_map: Optional[np.ndarray] = None
+
+    def build(self, inputs: Dict[str, Any]) -> HorizonModel:
+        return build_horizon_model(self.optimizer, inputs, self.steps, self.step_minutes / 60)
+
+    def _new_highs(self, time_budget: Optional[float] = None) -> highspy.Highs:
+        highs = super()._new_highs()
+        highs.setOptionValue('mip_rel_gap', self.mip_gap)
+        highs.setOptionValue('time_limit', min(self.time_limit, self.time_budget if time_budget is None else time_budget))
+        return highs
+
+    @staticmethod
+    def _layout_of(hm: HorizonModel):
+        return tuple((name, cols.shape) for name, (_, cols) in hm.blocks.items())
+
+    def mip_start(self, hm: HorizonModel) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if self._previous_values is None or self._layout_of(hm) != self._layout:
+            return None
+        return np.arange(hm.num_col, dtype=np.int32), self._previous_values[self._shift_map]
+
+    def remember(self, hm: HorizonModel, values: np.ndarray):
+        layout = self._layout_of(hm)
+        if layout != self._layout:
+            self._layout = layout
+            self._shift_map = hm.shift_map()
+        self._previous_values = values
+
+    def solve(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            start = time.perf_counter()
+            hm = self.build(inputs)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            mip_start = self.mip_start(hm) if self.warm_start else None
+            start = time.perf_counter()
+            solver_status, values, highs = self.run_model(hm, start=mip_start)
+            solve_ms = (time.perf_counter() - start) * 1000
+            self.stats.update(build_ms=build_ms, solve_ms=solve_ms,
+                              num_col=hm.num_col, num_row=hm.num_row, num_nz=hm.num_nz,
+                              num_int=int(hm.integer.sum()),
+                              steps=self.steps, step_minutes=self.step_minutes,
+                              forecasts=len(inputs.get('forecast') or {}),
+                              warm_start=mip_start is not None,
+                              **highs_info(highs))
+            self.warm_start_stats.record(mip_start is not None, solve_ms, self.stats['simplex_iterations'])
+
+            if values is not None:
+                if self.warm_start:
+                    self.remember(hm, values)
+                self.stats['horizon_objective'] = round(float(np.dot(hm.col_cost, values)), 4)
+                self.last_plan = hm.trajectories(values, ('bess_level', 'unidir_soc', 'bidir_soc', 'imp', 'exp'))
+                output = self.optimizer.extract_output(hm.step_view(values, 0), inputs)
+                return {'status': 'success', 'output': output, 'solver_status': solver_status}
+
+            self.logger.error("Optimizer failed to find solution")
+            return {'status': 'error', 'message': 'Solver did not find optimal solution',
+                    'solver_status': solver_status}
+
+        except Exception as e:
+            self.logger.error(f"Error running optimization: {e}")
+            return {'status': 'error', 'message': str(e)}
+
+
+class SparseBackend(HorizonBackend):
+    """
+    The single-interval model built block-wise from device tables (one array operation per
+    constraint family) instead of per-device Python loops: the horizon formulation with one
+    step of one hour, which is exactly the model of run_optimization(). Solved to HiGHS'
+    default gap within the solveTimeLimit budget, like the 'pyomo' backend (no separate
+    horizon.timeLimit).
+    """
+    name = 'sparse'
+    uses_forecasts = False
+
+    def __init__(self, optimizer):
+        HighsBackend.__init__(self, optimizer)
+        self.steps = 1
+        self.step_minutes = 60.0
+        self.mip_gap = 1e-4
+        self.time_limit = math.inf
+        self.last_plan = {}
+        self._layout = None
+        self._shift_map = None
+
+
+BACKENDS = {
+    PyomoBackend.name: PyomoBackend,
+    PersistentPyomoBackend.name: PersistentPyomoBackend,
+    HighsBackend.name: HighsBackend,
+    SparseBackend.name: SparseBackend,
+    HorizonBackend.name: HorizonBackend,
+}
+
+
+def create_backend(optimizer, name: str = None) -> SolverBackend:
+    """
+    Create the solver backend configured in optimizerSettings (or `name`).
+
+    Objectives that override get_additional_constraints() with custom Pyomo constraints
+    can only be solved by the 'pyomo' backend. LP mode needs a HiGHS array backend.
+    """
+    settings = optimizer.settings
+    if name is None:
+        name = settings.get('backend') or ('pyomo_persistent' if settings.get('persistentModel') else 'pyomo')
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported solver backend: {name}. Supported backends: {list(BACKENDS)}")
+
+    from optimization.base_optimizer import BaseOptimizer
+    if name != PyomoBackend.name and \
+            type(optimizer).get_additional_constraints is not BaseOptimizer.get_additional_constraints:
+        logger.warning(f"Objective adds custom constraints - using the 'pyomo' backend instead of '{name}'")
+        name = PyomoBackend.name
+
+    if settings.get('lpMode') and not issubclass(BACKENDS[name], HighsBackend):
+        logger.warning(f"lpMode is not supported by the '{name}' backend - solving the MILP")
+
+    return BACKENDS[name](optimizer)
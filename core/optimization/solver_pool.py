@@ -0,0 +1,127 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: solver_pool.py
+@Description: Solve slots shared by the sites of a multi-site process (see multisite.py). At
+              most `workers` optimizations run at a time; when a slot frees up it goes to the
+              next site in round-robin order among the sites that are waiting, so a site with
+              frequent off-cycle triggers or slow solves cannot starve the others. Every site
+              waits for its own requests in FIFO order. Solves on the Pyomo backends still
+              run one at a time (see solver_backends.PYOMO_SOLVE_LOCK).
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+
+'''
+
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Any
+
+
+class SolverPool:
+    """Fair-share limit on the number of concurrent solves of several sites."""
+
+    def __init__(self, workers: int = 1):
+        """
+        Args:
+            workers: Number of solves that may run at the same time
+        """
+        if workers < 1:
+            raise ValueError(f"SolverPool needs at least one worker, got {workers}")
+        self.workers = workers
+        self.logger = logging.getLogger('ems.solver_pool')
+        self._lock = threading.Lock()
+        self._free = workers
+        # site -> queued grant events; a site is moved to the back after each grant
+        self._waiting: 'OrderedDict[str, deque]' = OrderedDict()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _site_stats(self, site_id: str) -> Dict[str, float]:
+        if site_id not in self._stats:
+            self._stats[site_id] = {'solves': 0, 'waited': 0, 'wait_ms': 0.0, 'max_wait_ms': 0.0}
+        return self._stats[site_id]
+
+    def _grant_next(self):
+        """Hand the free slot to the first waiting site (lock held)."""
+        site_id, queue = next(iter(self._waiting.items()))
+        granted = queue.popleft()
+        del self._waiting[site_id]
+        if queue:
+            self._waiting[site_id] = queue
+        granted.set()
+
+    @contextmanager
+    def slot(self, site_id: str):
+        """
+        Hold one solve slot for `site_id` while the block runs.
+
+        Args:
+            site_id: Site the solve belongs to (the unit of fairness)
+
+        Yields:
+            float: Time waited for the slot, in ms
+        """
+        start = time.perf_counter()
+        with self._lock:
+            stats = self._site_stats(site_id)
+            if self._free and not self._waiting:
+                self._free -= 1
+                granted = None
+            else:
+                granted = threading.Event()
+                self._waiting.setdefault(site_id, deque()).append(granted)
+        if granted is not None:
+            granted.wait()
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            stats['solves'] += 1
+            if granted is not None:
+                stats['waited'] += 1
+                stats['wait_ms'] += wait_ms
+                stats['max_wait_ms'] = max(stats['max_wait_ms'], wait_ms)
+        if granted is not None:
+            self.logger.debug(f"Site {site_id} waited {wait_ms:.0f} ms for a solver slot")
+        try:
+            yield wait_ms
+        finally:
+            with self._lock:
+                # A freed slot passes straight to the next waiter, or returns to the pool
+                if self._waiting:
+                    self._grant_next()
+                else:
+                    self._free += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Workers, busy slots, waiting requests and solves/waits per site."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'busy': self.workers - self._free,
+                'waiting': sum(len(queue) for queue in self._waiting.values()),
+                'sites': {site_id: {**stats, 'wait_ms': round(stats['wait_ms'], 3),
+                                    'max_wait_ms': round(stats['max_wait_ms'], 3)}
+                          for site_id, stats in self._stats.items()},
+            }
@@ -19,7 +19,7 @@ limitations under the License.
 @Description: TODO
 
 @Created: 11 February 2026
-@Last Modified: 01 March 2026
+@Last Modified: 19 October 2026
 @Author: Leon Gritsyuk
 
 @Version: v2.0.2
@@ -28,34 +28,113 @@ limitations under the License.
 
 from utils.time_utils import calculate_time_for_execution
 from utils.logging_utils import setup_logging
+from utils.trigger_utils import TriggerMonitor, describe_events, trigger_settings_enabled
+from utils.profiling_utils import CycleProfiler
+from db.migrator import run_migrations
+from db.queries import log_query_stats
 import json
 import time
 import logging
+import threading
+from contextlib import nullcontext
 
 # Operating modes for the system
 from modes.optimizer_mode import OptimizerMode
 from modes.droop_mode import DroopMode
+from data.modbus_writer import ModbusWriter
+from optimization.optimizer import OptimizerRunner
+from optimization.shadow import ShadowEvaluator, shadow_settings_enabled
+from optimization.solver_pool import SolverPool
+from utils.database_utils import DatabaseOperations
+from db.pool import DatabasePool
+
+
+# Modes are created on first selection
+MODES = {
+    'optimizer': OptimizerMode,
+    'droop': DroopMode,
+}
 
 
 class Coordinator:
-    def __init__(self, config):
+    def __init__(self, config, site_id: str = None, db: DatabasePool = None,
+                 solver_pool: SolverPool = None, modbus_config: str = './conf/modbus.json'):
         """
         Initialize optimizer class.
         
         Args:
             config = `config.json` file which contains hardware parameters and general configuration parameters
+            site_id: Site this coordinator runs for when several share the process (see multisite.py)
+            db: Connection pool of the site (default: the process-wide pool)
+            solver_pool: Solve slots shared with the other sites of the process (default: none)
+            modbus_config: Path to the site's `modbus.json`
         """
         
         self.config = config
+        self.site_id = site_id
+        self.db = db
+        self.solver_pool = solver_pool
+        self.modbus_config = modbus_config
         self.current_mode = None
-        self.modes = {
-            'optimizer': OptimizerMode(config),
-            'droop': DroopMode(config),
-        }
-        self.logger = logging.getLogger('optimizer')
+        # Only the selected mode is built; all modes share one optimizer runner, one
+        # database layer and one Modbus writer (client pool), created on first use
+        self.modes = {}
+        self._db_ops = None
+        self._optimizer = None
+        self._modbus_writer = None
+        self.logger = logging.getLogger('optimizer' if site_id is None else f'optimizer.{site_id}')
+
+        # Other objectives solved on the live inputs (generalSiteConfig.shadowEvaluation)
+        self.shadow = None
+        if shadow_settings_enabled(config):
+            self.shadow = ShadowEvaluator(config, self.db_ops)
+            self.logger.info(f"Shadow evaluation of {len(self.shadow.objectives)} objectives "
+                             f"({self.shadow.workers} workers, {self.shadow.time_budget:.0f} s budget)")
+
+        # Off-cycle optimizations on live measurement events (generalSiteConfig.triggers)
+        self.trigger_monitor = None
+        if trigger_settings_enabled(config):
+            self.trigger_monitor = TriggerMonitor(config)
+            self.trigger_monitor.feed = self.db_ops.create_latest_value_feed(self.trigger_monitor.parameters)
+            self.logger.info(f"Re-optimization triggers watching {len(self.trigger_monitor.parameters)} parameters")
+
+        # cProfile of one cycle on SIGUSR1 (EMS_CYCLE_PROFILE_DIR)
+        self.profiler = CycleProfiler.from_env()
         
         self.running = False
+        # Set by stop() to cut the wait for the next cycle short
+        self._stopped = threading.Event()
+
+    # ── Shared resources ──────────────────────────────────────────────────────
+
+    @property
+    def db_ops(self) -> DatabaseOperations:
+        if self._db_ops is None:
+            self._db_ops = DatabaseOperations(site_config=self.config, db=self.db)
+        return self._db_ops
 
+    @property
+    def optimizer(self) -> OptimizerRunner:
+        if self._optimizer is None:
+            self._optimizer = OptimizerRunner(self.config, solver_pool=self.solver_pool, site_id=self.site_id)
+        return self._optimizer
+
+    @property
+    def modbus_writer(self) -> ModbusWriter:
+        if self._modbus_writer is None:
+            self._modbus_writer = ModbusWriter(config_file=self.modbus_config)
+        return self._modbus_writer
+
+    def get_mode(self, name: str):
+        """The mode called `name`, created with the shared resources when first selected."""
+        mode = self.modes.get(name)
+        if mode is None:
+            start = time.perf_counter()
+            mode = MODES[name](self.config, db_ops=self.db_ops, optimizer=self.optimizer,
+                               modbus_writer=self.modbus_writer, shadow=self.shadow)
+            self.modes[name] = mode
+            self.logger.info(f"Initialized {mode.mode_name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return mode
 
     def select_mode(self):
         """Evaluate conditions and select appropriate mode"""
@@ -71,12 +150,24 @@ class Coordinator:
         else:
             return True
 
-    def run_cycle(self):
-        """Execute a single cycle"""
+    def run_cycle(self, trigger: str = None):
+        """
+        Execute a single cycle
+
+        The cycle record holds the mode's stages plus the coordinator's own: 'select' (mode
+        selection), 'init' (creating the mode, on its first cycle only) and 'rebase' (trigger
+        reference update). It is queued here, after the rebase, and its total covers all of them.
+
+        Args:
+            trigger: Description of the trigger events of an off-cycle run (None if scheduled)
+        """
         self.logger.debug("Starting optimization cycle")
+        cycle_start = time.perf_counter()
+        timings = {}
 
         # Select mode for this cycle
         selected_mode = self.select_mode()
+        timings['select'] = (time.perf_counter() - cycle_start) * 1000
 
         # If mode changed, log it
         if self.current_mode != selected_mode:
@@ -84,29 +175,78 @@ class Coordinator:
             self.current_mode = selected_mode
 
         # Execute the selected mode
+        cycle = None
+        start = time.perf_counter()
         try:
             if selected_mode == 'optimizer' or selected_mode == 'droop':
-                result = self.modes[selected_mode].execute()
+                created = selected_mode not in self.modes
+                mode = self.get_mode(selected_mode)
+                if created:
+                    timings['init'] = (time.perf_counter() - start) * 1000
+                cycle = self.db_ops.new_cycle(mode.mode_name)
+                cycle.timings_ms.update(timings)
+                with self.profiler.capture(selected_mode) if self.profiler else nullcontext():
+                    result = mode.execute(trigger=trigger, cycle=cycle)
                 self.logger.debug(f"Executed {selected_mode} mode.")
         except Exception as e:
             self.logger.error(f"Error executing {selected_mode} mode: {e}")
             # Implement fallback behavior here if needed
+        execute_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        if self.trigger_monitor:
+            self.trigger_monitor.rebase()
+        rebase_ms = (time.perf_counter() - start) * 1000
+
+        if cycle is not None:
+            if self.trigger_monitor:
+                cycle.timings_ms['rebase'] = rebase_ms
+            cycle.timings_ms['total'] = (time.perf_counter() - cycle_start) * 1000
+            self.db_ops.record_cycle(cycle)
+        self.logger.debug(f"Cycle took {execute_ms:.0f} ms ({selected_mode} mode), "
+                          f"trigger rebase {rebase_ms:.0f} ms")
+
+    def wait_for_next_cycle(self, optimization_interval):
+        """
+        Sleep until the next scheduled cycle. With triggers configured, the live measurements
+        are polled meanwhile and an off-cycle optimization runs when a trigger fires.
+        """
+        sleep_time = calculate_time_for_execution(interval_minutes=optimization_interval)
+        if not self.trigger_monitor:
+            if sleep_time > 0:
+                self._stopped.wait(sleep_time)
+            return
+
+        deadline = time.monotonic() + sleep_time
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self._stopped.wait(min(self.trigger_monitor.poll_seconds, remaining)):
+                return
+            if deadline - time.monotonic() <= 0:
+                return
+            events = self.trigger_monitor.poll()
+            if events:
+                trigger = describe_events(events)
+                self.logger.info(f"Off-cycle optimization triggered by {trigger}")
+                self.run_cycle(trigger=trigger)
 
 
     def run(self, optimization_interval=15):
         self.logger.info("Optimizer Starting")
         self.running = True
+        self._stopped.clear()
+        if self.profiler:
+            self.profiler.install()
         
         try:            
             # Main coordination loop (15-minute cycles)
             while self.running:
 
                 self.run_cycle()
-                
-                sleep_time = calculate_time_for_execution(interval_minutes=optimization_interval)
-                
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+
+                self.wait_for_next_cycle(optimization_interval)
                     
         except KeyboardInterrupt:
             self.logger.info("Received keyboard interrupt, shutting down...")
@@ -115,10 +255,16 @@ class Coordinator:
         finally:
             self.shutdown()
 
+    def stop(self):
+        """Ask run() to return after the current cycle (it then calls shutdown())."""
+        self.running = False
+        self._stopped.set()
+
     def shutdown(self):
         """Clean shutdown of all components"""
         self.logger.info("Shutting down optimizer...")
         self.running = False
+        self._stopped.set()
         
         # Clean up modes
         for mode_name, mode in self.modes.items():
@@ -128,6 +274,23 @@ class Coordinator:
                     self.logger.info(f"Cleaned up {mode_name} mode")
                 except Exception as e:
                     self.logger.error(f"Error cleaning up {mode_name} mode: {e}")
+
+        # Then the resources they share
+        try:
+            if self.shadow is not None:
+                self.logger.info(f"Shadow evaluation: {self.shadow.stats()}")
+                self.shadow.close()
+            if self._db_ops is not None:
+                self._db_ops.close()
+            if self._modbus_writer is not None:
+                self._modbus_writer.close()
+                self.logger.info("Modbus writer closed")
+        except Exception as e:
+            self.logger.error(f"Error closing shared resources: {e}")
+
+        # The query stats are per process; a multi-site host logs them once for all sites
+        if self.site_id is None:
+            log_query_stats()
         
         self.logger.info("Optimizer shutdown complete")
 
@@ -135,6 +298,7 @@ class Coordinator:
 if __name__ == "__main__":
     
     setup_logging()
+    run_migrations()
 
     # Example configuration
     with open('./conf/config.json', 'r') as file:
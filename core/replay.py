@@ -0,0 +1,120 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: replay.py
+@Description: Offline replay of stored measurements through several objectives
+              (see optimization/replay.py), with a KPI comparison per objective.
+    # Last 7 days, every objective, one worker per CPU
+    python replay.py
+
+    # A month, three objectives, 8 workers, full report with per-interval KPIs
+    python replay.py --start "2026-09-01" --end "2026-10-01" \
+        --objectives maxWeightPowerFlow maxSelfConsumption peakShaving --workers 8 --output replay.json
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import argparse
+import json
+import logging
+from datetime import timedelta
+
+from optimization.objective_optimizers import OPTIMIZERS
+from optimization.replay import replay
+from utils.logging_utils import setup_logging
+from utils.time_utils import TIMEZONE, current_time, floor_to_hour, parse_datetime
+
+setup_logging()
+logger = logging.getLogger('replay')
+
+# Columns of the comparison table: (summary key, title, is a share)
+COLUMNS = [
+    ('solved', 'solved', False),
+    ('fallbacks', 'fallback', False),
+    ('import_kWh', 'import kWh', False),
+    ('export_kWh', 'export kWh', False),
+    ('peak_import_kW', 'peak kW', False),
+    ('ev_charge_kWh', 'EV kWh', False),
+    ('self_consumption', 'self-cons', True),
+    ('self_sufficiency', 'self-suff', True),
+    ('curtailment', 'curtailed', True),
+    ('load_shed', 'load shed', True),
+    ('solve_ms_p95', 'p95 ms', False),
+]
+
+
+def _cell(value, share: bool) -> str:
+    if value is None:
+        return '-'
+    if share:
+        return f'{value:.1%}'
+    return f'{value:.1f}' if isinstance(value, float) else str(value)
+
+
+def print_summary(report):
+    print(f"{report['intervals']} intervals {report['start']} - {report['end']}, "
+          f"loaded in {report['load_s']} s, solved in {report['solve_s']} s")
+    print(f"{'objective':<20}" + ''.join(f'{title:>11}' for _, title, _ in COLUMNS))
+    for objective, summary in report['summary'].items():
+        print(f"{objective:<20}" + ''.join(f'{_cell(summary[key], share):>11}' for key, _, share in COLUMNS))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay stored measurements through several objectives",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--start', type=str, help='Start datetime (default: 7 days before --end)')
+    parser.add_argument('--end', type=str, help='End datetime (default: the last whole hour)')
+    parser.add_argument('--objectives', nargs='+', default=list(OPTIMIZERS), choices=list(OPTIMIZERS))
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per CPU, 0: solve in this process)')
+    parser.add_argument('--backend', type=str, default=None, help='optimizerSettings.backend override')
+    parser.add_argument('--config', type=str, default='./conf/config.json', help='Site config')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write the full report (summary and per-interval KPIs) as JSON')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+
+    end = parse_datetime(args.end).replace(tzinfo=TIMEZONE) if args.end else floor_to_hour(current_time())
+    start = parse_datetime(args.start).replace(tzinfo=TIMEZONE) if args.start else end - timedelta(days=7)
+
+    with open(args.config, 'r') as file:
+        config = json.load(file)
+
+    settings = {'backend': args.backend} if args.backend else None
+    report = replay(config, args.objectives, start, end, workers=args.workers, settings=settings)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+        logger.info(f"Report written to {args.output}")
+
+    if args.json:
+        print(json.dumps({key: value for key, value in report.items() if key != 'records'}, indent=2))
+    else:
+        print_summary(report)
+
+
+if __name__ == '__main__':
+    main()
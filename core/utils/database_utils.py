@@ -16,310 +16,475 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 @File: database_utils.py
-@Description: # TODO: Add desc
+@Description: Optimizer-side database access: input queries, flattening of optimizer
+              inputs/outputs and persistence of optimization cycle records.
 
 @Created: 3rd February 2026
-@Last Modified: 05 March 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
 '''
 
 
+import json
 import logging
-import psycopg2
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from psycopg2.extras import Json
+
 import data.database_client as db_client
+from db.pool import DatabasePool, get_pool
+from db.writer import BackgroundWriter
 from utils.time_utils import current_time
 
+# (parameter, value, unit)
+Row = Tuple[str, float, str]
+# (parameter suffix, inputs field, unit)
+InputField = Tuple[str, str, str]
+
+
+def _to_float(value) -> Optional[float]:
+    """Non-numeric values, and NaN/Infinity (which JSONB has no literal for), are stored as null."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _rows_to_json(rows: List[Row]) -> list:
+    return [{'parameter': p, 'value': v, 'unit': u} for p, v, u in rows]
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Outputs
+# ─────────────────────────────────────────────────────────────────────────
+
+def flatten_outputs(data: Dict[str, Any]) -> List[Row]:
+    """
+    Flatten optimizer outputs into (parameter, value, unit) rows.
+
+    New multi-device structure expected:
+      {
+        'obj': float,
+        'imp': float, 'exp': float, 'exp1': float, 'exp2': float,
+        'afe':   { '<afe_id>':   { 'imp', 'exp', 'exp1', 'exp2' } },
+        'pv':    { '<pv_id>':    { 'power' } },
+        'wind':  { '<wind_id>':  { 'power' } },
+        'load':  { '<load_id>':  { 'power' } },
+        'cload': { '<cload_id>': { 'power' } },
+        'bess':  { '<bess_id>':  { 'charge', 'discharge', 'level' } },
+        'unidir':{ '<uid>':      { 'charge', 'soc' } },
+        'bidir': { '<bid>':      { 'charge', 'discharge', 'soc' } },
+      }
+
+    Falls back to the old flat structure for backward compatibility.
+    """
+    rows: List[Row] = []
+
+    def add(param, value, unit):
+        rows.append((param, _to_float(value), unit))
+
+    # Detect structure: new format has at least one per-device dict key
+    is_new_format = any(
+        k in data and isinstance(data[k], dict)
+        for k in ('afe', 'pv', 'wind', 'load', 'cload', 'bess', 'unidir', 'bidir')
+    )
+
+    if is_new_format:
+        # ── Aggregate grid scalars ────────────────────────────────────────
+        add('obj',  data.get('obj',  -1), '-')
+        add('imp',  data.get('imp',  -1), 'kW')
+        add('exp',  data.get('exp',  -1), 'kW')
+        add('exp1', data.get('exp1', -1), 'kW')
+        add('exp2', data.get('exp2', -1), 'kW')
+
+        # ── Per-AFE ───────────────────────────────────────────────────────
+        for afe_id, afe_data in data.get('afe', {}).items():
+            add(f'{afe_id}_imp',  afe_data.get('imp',  -1), 'kW')
+            add(f'{afe_id}_exp',  afe_data.get('exp',  -1), 'kW')
+            add(f'{afe_id}_exp1', afe_data.get('exp1', -1), 'kW')
+            add(f'{afe_id}_exp2', afe_data.get('exp2', -1), 'kW')
+
+        # ── Per-PV ────────────────────────────────────────────────────────
+        for pv_id, pv_data in data.get('pv', {}).items():
+            add(f'{pv_id}_power', pv_data.get('power', -1), 'kW')
+
+        # ── Per-Wind ──────────────────────────────────────────────────────
+        for wind_id, wind_data in data.get('wind', {}).items():
+            add(f'{wind_id}_power', wind_data.get('power', -1), 'kW')
+
+        # ── Per-Load ──────────────────────────────────────────────────────
+        for load_id, load_data in data.get('load', {}).items():
+            add(f'{load_id}_power', load_data.get('power', -1), 'kW')
+
+        # ── Per-Critical-Load ─────────────────────────────────────────────
+        for cload_id, cload_data in data.get('cload', {}).items():
+            add(f'{cload_id}_power', cload_data.get('power', -1), 'kW')
+
+        # ── Per-BESS ──────────────────────────────────────────────────────
+        for bess_id, bess_data in data.get('bess', {}).items():
+            add(f'{bess_id}_charge',    bess_data.get('charge',    -1), 'kW')
+            add(f'{bess_id}_discharge', bess_data.get('discharge', -1), 'kW')
+            add(f'{bess_id}_level',     bess_data.get('level',     -1), 'kWh')
+
+        # ── Per-Unidirectional-EV ─────────────────────────────────────────
+        for uid, uid_data in data.get('unidir', {}).items():
+            add(f'{uid}_charge', uid_data.get('charge', -1), 'kW')
+            add(f'{uid}_soc',    uid_data.get('soc', -1) * 100 if uid_data.get('soc', -1) != -1 else -1, '%')
+
+        # ── Per-Bidirectional-EV ──────────────────────────────────────────
+        for bid, bid_data in data.get('bidir', {}).items():
+            add(f'{bid}_charge',    bid_data.get('charge',    -1), 'kW')
+            add(f'{bid}_discharge', bid_data.get('discharge', -1), 'kW')
+            add(f'{bid}_soc',       bid_data.get('soc', -1) * 100 if bid_data.get('soc', -1) != -1 else -1, '%')
+
+    else:
+        # ── Legacy flat structure ──────────────────────────────────────────
+        legacy = [
+            ('obj',    data.get('obj',  -1), '-'),
+            ('imp',    data.get('imp',  -1), 'kW'),
+            ('exp',    data.get('exp',  -1), 'kW'),
+            ('exp1',   data.get('exp1', -1), 'kW'),
+            ('exp2',   data.get('exp2', -1), '%'),
+            ('pv',     data.get('pv',   -1), 'kW'),
+            ('ld',     data.get('ld',   -1), 'kW'),
+            ('bc',     data.get('bc',   -1), 'kW'),
+            ('bd',     data.get('bd',   -1), 'kW'),
+            ('bl',     data.get('bl',   -1), 'kWh'),
+            ('c1_ch',  data.get('c1_ch', -1), 'kW'),
+            ('c2_ch',  data.get('c2_ch', -1), 'kW'),
+            ('c2_dis', data.get('c2_dis', -1), 'kW'),
+            ('v1_soc', data.get('v1_soc', -1) * 100 if data.get('v1_soc', -1) != -1 else -1, '%'),
+            ('v2_soc', data.get('v2_soc', -1) * 100 if data.get('v2_soc', -1) != -1 else -1, '%'),
+            ('wind',   data.get('wind', -1), 'kW'),
+            ('cld',    data.get('cld',  -1), 'kW'),
+        ]
+        for param, value, unit in legacy:
+            add(param, value, unit)
+
+    return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Inputs
+# ─────────────────────────────────────────────────────────────────────────
+
+# (parameter suffix, inputs field, unit) of the recorded inputs of every device type
+INPUT_FIELDS: Dict[str, List[InputField]] = {
+    'afe': [
+        ('max',        'max_kW',               'kW'),
+        ('available',  'available',            '-'),
+        ('grid_svc',   'grid_svc_kW',          'kW'),
+    ],
+    'pv':    [('power_fct', 'power_fct_kW', 'kW')],
+    'wind':  [('power_fct', 'power_fct_kW', 'kW')],
+    'load':  [('power_fct', 'power_fct_kW', 'kW')],
+    'cload': [('power_fct', 'power_fct_kW', 'kW')],
+    'bess': [
+        ('efficiency', 'efficiency',           '-'),
+        ('level_init', 'level_init_kWh',       'kWh'),
+        ('level_min',  'level_min_kWh',        'kWh'),
+        ('level_max',  'level_max_kWh',        'kWh'),
+        ('power_max',  'power_max_kW',         'kW'),
+        ('fault',      'level_fault_kWh',      'kWh'),
+    ],
+    'unidir': [
+        ('soc_init',   'soc_init',             '-'),
+        ('capacity',   'car_capacity_kWh',     'kWh'),
+        ('efficiency', 'efficiency',           '-'),
+        ('power',      'charger_power_max_kW', 'kW'),
+        ('car_power',  'car_power_max_kW',     'kW'),
+    ],
+    'bidir': [
+        ('soc_init',   'soc_init',             '-'),
+        ('capacity',   'car_capacity_kWh',     'kWh'),
+        ('efficiency', 'efficiency',           '-'),
+        ('power',      'charger_power_max_kW', 'kW'),
+        ('arrival',    'arrival_soc',          '-'),
+        ('target',     'target_soc',           '-'),
+        ('available',  'is_available',         '-'),
+        ('car_power',  'car_power_max_kW',     'kW'),
+    ],
+}
+
+
+def flatten_inputs(data: Dict[str, Any]) -> List[Row]:
+    """
+    Flatten optimizer inputs into (parameter, value, unit) rows.
+
+    New multi-device structure expected:
+      {
+        'afe':   { '<afe_id>':   { 'max_kW', 'available', 'grid_svc_kW' } },
+        'pv':    { '<pv_id>':    { 'power_fct_kW' } },
+        'wind':  { '<wind_id>':  { 'power_fct_kW' } },
+        'load':  { '<load_id>':  { 'power_fct_kW' } },
+        'cload': { '<cload_id>': { 'power_fct_kW' } },
+        'bess':  { '<bess_id>':  { 'efficiency', 'level_init_kWh', ... } },
+        'unidir':{ '<uid>':      { 'soc_init', 'car_capacity_kWh', ... } },
+        'bidir': { '<bid>':      { 'soc_init', 'car_capacity_kWh', ... } },
+      }
+    """
+    rows: List[Row] = []
+
+    def add(param, value, unit):
+        rows.append((param, _to_float(value), unit))
+
+    is_new_format = any(
+        k in data and isinstance(data[k], dict)
+        for k in ('afe', 'pv', 'wind', 'load', 'cload', 'bess', 'unidir', 'bidir')
+    )
+
+    if is_new_format:
+        for group, fields in INPUT_FIELDS.items():
+            for device_id, device_data in data.get(group, {}).items():
+                for suffix, key, unit in fields:
+                    add(f'{device_id}_{suffix}', device_data.get(key, -1), unit)
+
+    else:
+        # ── Legacy flat structure ──────────────────────────────────────────
+        legacy = [
+            ('pv_fct',   data.get('pv_fct',   -1), 'kW'),
+            ('ld_fct',   data.get('ld_fct',   -1), 'kW'),
+            ('afe_max',  data.get('afe_max',  -1), 'kW'),
+            ('afe_abl',  data.get('afe_abl',  -1), '-'),
+            ('grid_svc', data.get('grid_svc', -1), 'kW'),
+            ('be',       data.get('be',       -1), '-'),
+            ('bl_min',   data.get('bl_min',   -1), 'kWh'),
+            ('bl_max',   data.get('bl_max',   -1), 'kWh'),
+            ('bc_max',   data.get('bc_max',   -1), 'kW'),
+            ('bl_init',  data.get('bl_init',  -1), 'kWh'),
+            ('bl_fault', data.get('bl_fault', -1), 'kWh'),
+            ('v1_p',     data.get('v1_p',     -1), 'kW'),
+            ('v1_c',     data.get('v1_c',     -1), 'kWh'),
+            ('v1_init',  data.get('v1_init',  -1), '-'),
+            ('v2_p',     data.get('v2_p',     -1), 'kW'),
+            ('v2_c',     data.get('v2_c',     -1), 'kWh'),
+            ('v2_init',  data.get('v2_init',  -1), '-'),
+            ('v2_arr',   data.get('v2_arr',   -1), '-'),
+            ('v2_trg',   data.get('v2_trg',   -1), '-'),
+            ('v2_abl',   data.get('v2_abl',   -1), '-'),
+            ('c1_eff',   data.get('c1_eff',   -1), '-'),
+            ('c1_p',     data.get('c1_p',     -1), 'kW'),
+            ('c2_eff',   data.get('c2_eff',   -1), '-'),
+            ('c2_p',     data.get('c2_p',     -1), 'kW'),
+            ('wind_fct', data.get('wind_fct', -1), 'kW'),
+            ('cld_fct',  data.get('cld_fct',  -1), 'kW'),
+        ]
+        for param, value, unit in legacy:
+            add(param, value, unit)
+
+    return rows
+
+
+def unflatten_inputs(rows: List[Dict[str, Any]], template: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild optimizer inputs from the recorded rows of a cycle (optimization_cycles.inputs).
+
+    Args:
+        rows: [{'parameter', 'value', 'unit'}] rows as stored by record_cycle()
+        template: Inputs of the same site (prepare_inputs() of its optimizer); gives the
+                  device set and the values the rows lack or record as missing (-1), e.g.
+                  car power limits of cycles recorded before they were stored
+
+    Returns:
+        Inputs in the prepare_inputs() format
+    """
+    # -1 is what flatten_inputs() records for a field the inputs lacked - not a value
+    values = {row['parameter']: row['value'] for row in rows if row.get('value') not in (None, -1)}
+    inputs = {}
+    for group, devices in template.items():
+        fields = INPUT_FIELDS.get(group, [])
+        inputs[group] = {}
+        for device_id, device_data in devices.items():
+            device_data = dict(device_data)
+            for suffix, key, _ in fields:
+                value = values.get(f'{device_id}_{suffix}')
+                if value is not None:
+                    device_data[key] = value
+            inputs[group][device_id] = device_data
+    return inputs
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Cycle records
+# ─────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class OptimizationCycle:
+    """
+    One optimizer run. Stored as a single `optimization_cycles` row; the "ems-inputs" and
+    "ems-outputs" views expand it back into one row per parameter. `quality` is 'ok',
+    'fallback' (setpoints from the merit-order fallback dispatch) or 'error'.
+    """
+    mode: str
+    objective: str
+    cycle_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    started_at: datetime = field(default_factory=current_time)
+    status: str = 'pending'
+    solver_status: Optional[str] = None
+    quality: str = 'ok'
+    message: Optional[str] = None
+    inputs: List[Row] = field(default_factory=list)
+    outputs: List[Row] = field(default_factory=list)
+    setpoints: Optional[Dict[str, Any]] = None
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    stats: Dict[str, Any] = field(default_factory=dict)
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage of the cycle (accumulated into timings_ms[name])."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings_ms[name] = self.timings_ms.get(name, 0.0) + elapsed
+
+    def actuated(self, newest_sample: datetime = None):
+        """
+        Record the data-to-actuation latency once the setpoints are written: from the start
+        of the cycle (the data fetch) and, if known, from the newest measurement used.
+        """
+        latency = {'data_to_actuation': round((time.perf_counter() - self._start) * 1000, 1)}
+        if newest_sample is not None:
+            latency['sample_to_actuation'] = round((current_time() - newest_sample).total_seconds() * 1000, 1)
+        self.stats['latency_ms'] = latency
+
+    def finish(self, status: str, quality: str = None, message: str = None):
+        """Set the final status and the total cycle duration."""
+        self.status = status
+        if quality is not None:
+            self.quality = quality
+        if message is not None:
+            self.message = message
+        self.timings_ms['total'] = (time.perf_counter() - self._start) * 1000
+
+
+INSERT_CYCLE_SQL = """
+    INSERT INTO optimization_cycles (
+        cycle_id, time, mode, objective, status, solver_status, quality, message,
+        fetch_ms, solve_ms, apply_ms, total_ms, inputs, outputs, setpoints, stats
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (cycle_id) DO NOTHING
+"""
+
+
+INSERT_SHADOW_SQL = """
+    INSERT INTO optimization_shadows (
+        cycle_id, time, objective, status, solver_status, message, solve_ms, wall_ms, outputs
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (cycle_id, objective) DO NOTHING
+"""
+
+
+def _json(value):
+    return Json(value, dumps=lambda obj: json.dumps(obj, default=str)) if value is not None else None
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Database operations
+# ─────────────────────────────────────────────────────────────────────────
 
 class DatabaseOperations:
     """Shared database operations for all modes"""
 
-    def __init__(self, db_config: Dict[str, str], site_config: Dict[str, str]):
-        self.db_config = db_config
+    def __init__(self, site_config: Dict[str, str], db: DatabasePool = None,
+                 writer: BackgroundWriter = None):
+        self.db = db or get_pool()
+        self.writer = writer or BackgroundWriter(self.db, name='ems-cycle-writer')
         self.site_config = site_config
         self.objective_function = site_config['generalSiteConfig']['objectiveFunction']
         self.logger = logging.getLogger('ems.database')
 
-    def get_latest_15_min_interval(self):
-        return db_client.get_last_15min_data(
-            host=self.db_config['host'],
-            database=self.db_config['database'],
-            user=self.db_config['user'],
-            password=self.db_config['password']
-        )
+    def create_input_provider(self, required: Dict[str, List[str]]) -> db_client.OptimizerInputProvider:
+        """
+        Build the combined input fetch for an optimizer.
 
-    def get_most_recent_data(self):
-        return db_client.get_most_recent_data(
-            host=self.db_config['host'],
-            database=self.db_config['database'],
-            user=self.db_config['user'],
-            password=self.db_config['password']
+        Args:
+            required: {'averaged': [...], 'recent': [...]} as returned by required_parameters()
+        """
+        return db_client.OptimizerInputProvider(
+            required.get('averaged', []), required.get('recent', []), db=self.db
         )
 
-    # ─────────────────────────────────────────────────────────────────────────
-    # Outputs
-    # ─────────────────────────────────────────────────────────────────────────
+    def create_forecast_provider(self, asset_keys: List[str]) -> db_client.ForecastProvider:
+        """
+        Build the forecast fetch of a receding-horizon optimizer.
 
-    def insert_outputs_to_db(self, data: Dict[str, Any], quality: str = 'ok'):
+        Args:
+            asset_keys: Device ids whose stored forecasts are read
         """
-        Insert optimizer outputs to database.
-
-        New multi-device structure expected:
-          {
-            'obj': float,
-            'imp': float, 'exp': float, 'exp1': float, 'exp2': float,
-            'afe':   { '<afe_id>':   { 'imp', 'exp', 'exp1', 'exp2' } },
-            'pv':    { '<pv_id>':    { 'power' } },
-            'wind':  { '<wind_id>':  { 'power' } },
-            'load':  { '<load_id>':  { 'power' } },
-            'cload': { '<cload_id>': { 'power' } },
-            'bess':  { '<bess_id>':  { 'charge', 'discharge', 'level' } },
-            'unidir':{ '<uid>':      { 'charge', 'soc' } },
-            'bidir': { '<bid>':      { 'charge', 'discharge', 'soc' } },
-          }
-
-        Falls back to the old flat structure for backward compatibility.
+        return db_client.ForecastProvider(asset_keys, db=self.db)
+
+    def create_latest_value_feed(self, parameters: List[str]) -> db_client.LatestValueFeed:
         """
-        conn = psycopg2.connect(
-            host=self.db_config['host'],
-            port=self.db_config['port'],
-            database=self.db_config['database'],
-            user=self.db_config['user'],
-            password=self.db_config['password']
-        )
-        cur = conn.cursor()
-        rows = []
-        output_id = 1
-
-        def add(param, value, unit):
-            nonlocal output_id
-            rows.append((
-                output_id, current_time(), param, value,
-                unit, quality, self.objective_function
-            ))
-            output_id += 1
-
-        # Detect structure: new format has at least one per-device dict key
-        is_new_format = any(
-            k in data and isinstance(data[k], dict)
-            for k in ('afe', 'pv', 'wind', 'load', 'cload', 'bess', 'unidir', 'bidir')
-        )
+        Build the live measurement feed of the re-optimization triggers.
+
+        Args:
+            parameters: Parameters whose latest values are read
+        """
+        return db_client.LatestValueFeed(parameters, db=self.db)
 
-        if is_new_format:
-            # ── Aggregate grid scalars ────────────────────────────────────────
-            add('obj',  data.get('obj',  -1), '-')
-            add('imp',  data.get('imp',  -1), 'kW')
-            add('exp',  data.get('exp',  -1), 'kW')
-            add('exp1', data.get('exp1', -1), 'kW')
-            add('exp2', data.get('exp2', -1), 'kW')
-
-            # ── Per-AFE ───────────────────────────────────────────────────────
-            for afe_id, afe_data in data.get('afe', {}).items():
-                add(f'{afe_id}_imp',  afe_data.get('imp',  -1), 'kW')
-                add(f'{afe_id}_exp',  afe_data.get('exp',  -1), 'kW')
-                add(f'{afe_id}_exp1', afe_data.get('exp1', -1), 'kW')
-                add(f'{afe_id}_exp2', afe_data.get('exp2', -1), 'kW')
-
-            # ── Per-PV ────────────────────────────────────────────────────────
-            for pv_id, pv_data in data.get('pv', {}).items():
-                add(f'{pv_id}_power', pv_data.get('power', -1), 'kW')
-
-            # ── Per-Wind ──────────────────────────────────────────────────────
-            for wind_id, wind_data in data.get('wind', {}).items():
-                add(f'{wind_id}_power', wind_data.get('power', -1), 'kW')
-
-            # ── Per-Load ──────────────────────────────────────────────────────
-            for load_id, load_data in data.get('load', {}).items():
-                add(f'{load_id}_power', load_data.get('power', -1), 'kW')
-
-            # ── Per-Critical-Load ─────────────────────────────────────────────
-            for cload_id, cload_data in data.get('cload', {}).items():
-                add(f'{cload_id}_power', cload_data.get('power', -1), 'kW')
-
-            # ── Per-BESS ──────────────────────────────────────────────────────
-            for bess_id, bess_data in data.get('bess', {}).items():
-                add(f'{bess_id}_charge',    bess_data.get('charge',    -1), 'kW')
-                add(f'{bess_id}_discharge', bess_data.get('discharge', -1), 'kW')
-                add(f'{bess_id}_level',     bess_data.get('level',     -1), 'kWh')
-
-            # ── Per-Unidirectional-EV ─────────────────────────────────────────
-            for uid, uid_data in data.get('unidir', {}).items():
-                add(f'{uid}_charge', uid_data.get('charge', -1), 'kW')
-                add(f'{uid}_soc',    uid_data.get('soc', -1) * 100 if uid_data.get('soc', -1) != -1 else -1, '%')
-
-            # ── Per-Bidirectional-EV ──────────────────────────────────────────
-            for bid, bid_data in data.get('bidir', {}).items():
-                add(f'{bid}_charge',    bid_data.get('charge',    -1), 'kW')
-                add(f'{bid}_discharge', bid_data.get('discharge', -1), 'kW')
-                add(f'{bid}_soc',       bid_data.get('soc', -1) * 100 if bid_data.get('soc', -1) != -1 else -1, '%')
-
-        else:
-            # ── Legacy flat structure ──────────────────────────────────────────
-            legacy = [
-                ('obj',    data.get('obj',  -1), '-'),
-                ('imp',    data.get('imp',  -1), 'kW'),
-                ('exp',    data.get('exp',  -1), 'kW'),
-                ('exp1',   data.get('exp1', -1), 'kW'),
-                ('exp2',   data.get('exp2', -1), '%'),
-                ('pv',     data.get('pv',   -1), 'kW'),
-                ('ld',     data.get('ld',   -1), 'kW'),
-                ('bc',     data.get('bc',   -1), 'kW'),
-                ('bd',     data.get('bd',   -1), 'kW'),
-                ('bl',     data.get('bl',   -1), 'kWh'),
-                ('c1_ch',  data.get('c1_ch', -1), 'kW'),
-                ('c2_ch',  data.get('c2_ch', -1), 'kW'),
-                ('c2_dis', data.get('c2_dis', -1), 'kW'),
-                ('v1_soc', data.get('v1_soc', -1) * 100 if data.get('v1_soc', -1) != -1 else -1, '%'),
-                ('v2_soc', data.get('v2_soc', -1) * 100 if data.get('v2_soc', -1) != -1 else -1, '%'),
-                ('wind',   data.get('wind', -1), 'kW'),
-                ('cld',    data.get('cld',  -1), 'kW'),
-            ]
-            for param, value, unit in legacy:
-                add(param, value, unit)
-
-        cur.executemany("""
-            INSERT INTO "ems-outputs" (output_id, time, parameter, value, unit, quality, objective)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, rows)
-        conn.commit()
-        cur.close()
-        conn.close()
-        self.logger.debug(f"Inserted {len(rows)} output records to database")
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Inputs
-    # ─────────────────────────────────────────────────────────────────────────
-
-    def insert_inputs_to_db(self, data: Dict[str, Any]):
+    def new_cycle(self, mode: str) -> OptimizationCycle:
+        """Start the record of a new optimization cycle."""
+        return OptimizationCycle(mode=mode, objective=self.objective_function)
+
+    def record_cycle(self, cycle: OptimizationCycle) -> bool:
         """
-        Insert optimizer inputs to database.
-
-        New multi-device structure expected:
-          {
-            'afe':   { '<afe_id>':   { 'max_kW', 'available', 'grid_svc_kW' } },
-            'pv':    { '<pv_id>':    { 'power_fct_kW' } },
-            'wind':  { '<wind_id>':  { 'power_fct_kW' } },
-            'load':  { '<load_id>':  { 'power_fct_kW' } },
-            'cload': { '<cload_id>': { 'power_fct_kW' } },
-            'bess':  { '<bess_id>':  { 'efficiency', 'level_init_kWh', ... } },
-            'unidir':{ '<uid>':      { 'soc_init', 'car_capacity_kWh', ... } },
-            'bidir': { '<bid>':      { 'soc_init', 'car_capacity_kWh', ... } },
-          }
+        Queue a finished cycle for persistence. The row is written by the background
+        writer in a single INSERT, off the control loop. All stage timings go into
+        stats.stages_ms; fetch, solve, apply and total also have their own columns.
+
+        Returns:
+            bool: False if the write queue was full and the record was dropped
         """
-        conn = psycopg2.connect(
-            host=self.db_config['host'],
-            port=self.db_config['port'],
-            database=self.db_config['database'],
-            user=self.db_config['user'],
-            password=self.db_config['password']
+        timings = cycle.timings_ms
+        params = (
+            cycle.cycle_id, cycle.started_at, cycle.mode, cycle.objective, cycle.status,
+            cycle.solver_status, cycle.quality, cycle.message,
+            timings.get('fetch'), timings.get('solve'), timings.get('apply'), timings.get('total'),
+            _json(_rows_to_json(cycle.inputs)), _json(_rows_to_json(cycle.outputs)),
+            _json(cycle.setpoints),
+            _json({**cycle.stats, 'stages_ms': {stage: round(ms, 3) for stage, ms in timings.items()}}),
         )
-        cur = conn.cursor()
-        rows = []
-        input_id = 1
-
-        def add(param, value, unit):
-            nonlocal input_id
-            rows.append((
-                input_id, current_time(), param, value,
-                unit, 'ok', self.objective_function
-            ))
-            input_id += 1
-
-        is_new_format = any(
-            k in data and isinstance(data[k], dict)
-            for k in ('afe', 'pv', 'wind', 'load', 'cload', 'bess', 'unidir', 'bidir')
+        queued = self.writer.submit(INSERT_CYCLE_SQL, params, name='insert_cycle')
+        if queued:
+            self.logger.debug(f"Queued cycle {cycle.cycle_id} ({len(cycle.inputs)} inputs, "
+                              f"{len(cycle.outputs)} outputs)")
+        return queued
+
+    def record_shadow(self, cycle_id: str, objective: str, result: Dict[str, Any]) -> bool:
+        """
+        Queue the result of a shadow objective for the cycle `cycle_id` (see
+        optimization/shadow.py); written by the background writer like cycle records.
+
+        Args:
+            cycle_id: cycle_id of the live cycle whose inputs were solved
+            objective: Shadow objective
+            result: 'status', 'outputs' (rows) and optionally 'solver_status', 'message',
+                    'solve_ms' and 'wall_ms'
+
+        Returns:
+            bool: False if the write queue was full and the record was dropped
+        """
+        params = (
+            cycle_id, current_time(), objective, result['status'], result.get('solver_status'),
+            result.get('message'), result.get('solve_ms'), result.get('wall_ms'),
+            _json(_rows_to_json(result.get('outputs') or [])),
         )
+        return self.writer.submit(INSERT_SHADOW_SQL, params, name='insert_shadow')
 
-        if is_new_format:
-            # ── Per-AFE ───────────────────────────────────────────────────────
-            for afe_id, afe_data in data.get('afe', {}).items():
-                add(f'{afe_id}_max',      afe_data.get('max_kW',      -1), 'kW')
-                add(f'{afe_id}_available', afe_data.get('available',   -1), '-')
-                add(f'{afe_id}_grid_svc', afe_data.get('grid_svc_kW', -1), 'kW')
-
-            # ── Per-PV ────────────────────────────────────────────────────────
-            for pv_id, pv_data in data.get('pv', {}).items():
-                add(f'{pv_id}_power_fct', pv_data.get('power_fct_kW', -1), 'kW')
-
-            # ── Per-Wind ──────────────────────────────────────────────────────
-            for wind_id, wind_data in data.get('wind', {}).items():
-                add(f'{wind_id}_power_fct', wind_data.get('power_fct_kW', -1), 'kW')
-
-            # ── Per-Load ──────────────────────────────────────────────────────
-            for load_id, load_data in data.get('load', {}).items():
-                add(f'{load_id}_power_fct', load_data.get('power_fct_kW', -1), 'kW')
-
-            # ── Per-Critical-Load ─────────────────────────────────────────────
-            for cload_id, cload_data in data.get('cload', {}).items():
-                add(f'{cload_id}_power_fct', cload_data.get('power_fct_kW', -1), 'kW')
-
-            # ── Per-BESS ──────────────────────────────────────────────────────
-            for bess_id, bess_data in data.get('bess', {}).items():
-                add(f'{bess_id}_efficiency',  bess_data.get('efficiency',     -1), '-')
-                add(f'{bess_id}_level_init',  bess_data.get('level_init_kWh', -1), 'kWh')
-                add(f'{bess_id}_level_min',   bess_data.get('level_min_kWh',  -1), 'kWh')
-                add(f'{bess_id}_level_max',   bess_data.get('level_max_kWh',  -1), 'kWh')
-                add(f'{bess_id}_power_max',   bess_data.get('power_max_kW',   -1), 'kW')
-                add(f'{bess_id}_fault',       bess_data.get('level_fault_kWh',-1), 'kWh')
-
-            # ── Per-Unidirectional-EV ─────────────────────────────────────────
-            for uid, uid_data in data.get('unidir', {}).items():
-                add(f'{uid}_soc_init',  uid_data.get('soc_init',          -1), '-')
-                add(f'{uid}_capacity',  uid_data.get('car_capacity_kWh',  -1), 'kWh')
-                add(f'{uid}_efficiency',uid_data.get('efficiency',         -1), '-')
-                add(f'{uid}_power',     uid_data.get('charger_power_max_kW', -1), 'kW')
-
-            # ── Per-Bidirectional-EV ──────────────────────────────────────────
-            for bid, bid_data in data.get('bidir', {}).items():
-                add(f'{bid}_soc_init',  bid_data.get('soc_init',             -1), '-')
-                add(f'{bid}_capacity',  bid_data.get('car_capacity_kWh',     -1), 'kWh')
-                add(f'{bid}_efficiency',bid_data.get('efficiency',            -1), '-')
-                add(f'{bid}_power',     bid_data.get('charger_power_max_kW', -1), 'kW')
-                add(f'{bid}_arrival',   bid_data.get('arrival_soc',          -1), '-')
-                add(f'{bid}_target',    bid_data.get('target_soc',           -1), '-')
-                add(f'{bid}_available', bid_data.get('is_available',         -1), '-')
-
-        else:
-            # ── Legacy flat structure ──────────────────────────────────────────
-            legacy = [
-                ('pv_fct',   data.get('pv_fct',   -1), 'kW'),
-                ('ld_fct',   data.get('ld_fct',   -1), 'kW'),
-                ('afe_max',  data.get('afe_max',  -1), 'kW'),
-                ('afe_abl',  data.get('afe_abl',  -1), '-'),
-                ('grid_svc', data.get('grid_svc', -1), 'kW'),
-                ('be',       data.get('be',       -1), '-'),
-                ('bl_min',   data.get('bl_min',   -1), 'kWh'),
-                ('bl_max',   data.get('bl_max',   -1), 'kWh'),
-                ('bc_max',   data.get('bc_max',   -1), 'kW'),
-                ('bl_init',  data.get('bl_init',  -1), 'kWh'),
-                ('bl_fault', data.get('bl_fault', -1), 'kWh'),
-                ('v1_p',     data.get('v1_p',     -1), 'kW'),
-                ('v1_c',     data.get('v1_c',     -1), 'kWh'),
-                ('v1_init',  data.get('v1_init',  -1), '-'),
-                ('v2_p',     data.get('v2_p',     -1), 'kW'),
-                ('v2_c',     data.get('v2_c',     -1), 'kWh'),
-                ('v2_init',  data.get('v2_init',  -1), '-'),
-                ('v2_arr',   data.get('v2_arr',   -1), '-'),
-                ('v2_trg',   data.get('v2_trg',   -1), '-'),
-                ('v2_abl',   data.get('v2_abl',   -1), '-'),
-                ('c1_eff',   data.get('c1_eff',   -1), '-'),
-                ('c1_p',     data.get('c1_p',     -1), 'kW'),
-                ('c2_eff',   data.get('c2_eff',   -1), '-'),
-                ('c2_p',     data.get('c2_p',     -1), 'kW'),
-                ('wind_fct', data.get('wind_fct', -1), 'kW'),
-                ('cld_fct',  data.get('cld_fct',  -1), 'kW'),
-            ]
-            for param, value, unit in legacy:
-                add(param, value, unit)
-
-        cur.executemany("""
-            INSERT INTO "ems-inputs" (input_id, time, parameter, value, unit, quality, objective)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, rows)
-        conn.commit()
-        cur.close()
-        conn.close()
-        self.logger.debug(f"Inserted {len(rows)} input records to database")
\ No newline at end of file
+    def close(self, timeout: float = 5.0):
+        """Flush pending cycle records."""
+        self.writer.close(timeout)
@@ -19,7 +19,7 @@ limitations under the License.
 @Description: # TODO: Add desc
 
 @Created: 3rd February 2026
-@Last Modified: 16 February 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -28,9 +28,14 @@ limitations under the License.
 
 import logging
 
-def setup_logging():
+def setup_logging(thread_names: bool = False):
+    """
+    Args:
+        thread_names: Also log the thread name (the site of a multi-site process)
+    """
+    thread = '%(threadName)s - ' if thread_names else ''
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+        format=f'%(asctime)s - %(levelname)s - {thread}%(name)s - %(message)s',
         handlers=[logging.StreamHandler()]
     )
\ No newline at end of file
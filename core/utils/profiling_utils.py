@@ -0,0 +1,237 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+@File: profiling_utils.py
+@Description: Cycle profiling. Every cycle record carries its per-stage durations
+              (stats.stages_ms: select, init, fetch, prepare, solve, apply, record, rebase,
+              total), the model size and the HiGHS statistics of the solve (stats.solver),
+              and the data-to-actuation latency (stats.latency_ms). This module prints percentiles over the last cycles:
+
+                  python -m utils.profiling_utils --last 200 [--mode "Optimizer Mode"] [--json]
+
+              With EMS_CYCLE_PROFILE_DIR set, the optimizer service captures a cProfile of the
+              next cycle on SIGUSR1 (kill -USR1 <pid>) and writes it to that directory.
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import argparse
+import cProfile
+import io
+import json
+import logging
+import math
+import os
+import pstats
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Sequence
+
+from db.queries import run_query
+from utils.logging_utils import setup_logging
+from utils.time_utils import current_time
+
+logger = logging.getLogger('ems.profiling')
+
+STAGES = ('select', 'init', 'fetch', 'prepare', 'solve', 'apply', 'record', 'rebase', 'total')
+
+# Per-cycle values of stats.solver and stats.latency_ms summarized next to the stages
+SOLVER_KEYS = ('build_ms', 'solve_ms', 'num_col', 'num_row', 'num_int',
+               'mip_nodes', 'mip_gap', 'simplex_iterations')
+LATENCY_KEYS = ('data_to_actuation', 'sample_to_actuation')
+
+
+# ── On-demand cProfile ────────────────────────────────────────────────────────
+
+class CycleProfiler:
+    """
+    cProfile of a single cycle, armed by a signal. The handler only sets a flag; the next
+    capture() profiles its block, writes `<label>-<time>.prof` (for pstats or snakeviz) and
+    logs the top functions by cumulative time.
+    """
+
+    def __init__(self, directory: str, signal_name: str = 'SIGUSR1', top: int = 25):
+        """
+        Args:
+            directory: Where the .prof files are written
+            signal_name: Signal that arms the profiler
+            top: Number of functions logged after a capture
+        """
+        self.directory = directory
+        self.signal_name = signal_name
+        self.top = top
+        self.last_path: Optional[str] = None
+        self._armed = threading.Event()
+
+    @classmethod
+    def from_env(cls) -> Optional['CycleProfiler']:
+        """A profiler writing to EMS_CYCLE_PROFILE_DIR, or None if it is not set."""
+        directory = os.getenv('EMS_CYCLE_PROFILE_DIR')
+        return cls(directory) if directory else None
+
+    def install(self) -> bool:
+        """Register the signal handler (main thread only; not available on every platform)."""
+        signum = getattr(signal, self.signal_name, None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            logger.warning(f"Cannot install the cycle profiler on {self.signal_name}")
+            return False
+        signal.signal(signum, lambda *_: self.arm())
+        logger.info(f"Cycle profiler armed by {self.signal_name} (pid {os.getpid()}), "
+                    f"profiles in {self.directory}")
+        return True
+
+    def arm(self):
+        """Profile the next capture()."""
+        self._armed.set()
+
+    @property
+    def armed(self) -> bool:
+        return self._armed.is_set()
+
+    @contextmanager
+    def capture(self, label: str = 'cycle'):
+        """Profile the block if the profiler is armed; otherwise just run it."""
+        if not self._armed.is_set():
+            yield
+            return
+        self._armed.clear()
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._save(profile, label)
+
+    def _save(self, profile: cProfile.Profile, label: str):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{label}-{current_time():%Y%m%d-%H%M%S}.prof")
+            profile.dump_stats(path)
+            self.last_path = path
+        except OSError as e:
+            logger.error(f"Could not write the cycle profile: {e}")
+            path = None
+
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(self.top)
+        logger.info(f"Cycle profile{f' written to {path}' if path else ''}:\n{summary.getvalue()}")
+
+
+# ── Percentiles ───────────────────────────────────────────────────────────────
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """q-th percentile (0-100) with linear interpolation; None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _stages_of(row: Dict[str, Any]) -> Dict[str, float]:
+    """Stage durations of a cycle row; records written before stats.stages_ms have the columns only."""
+    stages = dict((row.get('stats') or {}).get('stages_ms') or {})
+    for stage in ('fetch', 'solve', 'apply', 'total'):
+        if stage not in stages and row.get(f'{stage}_ms') is not None:
+            stages[stage] = row[f'{stage}_ms']
+    return stages
+
+
+def cycle_percentiles(rows: List[Dict[str, Any]],
+                      percentiles: Sequence[float] = (50, 90, 99)) -> Dict[str, Dict[str, Any]]:
+    """
+    Percentiles of the stage durations, solver statistics and latencies of cycle rows.
+
+    Args:
+        rows: optimization_cycles rows ('recent_cycles' query)
+        percentiles: Percentiles to compute (0-100)
+
+    Returns:
+        {metric: {'n', 'p<q>'..., 'max'}}, metrics named 'stage.<name>', 'solver.<key>'
+        and 'latency.<key>'; metrics without values are left out
+    """
+    series: Dict[str, List[float]] = {}
+
+    def add(metric, value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            series.setdefault(metric, []).append(float(value))
+
+    for row in rows:
+        stats = row.get('stats') or {}
+        for stage, value in _stages_of(row).items():
+            add(f'stage.{stage}', value)
+        solver = stats.get('solver') or {}
+        for key in SOLVER_KEYS:
+            add(f'solver.{key}', solver.get(key))
+        latency = stats.get('latency_ms') or {}
+        for key in LATENCY_KEYS:
+            add(f'latency.{key}', latency.get(key))
+
+    def order(metric):
+        group, name = metric.split('.', 1)
+        keys = {'stage': STAGES, 'solver': SOLVER_KEYS, 'latency': LATENCY_KEYS}[group]
+        return (('stage', 'latency', 'solver').index(group),
+                keys.index(name) if name in keys else len(keys), name)
+
+    summary = {}
+    for metric in sorted(series, key=order):
+        values = series[metric]
+        summary[metric] = {'n': len(values),
+                           **{f'p{q:g}': round(percentile(values, q), 3) for q in percentiles},
+                           'max': round(max(values), 3)}
+    return summary
+
+
+def fetch_recent_cycles(last: int, mode: str = None) -> List[Dict[str, Any]]:
+    """The last `last` cycle rows, newest first (all modes if `mode` is None)."""
+    return run_query('recent_cycles', (mode, last))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stage timing percentiles of the last optimization cycles')
+    parser.add_argument('--last', type=int, default=200, help='Number of most recent cycles')
+    parser.add_argument('--mode', default=None, help='Only cycles of this mode (e.g. "Optimizer Mode")')
+    parser.add_argument('--percentiles', type=float, nargs='+', default=[50, 90, 99])
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+
+    rows = fetch_recent_cycles(args.last, args.mode)
+    summary = cycle_percentiles(rows, args.percentiles)
+    if args.json:
+        print(json.dumps({'cycles': len(rows), 'metrics': summary}, indent=2))
+        return
+
+    print(f"{len(rows)} cycles{f' of {args.mode}' if args.mode else ''}")
+    columns = [f'p{q:g}' for q in args.percentiles] + ['max']
+    print(f"{'metric':<30} {'n':>5} " + ' '.join(f'{c:>10}' for c in columns))
+    for metric, values in summary.items():
+        print(f"{metric:<30} {values['n']:>5} " + ' '.join(f'{values[c]:>10.4g}' for c in columns))
+
+
+if __name__ == '__main__':
+    setup_logging()
+    main()
@@ -19,7 +19,7 @@ limitations under the License.
 @Description: # TODO: Add desc
 
 @Created: 1st July 2025
-@Last Modified: 05 March 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -90,4 +90,21 @@ def calculate_time_for_execution(
 
 def floor_to_hour(dt: datetime) -> datetime:
     """Round a datetime down to the nearest whole hour."""
-    return dt.replace(minute=0, second=0, microsecond=0)
\ No newline at end of file
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def parse_datetime(date_string: str) -> datetime:
+    """Parse datetime string in various formats."""
+    formats = [
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%d",
+    ]
+
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_string, fmt)
+        except ValueError:
+            continue
+
+    raise ValueError(f"Could not parse datetime: {date_string}")
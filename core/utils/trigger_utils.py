@@ -0,0 +1,219 @@
+'''
+SPDX-License-Identifier: Apache-2.0
+
+Copyright 2026 Eaton
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@File: trigger_utils.py
+@Description: Event-driven re-optimization triggers for the coordinator. Live measurements are
+              compared with their values at the last optimization; a sharp power deviation,
+              a change of an availability / grid-service / car state, or a SoC crossing one of
+              the configured bounds requests an immediate off-cycle optimization. Configured in
+              generalSiteConfig.triggers:
+                {"pollSeconds": 10, "debounceSeconds": 20, "minIntervalSeconds": 120,
+                 "powerDeviation": {"relative": 0.3, "absoluteW": 2000},
+                 "stateChange": true, "socBounds": [15, 90]}
+
+@Created: 19 October 2026
+@Last Modified: 19 October 2026
+@Author: Leon Gritsyuk
+
+@Version: v2.0.2
+'''
+
+
+import logging
+import time
+from typing import Dict, Any, List, NamedTuple, Optional
+
+logger = logging.getLogger('ems.triggers')
+
+# Device types whose power is watched for deviations
+POWER_TYPES = ('PV', 'WIND', 'LOAD', 'CRITICAL_LOAD')
+
+# Parameter suffixes per device type whose changes are state changes. A car plugging in or
+# out of a unidirectional charger shows as its car capacity changing between zero and non-zero.
+STATE_SUFFIXES = {
+    'AFE':   ('AVBL', 'GRIDSRVC'),
+    'BI_EV': ('CAR_AVBL',),
+}
+PLUG_SUFFIX = 'CAR_CAP'
+
+SOC_TYPES = ('BESS', 'UNI_EV', 'BI_EV')
+
+
+class TriggerEvent(NamedTuple):
+    """A trigger condition that fired: which kind, on which parameter, and the two values."""
+    kind: str
+    parameter: str
+    reference: Optional[float]
+    value: Optional[float]
+
+    def describe(self) -> str:
+        return f"{self.kind} {self.parameter}: {self.reference} -> {self.value}"
+
+
+class TriggerMonitor:
+    """
+    Watches live measurements between scheduled cycles.
+
+    A condition must still hold `debounceSeconds` after it first fired before an off-cycle
+    optimization is requested (so a flickering flag or a passing cloud does not cause a
+    solve), and optimizations are at least `minIntervalSeconds` apart, scheduled ones included.
+    """
+
+    def __init__(self, config: Dict[str, Any], feed=None, clock=time.monotonic):
+        """
+        Args:
+            config: Site configuration (devices and generalSiteConfig.triggers)
+            feed: Object with fetch() -> {parameter: value} over `parameters`, e.g. the DB's
+                  LatestValueFeed or an in-process measurement feed (may be set later)
+            clock: Monotonic time source in seconds
+        """
+        settings = config.get('generalSiteConfig', {}).get('triggers') or {}
+        self.poll_seconds = float(settings.get('pollSeconds', 10))
+        self.debounce_seconds = float(settings.get('debounceSeconds', 20))
+        self.min_interval_seconds = float(settings.get('minIntervalSeconds', 120))
+        deviation = settings.get('powerDeviation', {}) or {}
+        self.relative_deviation = float(deviation.get('relative', 0.3))
+        self.absolute_deviation = float(deviation.get('absoluteW', 2000))
+        self.state_change = bool(settings.get('stateChange', True))
+        self.soc_bounds = sorted(float(bound) for bound in settings.get('socBounds', [15, 90]))
+
+        self.power_parameters: List[str] = []
+        self.state_parameters: List[str] = []
+        self.plug_parameters: List[str] = []
+        self.soc_parameters: List[str] = []
+        for device in config.get('devices', []):
+            device_id, device_type = device['id'], device.get('type')
+            if device_type in POWER_TYPES and settings.get('powerDeviation', True):
+                self.power_parameters.append(f"{device_id}_POWER")
+            if self.state_change:
+                self.state_parameters += [f"{device_id}_{suffix}" for suffix in STATE_SUFFIXES.get(device_type, ())]
+                if device_type in ('UNI_EV', 'BI_EV'):
+                    self.plug_parameters.append(f"{device_id}_{PLUG_SUFFIX}")
+            if device_type in SOC_TYPES and self.soc_bounds:
+                self.soc_parameters.append(f"{device_id}_SoC")
+
+        self.parameters = (self.power_parameters + self.state_parameters
+                           + self.plug_parameters + self.soc_parameters)
+        self.feed = feed
+        self.clock = clock
+        self.reference: Dict[str, float] = {}
+        self.last_run: Optional[float] = None
+        self._pending_since: Optional[float] = None
+        self.stats = {'polls': 0, 'fired': 0, 'debounced': 0, 'rate_limited': 0}
+
+    # ── Conditions ────────────────────────────────────────────────────────────
+
+    def check(self, values: Dict[str, float]) -> List[TriggerEvent]:
+        """Trigger conditions that hold for `values` against the reference values."""
+        events = []
+        reference = self.reference
+
+        for parameter in self.power_parameters:
+            if parameter not in values or parameter not in reference:
+                continue
+            value, previous = abs(values[parameter]), abs(reference[parameter])
+            if abs(value - previous) > max(self.absolute_deviation, self.relative_deviation * previous):
+                events.append(TriggerEvent('power deviation', parameter, reference[parameter], values[parameter]))
+
+        for parameter in self.state_parameters:
+            if parameter in values and parameter in reference and values[parameter] != reference[parameter]:
+                events.append(TriggerEvent('state change', parameter, reference[parameter], values[parameter]))
+
+        for parameter in self.plug_parameters:
+            if parameter in values and parameter in reference and \
+                    (values[parameter] > 0) != (reference[parameter] > 0):
+                kind = 'car plugged in' if values[parameter] > 0 else 'car unplugged'
+                events.append(TriggerEvent(kind, parameter, reference[parameter], values[parameter]))
+
+        for parameter in self.soc_parameters:
+            if parameter not in values or parameter not in reference:
+                continue
+            value, previous = values[parameter], reference[parameter]
+            for bound in self.soc_bounds:
+                if (previous < bound) != (value < bound):
+                    events.append(TriggerEvent(f"SoC crossed {bound:g} %", parameter, previous, value))
+
+        return events
+
+    # ── Polling ───────────────────────────────────────────────────────────────
+
+    def rebase(self, values: Dict[str, float] = None):
+        """
+        Take the current values as the reference after an optimization ran.
+
+        Args:
+            values: The values the optimization used (default: fetched from the feed)
+        """
+        if values is None:
+            values = self._fetch()
+        self.reference = dict(values)
+        self.last_run = self.clock()
+        self._pending_since = None
+
+    def _fetch(self) -> Dict[str, float]:
+        try:
+            return self.feed.fetch()
+        except Exception as e:
+            logger.error(f"Could not read live measurements for the triggers: {e}")
+            return {}
+
+    def poll(self) -> List[TriggerEvent]:
+        """
+        Read the live values and decide whether to optimize now.
+
+        Returns:
+            The trigger events that request an off-cycle optimization, or [] if there are
+            none, they are still being debounced, or the solve rate limit applies
+        """
+        self.stats['polls'] += 1
+        if not self.parameters:
+            return []
+        now = self.clock()
+        events = self.check(self._fetch())
+
+        if not events:
+            if self._pending_since is not None:
+                self.stats['debounced'] += 1
+                logger.debug("Trigger condition cleared before the debounce time")
+            self._pending_since = None
+            return []
+
+        if self._pending_since is None:
+            self._pending_since = now
+            logger.debug(f"Trigger pending: {events[0].describe()}")
+        if now - self._pending_since < self.debounce_seconds:
+            return []
+        if self.last_run is not None and now - self.last_run < self.min_interval_seconds:
+            self.stats['rate_limited'] += 1
+            return []
+
+        self.stats['fired'] += 1
+        return events
+
+
+def describe_events(events: List[TriggerEvent], limit: int = 5) -> str:
+    """One line naming the first `limit` events."""
+    text = '; '.join(event.describe() for event in events[:limit])
+    if len(events) > limit:
+        text += f" (+{len(events) - limit} more)"
+    return text
+
+
+def trigger_settings_enabled(config: Dict[str, Any]) -> bool:
+    """True if generalSiteConfig.triggers is configured and not disabled."""
+    settings = config.get('generalSiteConfig', {}).get('triggers')
+    return bool(settings) and settings.get('enabled', True) is not False
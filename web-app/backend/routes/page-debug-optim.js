@@ -19,7 +19,7 @@ limitations under the License.
 @Description: # TODO: Add desc
 
 @Created: 24th November 2025
-@Last Modified: 01 March 2026
+@Last Modified: 19 October 2026
 @Author: LeonGritsyuk-eaton
 
 @Version: v2.0.2
@@ -145,4 +145,37 @@ router.get('/ems-outputs/recent', async (req, res) => {
   }
 });
 
+// GET /api/ems-outputs/shadow - Fetch shadow objective results of the latest evaluated cycle
+router.get('/ems-outputs/shadow', async (req, res) => {
+  try {
+    const query = `
+      SELECT 
+        s.cycle_id,
+        s.time,
+        s.objective,
+        s.status,
+        s.solver_status,
+        s.message,
+        s.solve_ms,
+        s.wall_ms,
+        s.outputs
+      FROM optimization_shadows s
+      WHERE s.cycle_id = (
+        SELECT cycle_id FROM optimization_shadows ORDER BY time DESC LIMIT 1
+      )
+      ORDER BY s.objective
+    `;
+    
+    const result = await pool.query(query);
+    
+    res.json(result.rows);
+  } catch (error) {
+    console.error('Error fetching shadow EMS outputs:', error);
+    res.status(500).json({ 
+      error: 'Internal server error',
+      message: 'Failed to fetch shadow EMS outputs'
+    });
+  }
+});
+
 export default router;
\ No newline at end of file
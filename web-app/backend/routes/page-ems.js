@@ -211,10 +211,11 @@ router.get('/:date', async (req, res) => {
          ORDER BY time ASC`,
         [date, allInputParams]
       ),
+      // 'fallback' cycles were dispatched by the merit-order fallback and actuated as well
       pool.query(
         `SELECT time, parameter, value, unit
          FROM "ems-outputs"
-         WHERE DATE(time) = $1 AND parameter = ANY($2::text[]) AND quality = 'ok'
+         WHERE DATE(time) = $1 AND parameter = ANY($2::text[]) AND quality IN ('ok', 'fallback')
          ORDER BY time ASC`,
         [date, allOutputParams]
       ),